@@ -0,0 +1 @@
+"""Výkonnostní benchmarky trading assistanta"""
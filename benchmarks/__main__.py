@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Spuštění benchmarků: python -m benchmarks [--quick] [--output out.json] [--baseline base.json]
+"""
+
+import argparse
+import json
+import platform
+import sys
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from benchmarks.harness import compare
+from benchmarks.suite import GROUPS, run_suite
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Výkonnostní benchmarky trading assistanta")
+    parser.add_argument("--group", action="append", choices=sorted(GROUPS),
+                        help="Spustí jen vybrané skupiny (lze opakovat)")
+    parser.add_argument("--quick", action="store_true", help="Menší objemy dat a méně opakování")
+    parser.add_argument("--output", default="benchmarks/results.json", help="Kam uložit výsledky (JSON)")
+    parser.add_argument("--baseline", help="Baseline JSON pro porovnání")
+    parser.add_argument("--threshold", type=float, default=0.15,
+                        help="Povolené zhoršení proti baseline (0.15 = 15 %%)")
+    args = parser.parse_args()
+
+    results = run_suite(args.group or list(GROUPS), quick=args.quick)
+    data = {
+        "meta": {
+            "created_at": datetime.now().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "quick": args.quick,
+        },
+        "results": {r.name: r.to_dict() for r in results},
+    }
+
+    for r in results:
+        print(f"{r.name:<50} {r.median * 1000:>10.3f} ms  ({r.per_op_us:>10.1f} µs/op)")
+
+    Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+    Path(args.output).write_text(json.dumps(data, indent=2), encoding="utf-8")
+    print(f"\nVýsledky uloženy do {args.output}")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))["results"]
+        regressions = compare(data["results"], baseline, args.threshold)
+        if regressions:
+            print(f"\n❌ Regrese nad {args.threshold:.0%}:")
+            for reg in regressions:
+                print(f"  {reg.name}: {reg.baseline * 1000:.3f} ms -> {reg.current * 1000:.3f} ms ({reg.change:+.0%})")
+            return 1
+        print(f"\n✅ Žádné regrese nad {args.threshold:.0%} proti {args.baseline}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Benchmark: čtení rozsahu svíček ze SQLite vs. sloupcového archivu (CandleLake)
+"""
+
+import argparse
+import asyncio
+import json
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.domain.models import CandleArray
+from src.infrastructure.persistence.database.sqlite_market_data_repository import SqliteMarketDataRepository
+from src.infrastructure.persistence.database.sqlite_schema import PRICE_SCALE, SIZE_SCALE, UPSERT_CANDLE
+from src.infrastructure.persistence.lake.candle_lake import CandleLake
+
+
+def make_array(symbol: str, count: int, start: datetime) -> CandleArray:
+    """Vygeneruje syntetické 15-minutové svíčky"""
+    rng = np.random.default_rng(42)
+    close = 100 + np.cumsum(rng.normal(0, 0.5, count))
+    timestamp = int(start.timestamp() * 1000) + np.arange(count, dtype=np.int64) * 900_000
+    return CandleArray(
+        symbol, timestamp, close, close + 0.5, close - 0.5, close, rng.uniform(1, 100, count)
+    )
+
+
+def _best_of(repeats: int, fn) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def run(candles: int = 100_000, repeats: int = 3) -> dict:
+    """Změří načtení celého rozsahu z obou úložišť a vrátí výsledky v sekundách"""
+    start = datetime(2022, 1, 1)
+    array = make_array("BTCUSDT", candles, start)
+    end = start + timedelta(minutes=15 * candles)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = str(Path(tmp) / "bench.db")
+        repository = SqliteMarketDataRepository(db_path)
+        rows = [
+            ("BTCUSDT", "15", ts, round(o * PRICE_SCALE), round(h * PRICE_SCALE),
+             round(lo * PRICE_SCALE), round(c * PRICE_SCALE), round(v * SIZE_SCALE))
+            for ts, o, h, lo, c, v in zip(
+                array.timestamp.tolist(), array.open.tolist(), array.high.tolist(),
+                array.low.tolist(), array.close.tolist(), array.volume.tolist()
+            )
+        ]
+        with sqlite3.connect(db_path) as conn:
+            conn.executemany(UPSERT_CANDLE, rows)
+
+        lake = CandleLake(str(Path(tmp) / "lake"))
+        lake.append("BTCUSDT", "15", array, backfill=True)
+        for month in lake.months("BTCUSDT", "15"):
+            lake.compact("BTCUSDT", "15", month)
+
+        sqlite_seconds = _best_of(
+            repeats, lambda: asyncio.run(repository.get_candles("BTCUSDT", start, end))
+        )
+        lake_seconds = _best_of(repeats, lambda: lake.read_range("BTCUSDT", "15", start, end))
+        lake_candles_seconds = _best_of(
+            repeats, lambda: lake.read_range("BTCUSDT", "15", start, end).to_candles()
+        )
+
+    return {
+        "candles": candles,
+        "sqlite_get_candles_s": sqlite_seconds,
+        "lake_read_range_s": lake_seconds,
+        "lake_read_range_to_candles_s": lake_candles_seconds,
+        "speedup": sqlite_seconds / lake_seconds if lake_seconds else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--candles", type=int, default=100_000)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+    print(json.dumps(run(args.candles, args.repeats), indent=2))
+
+
+if __name__ == "__main__":
+    main()
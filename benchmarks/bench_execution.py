@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Benchmark: slippage proti arrival ceně podle exekučního algoritmu
+
+Simulovaná burza (`PaperExchange`) s tenkou knihou: hladiny po 0,1 %,
+na nejlepší ceně 5 ks a s každým snímkem knihy do ní protistrana
+obchoduje (nejlepší hladina ubývá a doplňuje se).
+
+- market: celá objednávka jednou market objednávkou
+- twap / iceberg: `ExecutionScheduler` s dílčími objednávkami podle hloubky
+
+Výsledkem je slippage v bps (kladné = horší než střed knihy při příchodu).
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+from typing import Dict, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.application.services.execution_scheduler import ExecutionScheduler
+from src.config.settings import ExecutionConfig
+from src.domain.models import Order, OrderBook, OrderState, TradeType
+from src.infrastructure.external.paper.paper_client import PaperBybitClient
+from src.infrastructure.external.paper.paper_exchange import PaperExchange
+
+
+MID = Decimal("100")
+
+
+class _ThinBookClient(PaperBybitClient):
+    """Paper klient se syntetickou tenkou knihou místo dotazů na Bybit"""
+
+    def __init__(self):
+        super().__init__(PaperExchange(balance=Decimal("1e9"), taker_fee=Decimal("0"), maker_fee=Decimal("0")),
+                         book_max_age=0)
+        self._step = 0
+
+    async def get_orderbook(self, symbol: str, limit: int = 25) -> Optional[OrderBook]:
+        self._step += 1
+        # Protistrana odebírá z nejlepší hladiny 1 ks za snímek
+        top = Decimal(5 - self._step % 5)
+        tick = MID * Decimal("0.001")
+        levels = [(i, top if i == 1 else Decimal(5)) for i in range(1, limit + 1)]
+        book = OrderBook(
+            symbol=symbol,
+            bids=[(MID - tick * i, quantity) for i, quantity in levels],
+            asks=[(MID + tick * i, quantity) for i, quantity in levels],
+            timestamp=datetime.now()
+        )
+        self.exchange.update_book(book)
+        return book
+
+
+async def _market(quantity: Decimal) -> float:
+    client = _ThinBookClient()
+    book = await client.get_orderbook("BTCUSDT", 50)
+    order = client.exchange.place_order("BTCUSDT", TradeType.BUY, quantity)
+    mid = (book.bids[0][0] + book.asks[0][0]) / 2
+    return float((order.avg_price - mid) / mid * 10000)
+
+
+async def _algo(algo: str, quantity: Decimal, duration: float) -> float:
+    config = ExecutionConfig(
+        algo=algo, min_notional_usd=Decimal("0"), duration=duration, slices=10,
+        child_timeout=duration / 10, poll_interval=duration / 100
+    )
+    scheduler = ExecutionScheduler(_ThinBookClient(), config)
+    order = Order(order_link_id="bench", symbol="BTCUSDT", side=TradeType.BUY, quantity=quantity, price=MID)
+    done = asyncio.Event()
+
+    def on_event(event):
+        if event.state in (OrderState.FILLED, OrderState.CANCELLED):
+            done.set()
+
+    scheduler.start(order, on_event)
+    await done.wait()
+    return scheduler.reports()[-1]["slippage_bps"]
+
+
+def run(quantities=(5, 20, 50), duration: float = 0.5) -> Dict[str, Dict[str, float]]:
+    """Slippage (bps) podle velikosti objednávky a algoritmu"""
+    results = {}
+    for quantity in quantities:
+        quantity = Decimal(quantity)
+        results[f"{quantity}_units"] = {
+            "market": asyncio.run(_market(quantity)),
+            "twap": asyncio.run(_algo("twap", quantity, duration)),
+            "iceberg": asyncio.run(_algo("iceberg", quantity, duration)),
+        }
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Slippage podle exekučního algoritmu")
+    parser.add_argument("--quantity", type=int, action="append", help="Velikost objednávky (lze opakovat)")
+    parser.add_argument("--duration", type=float, default=0.5, help="Doba exekuce v sekundách")
+    args = parser.parse_args()
+    print(json.dumps(run(tuple(args.quantity or (5, 20, 50)), args.duration), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
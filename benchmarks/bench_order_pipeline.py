@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Benchmark: latence signál -> odeslání objednávky
+
+- journal_first: původní cesta BUY signálu - dotaz na zůstatek, zápis obchodu
+  (unit of work) a teprve pak objednávka na burzu
+- pipeline: zůstatek z začátku cyklu, objednávka hned přes `OrderPipeline`,
+  obchod se zapíše na pozadí
+
+Offline burza může simulovat síťovou latenci (`--exchange-latency-ms`).
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import tempfile
+import time
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.application.services.order_pipeline import OrderPipeline
+from src.config.settings import DatabaseConfig
+from src.domain.models import SignalStrength, SignalType, TradeStatus, TradingSignal
+from src.domain.services.trading_engine import TradingEngine
+from src.infrastructure.persistence.database.repository_factory import create_repositories
+
+from benchmarks.offline_exchange import OfflineBybitClient
+
+
+class _TimedClient(OfflineBybitClient):
+    """Offline burza se simulovanou latencí, zaznamenává čas odeslání objednávky"""
+
+    def __init__(self, latency: float):
+        super().__init__(latency=latency)
+        self.sent_at: List[float] = []
+
+    async def place_order(self, *args, **kwargs):
+        self.sent_at.append(time.perf_counter())
+        return await super().place_order(*args, **kwargs)
+
+
+def _signal(symbol: str) -> TradingSignal:
+    return TradingSignal(
+        strategy_name="bench", symbol=symbol, signal_type=SignalType.BUY, strength=SignalStrength.STRONG,
+        confidence=0.9, price=Decimal("30000"), timestamp=datetime.now(), indicators={}, reason="bench"
+    )
+
+
+def _percentiles(samples: List[float]) -> Dict[str, float]:
+    samples = sorted(samples)
+    return {
+        "p50_us": samples[len(samples) // 2] * 1_000_000,
+        "p99_us": samples[min(len(samples) - 1, int(len(samples) * 0.99))] * 1_000_000,
+    }
+
+
+async def _journal_first(repositories, client: _TimedClient, orders: int) -> List[float]:
+    engine = TradingEngine(repositories.trades, repositories.positions)
+    latencies = []
+    for i in range(orders):
+        signal = _signal(f"SYM{i}")
+        started = time.perf_counter()
+        balance = await client.get_account_balance()
+        signal.suggested_position_size = balance * Decimal("0.01") / signal.price
+        async with repositories.unit_of_work.begin():
+            trade = await engine.execute_trade(signal)
+            order_id = await client.place_order(
+                symbol=signal.symbol, side="buy", qty=signal.suggested_position_size
+            )
+            trade.exchange_order_id = order_id
+            trade.status = TradeStatus.OPEN
+            await repositories.trades.update_trade(trade)
+        latencies.append(client.sent_at[-1] - started)
+    return latencies
+
+
+async def _pipeline(repositories, client: _TimedClient, orders: int) -> List[float]:
+    engine = TradingEngine(repositories.trades, repositories.positions)
+    pipeline = OrderPipeline(client, engine, repositories.trades, repositories.unit_of_work)
+    balance = await client.get_account_balance()
+    latencies = []
+    for i in range(orders):
+        signal = _signal(f"SYM{i}")
+        started = time.perf_counter()
+        await pipeline.submit(signal, balance * Decimal("0.01") / signal.price, started)
+        latencies.append(client.sent_at[-1] - started)
+    await pipeline.close()
+    return latencies
+
+
+def run(orders: int = 300, exchange_latency_ms: float = 0.0) -> Dict[str, Dict[str, float]]:
+    """Percentily latence signál -> odeslání podle varianty"""
+    results = {}
+    for variant, scenario in (("journal_first", _journal_first), ("pipeline", _pipeline)):
+        with tempfile.TemporaryDirectory() as tmp:
+            async def main():
+                repositories = create_repositories(DatabaseConfig(path=str(Path(tmp) / "orders.db")))
+                try:
+                    client = _TimedClient(exchange_latency_ms / 1000)
+                    return await scenario(repositories, client, orders)
+                finally:
+                    await repositories.close()
+            results[variant] = _percentiles(asyncio.run(main()))
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Latence signál -> odeslání objednávky")
+    parser.add_argument("--orders", type=int, default=300)
+    parser.add_argument("--exchange-latency-ms", type=float, default=0.0)
+    args = parser.parse_args()
+    print(json.dumps(run(args.orders, args.exchange_latency_ms), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Benchmark: latence operací s připojením na každé volání vs. SqliteConnectionManager
+"""
+
+import argparse
+import json
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.infrastructure.persistence.database.sqlite_connection import SqliteConnectionManager
+
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS trades (
+        id TEXT PRIMARY KEY, symbol TEXT NOT NULL, price REAL NOT NULL, created_at TIMESTAMP
+    )
+"""
+INSERT = "INSERT OR REPLACE INTO trades (id, symbol, price, created_at) VALUES (?, ?, ?, ?)"
+SELECT = "SELECT * FROM trades WHERE id = ?"
+
+
+class _PerCallConnection:
+    """Původní vzor repository: nové připojení a commit pro každou operaci"""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def write(self, fn: Callable[[sqlite3.Connection], object]) -> None:
+        with self._connect() as conn:
+            fn(conn)
+            conn.commit()
+
+    def read(self, fn: Callable[[sqlite3.Connection], object]) -> None:
+        with self._connect() as conn:
+            fn(conn)
+
+
+def _per_op_us(ops: int, fn: Callable[[int], None]) -> float:
+    started = time.perf_counter()
+    for i in range(ops):
+        fn(i)
+    return (time.perf_counter() - started) / ops * 1_000_000
+
+
+def run(ops: int = 2000) -> Dict[str, Dict[str, float]]:
+    """Vrátí latenci zápisu a čtení (µs/operace) pro oba přístupy"""
+    results = {}
+    now = datetime.now()
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_path = str(Path(tmp) / "legacy.db")
+        legacy = _PerCallConnection(legacy_path)
+        legacy.write(lambda conn: conn.execute(SCHEMA))
+        results["per_call_connection"] = {
+            "insert_us": _per_op_us(ops, lambda i: legacy.write(
+                lambda conn: conn.execute(INSERT, (f"t{i}", "BTCUSDT", 30000.0, now)))),
+            "select_by_id_us": _per_op_us(ops, lambda i: legacy.read(
+                lambda conn: conn.execute(SELECT, (f"t{i}",)).fetchone())),
+        }
+
+        manager = SqliteConnectionManager(str(Path(tmp) / "managed.db"))
+        try:
+            manager.write_sync(lambda conn: conn.execute(SCHEMA))
+            results["connection_manager"] = {
+                "insert_us": _per_op_us(ops, lambda i: manager.write_sync(
+                    lambda conn: conn.execute(INSERT, (f"t{i}", "BTCUSDT", 30000.0, now)))),
+                "select_by_id_us": _per_op_us(ops, lambda i: manager.read_sync(
+                    lambda conn: conn.execute(SELECT, (f"t{i}",)).fetchone())),
+            }
+        finally:
+            manager.close()
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--ops", type=int, default=2000)
+    args = parser.parse_args()
+    print(json.dumps(run(args.ops), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Benchmark: analýza strategií v event loopu vs. v poolu procesů
+
+- inline: všechny strategie přímo v event loopu (výchozí režim orchestratoru)
+- pool: `StrategyPool` - svíčky přes sdílenou paměť do worker procesů
+
+Pro každý režim se měří propustnost (symboly/s) a nejdelší zdržení event
+loopu - souběžný task se každou 1 ms probouzí a zaznamenává zpoždění.
+Svíčky (200 na symbol) jsou z offline burzy a načtou se předem.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.application.services.strategy_pool import StrategyPool
+from src.config.settings import StrategyConfig
+from src.domain.models import Candle
+from src.strategies.registry import STRATEGY_CLASSES, create_strategy
+
+from benchmarks.offline_exchange import OfflineBybitClient
+
+
+async def _heartbeat(lags: List[float], stop: asyncio.Event) -> None:
+    """Zpoždění probuzení proti plánovanému 1ms spánku"""
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(0.001)
+        lags.append(time.perf_counter() - started - 0.001)
+
+
+async def _measure(analyze, candles: Dict[str, List[Candle]]) -> Dict[str, Any]:
+    lags: List[float] = []
+    stop = asyncio.Event()
+    heartbeat = asyncio.create_task(_heartbeat(lags, stop))
+    started = time.perf_counter()
+    results = await asyncio.gather(*(analyze(symbol, series) for symbol, series in candles.items()))
+    seconds = time.perf_counter() - started
+    stop.set()
+    await heartbeat
+    return {
+        "seconds": seconds,
+        "symbols_per_s": len(candles) / seconds,
+        "signals": sum(len(signals) for signals in results),
+        "max_loop_lag_ms": max(lags, default=0.0) * 1000,
+    }
+
+
+async def _run(symbols: int, workers: int) -> Dict[str, Any]:
+    client = OfflineBybitClient()
+    candles = {}
+    for i in range(symbols):
+        symbol = f"SYM{i}USDT"
+        candles[symbol] = await client.get_klines(symbol, "15", 200)
+    configs = {name: StrategyConfig() for name in STRATEGY_CLASSES}
+
+    strategies = [create_strategy(name, config) for name, config in configs.items()]
+
+    async def inline(symbol: str, series: List[Candle]):
+        signals = []
+        for strategy in strategies:
+            signal = await strategy.analyze(series, symbol)
+            if signal:
+                signals.append(signal)
+        return signals
+
+    results = {"cpu_count": os.cpu_count(), "symbols": symbols, "inline": await _measure(inline, candles)}
+
+    pool = StrategyPool(configs, workers)
+    started = time.perf_counter()
+    # Start worker procesů (spawn) se do propustnosti nepočítá
+    await asyncio.gather(*(pool.analyze(symbol, candles[symbol]) for symbol in list(candles)[:2 * workers]))
+    results[f"pool_{workers}_workers"] = dict(
+        await _measure(pool.analyze, candles), startup_s=time.perf_counter() - started
+    )
+    await pool.close()
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Strategie v event loopu vs. v poolu procesů")
+    parser.add_argument("--symbols", type=int, default=500, help="Počet symbolů")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Počet worker procesů")
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(_run(args.symbols, args.workers)), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Benchmark: zápisy jednoho obchodního rozhodnutí bez a s unit of work
+
+Rozhodnutí = uzavření protipozice (uzavírací obchod + smazání pozice),
+nový obchod, objednávka na offline burzu a aktualizace obchodu.
+Měří se čas a počet commitů na rozhodnutí pro synchronous=NORMAL i FULL
+(FULL = fsync při každém commitu).
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import tempfile
+import time
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+from typing import Dict
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.domain.models import (
+    Position, SignalStrength, SignalType, TradeStatus, TradeType, TradingSignal
+)
+from src.domain.repositories import IUnitOfWork, NullUnitOfWork
+from src.domain.services.trading_engine import TradingEngine
+from src.infrastructure.persistence.database.sqlite_connection import SqliteConnectionManager
+from src.infrastructure.persistence.database.sqlite_trade_repository import (
+    SqlitePositionRepository, SqliteTradeRepository
+)
+from src.infrastructure.persistence.database.unit_of_work import UnitOfWork
+
+from benchmarks.offline_exchange import OfflineBybitClient
+
+
+def _signal(symbol: str) -> TradingSignal:
+    return TradingSignal(
+        strategy_name="bench", symbol=symbol, signal_type=SignalType.BUY, strength=SignalStrength.STRONG,
+        confidence=0.9, price=Decimal("30000"), timestamp=datetime.now(), indicators={}, reason="bench",
+        suggested_position_size=Decimal("0.01")
+    )
+
+
+def _short(symbol: str) -> Position:
+    return Position(
+        symbol=symbol, side=TradeType.SELL, size=Decimal("0.01"), entry_price=Decimal("30100"),
+        current_price=Decimal("30000"), unrealized_pnl=Decimal("1"), margin=Decimal("300")
+    )
+
+
+async def _decisions(db_path: str, unit_of_work: IUnitOfWork, decisions: int, synchronous: str) -> Dict[str, float]:
+    manager = SqliteConnectionManager.for_path(db_path)
+    trades = SqliteTradeRepository(db_path)
+    positions = SqlitePositionRepository(db_path)
+    manager.write_sync(lambda conn: conn.execute(f"PRAGMA synchronous={synchronous}"))
+    engine = TradingEngine(trades, positions)
+    client = OfflineBybitClient()
+
+    elapsed = 0.0
+    transactions = 0
+    for i in range(decisions):
+        symbol = f"SYM{i}"
+        await positions.save_position(_short(symbol))
+
+        before = manager.write_transactions
+        started = time.perf_counter()
+        async with unit_of_work.begin():
+            trade = await engine.execute_trade(_signal(symbol))
+            order_id = await client.place_order(symbol=symbol, side="buy", qty=trade.quantity)
+            trade.exchange_order_id = order_id
+            trade.status = TradeStatus.OPEN
+            await trades.update_trade(trade)
+        elapsed += time.perf_counter() - started
+        transactions += manager.write_transactions - before
+
+    return {
+        "decision_us": elapsed / decisions * 1_000_000,
+        "commits_per_decision": transactions / decisions,
+    }
+
+
+def run(decisions: int = 500) -> Dict[str, Dict[str, float]]:
+    """Výsledky podle varianty (per_write/unit_of_work x synchronous)"""
+    results = {}
+    for synchronous in ("NORMAL", "FULL"):
+        for variant, unit_of_work in (("per_write", NullUnitOfWork()), ("unit_of_work", UnitOfWork())):
+            with tempfile.TemporaryDirectory() as tmp:
+                try:
+                    results[f"{variant}.{synchronous.lower()}"] = asyncio.run(
+                        _decisions(str(Path(tmp) / "uow.db"), unit_of_work, decisions, synchronous)
+                    )
+                finally:
+                    SqliteConnectionManager.close_all()
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Commity na obchodní rozhodnutí bez a s unit of work")
+    parser.add_argument("--decisions", type=int, default=500)
+    args = parser.parse_args()
+    print(json.dumps(run(args.decisions), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+import asyncio
+import statistics
+import time
+from dataclasses import dataclass, asdict
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+
+@dataclass
+class BenchmarkResult:
+    """Výsledek jednoho benchmarku (časy v sekundách za jedno opakování)"""
+    name: str
+    median: float
+    minimum: float
+    repeats: int
+    ops: int = 1
+
+    @property
+    def per_op_us(self) -> float:
+        """Medián času na jednu operaci v mikrosekundách"""
+        return self.median / self.ops * 1_000_000 if self.ops else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["per_op_us"] = self.per_op_us
+        return data
+
+
+@dataclass
+class Regression:
+    """Zhoršení benchmarku proti baseline"""
+    name: str
+    baseline: float
+    current: float
+
+    @property
+    def change(self) -> float:
+        return self.current / self.baseline - 1 if self.baseline else 0.0
+
+
+def measure(
+    name: str,
+    fn: Callable[[], Any],
+    repeats: int = 5,
+    ops: int = 1,
+    setup: Optional[Callable[[], Any]] = None
+) -> BenchmarkResult:
+    """Změří synchronní funkci (setup se volá před každým opakováním mimo měření)"""
+    times = []
+    for _ in range(repeats):
+        if setup:
+            setup()
+        started = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - started)
+    return BenchmarkResult(name, statistics.median(times), min(times), repeats, ops)
+
+
+def measure_async(
+    name: str,
+    fn: Callable[[], Awaitable[Any]],
+    repeats: int = 5,
+    ops: int = 1,
+    setup: Optional[Callable[[], Awaitable[Any]]] = None
+) -> BenchmarkResult:
+    """Změří korutinu; všechna opakování běží v jednom event loopu"""
+    async def _run() -> List[float]:
+        times = []
+        for _ in range(repeats):
+            if setup:
+                await setup()
+            started = time.perf_counter()
+            await fn()
+            times.append(time.perf_counter() - started)
+        return times
+
+    times = asyncio.run(_run())
+    return BenchmarkResult(name, statistics.median(times), min(times), repeats, ops)
+
+
+def compare(
+    results: Dict[str, Dict[str, Any]],
+    baseline: Dict[str, Dict[str, Any]],
+    threshold: float = 0.15
+) -> List[Regression]:
+    """Vrátí benchmarky, jejichž medián je o více než `threshold` horší než baseline"""
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if not base or not base.get("median"):
+            continue
+        regression = Regression(name, base["median"], result["median"])
+        if regression.change > threshold:
+            regressions.append(regression)
+    return regressions
@@ -0,0 +1,138 @@
+import asyncio
+import math
+import time
+import zlib
+from typing import Dict, List, Optional
+
+from src.infrastructure.external.bybit.bybit_client import BybitClient, BybitApiError
+
+
+class OfflineBybitClient(BybitClient):
+    """BybitClient bez sítě - odpovídá syntetickými v5 payloady
+
+    Parsování odpovědí probíhá stejným kódem jako u skutečného klienta, mění
+    se jen `_make_request`. Payloady se generují jednou pro symbol a cachují,
+    aby benchmark měřil zpracování a ne generování dat. `latency` (sekundy)
+    simuluje síťovou odezvu každého dotazu.
+    """
+
+    def __init__(
+        self,
+        balance: str = "10000",
+        kline_count: int = 200,
+        latency: float = 0.0,
+        instruments: Optional[List[str]] = None
+    ):
+        super().__init__(api_key="offline", api_secret="offline", testnet=True)
+        self.balance = balance
+        self.kline_count = kline_count
+        self.latency = latency
+        # Symboly v instruments-info (stránkované podle `limit`)
+        self.instruments = instruments or ["BTCUSDT", "ETHUSDT", "SOLUSDT"]
+        self.requests: Dict[str, int] = {}
+        self._klines: Dict[str, List[List[str]]] = {}
+        self._order_seq = 0
+        # orderLinkId -> parametry odeslané objednávky
+        self.orders: Dict[str, Dict] = {}
+        self.session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        return None
+
+    async def _make_request(
+        self,
+        method: str,
+        endpoint: str,
+        params: Optional[Dict] = None,
+        authenticated: bool = False
+    ) -> Dict:
+        params = params or {}
+        self.requests[endpoint] = self.requests.get(endpoint, 0) + 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        if endpoint == "/v5/market/kline":
+            rows = self._kline_rows(params["symbol"])
+            return {"symbol": params["symbol"], "list": rows[:int(params.get("limit", 200))]}
+        if endpoint == "/v5/market/tickers":
+            last = self._kline_rows(params["symbol"])[0][4]
+            return {"list": [{
+                "symbol": params["symbol"], "lastPrice": last, "bid1Price": last, "ask1Price": last,
+                "volume24h": "12345.6", "price24hPcnt": "0.0123"
+            }]}
+        if endpoint == "/v5/market/orderbook":
+            mid = float(self._kline_rows(params["symbol"])[0][4])
+            depth = int(params.get("limit", 25))
+            return {
+                "s": params["symbol"],
+                "b": [[f"{mid - 0.1 * (i + 1):.4f}", f"{1 + i * 0.5:.3f}"] for i in range(depth)],
+                "a": [[f"{mid + 0.1 * (i + 1):.4f}", f"{1 + i * 0.5:.3f}"] for i in range(depth)],
+            }
+        if endpoint == "/v5/market/instruments-info":
+            start = int(params.get("cursor") or 0)
+            end = start + int(params.get("limit", 500))
+            return {
+                "category": "linear",
+                "list": [{
+                    "symbol": symbol, "status": "Trading",
+                    "priceFilter": {"minPrice": "0.0001", "maxPrice": "199999.9998", "tickSize": "0.0001"},
+                    "lotSizeFilter": {
+                        "maxOrderQty": "1000", "maxMktOrderQty": "100", "minOrderQty": "0.001",
+                        "qtyStep": "0.001", "minNotionalValue": "5"
+                    }
+                } for symbol in self.instruments[start:end]],
+                "nextPageCursor": str(end) if end < len(self.instruments) else ""
+            }
+        if endpoint == "/v5/order/create":
+            self._order_seq += 1
+            order_id = f"offline-{self._order_seq}"
+            self.orders[params.get("orderLinkId", order_id)] = dict(params, orderId=order_id)
+            return {"orderId": order_id, "orderLinkId": params.get("orderLinkId", "")}
+        if endpoint == "/v5/order/cancel":
+            # Offline objednávky jsou plněné hned - není co rušit
+            raise BybitApiError("Objednávka už je vyřízená")
+        if endpoint == "/v5/order/realtime":
+            # Market objednávky offline burza plní hned celé
+            order = self.orders.get(params.get("orderLinkId", ""))
+            if order is None:
+                return {"list": []}
+            return {"list": [{
+                "orderId": order["orderId"], "orderLinkId": params["orderLinkId"], "orderStatus": "Filled",
+                "cumExecQty": order["qty"], "avgPrice": self._kline_rows(order["symbol"])[0][4],
+                "updatedTime": str(int(time.time() * 1000))
+            }]}
+        if endpoint == "/v5/position/trading-stop":
+            return {}
+        if endpoint == "/v5/position/list":
+            return {"list": [{
+                "symbol": "BTCUSDT", "side": "Buy", "size": "0.01", "avgPrice": "30000",
+                "markPrice": "30100", "unrealisedPnl": "1", "positionIM": "300", "leverage": "1"
+            }]}
+        if endpoint == "/v5/account/wallet-balance":
+            return {"list": [{"coin": [{
+                "coin": "USDT", "walletBalance": self.balance,
+                "availableBalance": self.balance, "equity": self.balance
+            }]}]}
+
+        raise BybitApiError(f"Offline burza nepodporuje endpoint {endpoint}")
+
+    def _kline_rows(self, symbol: str) -> List[List[str]]:
+        """Syntetické svíčky symbolu (nejnovější první, jako v5 API)"""
+        rows = self._klines.get(symbol)
+        if rows is None:
+            seed = zlib.crc32(symbol.encode()) % 1000
+            now = int(time.time() // 900 * 900 * 1000)
+            rows = []
+            for i in range(self.kline_count):
+                price = 100 + seed / 10 + 5 * math.sin((i + seed) / 9) + 2 * math.sin((i + seed) / 3)
+                ts = now - (self.kline_count - 1 - i) * 900_000
+                rows.append([
+                    str(ts), f"{price:.4f}", f"{price + 0.6:.4f}", f"{price - 0.6:.4f}",
+                    f"{price + 0.1:.4f}", f"{10 + (i * 7 + seed) % 23:.3f}", "0"
+                ])
+            rows.reverse()
+            self._klines[symbol] = rows
+        return rows
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Zátěžový test: souběžné ukládání obchodů bez ID, žádný se nesmí ztratit
+
+    python -m benchmarks.stress_trade_ids --trades 100000 --workers 50
+"""
+
+import argparse
+import asyncio
+import sys
+import tempfile
+import time
+from decimal import Decimal
+from pathlib import Path
+from typing import Dict
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.config.settings import DatabaseConfig
+from src.domain.models import Trade, TradeType
+from src.infrastructure.persistence.database.repository_factory import (
+    create_repositories, close_repositories
+)
+
+
+async def stress(database_type: str, trades: int, workers: int, db_path: str) -> Dict[str, float]:
+    """Uloží `trades` obchodů z `workers` souběžných tasků a spočítá ztráty"""
+    repositories = create_repositories(DatabaseConfig(type=database_type, path=db_path))
+    per_worker = trades // workers
+    ids = []
+
+    async def worker(index: int):
+        for _ in range(per_worker):
+            trade = await repositories.trades.save_trade(Trade(
+                symbol=f"SYM{index % 10}", side=TradeType.BUY, quantity=Decimal("0.01"),
+                price=Decimal("30000"), strategy_name="stress"
+            ))
+            ids.append(trade.id)
+
+    started = time.perf_counter()
+    try:
+        await asyncio.gather(*(worker(i) for i in range(workers)))
+        elapsed = time.perf_counter() - started
+        stored = 0
+        for index in range(10):
+            stored += len(await repositories.trades.get_trades_by_symbol(f"SYM{index}"))
+    finally:
+        await close_repositories()
+
+    expected = per_worker * workers
+    return {
+        "trades": expected,
+        "unique_ids": len(set(ids)),
+        "stored": stored,
+        "lost": expected - stored,
+        "seconds": elapsed,
+        "per_trade_us": elapsed / expected * 1_000_000,
+    }
+
+
+def run(database_type: str = "sqlite", trades: int = 100_000, workers: int = 50) -> Dict[str, float]:
+    with tempfile.TemporaryDirectory() as tmp:
+        return asyncio.run(stress(database_type, trades, workers, str(Path(tmp) / "stress.db")))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Souběžné ukládání obchodů - kontrola kolizí ID")
+    parser.add_argument("--type", default="sqlite", choices=["sqlite", "aiosqlite"])
+    parser.add_argument("--trades", type=int, default=100_000)
+    parser.add_argument("--workers", type=int, default=50)
+    args = parser.parse_args()
+
+    result = run(args.type, args.trades, args.workers)
+    for key, value in result.items():
+        print(f"{key}: {value}")
+    return 0 if result["lost"] == 0 and result["unique_ids"] == result["trades"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
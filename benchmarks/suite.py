@@ -0,0 +1,406 @@
+import asyncio
+import logging
+import tempfile
+from datetime import datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from src.config.settings import Settings, StrategyConfig
+from src.domain.models import Candle, OrderBook, Trade, TradeType
+from src.domain.services.trading_engine import TradingEngine
+from src.application.services.trading_orchestrator import TradingOrchestrator
+from src.config.settings import DatabaseConfig
+from src.infrastructure.persistence.database.repository_factory import (
+    create_repositories, close_repositories
+)
+from src.infrastructure.persistence.database.sqlite_trade_repository import (
+    SqliteTradeRepository, SqlitePositionRepository
+)
+from src.infrastructure.external.paper.paper_exchange import PaperExchange
+from src.infrastructure.persistence.database.sqlite_market_data_repository import SqliteMarketDataRepository
+from src.strategies.registry import STRATEGY_CLASSES, create_strategy
+
+from .harness import BenchmarkResult, measure, measure_async
+from .offline_exchange import OfflineBybitClient
+
+
+CYCLE_SYMBOL_COUNTS = (10, 100, 1000)
+
+
+def _settings(symbols: List[str]) -> Settings:
+    settings = Settings()
+    settings.trading.default_symbols = symbols
+    settings.strategies = {name: StrategyConfig() for name in STRATEGY_CLASSES}
+    settings.api.trading_enabled = True
+    return settings
+
+
+def _candles(count: int = 200) -> List[Candle]:
+    client = OfflineBybitClient(kline_count=count)
+    return asyncio.run(client.get_klines("BTCUSDT", "15", count))
+
+
+def bench_indicators(quick: bool) -> List[BenchmarkResult]:
+    """Indikátory BaseStrategy nad 200 svíčkami"""
+    candles = _candles()
+    strategy = create_strategy("rsi_macd", StrategyConfig())
+    repeats = 5 if quick else 20
+    return [
+        measure("indicators.sma", lambda: strategy._calculate_sma(candles, 20), repeats),
+        measure("indicators.ema", lambda: strategy._calculate_ema(candles, 21), repeats),
+        measure("indicators.rsi", lambda: strategy._calculate_rsi(candles, 14), repeats),
+        measure("indicators.macd", lambda: strategy._calculate_macd(candles, 12, 26, 9), repeats),
+    ]
+
+
+def bench_strategies(quick: bool) -> List[BenchmarkResult]:
+    """`analyze` každé strategie nad 200 svíčkami"""
+    candles = _candles()
+    repeats = 5 if quick else 20
+    results = []
+    for name in STRATEGY_CLASSES:
+        strategy = create_strategy(name, StrategyConfig())
+        results.append(measure_async(
+            f"strategies.{name}.analyze", lambda s=strategy: s.analyze(candles, "BTCUSDT"), repeats
+        ))
+    return results
+
+
+def bench_repositories(quick: bool) -> List[BenchmarkResult]:
+    """Zápis a čtení repository pro oba databázové backendy"""
+    # Výchozí backend si ponechává původní názvy kvůli porovnání s baseline
+    return (
+        _bench_repository_backend("sqlite", "repositories", quick)
+        + _bench_repository_backend("aiosqlite", "repositories.aiosqlite", quick)
+    )
+
+
+def _bench_repository_backend(database_type: str, prefix: str, quick: bool) -> List[BenchmarkResult]:
+    ops = 50 if quick else 200
+    repeats = 3 if quick else 5
+    candles = _candles(ops)
+    results = []
+
+    with tempfile.TemporaryDirectory() as tmp:
+        repositories = create_repositories(DatabaseConfig(type=database_type, path=str(Path(tmp) / "bench.db")))
+        trades = repositories.trades
+        positions = repositories.positions
+        market_data = repositories.market_data
+
+        async def save_trades():
+            for i in range(ops):
+                await trades.save_trade(Trade(
+                    symbol="BTCUSDT", side=TradeType.BUY, quantity=Decimal("0.01"),
+                    price=Decimal("30000"), strategy_name="RsiMacdStrategy"
+                ))
+
+        async def save_candles():
+            for candle in candles:
+                await market_data.save_candle(candle)
+
+        async def save_candles_flushed():
+            # Zápis až na disk - save_candle s write-behind měří jen zařazení do fronty
+            for candle in candles:
+                await market_data.save_candle(candle)
+            await market_data.flush()
+
+        async def read_latest_candles():
+            for _ in range(ops):
+                await market_data.get_latest_candles("BTCUSDT", 100)
+
+        async def read_trades():
+            for _ in range(ops):
+                await trades.get_trades_by_symbol("BTCUSDT")
+
+        async def read_positions():
+            for _ in range(ops):
+                await positions.get_position_by_symbol("BTCUSDT")
+
+        async def read_daily_trades():
+            now = datetime.now()
+            for _ in range(ops):
+                await trades.get_trades_by_date_range(now - timedelta(days=1), now + timedelta(days=1))
+
+        results.append(measure_async(f"{prefix}.save_trade", save_trades, repeats, ops))
+        results.append(measure_async(f"{prefix}.save_candle", save_candles, repeats, ops))
+        results.append(measure_async(
+            f"{prefix}.save_candle_flushed", save_candles_flushed, repeats, ops, setup=market_data.flush
+        ))
+        results.append(measure_async(f"{prefix}.get_latest_candles", read_latest_candles, repeats, ops))
+        results.append(measure_async(f"{prefix}.get_trades_by_symbol", read_trades, repeats, ops))
+        results.append(measure_async(f"{prefix}.get_trades_by_date_range", read_daily_trades, repeats, ops))
+        results.append(measure_async(f"{prefix}.get_position_by_symbol", read_positions, repeats, ops))
+        asyncio.run(close_repositories())
+
+    return results
+
+
+def bench_client(quick: bool) -> List[BenchmarkResult]:
+    """Parsování v5 odpovědí v BybitClient"""
+    client = OfflineBybitClient()
+    asyncio.run(client.get_klines("BTCUSDT", "15", 200))  # zahřeje cache payloadů
+    repeats = 5 if quick else 20
+    return [
+        measure_async("client.get_klines", lambda: client.get_klines("BTCUSDT", "15", 200), repeats),
+        measure_async("client.get_orderbook", lambda: client.get_orderbook("BTCUSDT", 50), repeats),
+        measure_async("client.get_ticker", lambda: client.get_ticker("BTCUSDT"), repeats),
+        measure_async("client.get_positions", client.get_positions, repeats),
+        measure_async("client.get_account_balance", client.get_account_balance, repeats),
+    ]
+
+
+def bench_trading_cycle(quick: bool) -> List[BenchmarkResult]:
+    """Celý `_run_trading_cycle` proti offline burze"""
+    counts = [c for c in CYCLE_SYMBOL_COUNTS if not quick or c <= 100]
+    # (symbolů, latence burzy v ms) - s latencí je vidět souběžná analytická fáze
+    runs = [(count, 0) for count in counts] + [(100, 20)]
+    results = []
+
+    for count, latency_ms in runs:
+        symbols = [f"SYM{i:04d}USDT" for i in range(count)]
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = str(Path(tmp) / "bench.db")
+            trades = SqliteTradeRepository(db_path)
+            positions = SqlitePositionRepository(db_path)
+            client = OfflineBybitClient(latency=latency_ms / 1000)
+            orchestrator = TradingOrchestrator(
+                settings=_settings(symbols),
+                bybit_client=client,
+                trading_engine=TradingEngine(trades, positions),
+                trade_repository=trades,
+                position_repository=positions,
+                market_data_repository=SqliteMarketDataRepository(db_path)
+            )
+
+            async def reset():
+                orchestrator.last_analysis_time.clear()
+
+            suffix = f"_{latency_ms}ms" if latency_ms else ""
+            results.append(measure_async(
+                f"cycle.run_trading_cycle.{count}_symbols{suffix}", orchestrator._run_trading_cycle,
+                repeats=1 if count >= 1000 else 3, ops=count, setup=reset
+            ))
+
+    return results
+
+
+def bench_candle_lake(quick: bool) -> List[BenchmarkResult]:
+    """Čtení rozsahu svíček: SQLite vs. sloupcový archiv"""
+    try:
+        from .bench_candle_lake import run
+    except ImportError:
+        return []
+    data = run(candles=20_000 if quick else 100_000, repeats=3)
+    return [
+        BenchmarkResult("lake.sqlite_get_candles", data["sqlite_get_candles_s"], data["sqlite_get_candles_s"], 3),
+        BenchmarkResult("lake.read_range", data["lake_read_range_s"], data["lake_read_range_s"], 3),
+    ]
+
+
+def bench_sqlite_connection(quick: bool) -> List[BenchmarkResult]:
+    """Latence na operaci: připojení na volání vs. SqliteConnectionManager"""
+    from .bench_sqlite_connection import run
+    results = []
+    for variant, latencies in run(ops=300 if quick else 2000).items():
+        for operation, per_op_us in latencies.items():
+            seconds = per_op_us / 1_000_000
+            results.append(BenchmarkResult(f"sqlite.{variant}.{operation[:-3]}", seconds, seconds, 1))
+    return results
+
+
+def bench_unit_of_work(quick: bool) -> List[BenchmarkResult]:
+    """Zápisy jednoho obchodního rozhodnutí: commit na zápis vs. unit of work"""
+    from .bench_unit_of_work import run
+    results = []
+    for variant, data in run(decisions=100 if quick else 500).items():
+        seconds = data["decision_us"] / 1_000_000
+        results.append(BenchmarkResult(f"unit_of_work.{variant}.decision", seconds, seconds, 1))
+    return results
+
+
+def bench_order_pipeline(quick: bool) -> List[BenchmarkResult]:
+    """Latence signál -> odeslání objednávky: zápis před odesláním vs. pipeline"""
+    from .bench_order_pipeline import run
+    results = []
+    for variant, data in run(orders=100 if quick else 300).items():
+        seconds = data["p50_us"] / 1_000_000
+        results.append(BenchmarkResult(f"order_pipeline.{variant}.signal_to_send", seconds, seconds, 1))
+    return results
+
+
+def _paper_book(symbol: str, mid: float, step: int) -> OrderBook:
+    """Syntetická L2 kniha (50 hladin) s posunem středu podle kroku"""
+    mid = Decimal(f"{mid + (step % 20 - 10) * 0.1:.1f}")
+    tick = Decimal("0.1")
+    return OrderBook(
+        symbol=symbol,
+        bids=[(mid - tick * (i + 1), Decimal(f"{1 + i * 0.5:.1f}")) for i in range(50)],
+        asks=[(mid + tick * (i + 1), Decimal(f"{1 + i * 0.5:.1f}")) for i in range(50)],
+        timestamp=datetime(2024, 1, 1) + timedelta(milliseconds=step)
+    )
+
+
+def bench_paper_exchange(quick: bool) -> List[BenchmarkResult]:
+    """Párování na simulované burze: market + limitní objednávky, nový snímek knihy každých 10"""
+    count = 2_000 if quick else 20_000
+    books = [_paper_book("BTCUSDT", 30000, step) for step in range(count // 10)]
+    state = {}
+
+    def setup():
+        state["exchange"] = PaperExchange()
+        state["exchange"].update_book(books[0])
+
+    def run():
+        exchange = state["exchange"]
+        for i in range(count):
+            if i % 10 == 0:
+                exchange.update_book(books[i // 10])
+            side = TradeType.BUY if i % 2 == 0 else TradeType.SELL
+            if i % 3 == 0:
+                mid = exchange.mid_price("BTCUSDT")
+                offset = Decimal("0.3") if side == TradeType.SELL else Decimal("-0.3")
+                exchange.place_order("BTCUSDT", side, Decimal("0.5"), price=mid + offset)
+            else:
+                exchange.place_order("BTCUSDT", side, Decimal("0.5"))
+
+    return [measure("paper.place_order", run, repeats=3, ops=count, setup=setup)]
+
+
+def bench_risk_engine(quick: bool) -> List[BenchmarkResult]:
+    """Předobchodní kontrola s 10 a 10 000 otevřenými pozicemi (má být stejně rychlá)"""
+    from src.application.services.risk_engine import RiskEngine
+    from src.config.settings import RiskManagementConfig
+
+    checks = 10_000 if quick else 100_000
+    results = []
+    for positions in (10, 10_000):
+        limits = RiskManagementConfig(max_position_size_usd=Decimal("1e9"), max_positions=positions + 1)
+        risk = RiskEngine(limits)
+        for i in range(positions):
+            risk.on_fill(f"SYM{i}", TradeType.BUY, Decimal("1"), Decimal("100"), reserved=False)
+
+        def run():
+            for i in range(checks):
+                risk.check_order(f"SYM{i % positions}", TradeType.BUY, Decimal("1"), Decimal("101"))
+
+        results.append(measure(f"risk.check_order.{positions}_positions", run, repeats=3, ops=checks))
+    return results
+
+
+def bench_portfolio_sizer(quick: bool) -> List[BenchmarkResult]:
+    """Společné určení velikosti BUY signálů cyklu (50 a 1000 symbolů)"""
+    from src.application.services.portfolio_sizer import PortfolioSizer, SizingRequest
+    from src.config.settings import RiskManagementConfig
+    from src.domain.models import SignalStrength, SignalType, TradingSignal
+
+    sizer = PortfolioSizer(RiskManagementConfig(max_positions=20))
+    repeats = 20 if quick else 200
+    results = []
+    for count in (50, 1000):
+        requests = [
+            SizingRequest(TradingSignal(
+                strategy_name="rsi_macd", symbol=f"SYM{i}", signal_type=SignalType.BUY,
+                strength=SignalStrength.STRONG, confidence=0.8, price=Decimal(100 + i),
+                timestamp=datetime(2024, 1, 1), indicators={}, reason="bench",
+                suggested_stop_loss=Decimal(95 + i) if i % 2 else None
+            ), 0.8 + (i % 7) / 10)
+            for i in range(count)
+        ]
+
+        def run():
+            for _ in range(repeats):
+                sizer.allocate(requests, Decimal("10000"))
+
+        results.append(measure(f"portfolio_sizer.allocate.{count}_signals", run, repeats=3, ops=repeats))
+    return results
+
+
+def bench_stop_manager(quick: bool) -> List[BenchmarkResult]:
+    """Tik ceny s 10 a 10 000 řízenými stopy na symbolu (má být stejně rychlý)"""
+    from src.application.services.stop_manager import StopManager
+    from src.config.settings import RiskManagementConfig, StopManagementConfig
+    from src.domain.models import TradeType
+
+    ticks = 10_000 if quick else 100_000
+    results = []
+    for count in (10, 10_000):
+        stops = StopManager(None, StopManagementConfig(enabled=True, trailing_pct=1.0), RiskManagementConfig())
+        for i in range(count):
+            # Vstupy rozprostřené tak, aby tiky kolem 100 stopy nespouštěly ani neposouvaly
+            stops.track("BTCUSDT", TradeType.BUY, 200 + i / 100, stop_price=50, key=f"lot{i}")
+
+        def run():
+            for i in range(ticks):
+                stops.on_price("BTCUSDT", 100 + (i % 100) / 100)
+
+        results.append(measure(f"stops.on_price.{count}_positions", run, repeats=3, ops=ticks))
+    return results
+
+
+def bench_instruments(quick: bool) -> List[BenchmarkResult]:
+    """Načtení 500 kontraktů po stránkách a kontrola objednávky proti cache"""
+    from src.infrastructure.external.bybit.instrument_registry import InstrumentRegistry
+
+    symbols = [f"SYM{i}USDT" for i in range(500)]
+    registry = InstrumentRegistry(OfflineBybitClient(instruments=symbols), page_size=100)
+    results = [measure_async("instruments.load.500_symbols", registry.load, repeats=3, ops=500)]
+
+    ops = 10_000 if quick else 100_000
+    quantity, price = Decimal("0.0123456"), Decimal("30000")
+
+    def run():
+        for i in range(ops):
+            registry.check_order(symbols[i % 500], quantity, price)
+
+    results.append(measure("instruments.check_order", run, repeats=3, ops=ops))
+    return results
+
+
+def bench_trade_ids(quick: bool) -> List[BenchmarkResult]:
+    """Souběžné ukládání 100k obchodů bez ID (ztracený obchod = chyba)"""
+    from src.domain.services.id_generator import IdGenerator
+    from .stress_trade_ids import run
+
+    generator = IdGenerator("trade_")
+    ops = 10_000 if quick else 100_000
+    results = [measure("trade_ids.next_id", lambda: [generator.next_id() for _ in range(ops)], 3, ops)]
+
+    stress = run("sqlite", trades=ops)
+    if stress["lost"] or stress["unique_ids"] != stress["trades"]:
+        raise RuntimeError(f"Ztracené obchody při zátěžovém testu: {stress}")
+    seconds = stress["seconds"]
+    results.append(BenchmarkResult("trade_ids.concurrent_save_trade", seconds, seconds, 1, ops))
+    return results
+
+
+GROUPS: Dict[str, Callable[[bool], List[BenchmarkResult]]] = {
+    "indicators": bench_indicators,
+    "strategies": bench_strategies,
+    "repositories": bench_repositories,
+    "client": bench_client,
+    "cycle": bench_trading_cycle,
+    "lake": bench_candle_lake,
+    "sqlite": bench_sqlite_connection,
+    "trade_ids": bench_trade_ids,
+    "unit_of_work": bench_unit_of_work,
+    "order_pipeline": bench_order_pipeline,
+    "paper_exchange": bench_paper_exchange,
+    "risk": bench_risk_engine,
+    "portfolio_sizer": bench_portfolio_sizer,
+    "stops": bench_stop_manager,
+    "instruments": bench_instruments,
+}
+
+
+def run_suite(groups: List[str], quick: bool = False) -> List[BenchmarkResult]:
+    """Spustí vybrané skupiny benchmarků"""
+    # Logy obchodní logiky by zkreslovaly měření
+    logging.disable(logging.CRITICAL)
+    try:
+        results = []
+        for group in groups:
+            results.extend(GROUPS[group](quick))
+        return results
+    finally:
+        logging.disable(logging.NOTSET)
@@ -17,6 +17,8 @@ from datetime import datetime, timedelta
 from src.config.settings import get_settings
 from src.infrastructure.external.bybit.bybit_client import BybitClient
 from src.infrastructure.persistence.database.sqlite_trade_repository import SqliteTradeRepository
+from src.infrastructure.persistence.database.sqlite_strategy_metrics_repository import SqliteStrategyMetricsRepository
+from src.application.services.trade_history import load_pnl_rows, load_pnl_timeline
 
 settings = get_settings()
 
@@ -97,34 +99,50 @@ with col2:
     end_date = st.date_input("Koncové datum", value=datetime.now())
 
 trade_repo = SqliteTradeRepository(settings.database.path)
-trades = asyncio.run(trade_repo.get_trades_by_date_range(
+# PnL po hodinách a symbolech - graf nedrží celou historii obchodů
+timeline = asyncio.run(load_pnl_timeline(
+    trade_repo,
     datetime.combine(start_date, datetime.min.time()),
     datetime.combine(end_date, datetime.max.time())
 ))
 
-if trades:
-    df_trades = pd.DataFrame([{
-        "timestamp": t.created_at,
-        "symbol": t.symbol,
-        "pnl": float(t.pnl or 0)
-    } for t in trades])
-    fig = px.bar(df_trades, x="timestamp", y="pnl", color="symbol", title="PnL podle obchodů")
+if timeline:
+    df_trades = pd.DataFrame(timeline)
+    fig = px.bar(df_trades, x="timestamp", y="pnl", color="symbol", title="PnL podle obchodů (po hodinách)")
     st.plotly_chart(fig, use_container_width=True)
 else:
     st.info("Žádné obchody v zadaném intervalu")
 
 st.subheader("Performance analytics")
-if trades:
-    total_pnl = df_trades["pnl"].sum()
-    st.metric("Celkový realizovaný PnL (USDT)", f"{total_pnl:.2f}")
-    pnl_by_symbol = df_trades.groupby("symbol")["pnl"].sum().reset_index()
+summary = asyncio.run(trade_repo.get_pnl_summary(start_date, end_date))
+if summary.trades:
+    c1, c2, c3 = st.columns(3)
+    c1.metric("Celkový realizovaný PnL (USDT)", f"{summary.total_pnl:.2f}")
+    c2.metric("Win rate", f"{summary.win_rate:.0%}")
+    c3.metric("Profit factor", f"{summary.profit_factor:.2f}")
+    pnl_by_symbol = pd.DataFrame(asyncio.run(load_pnl_rows(trade_repo, start_date, end_date, "symbol")))
     fig_sym = px.bar(pnl_by_symbol, x="symbol", y="pnl", title="PnL podle symbolů")
     st.plotly_chart(fig_sym, use_container_width=True)
-    df_trades["date"] = pd.to_datetime(df_trades["timestamp"]).dt.date
-    daily_pnl = df_trades.groupby("date")["pnl"].sum().reset_index()
-    fig_daily = px.line(daily_pnl, x="date", y="pnl", title="Denní PnL")
+    daily_pnl = pd.DataFrame(asyncio.run(load_pnl_rows(trade_repo, start_date, end_date, "day")))
+    fig_daily = px.line(daily_pnl, x="day", y="pnl", title="Denní PnL")
     st.plotly_chart(fig_daily, use_container_width=True)
 
+st.subheader("Metriky strategií")
+strategy_metrics = asyncio.run(SqliteStrategyMetricsRepository(settings.database.path).get_all_metrics())
+if strategy_metrics:
+    st.dataframe(pd.DataFrame([{
+        "strategy": m.strategy_name or "-",
+        "trades": m.total_trades,
+        "win_rate": m.win_rate,
+        "pnl": float(m.total_pnl),
+        "profit_factor": m.profit_factor,
+        "max_drawdown": float(m.max_drawdown),
+        "sharpe": m.sharpe_ratio,
+        "updated_at": m.updated_at
+    } for m in strategy_metrics]))
+else:
+    st.info("Zatím žádné uzavřené obchody strategií")
+
 st.subheader("Tržní data")
 symbol = st.selectbox("Symbol", settings.trading.default_symbols)
 interval = st.selectbox("Interval (minuty)", ["1", "3", "5", "15", "60", "240", "D"])
@@ -17,6 +17,7 @@ from datetime import datetime, timedelta
 from src.config.settings import get_settings
 from src.infrastructure.external.bybit.bybit_client import BybitClient
 from src.infrastructure.persistence.database.sqlite_trade_repository import SqliteTradeRepository
+from src.application.services.trade_history import load_pnl_rows, load_pnl_timeline, load_recent_trade_rows
 
 # Heslo pro LIVE režim
 LIVE_PASSWORD = "LIVE"
@@ -160,22 +161,17 @@ try:
 
     try:
         trade_repo = SqliteTradeRepository(settings.database.path)
-        trades = asyncio.run(trade_repo.get_trades_by_date_range(
-            datetime.combine(start_date, datetime.min.time()),
-            datetime.combine(end_date, datetime.max.time())
-        ))
+        period = (datetime.combine(start_date, datetime.min.time()), datetime.combine(end_date, datetime.max.time()))
+        # PnL po hodinách - graf nedrží celou historii obchodů
+        timeline = asyncio.run(load_pnl_timeline(trade_repo, *period))
         
-        if trades:
-            df_trades = pd.DataFrame([{
-                "timestamp": t.created_at,
-                "symbol": t.symbol,
-                "pnl": float(t.pnl or 0)
-            } for t in trades])
+        if timeline:
+            df_trades = pd.DataFrame(timeline).groupby("timestamp", as_index=False)[["pnl", "trades"]].sum()
             
             if not df_trades.empty:
                 # Performance grafy
                 fig = px.line(df_trades, x="timestamp", y="pnl", 
-                            title="PnL v čase", line_shape="linear")
+                            title="PnL v čase (po hodinách)", line_shape="linear")
                 st.plotly_chart(fig, use_container_width=True)
                 
                 cumulative_pnl = df_trades["pnl"].cumsum()
@@ -184,14 +180,18 @@ try:
                                 title="Kumulativní PnL")
                 st.plotly_chart(fig_cum, use_container_width=True)
                 
-                # PnL podle symbolů
-                pnl_by_symbol = df_trades.groupby("symbol")["pnl"].sum().reset_index()
-                fig_symbol = px.bar(pnl_by_symbol, x="symbol", y="pnl",
-                                  title="PnL podle symbolů")
-                st.plotly_chart(fig_symbol, use_container_width=True)
+                # PnL podle symbolů (souhrn z databáze)
+                pnl_rows = asyncio.run(load_pnl_rows(trade_repo, start_date, end_date, "symbol"))
+                if pnl_rows:
+                    fig_symbol = px.bar(pd.DataFrame(pnl_rows), x="symbol", y="pnl",
+                                      title="PnL podle symbolů")
+                    st.plotly_chart(fig_symbol, use_container_width=True)
+                else:
+                    st.info("ℹ️ Žádné uzavřené obchody s PnL v daném období")
                 
                 # Tabulka obchodů
-                st.dataframe(df_trades.tail(20), use_container_width=True)
+                st.dataframe(pd.DataFrame(asyncio.run(load_recent_trade_rows(trade_repo, *period))),
+                           use_container_width=True)
         else:
             st.info("ℹ️ Žádné obchody v daném období")
     except Exception as e:
@@ -0,0 +1,165 @@
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Dict, List, Optional
+
+from ...domain.models import Candle, Trade, TradeType, TradeStatus, TradingSignal, SignalType
+from ...strategies.base_strategy import BaseStrategy
+
+
+# Stejné pravidlo jako v TradingOrchestrator._process_signals
+MIN_SIGNAL_STRENGTH = 0.8
+
+
+@dataclass
+class _OpenPosition:
+    """Otevřená simulovaná pozice"""
+    entry_price: Decimal
+    quantity: Decimal
+    stop_loss: Optional[Decimal]
+    take_profit: Optional[Decimal]
+    opened_at: Candle
+
+
+class Backtester:
+    """Jednoduchý bar-by-bar backtest strategií nad historickými svíčkami
+
+    Simulace odpovídá živému obchodování: BUY signál otevře long pozici na
+    close svíčky, SELL signál ji uzavře, stop loss a take profit se vyhodnocují
+    z high/low následujících svíček (při zásahu obou se počítá stop loss).
+    """
+
+    def __init__(
+        self,
+        position_size_usd: Decimal = Decimal('100'),
+        fee_rate: Decimal = Decimal('0.00055')
+    ):
+        self.position_size_usd = position_size_usd
+        self.fee_rate = fee_rate
+
+    async def collect_signals(
+        self,
+        strategy: BaseStrategy,
+        series: List[Candle],
+        start: int,
+        end: int
+    ) -> List[Optional[TradingSignal]]:
+        """Spustí strategii nad prefixy řady a vrátí signál pro každou svíčku [start, end)"""
+        symbol = series[0].symbol if series else ""
+        signals = []
+        for i in range(start, end):
+            signals.append(await strategy.analyze(series[:i + 1], symbol))
+        return signals
+
+    @staticmethod
+    def combine_signals(
+        signal_sets: Dict[str, List[Optional[TradingSignal]]],
+        weights: Dict[str, float],
+        min_strength: float = MIN_SIGNAL_STRENGTH
+    ) -> List[Optional[TradingSignal]]:
+        """Zkombinuje signály více strategií podle vah (jako orchestrator)"""
+        if not signal_sets:
+            return []
+
+        length = len(next(iter(signal_sets.values())))
+        combined: List[Optional[TradingSignal]] = []
+        for i in range(length):
+            buy_strength = 0.0
+            sell_strength = 0.0
+            best_buy = None
+            best_sell = None
+            for name, signals in signal_sets.items():
+                signal = signals[i]
+                if signal is None:
+                    continue
+                strength = signal.confidence * weights.get(name, 1.0)
+                if signal.signal_type == SignalType.BUY:
+                    buy_strength += strength
+                    if best_buy is None or signal.confidence > best_buy.confidence:
+                        best_buy = signal
+                elif signal.signal_type == SignalType.SELL:
+                    sell_strength += strength
+                    if best_sell is None or signal.confidence > best_sell.confidence:
+                        best_sell = signal
+
+            if buy_strength > sell_strength and buy_strength > min_strength:
+                combined.append(best_buy)
+            elif sell_strength > buy_strength and sell_strength > min_strength:
+                combined.append(best_sell)
+            else:
+                combined.append(None)
+        return combined
+
+    def simulate(
+        self,
+        series: List[Candle],
+        signals: List[Optional[TradingSignal]],
+        start: int,
+        strategy_name: str
+    ) -> List[Trade]:
+        """Přehraje signály (signals[k] patří ke svíčce start + k) a vrátí uzavřené obchody"""
+        trades: List[Trade] = []
+        position: Optional[_OpenPosition] = None
+        last_index = start + len(signals) - 1
+
+        for k, signal in enumerate(signals):
+            candle = series[start + k]
+
+            if position:
+                if position.stop_loss and candle.low <= position.stop_loss:
+                    trades.append(self._close(position, position.stop_loss, candle, strategy_name, len(trades)))
+                    position = None
+                elif position.take_profit and candle.high >= position.take_profit:
+                    trades.append(self._close(position, position.take_profit, candle, strategy_name, len(trades)))
+                    position = None
+
+            if signal is None:
+                continue
+
+            if signal.signal_type == SignalType.BUY and position is None and candle.close > 0:
+                position = _OpenPosition(
+                    entry_price=candle.close,
+                    quantity=self.position_size_usd / candle.close,
+                    stop_loss=signal.suggested_stop_loss,
+                    take_profit=signal.suggested_take_profit,
+                    opened_at=candle
+                )
+            elif signal.signal_type == SignalType.SELL and position is not None:
+                trades.append(self._close(position, candle.close, candle, strategy_name, len(trades)))
+                position = None
+
+        # Na konci okna pozici uzavři za poslední close
+        if position and last_index >= start:
+            last = series[last_index]
+            trades.append(self._close(position, last.close, last, strategy_name, len(trades)))
+
+        return trades
+
+    def _close(
+        self,
+        position: _OpenPosition,
+        exit_price: Decimal,
+        candle: Candle,
+        strategy_name: str,
+        sequence: int
+    ) -> Trade:
+        """Vytvoří uzavřený obchod ze simulované pozice"""
+        commission = (position.entry_price + exit_price) * position.quantity * self.fee_rate
+        pnl = (exit_price - position.entry_price) * position.quantity - commission
+        return Trade(
+            id=f"bt_{candle.symbol}_{strategy_name}_{int(position.opened_at.timestamp.timestamp())}_{sequence}",
+            symbol=candle.symbol,
+            side=TradeType.BUY,
+            quantity=position.quantity,
+            price=position.entry_price,
+            status=TradeStatus.CLOSED,
+            strategy_name=strategy_name,
+            created_at=position.opened_at.timestamp,
+            executed_at=position.opened_at.timestamp,
+            closed_at=candle.timestamp,
+            stop_loss=position.stop_loss,
+            take_profit=position.take_profit,
+            entry_price=position.entry_price,
+            exit_price=exit_price,
+            pnl=pnl,
+            commission=commission
+        )
@@ -0,0 +1,49 @@
+import logging
+from datetime import datetime
+
+from ...infrastructure.external.bybit.bybit_client import BybitClient
+from ...infrastructure.persistence.lake.candle_lake import CandleLake
+
+
+logger = logging.getLogger(__name__)
+
+# Délka Bybit intervalů v milisekundách ("M" nemá pevnou délku)
+INTERVAL_MS = {
+    "1": 60_000, "3": 180_000, "5": 300_000, "15": 900_000, "30": 1_800_000,
+    "60": 3_600_000, "120": 7_200_000, "240": 14_400_000, "360": 21_600_000,
+    "720": 43_200_000, "D": 86_400_000, "W": 604_800_000,
+}
+
+
+async def backfill_candles(
+    client: BybitClient,
+    lake: CandleLake,
+    symbol: str,
+    interval: str,
+    start_time: datetime,
+    end_time: datetime,
+    page_size: int = 1000
+) -> int:
+    """Stáhne historické svíčky po stránkách a uloží je do archivu
+
+    Vrací počet zapsaných svíček.
+    """
+    if interval not in INTERVAL_MS:
+        raise ValueError(f"Nepodporovaný interval pro backfill: {interval}")
+
+    step = INTERVAL_MS[interval]
+    cursor = int(start_time.timestamp() * 1000)
+    end_ms = int(end_time.timestamp() * 1000)
+    written = 0
+
+    while cursor <= end_ms:
+        page_end = min(cursor + step * (page_size - 1), end_ms)
+        candles = await client.get_klines(
+            symbol=symbol, interval=interval, limit=page_size, start_time=cursor, end_time=page_end
+        )
+        if candles:
+            written += await lake.append_async(symbol, interval, candles, backfill=True)
+        cursor = page_end + step
+
+    logger.info(f"Backfill {symbol}/{interval}: uloženo {written} svíček")
+    return written
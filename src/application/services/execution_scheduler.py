@@ -0,0 +1,405 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass, asdict
+from decimal import Decimal, ROUND_DOWN
+from enum import Enum
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from ...config.settings import ExecutionConfig
+from ...domain.models import ExecutionEvent, Order, OrderBook, OrderState, TradeType
+from ...infrastructure.external.bybit.bybit_client import BybitClient
+from ...infrastructure.external.bybit.instrument_registry import InstrumentRegistry
+
+
+logger = logging.getLogger(__name__)
+
+
+_ZERO = Decimal('0')
+_BPS = Decimal('0.0001')
+# Přesnost množství dílčích objednávek
+_QUANTITY_STEP = Decimal('0.00000001')
+
+
+class ExecutionAlgo(Enum):
+    MARKET = "market"
+    TWAP = "twap"
+    ICEBERG = "iceberg"
+
+
+@dataclass
+class ExecutionReport:
+    """Výsledek rodičovské objednávky proti ceně při příchodu"""
+    order_link_id: str
+    symbol: str
+    side: str
+    algo: str
+    state: str
+    quantity: float
+    filled_quantity: float
+    # Střed knihy při převzetí objednávky
+    arrival_price: float
+    avg_price: Optional[float]
+    # Kladné = horší než arrival (nákup dráž, prodej levněji)
+    slippage_bps: Optional[float]
+    children: int
+    replaced: int
+    duration_s: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class ExecutionStats:
+    """Čítače exekučních algoritmů"""
+    parents: int = 0
+    active: int = 0
+    filled: int = 0
+    cancelled: int = 0
+    children: int = 0
+    child_rejected: int = 0
+    replaced: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class _ParentExecution:
+    """Rodičovská objednávka a plnění jejích dílčích objednávek"""
+
+    def __init__(
+        self,
+        order: Order,
+        algo: ExecutionAlgo,
+        on_event: Callable[[ExecutionEvent], Any],
+        stop_loss: Optional[Decimal],
+        take_profit: Optional[Decimal]
+    ):
+        self.order = order
+        self.algo = algo
+        self.on_event = on_event
+        self.stop_loss = stop_loss
+        self.take_profit = take_profit
+        self.arrival_price = order.price
+        self.started = time.monotonic()
+        self.filled = _ZERO
+        self.notional = _ZERO
+        self.fee = _ZERO
+        self.children = 0
+        self.replaced = 0
+        self.exchange_order_id: Optional[str] = None
+        # Čekající dílčí objednávka a její už započtené plnění
+        self.child_link: Optional[str] = None
+        self.child_filled = _ZERO
+        self.child_notional = _ZERO
+        self.child_fee = _ZERO
+        self.task: Optional[asyncio.Task] = None
+
+    @property
+    def remaining(self) -> Decimal:
+        return self.order.quantity - self.filled
+
+    @property
+    def avg_price(self) -> Optional[Decimal]:
+        return self.notional / self.filled if self.filled else None
+
+
+class ExecutionScheduler:
+    """Exekuční algoritmy pro velké objednávky (TWAP, iceberg)
+
+    Objednávka s notionalem od `min_notional_usd` se rozdělí na dílčí
+    objednávky. Každá rodičovská objednávka běží jako vlastní asyncio task,
+    `start()` se vrací hned. Dílčí objednávku omezuje lokální order book:
+    nejvýš `participation` likvidity protistrany do `depth_bps` od nejlepší
+    ceny.
+
+    - TWAP: `slices` market objednávek rovnoměrně za `duration`. Co kniha
+      nepustí, dožene další řez; poslední řez pošle celý zbytek.
+    - iceberg: limitní objednávka za nejlepší cenu vlastní strany, viditelná
+      jen část. Když ji cena opustí nebo čeká déle než `child_timeout`, zruší
+      se a zadá znovu (cancel/replace). Po `duration` dorovná zbytek market.
+
+    Plnění dílčích objednávek se hlásí přes `on_event` jako kumulativní
+    `ExecutionEvent` rodičovské objednávky - žurnál a risk engine tak vidí
+    jednu objednávku. Průměrná cena se porovná s cenou při příchodu
+    (střed knihy) v `reports()`.
+    """
+
+    def __init__(
+        self,
+        bybit_client: BybitClient,
+        config: ExecutionConfig,
+        book_depth: int = 50,
+        instruments: Optional[InstrumentRegistry] = None
+    ):
+        self.bybit_client = bybit_client
+        self.config = config
+        self.algo = ExecutionAlgo(config.algo)
+        self.book_depth = book_depth
+        self.instruments = instruments
+        # order_link_id rodiče -> běžící exekuce
+        self._parents: Dict[str, _ParentExecution] = {}
+        self._reports: Deque[ExecutionReport] = deque(maxlen=100)
+        self._stats = ExecutionStats()
+
+    def should_slice(self, quantity: Decimal, price: Decimal) -> bool:
+        """Půjde objednávka přes exekuční algoritmus"""
+        return self.algo != ExecutionAlgo.MARKET and quantity * price >= self.config.min_notional_usd
+
+    def manages(self, order_link_id: str) -> bool:
+        return order_link_id in self._parents
+
+    def start(
+        self,
+        order: Order,
+        on_event: Callable[[ExecutionEvent], Any],
+        stop_loss: Optional[Decimal] = None,
+        take_profit: Optional[Decimal] = None
+    ) -> None:
+        """Spustí algoritmus rodičovské objednávky na pozadí (stopy dílčích objednávek na tick)"""
+        parent = _ParentExecution(
+            order, self.algo, on_event,
+            self._tick_price(order.symbol, stop_loss), self._tick_price(order.symbol, take_profit)
+        )
+        self._parents[order.order_link_id] = parent
+        self._stats.parents += 1
+        parent.task = asyncio.create_task(self._run(parent))
+        logger.info(f"{self.algo.value.upper()} pro {order.order_link_id}: {order.quantity} {order.symbol}")
+
+    async def cancel(self, order_link_id: str) -> bool:
+        """Zastaví algoritmus a zruší čekající dílčí objednávku (nevyplněný zbytek propadne)"""
+        parent = self._parents.get(order_link_id)
+        if parent is None or parent.task is None:
+            return False
+        parent.task.cancel()
+        await asyncio.gather(parent.task, return_exceptions=True)
+        return True
+
+    def reports(self) -> List[Dict[str, Any]]:
+        """Posledních 100 dokončených rodičovských objednávek"""
+        return [report.to_dict() for report in self._reports]
+
+    def stats(self) -> Dict[str, Any]:
+        self._stats.active = len(self._parents)
+        result = self._stats.to_dict()
+        slippage = [r.slippage_bps for r in self._reports if r.slippage_bps is not None]
+        result["avg_slippage_bps"] = sum(slippage) / len(slippage) if slippage else None
+        return result
+
+    async def close(self) -> None:
+        """Zastaví všechny běžící algoritmy"""
+        for order_link_id in list(self._parents):
+            await self.cancel(order_link_id)
+
+    async def _run(self, parent: _ParentExecution) -> None:
+        order = parent.order
+        try:
+            book = await self._book(order.symbol)
+            if book and book.bids and book.asks:
+                parent.arrival_price = (book.bids[0][0] + book.asks[0][0]) / 2
+            if parent.algo == ExecutionAlgo.TWAP:
+                await self._run_twap(parent, book)
+            else:
+                await self._run_iceberg(parent, book)
+        except asyncio.CancelledError:
+            logger.info(f"Exekuce {order.order_link_id} zrušena, vyplněno {parent.filled}/{order.quantity}")
+            await self._cancel_child(parent)
+        except Exception as e:
+            logger.error(f"Chyba exekuce {order.order_link_id}: {e}")
+            await self._cancel_child(parent)
+        finally:
+            self._finish(parent)
+
+    async def _run_twap(self, parent: _ParentExecution, book: Optional[OrderBook]) -> None:
+        slices = max(self.config.slices, 1)
+        interval = self.config.duration / slices
+        for step in range(1, slices + 1):
+            if step > 1:
+                await asyncio.sleep(interval)
+                book = await self._book(parent.order.symbol)
+            if step == slices:
+                quantity = parent.remaining
+            else:
+                # Dohání plán, ale jen do hloubky knihy
+                behind = parent.order.quantity * step / slices - parent.filled
+                quantity = min(behind, self._depth_limit(book, parent.order.side))
+            if quantity > 0:
+                await self._execute_child(parent, self._child_quantity(parent, quantity))
+            if parent.remaining <= 0:
+                return
+
+    async def _run_iceberg(self, parent: _ParentExecution, book: Optional[OrderBook]) -> None:
+        deadline = parent.started + self.config.duration
+        side = parent.order.side
+        while parent.remaining > 0 and time.monotonic() < deadline:
+            own = (book.bids if side == TradeType.BUY else book.asks) if book else None
+            peak = self._depth_limit(book, side)
+            if own and peak > 0:
+                price = own[0][0]
+                timeout = min(self.config.child_timeout, deadline - time.monotonic())
+                await self._execute_child(parent, self._child_quantity(parent, peak), price, timeout)
+            else:
+                await asyncio.sleep(self.config.poll_interval)
+            book = await self._book(parent.order.symbol)
+        if parent.remaining > 0:
+            # Doba vypršela - zbytek za trh
+            await self._execute_child(parent, parent.remaining)
+
+    async def _execute_child(
+        self,
+        parent: _ParentExecution,
+        quantity: Decimal,
+        price: Optional[Decimal] = None,
+        timeout: Optional[float] = None
+    ) -> None:
+        """Zadá dílčí objednávku a sleduje ji do konce
+
+        Limitní objednávka se zruší, když ji cena opustí, nebo po `timeout`
+        sekundách; market objednávka nejpozději po `child_timeout`.
+        """
+        order = parent.order
+        parent.children += 1
+        link = f"{order.order_link_id}_{parent.children}"
+        exchange_order_id = await self.bybit_client.place_order(
+            symbol=order.symbol,
+            side=order.side.value,
+            qty=quantity,
+            order_type="Limit" if price is not None else "Market",
+            price=price,
+            stop_loss=parent.stop_loss,
+            take_profit=parent.take_profit,
+            order_link_id=link
+        )
+        self._stats.children += 1
+        if not exchange_order_id:
+            self._stats.child_rejected += 1
+            if price is None:
+                raise RuntimeError(f"dílčí objednávka {link} odmítnuta")
+            await asyncio.sleep(self.config.poll_interval)
+            return
+
+        parent.exchange_order_id = exchange_order_id
+        parent.child_link, parent.child_filled, parent.child_notional, parent.child_fee = link, _ZERO, _ZERO, _ZERO
+        expires = time.monotonic() + (timeout if timeout is not None else self.config.child_timeout)
+        while True:
+            event = await self.bybit_client.get_order(order.symbol, link)
+            if event:
+                self._apply_child(parent, event)
+                if event.state in (OrderState.FILLED, OrderState.CANCELLED, OrderState.REJECTED):
+                    break
+            if time.monotonic() >= expires or (price is not None and await self._moved_away(order, price)):
+                if await self._cancel_child(parent) and parent.remaining > 0:
+                    parent.replaced += 1
+                    self._stats.replaced += 1
+                break
+            await asyncio.sleep(self.config.poll_interval)
+        parent.child_link = None
+
+    async def _moved_away(self, order: Order, price: Decimal) -> bool:
+        """Nejlepší cena vlastní strany odešla od limitní ceny dílčí objednávky"""
+        book = await self._book(order.symbol)
+        own = (book.bids if order.side == TradeType.BUY else book.asks) if book else None
+        if not own:
+            return False
+        return own[0][0] > price if order.side == TradeType.BUY else own[0][0] < price
+
+    async def _cancel_child(self, parent: _ParentExecution) -> bool:
+        """Zruší čekající dílčí objednávku a započte její poslední plnění"""
+        link = parent.child_link
+        if link is None:
+            return False
+        parent.child_link = None
+        cancelled = await self.bybit_client.cancel_order(parent.order.symbol, link)
+        event = await self.bybit_client.get_order(parent.order.symbol, link)
+        if event:
+            self._apply_child(parent, event)
+        return cancelled
+
+    def _apply_child(self, parent: _ParentExecution, event: ExecutionEvent) -> None:
+        """Nové plnění dílčí objednávky -> kumulativní událost rodiče"""
+        filled = event.filled_quantity - parent.child_filled
+        if filled <= 0:
+            return
+        child_notional = event.filled_quantity * (event.avg_fill_price or parent.arrival_price)
+        parent.filled += filled
+        parent.notional += child_notional - parent.child_notional
+        parent.fee += max(event.fee - parent.child_fee, _ZERO)
+        parent.child_filled, parent.child_notional = event.filled_quantity, child_notional
+        parent.child_fee = max(event.fee, parent.child_fee)
+        if parent.remaining > 0:
+            self._emit(parent, OrderState.PARTIALLY_FILLED)
+
+    def _finish(self, parent: _ParentExecution) -> None:
+        order = parent.order
+        self._parents.pop(order.order_link_id, None)
+        state = OrderState.FILLED if parent.remaining <= 0 else OrderState.CANCELLED
+        if state == OrderState.FILLED:
+            self._stats.filled += 1
+        else:
+            self._stats.cancelled += 1
+        self._emit(parent, state)
+
+        avg_price = parent.avg_price
+        slippage = None
+        if avg_price is not None and parent.arrival_price:
+            direction = 1 if order.side == TradeType.BUY else -1
+            slippage = float((avg_price - parent.arrival_price) / parent.arrival_price / _BPS) * direction
+        report = ExecutionReport(
+            order_link_id=order.order_link_id,
+            symbol=order.symbol,
+            side=order.side.value,
+            algo=parent.algo.value,
+            state=state.value,
+            quantity=float(order.quantity),
+            filled_quantity=float(parent.filled),
+            arrival_price=float(parent.arrival_price),
+            avg_price=float(avg_price) if avg_price is not None else None,
+            slippage_bps=slippage,
+            children=parent.children,
+            replaced=parent.replaced,
+            duration_s=time.monotonic() - parent.started
+        )
+        self._reports.append(report)
+        logger.info(
+            f"Exekuce {order.order_link_id} ({state.value}): {parent.filled}/{order.quantity} "
+            f"za {report.avg_price}, arrival {report.arrival_price}, slippage {slippage} bps"
+        )
+
+    def _emit(self, parent: _ParentExecution, state: OrderState) -> None:
+        try:
+            parent.on_event(ExecutionEvent(
+                parent.order.order_link_id, state, parent.filled, parent.avg_price, parent.exchange_order_id,
+                fee=parent.fee
+            ))
+        except Exception as e:
+            logger.error(f"Chyba při zpracování stavu {parent.order.order_link_id}: {e}")
+
+    def _depth_limit(self, book: Optional[OrderBook], side: TradeType) -> Decimal:
+        """Velikost dílčí objednávky podle likvidity protistrany u nejlepší ceny"""
+        levels = (book.asks if side == TradeType.BUY else book.bids) if book else None
+        if not levels:
+            return _ZERO
+        best = levels[0][0]
+        band = best * Decimal(str(self.config.depth_bps)) * _BPS
+        available = sum((quantity for price, quantity in levels if abs(price - best) <= band), _ZERO)
+        return available * Decimal(str(self.config.participation))
+
+    async def _book(self, symbol: str) -> Optional[OrderBook]:
+        return await self.bybit_client.get_orderbook(symbol, self.book_depth)
+
+    def _tick_price(self, symbol: str, price: Optional[Decimal]) -> Optional[Decimal]:
+        if price is None or not self.instruments:
+            return price
+        return self.instruments.round_price(symbol, price)
+
+    def _child_quantity(self, parent: _ParentExecution, quantity: Decimal) -> Decimal:
+        """Množství dílčí objednávky - nejvýš zbytek, dolů na krok lotu, aspoň minimum kontraktu"""
+        remaining = parent.remaining
+        if quantity >= remaining:
+            return remaining
+        instrument = self.instruments.get(parent.order.symbol) if self.instruments else None
+        if instrument is None:
+            return quantity.quantize(_QUANTITY_STEP, rounding=ROUND_DOWN)
+        return min(max(instrument.round_quantity(quantity), instrument.min_qty), remaining)
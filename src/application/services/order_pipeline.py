@@ -0,0 +1,424 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass, asdict
+from decimal import Decimal
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional
+
+from ...domain.models import (
+    ExecutionEvent, Order, OrderState, SignalType, Trade, TradeStatus, TradeType, TradingSignal
+)
+from ...domain.repositories import ITradeRepository, IUnitOfWork, NullUnitOfWork
+from ...domain.services.id_generator import IdGenerator
+from ...domain.services.trading_engine import ITradingEngine
+from ...infrastructure.external.bybit.bybit_client import BybitClient
+from ...infrastructure.external.bybit.instrument_registry import InstrumentRegistry
+from .execution_scheduler import ExecutionScheduler
+from .risk_engine import RiskEngine
+
+
+logger = logging.getLogger(__name__)
+
+
+ORDER_LINK_PREFIX = "ord_"
+
+
+class LatencyStats:
+    """Klouzavé latence (posledních `window` měření) v milisekundách"""
+
+    def __init__(self, window: int = 1000):
+        self.count = 0
+        self.max = 0.0
+        self._samples: Deque[float] = deque(maxlen=window)
+
+    def record(self, seconds: float) -> None:
+        self.count += 1
+        self.max = max(self.max, seconds)
+        self._samples.append(seconds)
+
+    def to_dict(self) -> Dict[str, Any]:
+        samples = sorted(self._samples)
+        if not samples:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "last_ms": self._samples[-1] * 1000,
+            "p50_ms": samples[len(samples) // 2] * 1000,
+            "p99_ms": samples[min(len(samples) - 1, int(len(samples) * 0.99))] * 1000,
+            "max_ms": self.max * 1000,
+        }
+
+
+@dataclass
+class OrderPipelineStats:
+    """Metriky objednávek a žurnálu"""
+    submitted: int = 0
+    acknowledged: int = 0
+    rejected: int = 0
+    risk_rejected: int = 0
+    instrument_rejected: int = 0
+    filled: int = 0
+    cancelled: int = 0
+    journaled: int = 0
+    journal_errors: int = 0
+    active_orders: int = 0
+    journal_backlog: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class OrderPipeline:
+    """Odeslání objednávky na burzu a její žurnál mimo kritickou cestu
+
+    `submit()` pošle objednávku hned - bez čekání na databázi. Obchod se
+    do žurnálu (trade repository, jedna unit of work) zapíše až potom na
+    pozadí a stavy z burzy (`on_execution`, `poll_orders`) ho průběžně
+    aktualizují. Žurnál je jedna FIFO fronta, takže aktualizace nikdy
+    nepředběhne založení obchodu.
+
+    S `risk_engine` projde každá objednávka před odesláním předobchodní
+    kontrolou a plnění z událostí burzy aktualizují jeho čítače.
+
+    Velké objednávky (`scheduler.should_slice`) nejdou na burzu jednou
+    market objednávkou - rozdělí je exekuční algoritmus na pozadí a jeho
+    souhrnné stavy chodí do `on_execution` jako u běžné objednávky.
+
+    Uzavření pozice (`submit_close`) jde na burzu jako reduce-only market
+    objednávka, pozici v žurnálu uzavře až její plnění.
+
+    S registrem kontraktů (`instruments`) se množství před odesláním
+    zaokrouhlí na krok lotu, stop loss a take profit na tick a objednávka
+    mimo limity kontraktu na burzu nejde.
+
+    Měří se latence signál -> odeslání a odeslání -> potvrzení burzou.
+    """
+
+    def __init__(
+        self,
+        bybit_client: BybitClient,
+        trading_engine: ITradingEngine,
+        trade_repository: ITradeRepository,
+        unit_of_work: Optional[IUnitOfWork] = None,
+        risk_engine: Optional[RiskEngine] = None,
+        scheduler: Optional[ExecutionScheduler] = None,
+        instruments: Optional[InstrumentRegistry] = None
+    ):
+        self.bybit_client = bybit_client
+        self.trading_engine = trading_engine
+        self.trade_repository = trade_repository
+        self.unit_of_work = unit_of_work or NullUnitOfWork()
+        self.risk_engine = risk_engine
+        self.scheduler = scheduler
+        self.instruments = instruments
+        self.signal_to_send = LatencyStats()
+        self.send_to_ack = LatencyStats()
+        # order_link_id -> objednávka, která ještě neskončila
+        self.orders: Dict[str, Order] = {}
+        self._ids = IdGenerator(ORDER_LINK_PREFIX)
+        self._stats = OrderPipelineStats()
+        self._journal: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def has_active_order(self, symbol: str) -> bool:
+        """Má symbol objednávku, která ještě neskončila"""
+        return any(order.symbol == symbol for order in self.orders.values())
+
+    async def submit(
+        self,
+        signal: TradingSignal,
+        quantity: Decimal,
+        signal_at: Optional[float] = None
+    ) -> Optional[Order]:
+        """Odešle market objednávku podle signálu, žurnál zařadí na pozadí
+
+        `signal_at` je `time.perf_counter()` vzniku signálu. Vrátí None,
+        pokud symbol už má aktivní objednávku. Objednávka zamítnutá risk
+        enginem nebo mimo limity kontraktu se vrátí ve stavu rejected a na
+        burzu nejde.
+        """
+        started = signal_at if signal_at is not None else time.perf_counter()
+        if self.has_active_order(signal.symbol):
+            logger.warning(f"Objednávka pro {signal.symbol} ještě neskončila, signál přeskočen")
+            return None
+
+        side = TradeType.BUY if signal.signal_type == SignalType.BUY else TradeType.SELL
+        check = self.instruments.check_order(signal.symbol, quantity, signal.price) if self.instruments else None
+        stop_loss, take_profit = signal.suggested_stop_loss, signal.suggested_take_profit
+        if check is not None:
+            quantity = check.quantity
+            stop_loss = stop_loss and self.instruments.round_price(signal.symbol, stop_loss)
+            take_profit = take_profit and self.instruments.round_price(signal.symbol, take_profit)
+        order = Order(
+            order_link_id=self._ids.next_id(), symbol=signal.symbol, side=side,
+            quantity=quantity, price=signal.price
+        )
+        self._stats.submitted += 1
+
+        if check is not None and not check:
+            logger.warning(f"Objednávka {order.symbol} ({quantity}) mimo limity kontraktu: {check.reason}")
+            order.apply(ExecutionEvent(order.order_link_id, OrderState.REJECTED))
+            self._stats.instrument_rejected += 1
+            return order
+
+        if self.risk_engine:
+            decision = self.risk_engine.check_order(order.symbol, side, quantity, signal.price)
+            if not decision:
+                logger.warning(f"Objednávka {order.symbol} zamítnuta risk enginem: {decision.reason}")
+                order.apply(ExecutionEvent(order.order_link_id, OrderState.REJECTED))
+                self._stats.risk_rejected += 1
+                return order
+            self.risk_engine.reserve(order.symbol, side, quantity, signal.price)
+        self.orders[order.order_link_id] = order
+
+        if self.scheduler and self.scheduler.should_slice(quantity, signal.price):
+            # Dílčí objednávky pošle algoritmus, potvrzení je převzetí rodičovské objednávky
+            self.signal_to_send.record(time.perf_counter() - started)
+            order.apply(ExecutionEvent(order.order_link_id, OrderState.ACKNOWLEDGED))
+            self._stats.acknowledged += 1
+            self._enqueue(lambda: self._journal_open(order, signal))
+            self.scheduler.start(order, self.on_execution, stop_loss, take_profit)
+            return order
+
+        self.signal_to_send.record(time.perf_counter() - started)
+        if await self._send(order, stop_loss, take_profit):
+            self._enqueue(lambda: self._journal_open(order, signal))
+        return order
+
+    async def submit_close(
+        self,
+        symbol: str,
+        side: TradeType,
+        quantity: Decimal,
+        price: Decimal
+    ) -> Optional[Order]:
+        """Odešle reduce-only market objednávku, která uzavře pozici
+
+        `side` je strana uzavírací objednávky, `price` poslední známá cena
+        (pro risk engine). Pozice se v žurnálu uzavře za průměrnou cenu
+        plnění až po plnění z burzy a do risk enginu se započte jako každé
+        plnění. Vrátí None, pokud symbol už má aktivní objednávku.
+        """
+        if self.has_active_order(symbol):
+            logger.warning(f"Objednávka pro {symbol} ještě neskončila, uzavření přeskočeno")
+            return None
+
+        order = Order(
+            order_link_id=self._ids.next_id(), symbol=symbol, side=side,
+            quantity=quantity, price=price, reduce_only=True
+        )
+        self._stats.submitted += 1
+        if self.risk_engine:
+            decision = self.risk_engine.check_order(symbol, side, quantity, price)
+            if not decision:
+                logger.warning(f"Uzavření {symbol} zamítnuto risk enginem: {decision.reason}")
+                order.apply(ExecutionEvent(order.order_link_id, OrderState.REJECTED))
+                self._stats.risk_rejected += 1
+                return order
+            self.risk_engine.reserve(symbol, side, quantity, price)
+        self.orders[order.order_link_id] = order
+        await self._send(order)
+        return order
+
+    async def _send(
+        self,
+        order: Order,
+        stop_loss: Optional[Decimal] = None,
+        take_profit: Optional[Decimal] = None
+    ) -> bool:
+        """Market objednávka na burzu; False = odmítnutá (rezervace uvolněna)"""
+        sent_at = time.perf_counter()
+        try:
+            order_id = await self.bybit_client.place_order(
+                symbol=order.symbol,
+                side=order.side.value,
+                qty=order.quantity,
+                order_type="Market",
+                stop_loss=stop_loss,
+                take_profit=take_profit,
+                order_link_id=order.order_link_id,
+                reduce_only=order.reduce_only
+            )
+        except Exception as e:
+            logger.error(f"Chyba při odesílání objednávky {order.order_link_id}: {e}")
+            order_id = None
+        self.send_to_ack.record(time.perf_counter() - sent_at)
+
+        if not order_id:
+            order.apply(ExecutionEvent(order.order_link_id, OrderState.REJECTED))
+            self.orders.pop(order.order_link_id, None)
+            if self.risk_engine:
+                self.risk_engine.release(order.symbol, order.side, order.quantity)
+            self._stats.rejected += 1
+            return False
+
+        order.apply(ExecutionEvent(order.order_link_id, OrderState.ACKNOWLEDGED, exchange_order_id=order_id))
+        self._stats.acknowledged += 1
+        return True
+
+    def on_execution(self, event: ExecutionEvent) -> bool:
+        """Zpracuje stav objednávky z burzy; False pro neznámé/zastaralé události"""
+        order = self.orders.get(event.order_link_id)
+        if order is None:
+            return False
+        filled, notional = order.filled_quantity, order.filled_quantity * (order.avg_fill_price or order.price)
+        fee = order.fee
+        if not order.apply(event):
+            return False
+
+        if self.risk_engine:
+            self._update_risk(order, filled, notional, fee)
+
+        if order.state == OrderState.FILLED:
+            self._stats.filled += 1
+        elif order.state == OrderState.CANCELLED:
+            self._stats.cancelled += 1
+        elif order.state == OrderState.REJECTED:
+            self._stats.rejected += 1
+        if order.is_terminal:
+            self.orders.pop(order.order_link_id, None)
+        if not order.reduce_only:
+            self._enqueue(lambda: self._journal_state(order))
+        elif order.is_terminal and order.filled_quantity > 0:
+            self._enqueue(lambda: self._journal_close(order))
+        return True
+
+    def _update_risk(
+        self, order: Order, filled_before: Decimal, notional_before: Decimal, fee_before: Decimal
+    ) -> None:
+        """Nové plnění a poplatek (rozdíly kumulativních hodnot) a uvolnění zbytku ukončené objednávky"""
+        filled = order.filled_quantity - filled_before
+        if filled > 0:
+            notional = order.filled_quantity * (order.avg_fill_price or order.price)
+            self.risk_engine.on_fill(
+                order.symbol, order.side, filled, (notional - notional_before) / filled, order.fee - fee_before
+            )
+        if order.is_terminal and order.filled_quantity < order.quantity:
+            self.risk_engine.release(order.symbol, order.side, order.quantity - order.filled_quantity)
+
+    async def cancel(self, order_link_id: str) -> bool:
+        """Zruší aktivní objednávku (u exekučního algoritmu i jeho čekající dílčí objednávku)"""
+        order = self.orders.get(order_link_id)
+        if order is None:
+            return False
+        if self.scheduler and self.scheduler.manages(order_link_id):
+            return await self.scheduler.cancel(order_link_id)
+        if not await self.bybit_client.cancel_order(order.symbol, order_link_id):
+            return False
+        event = await self.bybit_client.get_order(order.symbol, order_link_id)
+        if event:
+            self.on_execution(event)
+        return True
+
+    async def poll_orders(self) -> int:
+        """Dotáže se burzy na potvrzené objednávky (počet změn stavu)"""
+        orders = [
+            order for order in self.orders.values()
+            if order.state != OrderState.PENDING
+            and not (self.scheduler and self.scheduler.manages(order.order_link_id))
+        ]
+        events = await asyncio.gather(
+            *(self.bybit_client.get_order(order.symbol, order.order_link_id) for order in orders)
+        )
+        return sum(1 for event in events if event and self.on_execution(event))
+
+    async def run_order_tracking(self, interval: float) -> None:
+        """Sleduje stavy objednávek každých `interval` sekund (do zrušení tasku)"""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.poll_orders()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Chyba při sledování objednávek: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Metriky objednávek a latence"""
+        self._stats.active_orders = len(self.orders)
+        self._stats.journal_backlog = self._journal.qsize() if self._journal else 0
+        result = self._stats.to_dict()
+        result["signal_to_send"] = self.signal_to_send.to_dict()
+        result["send_to_ack"] = self.send_to_ack.to_dict()
+        if self.scheduler:
+            result["execution"] = self.scheduler.stats()
+        return result
+
+    async def flush(self) -> None:
+        """Počká na zapsání celého žurnálu"""
+        if self._journal is not None:
+            await self._journal.join()
+
+    async def close(self) -> None:
+        """Zastaví exekuční algoritmy, dopíše žurnál a zastaví jeho task"""
+        if self.scheduler:
+            await self.scheduler.close()
+        await self.flush()
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def _enqueue(self, job: Callable[[], Awaitable[None]]) -> None:
+        if self._task is None:
+            self._journal = asyncio.Queue()
+            self._task = asyncio.create_task(self._journal_loop())
+        self._journal.put_nowait(job)
+
+    async def _journal_loop(self) -> None:
+        while True:
+            job = await self._journal.get()
+            try:
+                await job()
+                self._stats.journaled += 1
+            except Exception as e:
+                self._stats.journal_errors += 1
+                logger.error(f"Chyba při zápisu žurnálu objednávek: {e}")
+            finally:
+                self._journal.task_done()
+
+    async def _journal_open(self, order: Order, signal: TradingSignal) -> None:
+        """Založí obchod objednávky (včetně uzavření protipozice) jedním commitem"""
+        signal.suggested_position_size = order.quantity
+        async with self.unit_of_work.begin():
+            trade = await self.trading_engine.execute_trade(signal)
+            if trade is None:
+                raise RuntimeError(f"obchod pro objednávku {order.order_link_id} se nepodařilo založit")
+            _sync_trade(trade, order)
+            await self.trade_repository.update_trade(trade)
+        order.trade_id = trade.id
+        logger.info(f"Objednávka {order.order_link_id} zapsána jako obchod {trade.id}")
+
+    async def _journal_close(self, order: Order) -> None:
+        """Uzavře pozici plněné reduce-only objednávky za cenu plnění"""
+        async with self.unit_of_work.begin():
+            trade = await self.trading_engine.close_position(order.symbol, order.avg_fill_price or order.price)
+        if trade is None:
+            raise RuntimeError(f"pozici {order.symbol} objednávky {order.order_link_id} se nepodařilo uzavřít")
+        order.trade_id = trade.id
+        logger.info(f"Objednávka {order.order_link_id} uzavřela pozici {order.symbol} obchodem {trade.id}")
+
+    async def _journal_state(self, order: Order) -> None:
+        """Promítne aktuální stav objednávky do jejího obchodu"""
+        if order.trade_id is None:
+            raise RuntimeError(f"objednávka {order.order_link_id} nemá obchod v žurnálu")
+        trade = await self.trade_repository.get_trade_by_id(order.trade_id)
+        if trade is None:
+            raise RuntimeError(f"obchod {order.trade_id} nenalezen")
+        _sync_trade(trade, order)
+        await self.trade_repository.update_trade(trade)
+
+
+def _sync_trade(trade: Trade, order: Order) -> None:
+    """Stav objednávky -> obchod (do plnění zůstává pending)"""
+    trade.exchange_order_id = order.exchange_order_id
+    if order.filled_quantity > 0:
+        trade.status = TradeStatus.OPEN
+        trade.quantity = order.filled_quantity
+        trade.entry_price = order.avg_fill_price or trade.price
+        trade.executed_at = order.updated_at
+    elif order.state in (OrderState.CANCELLED, OrderState.REJECTED):
+        trade.status = TradeStatus.CANCELLED
+    else:
+        trade.status = TradeStatus.PENDING
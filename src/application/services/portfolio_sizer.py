@@ -0,0 +1,129 @@
+import logging
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import List, Optional
+
+import numpy as np
+
+from ...config.settings import RiskManagementConfig
+from ...domain.models import TradingSignal
+from .risk_engine import RiskEngine
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SizingRequest:
+    """BUY rozhodnutí cyklu čekající na velikost"""
+    signal: TradingSignal
+    # Vážená síla signálů symbolu (confidence * váha strategie)
+    strength: float
+    signal_at: Optional[float] = None
+
+
+@dataclass
+class SizedOrder:
+    """Objednávka připravená k odeslání"""
+    signal: TradingSignal
+    quantity: Decimal
+    notional: Decimal
+    signal_at: Optional[float] = None
+
+
+class PortfolioSizer:
+    """Společné rozdělení kapitálu mezi BUY signály jednoho cyklu
+
+    Požadovaná velikost signálu je stejná jako v `calculate_position_size`:
+    `risk_per_trade` zůstatku na vzdálenost ke stop lossu, bez stop lossu
+    1 % zůstatku. Každá je omezená `max_position_size_usd`.
+
+    Společná omezení celé dávky:
+    - volné sloty do `max_positions` - projdou nejsilnější signály
+    - kapitál = zůstatek - gross notional otevřených pozic; když požadavky
+      přesáhnou, dělí se poměrem síly signálů a co signál s nižším stropem
+      nevyčerpá, připadne ostatním (water-filling)
+
+    Výpočet je vektorový (NumPy) nad všemi signály dávky. Objednávky pod
+    `min_order_usd` se zahodí.
+    """
+
+    def __init__(
+        self,
+        limits: RiskManagementConfig,
+        risk_per_trade: float = 0.02,
+        min_order_usd: Decimal = Decimal('5')
+    ):
+        self.limits = limits
+        self.risk_per_trade = risk_per_trade
+        self.min_order_usd = min_order_usd
+
+    def allocate(
+        self,
+        requests: List[SizingRequest],
+        balance: Decimal,
+        risk_engine: Optional[RiskEngine] = None
+    ) -> List[SizedOrder]:
+        """Velikosti objednávek dávky (nejsilnější první)"""
+        if not requests or balance <= 0:
+            return []
+
+        balance_f = float(balance)
+        price = np.array([float(r.signal.price) for r in requests])
+        stop = np.array([
+            float(r.signal.suggested_stop_loss) if r.signal.suggested_stop_loss else np.nan for r in requests
+        ])
+        strength = np.array([max(r.strength, 0.0) for r in requests])
+
+        # Požadovaný notional jednotlivě (jako calculate_position_size)
+        distance = np.abs(price - stop)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            risk_based = balance_f * self.risk_per_trade / distance * price
+        desired = np.where(np.isfinite(risk_based) & (distance > 0), risk_based, balance_f * 0.01)
+        cap = np.minimum(desired, float(self.limits.max_position_size_usd))
+        cap[(price <= 0) | (strength <= 0)] = 0.0
+
+        # Volné sloty - zbytek nejslabších signálů vypadne
+        open_positions = risk_engine.open_positions + risk_engine.opening_positions if risk_engine else 0
+        slots = max(self.limits.max_positions - open_positions, 0)
+        order = np.argsort(-strength, kind="stable")
+        cap[order[slots:]] = 0.0
+
+        # Kapitál drží otevřené pozice i odeslané, dosud neplněné objednávky
+        committed = float(risk_engine.gross_notional + risk_engine.reserved_notional) if risk_engine else 0.0
+        allocation = _water_fill(cap, strength, max(balance_f - committed, 0.0))
+
+        sized = []
+        for i in order:
+            notional = allocation[i]
+            if notional < float(self.min_order_usd):
+                continue
+            request = requests[i]
+            sized.append(SizedOrder(
+                signal=request.signal,
+                quantity=Decimal(f"{notional / price[i]:.8f}"),
+                notional=Decimal(f"{notional:.2f}"),
+                signal_at=request.signal_at
+            ))
+
+        if len(sized) < len(requests):
+            logger.info(f"Dávka {len(requests)} BUY signálů: velikost dostalo {len(sized)}")
+        return sized
+
+
+def _water_fill(cap: np.ndarray, weight: np.ndarray, budget: float) -> np.ndarray:
+    """Rozdělí `budget` poměrem vah, nikdo nedostane víc než svůj strop"""
+    allocation = np.zeros_like(cap)
+    active = cap > 0
+    remaining = budget
+    # Každé kolo aspoň jeden signál narazí na strop, nebo se rozpočet vyčerpá
+    for _ in range(len(cap)):
+        if remaining <= 1e-9 or not active.any():
+            break
+        weights = np.where(active, weight, 0.0)
+        share = remaining * weights / weights.sum()
+        take = np.minimum(share, cap - allocation)
+        allocation += take
+        remaining -= take.sum()
+        active &= allocation < cap - 1e-9
+    return allocation
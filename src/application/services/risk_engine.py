@@ -0,0 +1,288 @@
+import logging
+from dataclasses import dataclass, field, asdict
+from datetime import date
+from decimal import Decimal
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from ...config.settings import RiskManagementConfig
+from ...domain.models import Position, TradeType
+
+
+logger = logging.getLogger(__name__)
+
+
+_ZERO = Decimal('0')
+
+
+@dataclass
+class RiskDecision:
+    """Výsledek předobchodní kontroly"""
+    approved: bool
+    reason: str = ""
+
+    def __bool__(self) -> bool:
+        return self.approved
+
+
+@dataclass
+class RiskStats:
+    """Čítače kontrol risk enginu"""
+    checks: int = 0
+    rejected: int = 0
+    # důvod -> počet zamítnutí
+    rejections: Dict[str, int] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class _Exposure:
+    """Expozice jednoho symbolu (kladná velikost = long)"""
+
+    __slots__ = ("size", "cost", "mark", "pending")
+
+    def __init__(self):
+        self.size = _ZERO
+        # Vstupní notional otevřené části
+        self.cost = _ZERO
+        self.mark = _ZERO
+        # Rezervované (odeslané, dosud neplněné) množství se znaménkem
+        self.pending = _ZERO
+
+    @property
+    def notional(self) -> Decimal:
+        return self.size * self.mark
+
+    @property
+    def reserved(self) -> Decimal:
+        """Notional rezervace nad rámec současné pozice (snižující část se nepočítá)"""
+        return max(abs(self.size + self.pending) - abs(self.size), _ZERO) * self.mark
+
+    @property
+    def unrealized(self) -> Decimal:
+        if not self.size:
+            return _ZERO
+        direction = 1 if self.size > 0 else -1
+        return (abs(self.size) * self.mark - self.cost) * direction
+
+
+class RiskEngine:
+    """Předobchodní risk engine s čítači v paměti
+
+    Drží po symbolech čistou pozici, rezervace odeslaných objednávek
+    a ocenění a k nim souhrny (otevřené pozice, gross/net notional,
+    nerealizované PnL, realizované PnL dne). Každá změna symbolu souhrny
+    opraví o rozdíl, takže `check_order` je O(1) bez ohledu na počet pozic.
+
+    Čítače se mění jen z plnění (`on_fill`), rezervací a ocenění (`mark`) -
+    obchody se znovu nenačítají. Počáteční stav dodá `load()`.
+
+    Kill switch (ručně, z konfigurace nebo po překročení denní ztráty)
+    zamítá objednávky, které expozici zvyšují; snižující projdou.
+    """
+
+    def __init__(self, limits: RiskManagementConfig, today: Callable[[], date] = date.today):
+        self.limits = limits
+        self.kill_switch_reason: Optional[str] = "konfigurace" if limits.kill_switch else None
+        self._today = today
+        self._day = today()
+        self._exposures: Dict[str, _Exposure] = {}
+        self._stats = RiskStats()
+        # Souhrny přes všechny symboly
+        self.open_positions = 0
+        # Symboly bez pozice s rezervovanou objednávkou (budoucí nové pozice)
+        self.opening_positions = 0
+        self.gross_notional = _ZERO
+        # Notional odeslaných, dosud neplněných objednávek, které expozici zvyšují
+        self.reserved_notional = _ZERO
+        self.net_notional = _ZERO
+        self.unrealized_pnl = _ZERO
+        self.realized_pnl_today = _ZERO
+
+    @property
+    def kill_switch(self) -> bool:
+        return self.kill_switch_reason is not None
+
+    @property
+    def daily_pnl(self) -> Decimal:
+        """Realizované PnL dne + aktuální nerealizované"""
+        self._roll_day()
+        return self.realized_pnl_today + self.unrealized_pnl
+
+    def load(self, positions: Iterable[Position], realized_today: Decimal = _ZERO) -> None:
+        """Počáteční stav z otevřených pozic a realizovaného PnL dne"""
+        for position in positions:
+            direction = 1 if position.side == TradeType.BUY else -1
+            with self._changing(position.symbol) as exposure:
+                exposure.size = position.size * direction
+                exposure.cost = position.entry_price * position.size
+                exposure.mark = position.current_price or position.entry_price
+        self.realized_pnl_today = realized_today
+        logger.info(f"Risk engine načten: {self.open_positions} pozic, realizované PnL dne {realized_today}")
+
+    def engage_kill_switch(self, reason: str) -> None:
+        if not self.kill_switch:
+            logger.error(f"Kill switch aktivován: {reason}")
+        self.kill_switch_reason = reason
+
+    def reset_kill_switch(self) -> None:
+        if self.kill_switch:
+            logger.warning(f"Kill switch zrušen (byl: {self.kill_switch_reason})")
+        self.kill_switch_reason = None
+
+    def check_order(self, symbol: str, side: TradeType, quantity: Decimal, price: Decimal) -> RiskDecision:
+        """Zkontroluje objednávku proti limitům `RiskManagementConfig` (O(1))"""
+        self._stats.checks += 1
+        if quantity <= 0 or price <= 0:
+            return self._reject("invalid_order")
+
+        exposure = self._exposures.get(symbol)
+        current = exposure.size + exposure.pending if exposure else _ZERO
+        projected = current + (quantity if side == TradeType.BUY else -quantity)
+        if abs(projected) <= abs(current) and (projected == 0 or (projected > 0) == (current > 0)):
+            # Snížení expozice projde vždy (i s kill switchem)
+            return RiskDecision(True)
+
+        if self.kill_switch:
+            return self._reject("kill_switch")
+        if self.daily_pnl < -self.limits.max_daily_loss_usd:
+            self.engage_kill_switch(f"denní ztráta {self.daily_pnl} přes limit {self.limits.max_daily_loss_usd}")
+            return self._reject("kill_switch")
+        if abs(projected) * price > self.limits.max_position_size_usd:
+            return self._reject("max_position_size")
+        if current == 0 and self.open_positions + self.opening_positions >= self.limits.max_positions:
+            return self._reject("max_positions")
+        return RiskDecision(True)
+
+    def reserve(self, symbol: str, side: TradeType, quantity: Decimal, price: Optional[Decimal] = None) -> None:
+        """Započítá odeslanou objednávku do expozice až do plnění nebo `release`
+
+        `price` ocení rezervaci symbolu, který ještě nemá ocenění z plnění
+        nebo `mark`.
+        """
+        with self._changing(symbol) as exposure:
+            exposure.pending += quantity if side == TradeType.BUY else -quantity
+            if price and price > 0 and not exposure.mark:
+                exposure.mark = price
+
+    def release(self, symbol: str, side: TradeType, quantity: Decimal) -> None:
+        """Uvolní neplněnou část objednávky (zrušení, odmítnutí)"""
+        self.reserve(symbol, side, -quantity)
+
+    def on_fill(
+        self,
+        symbol: str,
+        side: TradeType,
+        quantity: Decimal,
+        price: Decimal,
+        fee: Decimal = _ZERO,
+        reserved: bool = True
+    ) -> None:
+        """Plnění objednávky - pozice, realizované PnL dne a uvolnění rezervace"""
+        self._roll_day()
+        signed = quantity if side == TradeType.BUY else -quantity
+        with self._changing(symbol) as exposure:
+            if reserved:
+                exposure.pending -= signed
+            exposure.mark = price
+            if exposure.size == 0 or (exposure.size > 0) == (signed > 0):
+                exposure.cost += price * quantity
+                exposure.size += signed
+            else:
+                size = abs(exposure.size)
+                closing = min(size, quantity)
+                direction = 1 if exposure.size > 0 else -1
+                released = exposure.cost if closing == size else exposure.cost * closing / size
+                self.realized_pnl_today += (price * closing - released) * direction
+                exposure.cost -= released
+                exposure.size += signed
+                if exposure.size and (exposure.size > 0) != (direction > 0):
+                    # Přetočení - zbytek otevřen za cenu plnění
+                    exposure.cost = price * abs(exposure.size)
+        self.realized_pnl_today -= fee
+
+    def mark(self, symbol: str, price: Decimal) -> None:
+        """Nové ocenění symbolu (nerealizované PnL, notional)"""
+        exposure = self._exposures.get(symbol)
+        if exposure is None or price <= 0:
+            return
+        with self._changing(symbol) as exposure:
+            exposure.mark = price
+
+    def check_daily_loss(self) -> bool:
+        """Aktivuje kill switch při překročení denní ztráty (True = aktivní)"""
+        if not self.kill_switch and self.daily_pnl < -self.limits.max_daily_loss_usd:
+            self.engage_kill_switch(f"denní ztráta {self.daily_pnl} přes limit {self.limits.max_daily_loss_usd}")
+        return self.kill_switch
+
+    def exposure(self, symbol: str) -> Dict[str, Any]:
+        """Čítače jednoho symbolu"""
+        exposure = self._exposures.get(symbol) or _Exposure()
+        return {
+            "size": float(exposure.size),
+            "pending": float(exposure.pending),
+            "reserved_notional": float(exposure.reserved),
+            "gross_notional": float(abs(exposure.notional)),
+            "net_notional": float(exposure.notional),
+            "unrealized_pnl": float(exposure.unrealized),
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        result = self._stats.to_dict()
+        result.update({
+            "kill_switch": self.kill_switch,
+            "kill_switch_reason": self.kill_switch_reason,
+            "open_positions": self.open_positions,
+            "opening_positions": self.opening_positions,
+            "gross_notional": float(self.gross_notional),
+            "reserved_notional": float(self.reserved_notional),
+            "net_notional": float(self.net_notional),
+            "unrealized_pnl": float(self.unrealized_pnl),
+            "realized_pnl_today": float(self.realized_pnl_today),
+            "daily_pnl": float(self.daily_pnl),
+        })
+        return result
+
+    def _reject(self, reason: str) -> RiskDecision:
+        self._stats.rejected += 1
+        self._stats.rejections[reason] = self._stats.rejections.get(reason, 0) + 1
+        return RiskDecision(False, reason)
+
+    def _roll_day(self) -> None:
+        today = self._today()
+        if today != self._day:
+            self._day = today
+            self.realized_pnl_today = _ZERO
+
+    def _changing(self, symbol: str) -> "_ExposureChange":
+        exposure = self._exposures.get(symbol)
+        if exposure is None:
+            exposure = self._exposures[symbol] = _Exposure()
+        return _ExposureChange(self, exposure)
+
+
+class _ExposureChange:
+    """Změna expozice symbolu - souhrny enginu se opraví o rozdíl"""
+
+    __slots__ = ("engine", "exposure")
+
+    def __init__(self, engine: RiskEngine, exposure: _Exposure):
+        self.engine = engine
+        self.exposure = exposure
+
+    def __enter__(self) -> _Exposure:
+        self._apply(-1)
+        return self.exposure
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self._apply(1)
+
+    def _apply(self, sign: int) -> None:
+        engine, exposure = self.engine, self.exposure
+        engine.open_positions += sign if exposure.size else 0
+        engine.opening_positions += sign if not exposure.size and exposure.pending else 0
+        notional = exposure.notional
+        engine.gross_notional += abs(notional) * sign
+        engine.reserved_notional += exposure.reserved * sign
+        engine.net_notional += notional * sign
+        engine.unrealized_pnl += exposure.unrealized * sign
@@ -0,0 +1,456 @@
+import asyncio
+import functools
+import json
+import logging
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+from dataclasses import dataclass, asdict, field
+from datetime import datetime
+from decimal import Decimal
+from multiprocessing.process import BaseProcess
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from ...config.settings import Settings, StrategyConfig, TradingConfig
+from ...domain.models import Candle, SignalStrength, SignalType, TradingSignal
+from ...domain.services.hash_ring import HashRing
+from ...infrastructure.external.bybit.bybit_client import BybitClient
+from ...strategies.base_strategy import BaseStrategy
+from ...strategies.registry import create_strategy
+
+
+logger = logging.getLogger(__name__)
+
+# Svíčky posílané koordinátorovi k uložení (jako při analýze v event loopu)
+STORED_CANDLES = 10
+
+
+@dataclass
+class ShardStats:
+    """Čítače koordinátoru shardů"""
+    workers: int = 0
+    symbols: int = 0
+    analyses: int = 0
+    signals: int = 0
+    # Analýzy od workeru, kterému symbol už nepatří (po přerozdělení)
+    stale_analyses: int = 0
+    worker_deaths: int = 0
+    rebalances: int = 0
+    moved_symbols: int = 0
+    unassigned_symbols: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class _WorkerHandle:
+    worker_id: str
+    process: BaseProcess
+    writer: Optional[asyncio.StreamWriter] = None
+    last_seen: float = 0.0
+    symbols: List[str] = field(default_factory=list)
+    # Vyřazený worker se už zpět nepřihlásí
+    dead: bool = False
+
+
+class ShardCoordinator:
+    """Koordinátor workerů - každý worker analyzuje svůj shard symbolů
+
+    Koordinátor (proces s účtem, risk enginem a odesíláním objednávek)
+    spustí `sharding.workers` procesů a symboly jim rozdělí konzistentním
+    hashováním (`HashRing`). Workery posílají výsledky analýz přes unix
+    socket v privátním adresáři jako JSON řádky. Signály poslední analýzy
+    symbolů si orchestrator vyzvedne v `drain()`, ceny jdou průběžně do
+    `on_price` a nové svíčky k uložení do `on_candles`.
+
+    Worker je mrtvý, když skončí jeho proces, zavře spojení nebo se déle
+    než `heartbeat_timeout` neozve. Jeho symboly se přerozdělí zbylým
+    workerům - ostatní symboly zůstanou, kde byly.
+    """
+
+    def __init__(
+        self,
+        settings: Settings,
+        client_factory: Optional[Callable[[], BybitClient]] = None,
+        on_price: Optional[Callable[[str, Decimal, Optional[float]], Any]] = None,
+        on_candles: Optional[Callable[[str, List[Candle]], Awaitable[None]]] = None
+    ):
+        self.settings = settings
+        self.config = settings.trading.sharding
+        self.symbols = list(dict.fromkeys(settings.trading.default_symbols))
+        # Workery potřebují jen veřejná tržní data - bez API klíčů
+        self.client_factory = client_factory or functools.partial(
+            BybitClient, "", "", settings.api.bybit_testnet
+        )
+        self.on_price = on_price
+        self.on_candles = on_candles
+        self._ring = HashRing(virtual_nodes=self.config.virtual_nodes)
+        self._workers: Dict[str, _WorkerHandle] = {}
+        # symbol -> signály poslední analýzy (analýza bez signálů symbol odebere)
+        self._pending: Dict[str, List[TradingSignal]] = {}
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._directory: Optional[str] = None
+        self._monitor: Optional[asyncio.Task] = None
+        self._connected: Optional[asyncio.Event] = None
+        self._started = False
+        self._closing = False
+        self._stats = ShardStats()
+
+    async def start(self) -> None:
+        """Spustí IPC server a worker procesy, počká na jejich přihlášení"""
+        # mkdtemp zakládá adresář s právy 0700 - socket je jen pro tohoto uživatele
+        self._directory = tempfile.mkdtemp(prefix="shards_")
+        path = os.path.join(self._directory, "coordinator.sock")
+        self._connected = asyncio.Event()
+        self._server = await asyncio.start_unix_server(self._handle_connection, path=path)
+
+        context = multiprocessing.get_context("spawn")
+        for i in range(self.config.workers):
+            worker_id = f"worker-{i}"
+            process = context.Process(
+                target=run_shard_worker, name=f"shard-{worker_id}", daemon=True,
+                args=(worker_id, path, self.settings.trading, self.settings.strategies, self.client_factory)
+            )
+            process.start()
+            self._workers[worker_id] = _WorkerHandle(worker_id, process)
+
+        try:
+            await asyncio.wait_for(self._connected.wait(), self.config.heartbeat_timeout)
+        except asyncio.TimeoutError:
+            logger.error("Některé shard workery se nepřihlásily včas")
+        self._started = True
+        for worker in self._workers.values():
+            if worker.writer is None:
+                self._lost(worker, "nepřihlásil se")
+        self._rebalance()
+        self._monitor = asyncio.create_task(self._watch())
+        logger.info(f"Koordinátor shardů: {len(self._ring)} workerů, {len(self.symbols)} symbolů")
+
+    def drain(self) -> Dict[str, List[TradingSignal]]:
+        """Signály došlé od posledního volání (za symbol jen poslední analýza)"""
+        pending, self._pending = self._pending, {}
+        return pending
+
+    def assignments(self) -> Dict[str, List[str]]:
+        """Aktuální shardy živých workerů"""
+        return {worker_id: list(self._workers[worker_id].symbols) for worker_id in self._ring.nodes}
+
+    def stats(self) -> Dict[str, Any]:
+        self._stats.workers = len(self._ring)
+        self._stats.symbols = len(self.symbols)
+        return self._stats.to_dict()
+
+    async def close(self) -> None:
+        """Zastaví workery a uvolní socket"""
+        self._closing = True
+        if self._monitor:
+            self._monitor.cancel()
+            await asyncio.gather(self._monitor, return_exceptions=True)
+        for worker in self._workers.values():
+            if worker.writer is not None:
+                self._send(worker, {"type": "stop"})
+                worker.writer.close()
+        if self._server:
+            self._server.close()
+        loop = asyncio.get_running_loop()
+        for worker in self._workers.values():
+            await loop.run_in_executor(None, worker.process.join, 5)
+            if worker.process.is_alive():
+                worker.process.kill()
+        if self._directory:
+            shutil.rmtree(self._directory, ignore_errors=True)
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        worker = None
+        try:
+            hello = json.loads(await reader.readline() or b"{}")
+            worker = self._workers.get(hello.get("worker"))
+            if hello.get("type") != "hello" or worker is None or worker.dead or worker.writer is not None:
+                worker = None
+                writer.close()
+                return
+            worker.writer, worker.last_seen = writer, time.monotonic()
+            self._ring.add(worker.worker_id)
+            if self._started:
+                self._rebalance()
+            elif all(w.writer is not None for w in self._workers.values()):
+                self._connected.set()
+
+            async for line in reader:
+                worker.last_seen = time.monotonic()
+                await self._on_message(worker, json.loads(line))
+        except Exception as e:
+            if not self._closing:
+                logger.error(f"Chyba spojení se shard workerem: {e}")
+        finally:
+            if worker is not None and worker.writer is writer and not self._closing:
+                self._lost(worker, "spojení ukončeno")
+
+    async def _on_message(self, worker: _WorkerHandle, message: Dict[str, Any]) -> None:
+        if message.get("type") != "analysis":
+            return
+        symbol = message["symbol"]
+        if self._ring.node_for(symbol) != worker.worker_id:
+            self._stats.stale_analyses += 1
+            return
+        signals = [_signal_from_message(item) for item in message.get("signals", [])]
+        self._stats.analyses += 1
+        self._stats.signals += len(signals)
+        if signals:
+            self._pending[symbol] = signals
+        else:
+            # Starší signály už neplatí
+            self._pending.pop(symbol, None)
+        if message.get("price") and self.on_price:
+            self.on_price(symbol, Decimal(message["price"]), message.get("timestamp"))
+        if message.get("candles") and self.on_candles:
+            try:
+                await self.on_candles(symbol, [_candle_from_message(symbol, row) for row in message["candles"]])
+            except Exception as e:
+                logger.error(f"Chyba při ukládání svíček {symbol} ze shardu: {e}")
+
+    async def _watch(self) -> None:
+        """Kontroluje procesy a heartbeaty workerů (do zrušení tasku)"""
+        while True:
+            await asyncio.sleep(self.config.heartbeat_interval)
+            now = time.monotonic()
+            for worker in list(self._workers.values()):
+                if worker.worker_id not in self._ring:
+                    continue
+                if not worker.process.is_alive():
+                    self._lost(worker, f"proces skončil ({worker.process.exitcode})")
+                elif now - worker.last_seen > self.config.heartbeat_timeout:
+                    self._lost(worker, "bez heartbeatu")
+
+    def _lost(self, worker: _WorkerHandle, reason: str) -> None:
+        """Vyřadí workera z kruhu a přerozdělí jeho symboly"""
+        if self._closing:
+            return
+        logger.error(
+            f"Shard worker {worker.worker_id} ztracen ({reason}), přerozděluji {len(worker.symbols)} symbolů"
+        )
+        worker.dead = True
+        self._ring.remove(worker.worker_id)
+        if worker.writer is not None:
+            worker.writer.close()
+            worker.writer = None
+        worker.symbols = []
+        if worker.process.is_alive():
+            worker.process.kill()
+        self._stats.worker_deaths += 1
+        if self._started:
+            self._rebalance()
+
+    def _rebalance(self) -> None:
+        """Pošle workerům, jejichž shard se změnil, nové přidělení"""
+        shards = self._ring.assign(self.symbols)
+        for worker_id, symbols in shards.items():
+            worker = self._workers[worker_id]
+            if symbols != worker.symbols:
+                self._stats.moved_symbols += len(set(symbols) - set(worker.symbols))
+                worker.symbols = symbols
+                self._send(worker, {"type": "assign", "symbols": symbols})
+        self._stats.rebalances += 1
+        self._stats.unassigned_symbols = 0 if shards else len(self.symbols)
+        if not shards:
+            logger.error("Žádný živý shard worker - symboly se neanalyzují")
+
+    def _send(self, worker: _WorkerHandle, message: Dict[str, Any]) -> None:
+        if worker.writer is not None:
+            worker.writer.write((json.dumps(message) + "\n").encode())
+
+
+class ShardWorker:
+    """Worker jednoho shardu - analyzuje přidělené symboly a posílá výsledky koordinátorovi
+
+    Každých `refresh_interval` sekund (a hned po novém přidělení) načte
+    svíčky svých symbolů a spustí strategie, symbol nejvýš jednou za
+    `min_analysis_interval`. Obchodní rozhodnutí i ukládání svíček dělá
+    koordinátor - worker mu posílá svíčky, které ještě neposlal (aspoň
+    posledních `STORED_CANDLES`).
+    """
+
+    def __init__(
+        self,
+        worker_id: str,
+        socket_path: str,
+        trading: TradingConfig,
+        strategies: Dict[str, StrategyConfig],
+        client_factory: Callable[[], BybitClient]
+    ):
+        self.worker_id = worker_id
+        self.socket_path = socket_path
+        self.trading = trading
+        self.client_factory = client_factory
+        self.symbols: List[str] = []
+        self.strategies: List[BaseStrategy] = []
+        for name, config in strategies.items():
+            strategy = create_strategy(name, config) if config.enabled else None
+            if strategy is not None:
+                self.strategies.append(strategy)
+        # symbol -> čas poslední analýzy (monotonic) a poslední odeslaná uzavřená svíčka
+        self._analyzed: Dict[str, float] = {}
+        self._forwarded: Dict[str, datetime] = {}
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._wake: Optional[asyncio.Event] = None
+
+    async def run(self) -> None:
+        """Běží, dokud koordinátor nepošle stop nebo nezavře spojení"""
+        reader, self._writer = await asyncio.open_unix_connection(self.socket_path)
+        self._wake = asyncio.Event()
+        self._send({"type": "hello", "worker": self.worker_id})
+        client = self.client_factory()
+        async with client:
+            tasks = [asyncio.create_task(self._heartbeat()), asyncio.create_task(self._analyze_loop(client))]
+            try:
+                await self._listen(reader)
+            finally:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                self._writer.close()
+
+    async def _listen(self, reader: asyncio.StreamReader) -> None:
+        async for line in reader:
+            message = json.loads(line)
+            if message.get("type") == "assign":
+                self.symbols = message["symbols"]
+                # Symbol, který se vrátí, se analyzuje a posílá znovu celý
+                for state in (self._analyzed, self._forwarded):
+                    for symbol in [symbol for symbol in state if symbol not in self.symbols]:
+                        del state[symbol]
+                logger.info(f"{self.worker_id}: přiděleno {len(self.symbols)} symbolů")
+                self._wake.set()
+            elif message.get("type") == "stop":
+                return
+
+    async def _heartbeat(self) -> None:
+        while True:
+            self._send({"type": "heartbeat"})
+            await asyncio.sleep(self.trading.sharding.heartbeat_interval)
+
+    async def _analyze_loop(self, client: BybitClient) -> None:
+        semaphore = asyncio.Semaphore(max(1, self.trading.analysis_concurrency))
+        # Do prvního přidělení není co analyzovat
+        await self._wake.wait()
+        while True:
+            self._wake.clear()
+            await asyncio.gather(*(self._analyze(client, symbol, semaphore) for symbol in list(self.symbols)))
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.trading.refresh_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _analyze(self, client: BybitClient, symbol: str, semaphore: asyncio.Semaphore) -> None:
+        async with semaphore:
+            # Symbol mezitím mohl přejít jinému workeru
+            if symbol not in self.symbols:
+                return
+            analyzed = self._analyzed.get(symbol)
+            if analyzed is not None and time.monotonic() - analyzed < self.trading.min_analysis_interval:
+                return
+            try:
+                candles = await client.get_klines(
+                    symbol=symbol, interval=self.trading.kline_interval, limit=self.trading.kline_limit
+                )
+                if not candles:
+                    return
+                signals = []
+                for strategy in self.strategies:
+                    try:
+                        signal = await strategy.analyze(candles, symbol)
+                        if signal:
+                            signals.append(signal)
+                    except Exception as e:
+                        logger.error(f"Chyba ve strategii {strategy.name}: {e}")
+                self._send({
+                    "type": "analysis", "symbol": symbol, "price": str(candles[-1].close),
+                    "timestamp": time.time(), "signals": [_signal_to_message(signal) for signal in signals],
+                    "candles": [_candle_to_message(candle) for candle in self._new_candles(symbol, candles)]
+                })
+                self._analyzed[symbol] = time.monotonic()
+            except Exception as e:
+                logger.error(f"{self.worker_id}: chyba při analýze {symbol}: {e}")
+
+    def _new_candles(self, symbol: str, candles: List[Candle]) -> List[Candle]:
+        """Svíčky od první dosud neposlané uzavřené, aspoň posledních `STORED_CANDLES`"""
+        forwarded = self._forwarded.get(symbol)
+        start = 0
+        if forwarded is not None:
+            start = next((i for i, candle in enumerate(candles) if candle.timestamp > forwarded), len(candles))
+        if len(candles) > 1:
+            self._forwarded[symbol] = candles[-2].timestamp
+        return candles[max(0, min(start, len(candles) - STORED_CANDLES)):]
+
+    def _send(self, message: Dict[str, Any]) -> None:
+        self._writer.write((json.dumps(message, default=str) + "\n").encode())
+
+
+def run_shard_worker(
+    worker_id: str,
+    socket_path: str,
+    trading: TradingConfig,
+    strategies: Dict[str, StrategyConfig],
+    client_factory: Callable[[], BybitClient]
+) -> None:
+    """Vstupní bod worker procesu"""
+    logging.basicConfig(level=logging.INFO, format=f'%(asctime)s - {worker_id} - %(levelname)s - %(message)s')
+    asyncio.run(ShardWorker(worker_id, socket_path, trading, strategies, client_factory).run())
+
+
+def _optional_decimal(value: Optional[Any]) -> Optional[str]:
+    return str(value) if value is not None else None
+
+
+def _candle_to_message(candle: Candle) -> List[str]:
+    return [
+        candle.timestamp.isoformat(), str(candle.open), str(candle.high), str(candle.low),
+        str(candle.close), str(candle.volume), candle.interval
+    ]
+
+
+def _candle_from_message(symbol: str, row: List[str]) -> Candle:
+    return Candle(
+        symbol=symbol, timestamp=datetime.fromisoformat(row[0]), open=Decimal(row[1]), high=Decimal(row[2]),
+        low=Decimal(row[3]), close=Decimal(row[4]), volume=Decimal(row[5]), interval=row[6]
+    )
+
+
+def _signal_to_message(signal: TradingSignal) -> Dict[str, Any]:
+    return {
+        "strategy_name": signal.strategy_name,
+        "symbol": signal.symbol,
+        "signal_type": signal.signal_type.value,
+        "strength": signal.strength.value,
+        "confidence": signal.confidence,
+        "price": str(signal.price),
+        "timestamp": signal.timestamp.isoformat(),
+        "indicators": signal.indicators,
+        "reason": signal.reason,
+        "suggested_stop_loss": _optional_decimal(signal.suggested_stop_loss),
+        "suggested_take_profit": _optional_decimal(signal.suggested_take_profit),
+        "suggested_position_size": _optional_decimal(signal.suggested_position_size),
+    }
+
+
+def _signal_from_message(data: Dict[str, Any]) -> TradingSignal:
+    def optional(key: str) -> Optional[Decimal]:
+        return Decimal(data[key]) if data.get(key) is not None else None
+
+    return TradingSignal(
+        strategy_name=data["strategy_name"],
+        symbol=data["symbol"],
+        signal_type=SignalType(data["signal_type"]),
+        strength=SignalStrength(data["strength"]),
+        confidence=data["confidence"],
+        price=Decimal(data["price"]),
+        timestamp=datetime.fromisoformat(data["timestamp"]),
+        indicators=data.get("indicators", {}),
+        reason=data.get("reason", ""),
+        suggested_stop_loss=optional("suggested_stop_loss"),
+        suggested_take_profit=optional("suggested_take_profit"),
+        suggested_position_size=optional("suggested_position_size"),
+    )
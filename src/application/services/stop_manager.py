@@ -0,0 +1,341 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from dataclasses import dataclass, asdict
+from decimal import Decimal
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Union
+
+from ...config.settings import RiskManagementConfig, StopManagementConfig
+from ...domain.models import Position, TradeType
+from ...infrastructure.external.bybit.bybit_client import BybitClient
+from ...infrastructure.external.bybit.instrument_registry import InstrumentRegistry
+
+
+logger = logging.getLogger(__name__)
+
+
+Price = Union[Decimal, float]
+
+
+@dataclass
+class StopExit:
+    """Spuštěný stop - pozici je potřeba uzavřít"""
+    key: str
+    symbol: str
+    side: TradeType
+    # stop | trailing | break_even | time
+    reason: str
+    stop_price: Decimal
+    price: Decimal
+
+
+@dataclass
+class StopManagerStats:
+    """Čítače stop manageru"""
+    ticks: int = 0
+    positions: int = 0
+    stop_moves: int = 0
+    exits: int = 0
+    amend_batches: int = 0
+    amends_sent: int = 0
+    amend_errors: int = 0
+    pending_amends: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class _ManagedStop:
+    """Stop jedné pozice
+
+    Ceny jsou floaty v prostoru `směr * cena` (long +1, short -1) - pro obě
+    strany pak platí totéž: stop se spustí, když cena klesne na stop,
+    a posouvá se jen nahoru.
+    """
+
+    __slots__ = (
+        "key", "symbol", "side", "direction", "stop", "reason", "trail", "step",
+        "break_even_at", "break_even_stop", "deadline", "version"
+    )
+
+    def __init__(self, key: str, symbol: str, side: TradeType):
+        self.key = key
+        self.symbol = symbol
+        self.side = side
+        self.direction = 1 if side == TradeType.BUY else -1
+        self.stop = 0.0
+        self.reason = "stop"
+        # Trailing vzdálenost a minimální posun stopu (0 = bez trailingu)
+        self.trail = 0.0
+        self.step = 0.0
+        # Cena, od které se stop posune na break-even (None = už posunut / vypnuto)
+        self.break_even_at: Optional[float] = None
+        self.break_even_stop = 0.0
+        self.deadline: Optional[float] = None
+        self.version = 0
+
+    @property
+    def activation(self) -> Optional[float]:
+        """Nejbližší cena, při které se má stop posunout"""
+        levels = []
+        if self.trail:
+            levels.append(self.stop + self.trail + self.step)
+        if self.break_even_at is not None:
+            levels.append(self.break_even_at)
+        return min(levels) if levels else None
+
+
+class _SymbolTriggers:
+    """Cenové spouště symbolu po směrech: haldy stopů a posunů"""
+
+    __slots__ = ("stops", "activations", "live")
+
+    def __init__(self):
+        # Max-halda stopů (klíč -stop) a min-halda aktivačních cen
+        self.stops = {1: [], -1: []}
+        self.activations = {1: [], -1: []}
+        self.live = 0
+
+
+class StopManager:
+    """Lokální stopy řízené tiky - trailing, break-even a časový stop
+
+    Každá cena ze streamu (`on_price`) projde jen spouště, které cena
+    překročila. Stopy i ceny, při kterých se má stop posunout, jsou v haldách
+    po symbolech a směrech, takže tik bez akce je O(1) bez ohledu na počet
+    pozic. Zastaralé položky (posunutý nebo odebraný stop) se přeskočí
+    podle verze. Časové stopy jsou v jedné haldě podle termínu.
+
+    - trailing: stop `trailing_pct` % od nejlepší ceny, posun nejméně o
+      `trail_step_pct` %
+    - break-even: po pohybu o `break_even_trigger_pct` % jde stop na vstup
+      + `break_even_offset_pct` %
+    - časový stop: pozice starší než `time_stop_minutes` se uzavře
+
+    Posunuté stopy se na burzu posílají po dávkách (`flush_amends`) - za
+    symbol jen poslední hodnota, zaokrouhlená na tick kontraktu
+    (`instruments`). Spuštěné stopy vrací `on_price` a předá je
+    `on_exit`.
+    """
+
+    def __init__(
+        self,
+        bybit_client: BybitClient,
+        config: StopManagementConfig,
+        limits: RiskManagementConfig,
+        on_exit: Optional[Callable[[StopExit], Awaitable[None]]] = None,
+        instruments: Optional[InstrumentRegistry] = None
+    ):
+        self.bybit_client = bybit_client
+        self.config = config
+        self.limits = limits
+        self.on_exit = on_exit
+        self.instruments = instruments
+        self._stops: Dict[str, _ManagedStop] = {}
+        self._triggers: Dict[str, _SymbolTriggers] = {}
+        # (termín, pořadí, stop)
+        self._deadlines: List[tuple] = []
+        self._sequence = itertools.count()
+        # symbol -> stop k odeslání na burzu
+        self._amends: Dict[str, Decimal] = {}
+        self._stats = StopManagerStats()
+
+    def track(
+        self,
+        symbol: str,
+        side: TradeType,
+        entry_price: Price,
+        stop_price: Optional[Price] = None,
+        opened_at: Optional[float] = None,
+        key: Optional[str] = None
+    ) -> None:
+        """Začne řídit stop pozice (bez `stop_price` podle `stop_loss_percentage`)"""
+        key = key or symbol
+        self.remove(key)
+        stop = _ManagedStop(key, symbol, side)
+        d = stop.direction
+        entry = float(entry_price)
+        if stop_price is None:
+            stop_price = entry * (1 - d * self.limits.stop_loss_percentage / 100)
+        stop.stop = float(stop_price) * d
+        stop.trail = entry * self.config.trailing_pct / 100
+        stop.step = entry * self.config.trail_step_pct / 100
+        if self.config.break_even_trigger_pct > 0:
+            stop.break_even_at = entry * d + entry * self.config.break_even_trigger_pct / 100
+            stop.break_even_stop = entry * d + entry * self.config.break_even_offset_pct / 100
+        if self.config.time_stop_minutes > 0:
+            stop.deadline = (opened_at or time.time()) + self.config.time_stop_minutes * 60
+            heapq.heappush(self._deadlines, (stop.deadline, next(self._sequence), stop))
+
+        self._stops[key] = stop
+        triggers = self._triggers.get(symbol)
+        if triggers is None:
+            triggers = self._triggers[symbol] = _SymbolTriggers()
+        triggers.live += 1
+        self._push(stop, triggers)
+
+    def remove(self, key: str) -> bool:
+        """Přestane řídit stop (položky v haldách se zahodí líně)"""
+        stop = self._stops.pop(key, None)
+        if stop is None:
+            return False
+        self._triggers[stop.symbol].live -= 1
+        return True
+
+    def sync(self, positions: Iterable[Position]) -> None:
+        """Srovná řízené stopy s otevřenými pozicemi (klíč = symbol)"""
+        current = {}
+        for position in positions:
+            current[position.symbol] = position
+            tracked = self._stops.get(position.symbol)
+            if tracked is None or tracked.side != position.side:
+                self.track(
+                    position.symbol, position.side, position.entry_price,
+                    opened_at=position.created_at.timestamp()
+                )
+        for key in [key for key in self._stops if key not in current]:
+            self.remove(key)
+
+    def stop_price(self, key: str) -> Optional[Decimal]:
+        stop = self._stops.get(key)
+        return _decimal(stop.stop * stop.direction) if stop else None
+
+    def on_price(self, symbol: str, price: Price, timestamp: Optional[float] = None) -> List[StopExit]:
+        """Nová cena symbolu - posune a spustí stopy, vrátí spuštěné"""
+        self._stats.ticks += 1
+        exits = []
+        triggers = self._triggers.get(symbol)
+        if triggers is not None and triggers.live:
+            p = float(price)
+            for d in (1, -1):
+                x = p * d
+                activations = triggers.activations[d]
+                while activations and activations[0][0] <= x:
+                    _, _, version, stop = heapq.heappop(activations)
+                    if stop.version == version and self._stops.get(stop.key) is stop:
+                        self._advance(stop, x, triggers)
+                stops = triggers.stops[d]
+                while stops and -stops[0][0] >= x:
+                    _, _, version, stop = heapq.heappop(stops)
+                    if stop.version == version and self._stops.get(stop.key) is stop:
+                        exits.append(self._exit(stop, stop.reason, p))
+        if self._deadlines and self._deadlines[0][0] <= (timestamp or time.time()):
+            exits.extend(self.check_time(timestamp, prices={symbol: price}))
+        if exits:
+            self._dispatch(exits)
+        return exits
+
+    def check_time(self, now: Optional[float] = None, prices: Optional[Dict[str, Price]] = None) -> List[StopExit]:
+        """Spustí časové stopy s prošlým termínem"""
+        now = now or time.time()
+        exits = []
+        while self._deadlines and self._deadlines[0][0] <= now:
+            _, _, stop = heapq.heappop(self._deadlines)
+            if self._stops.get(stop.key) is stop:
+                price = (prices or {}).get(stop.symbol, 0)
+                exits.append(self._exit(stop, "time", float(price)))
+        return exits
+
+    async def flush_amends(self) -> int:
+        """Pošle posunuté stopy na burzu jednou dávkou (počet úspěšných)"""
+        if not self._amends:
+            return 0
+        amends, self._amends = self._amends, {}
+        symbols = list(amends)
+        results = await asyncio.gather(
+            *(self.bybit_client.set_trading_stop(symbol, stop_loss=self._stop_loss(symbol, amends[symbol]))
+              for symbol in symbols),
+            return_exceptions=True
+        )
+        self._stats.amend_batches += 1
+        sent = 0
+        for symbol, result in zip(symbols, results):
+            if result is True:
+                sent += 1
+            else:
+                self._stats.amend_errors += 1
+                # Znovu příště, pokud ho mezitím nepřepsal novější posun
+                self._amends.setdefault(symbol, amends[symbol])
+        self._stats.amends_sent += sent
+        return sent
+
+    async def run(self, interval: float) -> None:
+        """Každých `interval` sekund časové stopy a dávka posunů (do zrušení tasku)"""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                exits = self.check_time()
+                if exits:
+                    self._dispatch(exits)
+                await self.flush_amends()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Chyba stop manageru: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        self._stats.positions = len(self._stops)
+        self._stats.pending_amends = len(self._amends)
+        return self._stats.to_dict()
+
+    def _advance(self, stop: _ManagedStop, x: float, triggers: _SymbolTriggers) -> None:
+        """Cena překročila aktivační úroveň - posune stop (trailing, break-even)"""
+        new, reason = stop.stop, stop.reason
+        if stop.trail and x - stop.trail > new:
+            new, reason = x - stop.trail, "trailing"
+        if stop.break_even_at is not None and x >= stop.break_even_at:
+            stop.break_even_at = None
+            if stop.break_even_stop > new:
+                new, reason = stop.break_even_stop, "break_even"
+        if new > stop.stop:
+            stop.stop, stop.reason = new, reason
+            self._stats.stop_moves += 1
+            self._amends[stop.symbol] = _decimal(new * stop.direction)
+        self._push(stop, triggers)
+
+    def _push(self, stop: _ManagedStop, triggers: _SymbolTriggers) -> None:
+        """Nová verze stopu do hald (staré položky zneplatní)"""
+        stop.version += 1
+        d = stop.direction
+        if len(triggers.stops[d]) > 2 * triggers.live + 32:
+            self._compact(triggers)
+        heapq.heappush(triggers.stops[d], (-stop.stop, next(self._sequence), stop.version, stop))
+        activation = stop.activation
+        if activation is not None:
+            heapq.heappush(triggers.activations[d], (activation, next(self._sequence), stop.version, stop))
+
+    def _compact(self, triggers: _SymbolTriggers) -> None:
+        """Zahodí zastaralé položky hald symbolu"""
+        for heaps in (triggers.stops, triggers.activations):
+            for d, heap in heaps.items():
+                heaps[d] = [
+                    entry for entry in heap
+                    if entry[3].version == entry[2] and self._stops.get(entry[3].key) is entry[3]
+                ]
+                heapq.heapify(heaps[d])
+
+    def _exit(self, stop: _ManagedStop, reason: str, price: float) -> StopExit:
+        self.remove(stop.key)
+        self._amends.pop(stop.symbol, None)
+        self._stats.exits += 1
+        triggered = StopExit(
+            key=stop.key, symbol=stop.symbol, side=stop.side, reason=reason,
+            stop_price=_decimal(stop.stop * stop.direction), price=_decimal(price)
+        )
+        logger.info(f"Stop {reason} {stop.symbol} spuštěn na {triggered.price} (stop {triggered.stop_price})")
+        return triggered
+
+    def _stop_loss(self, symbol: str, price: Decimal) -> Decimal:
+        return self.instruments.round_price(symbol, price) if self.instruments else price
+
+    def _dispatch(self, exits: List[StopExit]) -> None:
+        if self.on_exit is None:
+            return
+        for triggered in exits:
+            asyncio.get_running_loop().create_task(self.on_exit(triggered))
+
+
+def _decimal(value: float) -> Decimal:
+    return Decimal(str(round(value, 8)))
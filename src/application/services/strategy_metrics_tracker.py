@@ -0,0 +1,73 @@
+import logging
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from ...domain.models import StrategyMetrics, Trade
+from ...domain.repositories import IStrategyMetricsRepository
+from ...infrastructure.persistence.database.unit_of_work import current_unit
+
+
+logger = logging.getLogger(__name__)
+
+
+class StrategyMetricsTracker:
+    """Živé metriky strategií aktualizované po každém uzavřeném obchodu
+
+    Stav akumulátorů se ukládá do repository, po restartu se jen načte
+    a historie obchodů se znovu nepřehrává.
+    """
+
+    def __init__(self, repository: IStrategyMetricsRepository):
+        self.repository = repository
+        self._metrics: Dict[str, StrategyMetrics] = {}
+
+    async def load(self) -> None:
+        """Načte uložený stav všech strategií"""
+        self._metrics = {m.strategy_name: m for m in await self.repository.get_all_metrics()}
+        logger.info(f"Načteny metriky {len(self._metrics)} strategií")
+
+    async def record(self, trade: Trade) -> Optional[StrategyMetrics]:
+        """Započítá uzavřený obchod (obchody bez PnL se přeskočí)
+
+        Uvnitř jednotky práce se obchod započte až po jejím commitu, vrácené
+        uzavření se tak do metrik nedostane (vrátí None).
+        """
+        if trade.pnl is None:
+            return None
+
+        unit = current_unit()
+        if unit is not None:
+            unit.after_commit(lambda: self._record(trade))
+            return None
+        return await self._record(trade)
+
+    async def _record(self, trade: Trade) -> StrategyMetrics:
+        name = trade.strategy_name or ""
+        metrics = self._metrics.get(name)
+        if metrics is None:
+            metrics = StrategyMetrics(strategy_name=name, created_at=datetime.now())
+            self._metrics[name] = metrics
+
+        metrics.record_trade(trade.pnl)
+        await self.repository.save_metrics(metrics)
+        return metrics
+
+    def get(self, strategy_name: str) -> Optional[StrategyMetrics]:
+        return self._metrics.get(strategy_name)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Aktuální čítače pro status a dashboardy"""
+        return {
+            name: {
+                "total_trades": m.total_trades,
+                "win_rate": m.win_rate,
+                "total_pnl": float(m.total_pnl),
+                "avg_win": float(m.avg_win),
+                "avg_loss": float(m.avg_loss),
+                "profit_factor": m.profit_factor,
+                "max_drawdown": float(m.max_drawdown),
+                "sharpe_ratio": m.sharpe_ratio,
+                "updated_at": m.updated_at
+            }
+            for name, m in sorted(self._metrics.items())
+        }
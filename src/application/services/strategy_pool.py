@@ -0,0 +1,168 @@
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, asdict
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ...config.settings import StrategyConfig
+from ...domain.models import Candle, CandleArray, TradingSignal
+from ...strategies.base_strategy import BaseStrategy
+from ...strategies.registry import create_strategy
+
+
+logger = logging.getLogger(__name__)
+
+
+# Řádky slotu: timestamp (epoch ms), open, high, low, close, volume
+_ROWS = 6
+
+
+@dataclass
+class StrategyPoolStats:
+    """Čítače procesního poolu strategií"""
+    workers: int = 0
+    slots: int = 0
+    tasks: int = 0
+    signals: int = 0
+    errors: int = 0
+    # Kolikrát analýza čekala na volný slot sdílené paměti
+    slot_waits: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class StrategyPool:
+    """Strategie v pracovních procesech - výpočet neblokuje event loop
+
+    Svíčky symbolu jdou do workeru jako sloupcové pole (`CandleArray`) ve
+    slotu sdílené paměti, bez picklování seznamu `Candle`. Slotů je dvakrát
+    víc než workerů a každý patří jedné analýze od zápisu do vrácení
+    signálů, takže se data nepřepíšou pod rukama. Worker si strategie
+    vytvoří jednou při startu a zpět posílá jen signály.
+
+    Delší řady než `max_candles` se zkrátí na posledních `max_candles` svíček.
+    """
+
+    def __init__(self, strategies: Dict[str, StrategyConfig], workers: int, max_candles: int = 1000):
+        self.strategies = {name: config for name, config in strategies.items() if config.enabled}
+        self.workers = workers
+        self.max_candles = max_candles
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._slots: List[SharedMemory] = []
+        self._free: Optional[asyncio.Queue] = None
+        self._stats = StrategyPoolStats(workers=workers)
+
+    def start(self) -> None:
+        """Spustí worker procesy a alokuje sloty sdílené paměti"""
+        if self._executor is not None:
+            return
+        # spawn: potomek nezdědí vlákna a zámky běžícího event loopu
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker, initargs=(self.strategies,)
+        )
+        size = _ROWS * self.max_candles * np.dtype(np.float64).itemsize
+        self._slots = [SharedMemory(create=True, size=size) for _ in range(2 * self.workers)]
+        self._free = asyncio.Queue()
+        for index in range(len(self._slots)):
+            self._free.put_nowait(index)
+        self._stats.slots = len(self._slots)
+        logger.info(f"Pool strategií: {self.workers} procesů, {len(self._slots)} slotů sdílené paměti")
+
+    async def analyze(self, symbol: str, candles: List[Candle]) -> List[TradingSignal]:
+        """Spustí všechny strategie nad svíčkami symbolu v některém workeru"""
+        self.start()
+        if self._free.empty():
+            self._stats.slot_waits += 1
+        slot = await self._free.get()
+        try:
+            # Převod až s volným slotem - jinak by se převody všech čekajících symbolů sešly v loopu najednou
+            array = CandleArray.from_candles(candles[-self.max_candles:])
+            _write_slot(self._slots[slot], array, self.max_candles)
+            signals, errors = await asyncio.get_running_loop().run_in_executor(
+                self._executor, _analyze_slot, self._slots[slot].name, len(array), symbol, self.max_candles
+            )
+        finally:
+            self._free.put_nowait(slot)
+
+        self._stats.tasks += 1
+        self._stats.signals += len(signals)
+        self._stats.errors += len(errors)
+        for name, error in errors:
+            logger.error(f"Chyba ve strategii {name}: {error}")
+        return signals
+
+    def stats(self) -> Dict[str, Any]:
+        return self._stats.to_dict()
+
+    async def close(self) -> None:
+        """Ukončí worker procesy a uvolní sdílenou paměť"""
+        if self._executor is None:
+            return
+        executor, self._executor = self._executor, None
+        await asyncio.get_running_loop().run_in_executor(None, executor.shutdown)
+        for memory in self._slots:
+            memory.close()
+            memory.unlink()
+        self._slots = []
+
+
+def _slot_view(memory: SharedMemory, capacity: int) -> np.ndarray:
+    return np.ndarray((_ROWS, capacity), dtype=np.float64, buffer=memory.buf)
+
+
+def _write_slot(memory: SharedMemory, array: CandleArray, capacity: int) -> None:
+    """Zkopíruje sloupce svíček do slotu (časy v ms jsou ve float64 přesné)"""
+    n = len(array)
+    view = _slot_view(memory, capacity)
+    view[0, :n] = array.timestamp
+    view[1, :n] = array.open
+    view[2, :n] = array.high
+    view[3, :n] = array.low
+    view[4, :n] = array.close
+    view[5, :n] = array.volume
+
+
+# Stav worker procesu
+_worker_strategies: List[BaseStrategy] = []
+_worker_memory: Dict[str, SharedMemory] = {}
+_worker_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _init_worker(strategies: Dict[str, StrategyConfig]) -> None:
+    """Inicializace worker procesu - strategie a event loop jednou na proces"""
+    global _worker_loop
+    for name, config in strategies.items():
+        strategy = create_strategy(name, config)
+        if strategy is not None:
+            _worker_strategies.append(strategy)
+    _worker_loop = asyncio.new_event_loop()
+
+
+def _analyze_slot(name: str, length: int, symbol: str, capacity: int) -> Tuple[List[TradingSignal], List[tuple]]:
+    """Vstupní bod workeru - signály a chyby (strategie, text) pro svíčky ve slotu"""
+    memory = _worker_memory.get(name)
+    if memory is None:
+        memory = _worker_memory[name] = SharedMemory(name=name)
+    view = _slot_view(memory, capacity)
+    # to_candles() data ze sdílené paměti zkopíruje, slot se pak může znovu použít
+    candles = CandleArray(
+        symbol, view[0, :length].astype(np.int64), view[1, :length], view[2, :length],
+        view[3, :length], view[4, :length], view[5, :length]
+    ).to_candles()
+    del view
+
+    signals, errors = [], []
+    for strategy in _worker_strategies:
+        try:
+            signal = _worker_loop.run_until_complete(strategy.analyze(candles, symbol))
+            if signal:
+                signals.append(signal)
+        except Exception as e:
+            errors.append((strategy.name, str(e)))
+    return signals, errors
@@ -0,0 +1,98 @@
+from contextlib import aclosing
+from datetime import date, datetime, timedelta
+from typing import Any, AsyncIterator, Dict, List, Tuple
+
+from ...domain.repositories import ITradeRepository
+
+
+async def iter_trade_rows(
+    trade_repository: ITradeRepository,
+    start_date: datetime,
+    end_date: datetime,
+    page_size: int = 500
+) -> AsyncIterator[Dict[str, Any]]:
+    """Historie obchodů jako kompaktní řádky (od nejnovějšího)
+
+    Obchody se čtou po stránkách a řádky se předávají hned dál - volající
+    nikdy nedrží celou historii, jen tři sloupce právě zpracovaného obchodu.
+    """
+    async with aclosing(trade_repository.iter_trades_by_date_range(start_date, end_date, page_size)) as trades:
+        async for trade in trades:
+            yield {
+                "timestamp": trade.created_at,
+                "symbol": trade.symbol,
+                "pnl": float(trade.pnl or 0)
+            }
+
+
+async def load_recent_trade_rows(
+    trade_repository: ITradeRepository,
+    start_date: datetime,
+    end_date: datetime,
+    limit: int = 20
+) -> List[Dict[str, Any]]:
+    """Posledních `limit` obchodů období pro tabulku (čte jen první stránku)"""
+    rows = []
+    async with aclosing(iter_trade_rows(trade_repository, start_date, end_date, page_size=limit)) as stream:
+        async for row in stream:
+            rows.append(row)
+            if len(rows) >= limit:
+                break
+    return rows
+
+
+async def load_pnl_timeline(
+    trade_repository: ITradeRepository,
+    start_date: datetime,
+    end_date: datetime,
+    bucket: timedelta = timedelta(hours=1),
+    page_size: int = 500
+) -> List[Dict[str, Any]]:
+    """PnL po časových oknech `bucket` a symbolech pro grafy v čase
+
+    Agreguje se průběžně po stránkách, počet řádků odpovídá počtu oken
+    se symboly, ne počtu obchodů. Řádky jsou seřazené od nejstaršího.
+    """
+    width = bucket.total_seconds()
+    groups: Dict[Tuple[datetime, str], List[float]] = {}
+    async for row in iter_trade_rows(trade_repository, start_date, end_date, page_size):
+        offset = (row["timestamp"] - start_date).total_seconds() // width
+        key = (start_date + timedelta(seconds=offset * width), row["symbol"])
+        group = groups.setdefault(key, [0.0, 0])
+        group[0] += row["pnl"]
+        group[1] += 1
+
+    return [
+        {"timestamp": timestamp, "symbol": symbol, "pnl": pnl, "trades": trades}
+        for (timestamp, symbol), (pnl, trades) in sorted(groups.items())
+    ]
+
+
+async def load_pnl_rows(
+    trade_repository: ITradeRepository,
+    start_day: date,
+    end_day: date,
+    group_by: str = "symbol"
+) -> List[Dict[str, Any]]:
+    """Agregované PnL pro grafy (`group_by` je "symbol", "strategy" nebo "day")
+
+    Čte souhrn z repository, počet řádků odpovídá počtu skupin, ne obchodů.
+    """
+    if group_by == "symbol":
+        groups = await trade_repository.get_pnl_by_symbol(start_day, end_day)
+    elif group_by == "strategy":
+        groups = await trade_repository.get_pnl_by_strategy(start_day, end_day)
+    elif group_by == "day":
+        groups = await trade_repository.get_daily_pnl(start_day, end_day)
+    else:
+        raise ValueError(f"Nepodporované seskupení PnL: {group_by}")
+
+    return [
+        {
+            group_by: key,
+            "pnl": float(summary.total_pnl),
+            "trades": summary.trades,
+            "win_rate": summary.win_rate
+        }
+        for key, summary in groups.items()
+    ]
@@ -1,24 +1,49 @@
 import asyncio
 import logging
-from typing import List, Dict, Optional
+import time
+from dataclasses import dataclass
+from typing import List, Dict, Optional, Tuple
 from datetime import datetime, timedelta
 from decimal import Decimal
 
-from ...domain.models import TradingSignal, SignalType, Trade
-from ...domain.repositories import ITradeRepository, IPositionRepository, IMarketDataRepository
+from ...domain.models import Candle, OrderState, Position, TradeType, TradingSignal, SignalType
+from ...domain.repositories import (
+    ITradeRepository, IPositionRepository, IMarketDataRepository, IUnitOfWork, NullUnitOfWork
+)
 from ...domain.services.trading_engine import ITradingEngine
 from ...infrastructure.external.bybit.bybit_client import BybitClient
+from ...infrastructure.external.paper.paper_client import PaperBybitClient
+from ...infrastructure.persistence.lake.candle_lake import CandleLake
+from .execution_scheduler import ExecutionScheduler
+from .order_pipeline import OrderPipeline
+from .portfolio_sizer import PortfolioSizer, SizingRequest
+from .risk_engine import RiskEngine
+from .shard_coordinator import ShardCoordinator
+from .stop_manager import StopExit, StopManager
+from .strategy_pool import StrategyPool
+from .strategy_metrics_tracker import StrategyMetricsTracker
+from ...infrastructure.external.bybit.instrument_registry import InstrumentRegistry
+from ...infrastructure.persistence.database.position_book import PositionBook
+from ...infrastructure.persistence.database.write_behind_market_data_repository import (
+    WriteBehindMarketDataRepository
+)
 from ...strategies.base_strategy import BaseStrategy
-from ...strategies.trend_following_strategy import TrendFollowingStrategy
-from ...strategies.rsi_macd_strategy import RsiMacdStrategy
-from ...strategies.breakout_strategy import BreakoutStrategy
-from ...strategies.volume_strategy import VolumeStrategy
+from ...strategies.registry import create_strategy
 from ...config.settings import Settings
 
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class SymbolAnalysis:
+    """Signály jednoho symbolu z analytické fáze cyklu"""
+    symbol: str
+    signals: List[TradingSignal]
+    # time.perf_counter() po doběhnutí strategií (latence signál -> odeslání)
+    signal_at: float
+
+
 class TradingOrchestrator:
     """Hlavní orchestrator pro řízení obchodování"""
     
@@ -29,7 +54,17 @@ class TradingOrchestrator:
         trading_engine: ITradingEngine,
         trade_repository: ITradeRepository,
         position_repository: IPositionRepository,
-        market_data_repository: IMarketDataRepository
+        market_data_repository: IMarketDataRepository,
+        candle_lake: Optional[CandleLake] = None,
+        metrics_tracker: Optional[StrategyMetricsTracker] = None,
+        unit_of_work: Optional[IUnitOfWork] = None,
+        order_pipeline: Optional[OrderPipeline] = None,
+        risk_engine: Optional[RiskEngine] = None,
+        portfolio_sizer: Optional[PortfolioSizer] = None,
+        stop_manager: Optional[StopManager] = None,
+        instruments: Optional[InstrumentRegistry] = None,
+        strategy_pool: Optional[StrategyPool] = None,
+        shard_coordinator: Optional[ShardCoordinator] = None
     ):
         self.settings = settings
         self.bybit_client = bybit_client
@@ -37,14 +72,54 @@ class TradingOrchestrator:
         self.trade_repository = trade_repository
         self.position_repository = position_repository
         self.market_data_repository = market_data_repository
+        self.candle_lake = candle_lake
+        self.metrics_tracker = metrics_tracker
+        # Zápisy jednoho obchodního rozhodnutí v jedné transakci
+        self.unit_of_work = unit_of_work or NullUnitOfWork()
+        # Předobchodní kontrola limitů nad čítači v paměti
+        self.risk_engine = risk_engine or RiskEngine(settings.trading.risk_management)
+        # Tick, krok lotu a limity kontraktů (načte a obnovuje main)
+        self.instruments = instruments or InstrumentRegistry(bybit_client)
+        # Objednávka jde na burzu první, obchod se zapíše na pozadí
+        self.order_pipeline = order_pipeline or OrderPipeline(
+            bybit_client, trading_engine, trade_repository, self.unit_of_work, self.risk_engine,
+            ExecutionScheduler(bybit_client, settings.trading.execution, instruments=self.instruments),
+            self.instruments
+        )
+        # Velikosti BUY objednávek se počítají společně za celý cyklus
+        self.portfolio_sizer = portfolio_sizer or PortfolioSizer(settings.trading.risk_management)
+        # Trailing, break-even a časové stopy z tiků streamu (None = vypnuto)
+        if stop_manager is None and settings.trading.stops.enabled:
+            stop_manager = StopManager(
+                bybit_client, settings.trading.stops, settings.trading.risk_management,
+                instruments=self.instruments
+            )
+        self.stop_manager = stop_manager
+        if self.stop_manager:
+            self.stop_manager.on_exit = self._on_stop_exit
         
         # Inicializace strategií
         self.strategies: List[BaseStrategy] = []
         self._init_strategies()
+        # Výpočet strategií v pracovních procesech (None = v event loopu)
+        if strategy_pool is None and settings.trading.strategy_workers > 0:
+            strategy_pool = StrategyPool(settings.strategies, settings.trading.strategy_workers)
+        self.strategy_pool = strategy_pool
+        # Režim koordinátor/workery: analýzy dělají worker procesy (spouští je main)
+        if shard_coordinator is None and settings.trading.sharding.enabled:
+            shard_coordinator = ShardCoordinator(settings)
+        self.shard_coordinator = shard_coordinator
+        if self.shard_coordinator:
+            self.shard_coordinator.on_price = self.on_market_price
+            self.shard_coordinator.on_candles = self._on_shard_candles
         
         # Kontrolní proměnné
         self.is_running = False
         self.last_analysis_time: Dict[str, datetime] = {}
+        # Zůstatek z začátku cyklu - dotaz na burzu není na cestě k objednávce
+        self.account_balance: Optional[Decimal] = None
+        # BUY rozhodnutí cyklu čekající na společné určení velikosti
+        self._buy_requests: List[SizingRequest] = []
     
     def _init_strategies(self):
         """Inicializuje obchodní strategie"""
@@ -53,15 +128,8 @@ class TradingOrchestrator:
                 continue
                 
             try:
-                if name == "trend_following":
-                    strategy = TrendFollowingStrategy(config)
-                elif name == "rsi_macd":
-                    strategy = RsiMacdStrategy(config)
-                elif name == "breakout":
-                    strategy = BreakoutStrategy(config)
-                elif name == "volume":
-                    strategy = VolumeStrategy(config)
-                else:
+                strategy = create_strategy(name, config)
+                if strategy is None:
                     logger.warning(f"Neznámá strategie: {name}")
                     continue
                 
@@ -71,6 +139,12 @@ class TradingOrchestrator:
             except Exception as e:
                 logger.error(f"Chyba při inicializaci strategie {name}: {e}")
     
+    async def load_risk_state(self):
+        """Naplní risk engine otevřenými pozicemi a realizovaným PnL dne"""
+        today = datetime.now().date()
+        daily = await self.trade_repository.get_pnl_summary(today, today)
+        self.risk_engine.load(await self.position_repository.get_all_positions(), daily.total_pnl)
+    
     async def start(self):
         """Spustí trading orchestrator"""
         logger.info("Spouštím Trading Orchestrator...")
@@ -89,111 +163,226 @@ class TradingOrchestrator:
         """Zastaví trading orchestrator"""
         logger.info("Zastavuji Trading Orchestrator...")
         self.is_running = False
+        if self.strategy_pool:
+            await self.strategy_pool.close()
+        if self.shard_coordinator:
+            await self.shard_coordinator.close()
     
     async def _run_trading_cycle(self):
         """Spustí jeden cyklus analýzy a obchodování"""
         logger.info("Spouštím trading cyklus...")
         
         try:
-            # Projdi všechny symboly
-            for symbol in self.settings.trading.default_symbols:
-                await self._analyze_symbol(symbol)
+            self.account_balance = await self.bybit_client.get_account_balance()
+            self._buy_requests = []
+            
+            # Fáze 1: analýza všech symbolů souběžně, zatím bez obchodních rozhodnutí
+            if self.shard_coordinator:
+                analyses = self._shard_analyses()
+            else:
+                analyses = await self._analyze_symbols(self.settings.trading.default_symbols)
+            
+            # Fáze 2: jedno rozhodnutí nad signály všech symbolů a jedna dávka objednávek
+            # Pozice jednou za cyklus - pro stopy i rozhodovací fázi
+            positions = {p.symbol: p for p in await self.position_repository.get_all_positions()}
+            if self.stop_manager:
+                self.stop_manager.sync(positions.values())
+            
+            if analyses:
+                await self._decide(analyses, positions)
+            
+            # Zkontroluj risk management (každý cyklus, i bez signálů)
+            await self._check_risk_management()
                 
         except Exception as e:
             logger.error(f"Chyba v trading cyklu: {e}")
     
-    async def _analyze_symbol(self, symbol: str):
+    async def _analyze_symbols(self, symbols: List[str]) -> List[SymbolAnalysis]:
+        """Analytická fáze - symboly souběžně, nejvýš `analysis_concurrency` najednou"""
+        semaphore = asyncio.Semaphore(max(self.settings.trading.analysis_concurrency, 1))
+        
+        async def analyze(symbol: str) -> Optional[SymbolAnalysis]:
+            async with semaphore:
+                return await self._analyze_symbol(symbol)
+        
+        # Symbol uvedený v konfiguraci vícekrát se analyzuje jednou
+        results = await asyncio.gather(*(analyze(symbol) for symbol in dict.fromkeys(symbols)))
+        return [analysis for analysis in results if analysis]
+    
+    async def _analyze_symbol(self, symbol: str) -> Optional[SymbolAnalysis]:
         """Analyzuje jeden symbol všemi strategiemi"""
         try:
             # Zkontroluj, zda už nebyl symbol nedávno analyzován
             if self._should_skip_analysis(symbol):
-                return
+                return None
             
             logger.info(f"Analyzuji symbol: {symbol}")
             
             # Získej tržní data
             candles = await self.bybit_client.get_klines(
                 symbol=symbol,
-                interval="15",  # 15-minutové svíčky
-                limit=200
+                interval=self.settings.trading.kline_interval,
+                limit=self.settings.trading.kline_limit
             )
             
             if not candles:
                 logger.warning(f"Nepodařilo se získat data pro {symbol}")
-                return
+                return None
+            
+            # Ocenění otevřené pozice pro risk engine
+            self.risk_engine.mark(symbol, candles[-1].close)
             
-            # Uložit data do cache/databáze
-            for candle in candles[-10:]:  # Ulož posledních 10 svíček
-                await self.market_data_repository.save_candle(candle)
+            await self._store_candles(symbol, candles)
             
             # Spusť analýzu všemi strategiemi
-            signals = []
-            for strategy in self.strategies:
-                try:
-                    signal = await strategy.analyze(candles, symbol)
-                    if signal:
-                        signals.append(signal)
-                        logger.info(f"Signál od {strategy.name}: {signal.signal_type.value} pro {symbol}")
-                        
-                except Exception as e:
-                    logger.error(f"Chyba ve strategii {strategy.name}: {e}")
-            
-            # Vyhodnoť signály a rozhodni o obchodu
-            if signals:
-                await self._process_signals(signals, symbol)
+            signals = await self._run_strategies(symbol, candles)
             
             # Aktualizuj čas poslední analýzy
             self.last_analysis_time[symbol] = datetime.now()
             
+            # O obchodu se rozhoduje až v rozhodovací fázi
+            if signals:
+                return SymbolAnalysis(symbol, signals, time.perf_counter())
+            
         except Exception as e:
             logger.error(f"Chyba při analýze symbolu {symbol}: {e}")
+        return None
+    
+    async def _store_candles(self, symbol: str, candles: List[Candle]):
+        """Posledních 10 svíček do databáze, uzavřené do archivu"""
+        # Uložit data do cache/databáze (jednou dávkou)
+        await self.market_data_repository.save_candles(candles[-10:])
+        
+        # Uzavřené svíčky (bez poslední rozpracované) do archivu
+        if self.candle_lake and len(candles) > 1:
+            try:
+                await self.candle_lake.append_async(symbol, candles[0].interval, candles[:-1])
+            except Exception as e:
+                logger.warning(f"Nepodařilo se uložit svíčky {symbol} do archivu: {e}")
+    
+    async def _on_shard_candles(self, symbol: str, candles: List[Candle]):
+        """Svíčky z analýzy shard workeru - uloží se jako při analýze v event loopu"""
+        self.last_analysis_time[symbol] = datetime.now()
+        await self._store_candles(symbol, candles)
+    
+    def _shard_analyses(self) -> List[SymbolAnalysis]:
+        """Signály, které od minulého cyklu poslaly shard workery"""
+        received_at = time.perf_counter()
+        return [
+            SymbolAnalysis(symbol, signals, received_at)
+            for symbol, signals in self.shard_coordinator.drain().items()
+        ]
+    
+    async def _run_strategies(self, symbol: str, candles: List[Candle]) -> List[TradingSignal]:
+        """Signály všech strategií - v poolu procesů, nebo přímo v event loopu"""
+        if self.strategy_pool:
+            signals = await self.strategy_pool.analyze(symbol, candles)
+            for signal in signals:
+                logger.info(f"Signál od {signal.strategy_name}: {signal.signal_type.value} pro {symbol}")
+            return signals
+        
+        signals = []
+        for strategy in self.strategies:
+            try:
+                signal = await strategy.analyze(candles, symbol)
+                if signal:
+                    signals.append(signal)
+                    logger.info(f"Signál od {strategy.name}: {signal.signal_type.value} pro {symbol}")
+                    
+            except Exception as e:
+                logger.error(f"Chyba ve strategii {strategy.name}: {e}")
+        return signals
     
     def _should_skip_analysis(self, symbol: str) -> bool:
         """Zkontroluje, zda přeskočit analýzu symbolu"""
         if symbol not in self.last_analysis_time:
             return False
         
-        # Minimální interval mezi analýzami (5 minut)
-        min_interval = timedelta(minutes=5)
+        # Minimální interval mezi analýzami
+        min_interval = timedelta(seconds=self.settings.trading.min_analysis_interval)
         time_diff = datetime.now() - self.last_analysis_time[symbol]
         
         return time_diff < min_interval
     
-    async def _process_signals(self, signals: List[TradingSignal], symbol: str):
-        """Zpracuje signály a rozhodne o obchodu"""
+    async def _decide(self, analyses: List[SymbolAnalysis], positions: Dict[str, Position]):
+        """Rozhodovací fáze - pozice a denní PnL jednou, pak jedna dávka objednávek
+        
+        Konflikty mezi symboly: symbol s nedokončenou objednávkou čeká, kill switch
+        vyřadí všechna otevření, uzavření proběhnou před otevřeními (uvolní sloty
+        a kapitál) a o slotech a kapitálu pro nové pozice rozhoduje `PortfolioSizer`.
+        """
         try:
-            # Zkontroluj, zda už nemáme pozici pro tento symbol
-            existing_position = await self.position_repository.get_position_by_symbol(symbol)
-            
-            # Kombinuj signály podle váhy strategií
-            buy_strength = 0.0
-            sell_strength = 0.0
+            # Denní PnL z čítačů risk enginu
+            kill_switch = self.risk_engine.check_daily_loss()
             
-            for signal in signals:
-                strategy_weight = self._get_strategy_weight(signal.strategy_name)
-                signal_strength = signal.confidence * strategy_weight
+            closes: List[Tuple[TradingSignal, float]] = []
+            for analysis in analyses:
+                decision = self._decide_symbol(analysis, positions.get(analysis.symbol))
+                if decision is None:
+                    continue
                 
-                if signal.signal_type == SignalType.BUY:
-                    buy_strength += signal_strength
-                elif signal.signal_type == SignalType.SELL:
-                    sell_strength += signal_strength
-            
-            # Rozhodnutí o obchodu
-            min_strength = 0.8  # Minimální síla pro obchod
+                signal, strength = decision
+                if signal.signal_type == SignalType.SELL:
+                    closes.append(decision)
+                elif kill_switch:
+                    logger.warning(f"BUY pro {analysis.symbol} vynechán - kill switch je aktivní")
+                else:
+                    logger.info(f"BUY pro {analysis.symbol} se silou {strength:.2f} čeká na velikost dávky")
+                    self._buy_requests.append(SizingRequest(signal, strength, analysis.signal_at))
             
-            if buy_strength > sell_strength and buy_strength > min_strength:
-                if not existing_position or existing_position.side.value != "buy":
-                    await self._execute_buy_signal(signals, symbol, buy_strength)
-                    
-            elif sell_strength > buy_strength and sell_strength > min_strength:
-                if not existing_position or existing_position.side.value != "sell":
-                    await self._execute_sell_signal(signals, symbol, sell_strength)
+            for signal, strength in closes:
+                await self._execute_sell_signal(signal, strength)
             
-            # Zkontroluj risk management
-            await self._check_risk_management()
+            # BUY signály všech symbolů najednou - velikost a odeslání dávky
+            await self._submit_buy_orders()
             
         except Exception as e:
-            logger.error(f"Chyba při zpracování signálů pro {symbol}: {e}")
+            logger.error(f"Chyba v rozhodovací fázi cyklu: {e}")
+    
+    def _decide_symbol(
+        self, analysis: SymbolAnalysis, existing_position: Optional[Position]
+    ) -> Optional[Tuple[TradingSignal, float]]:
+        """Rozhodne o jednom symbolu - nejsilnější signál vítězné strany a její síla"""
+        symbol = analysis.symbol
+        
+        # Kombinuj signály podle váhy strategií
+        buy_strength = 0.0
+        sell_strength = 0.0
+        
+        for signal in analysis.signals:
+            strategy_weight = self._get_strategy_weight(signal.strategy_name)
+            signal_strength = signal.confidence * strategy_weight
+            
+            if signal.signal_type == SignalType.BUY:
+                buy_strength += signal_strength
+            elif signal.signal_type == SignalType.SELL:
+                sell_strength += signal_strength
+        
+        # Rozhodnutí o obchodu
+        min_strength = 0.8  # Minimální síla pro obchod
+        
+        if self.order_pipeline.has_active_order(symbol):
+            logger.info(f"Objednávka pro {symbol} ještě neskončila, čekám na její stav")
+            return None
+        
+        if buy_strength > sell_strength and buy_strength > min_strength:
+            if not existing_position or existing_position.side.value != "buy":
+                return self._best_signal(analysis.signals, SignalType.BUY), buy_strength
+        
+        elif sell_strength > buy_strength and sell_strength > min_strength:
+            # Short pozice zatím nejsou - SELL jen uzavírá long
+            if existing_position and existing_position.side.value == "buy":
+                return self._best_signal(analysis.signals, SignalType.SELL), sell_strength
+        
+        return None
+    
+    @staticmethod
+    def _best_signal(signals: List[TradingSignal], signal_type: SignalType) -> TradingSignal:
+        """Nejsilnější signál daného typu"""
+        return max(
+            [s for s in signals if s.signal_type == signal_type],
+            key=lambda x: x.confidence
+        )
     
     def _get_strategy_weight(self, strategy_name: str) -> float:
         """Získá váhu strategie"""
@@ -202,66 +391,46 @@ class TradingOrchestrator:
                 return strategy.weight
         return 1.0
     
-    async def _execute_buy_signal(self, signals: List[TradingSignal], symbol: str, strength: float):
-        """Vykoná BUY signál"""
+    async def _submit_buy_orders(self):
+        """Určí velikosti BUY objednávek cyklu společně a odešle je najednou"""
+        requests, self._buy_requests = self._buy_requests, []
+        if not requests:
+            return
+        
         try:
-            # Najdi nejsilnější BUY signál
-            best_signal = max(
-                [s for s in signals if s.signal_type == SignalType.BUY],
-                key=lambda x: x.confidence
-            )
-            
-            logger.info(f"Vykonávám BUY pro {symbol} se silou {strength:.2f}")
-            
-            # Vypočítej velikost pozice
-            account_balance = await self.bybit_client.get_account_balance()
-            position_size = await self.trading_engine.calculate_position_size(
-                best_signal, account_balance, 0.02  # 2% risk
+            account_balance = self.account_balance
+            if account_balance is None:
+                account_balance = await self.bybit_client.get_account_balance()
+            orders = self.portfolio_sizer.allocate(requests, account_balance, self.risk_engine)
+            
+            for sized in orders:
+                sized.signal.suggested_position_size = sized.quantity
+            # Objednávky na burzu hned, obchody (a uzavření protipozic) zapíše žurnál
+            results = await asyncio.gather(
+                *(self.order_pipeline.submit(sized.signal, sized.quantity, sized.signal_at) for sized in orders),
+                return_exceptions=True
             )
             
-            # Omeň velikost pozice podle konfigurace
-            max_position_usd = self.settings.trading.risk_management.max_position_size_usd
-            if position_size * best_signal.price > max_position_usd:
-                position_size = max_position_usd / best_signal.price
-            
-            best_signal.suggested_position_size = position_size
-            
-            # Vykonej obchod
-            trade = await self.trading_engine.execute_trade(best_signal)
-            if trade:
-                logger.info(f"BUY obchod vykonán: {trade.id}")
-                
-                # Pošli objednávku na burzu
-                order_id = await self.bybit_client.place_order(
-                    symbol=symbol,
-                    side="buy",
-                    qty=position_size,
-                    order_type="Market",
-                    stop_loss=best_signal.suggested_stop_loss,
-                    take_profit=best_signal.suggested_take_profit
-                )
-                
-                if order_id:
-                    trade.exchange_order_id = order_id
-                    trade.status = "executed"
-                    await self.trade_repository.update_trade(trade)
+            for sized, order in zip(orders, results):
+                symbol = sized.signal.symbol
+                if isinstance(order, Exception):
+                    logger.error(f"Chyba při odesílání BUY objednávky pro {symbol}: {order}")
+                elif order and order.state == OrderState.REJECTED:
+                    logger.error(f"BUY objednávka pro {symbol} odmítnuta")
+                elif order:
+                    logger.info(f"BUY objednávka odeslána: {order.order_link_id} ({order.exchange_order_id})")
             
         except Exception as e:
-            logger.error(f"Chyba při vykonávání BUY signálu: {e}")
+            logger.error(f"Chyba při vykonávání BUY signálů: {e}")
     
-    async def _execute_sell_signal(self, signals: List[TradingSignal], symbol: str, strength: float):
+    async def _execute_sell_signal(self, best_signal: TradingSignal, strength: float):
         """Vykoná SELL signál"""
+        symbol = best_signal.symbol
         try:
-            # Najdi nejsilnější SELL signál
-            best_signal = max(
-                [s for s in signals if s.signal_type == SignalType.SELL],
-                key=lambda x: x.confidence
-            )
-            
             logger.info(f"Vykonávám SELL pro {symbol} se silou {strength:.2f}")
             
             # Pro SELL nejdříve uzavři existující pozici
-            await self.trading_engine.close_position(symbol)
+            await self._close_position(symbol, best_signal.price)
             
             # Pak případně otevři short pozici (pokud je povoleno)
             # TODO: Implementace short pozic
@@ -269,31 +438,57 @@ class TradingOrchestrator:
         except Exception as e:
             logger.error(f"Chyba při vykonávání SELL signálu: {e}")
     
+    async def _close_position(self, symbol: str, price: Decimal):
+        """Uzavře pozici symbolu v žurnálu a započte ji do risk enginu"""
+        async with self.unit_of_work.begin():
+            close_trade = await self.trading_engine.close_position(symbol, price)
+        
+        # Uzavření bez objednávky na burze - do risk enginu jako plnění
+        if close_trade:
+            self.risk_engine.on_fill(
+                symbol, close_trade.side, close_trade.quantity, close_trade.price, reserved=False
+            )
+            if self.stop_manager:
+                self.stop_manager.remove(symbol)
+        return close_trade
+    
+    def on_market_price(self, symbol: str, price: Decimal, timestamp: Optional[float] = None):
+        """Cena ze streamu - ocenění pro risk engine a kontrola stopů"""
+        self.risk_engine.mark(symbol, price)
+        if self.stop_manager:
+            self.stop_manager.on_price(symbol, price, timestamp)
+    
+    async def _on_stop_exit(self, triggered: StopExit):
+        """Spuštěný stop - reduce-only market objednávka na celou pozici
+        
+        Pozici v žurnálu uzavře a do risk enginu započte až plnění z burzy.
+        Odmítnutou objednávku zkusí stop znovu po `sync` v dalším cyklu.
+        """
+        try:
+            position = await self.position_repository.get_position_by_symbol(triggered.symbol)
+            if position is None:
+                return
+            logger.info(f"Stop ({triggered.reason}) pro {triggered.symbol} na {triggered.price}, uzavírám pozici")
+            side = TradeType.SELL if position.side == TradeType.BUY else TradeType.BUY
+            order = await self.order_pipeline.submit_close(
+                triggered.symbol, side, position.size, triggered.price or position.current_price
+            )
+            if order and order.state == OrderState.REJECTED:
+                logger.error(f"Uzavírací objednávka pro {triggered.symbol} odmítnuta")
+        except Exception as e:
+            logger.error(f"Chyba při uzavírání pozice {triggered.symbol} po stopu: {e}")
+    
     async def _check_risk_management(self):
-        """Zkontroluje risk management pravidla"""
+        """Zkontroluje risk management pravidla (čítače risk enginu, bez dotazů do databáze)"""
         try:
             # Zkontroluj počet otevřených pozic
-            positions = await self.position_repository.get_all_positions()
             max_positions = self.settings.trading.risk_management.max_positions
+            if self.risk_engine.open_positions > max_positions:
+                logger.warning(f"Překročen maximální počet pozic: {self.risk_engine.open_positions}/{max_positions}")
             
-            if len(positions) > max_positions:
-                logger.warning(f"Překročen maximální počet pozic: {len(positions)}/{max_positions}")
-            
-            # Zkontroluj denní ztráty
-            today = datetime.now().date()
-            today_start = datetime.combine(today, datetime.min.time())
-            today_end = datetime.combine(today, datetime.max.time())
-            
-            today_trades = await self.trade_repository.get_trades_by_date_range(
-                today_start, today_end
-            )
-            
-            daily_pnl = sum(trade.pnl for trade in today_trades if trade.pnl)
-            max_daily_loss = self.settings.trading.risk_management.max_daily_loss_usd
-            
-            if daily_pnl < -max_daily_loss:
-                logger.error(f"Překročena maximální denní ztráta: {daily_pnl}")
-                await self.stop()  # Zastaví obchodování
+            # Denní ztráta přes limit zapne kill switch - nové objednávky se zamítají,
+            # uzavírání pozic dál funguje
+            self.risk_engine.check_daily_loss()
             
         except Exception as e:
             logger.error(f"Chyba v risk managementu: {e}")
@@ -304,7 +499,7 @@ class TradingOrchestrator:
             positions = await self.position_repository.get_all_positions()
             open_trades = await self.trade_repository.get_open_trades()
             
-            return {
+            status = {
                 "is_running": self.is_running,
                 "strategies_count": len(self.strategies),
                 "active_strategies": [s.name for s in self.strategies if s.enabled],
@@ -314,6 +509,33 @@ class TradingOrchestrator:
                 "symbols": self.settings.trading.default_symbols
             }
             
+            if isinstance(self.market_data_repository, WriteBehindMarketDataRepository):
+                status["write_behind"] = self.market_data_repository.stats()
+            
+            if isinstance(self.position_repository, PositionBook):
+                status["position_book"] = self.position_repository.stats()
+            
+            status["order_pipeline"] = self.order_pipeline.stats()
+            status["risk"] = self.risk_engine.stats()
+            status["instruments"] = self.instruments.stats()
+            
+            if self.strategy_pool:
+                status["strategy_pool"] = self.strategy_pool.stats()
+            
+            if self.shard_coordinator:
+                status["sharding"] = self.shard_coordinator.stats()
+            
+            if self.stop_manager:
+                status["stops"] = self.stop_manager.stats()
+            
+            if isinstance(self.bybit_client, PaperBybitClient):
+                status["paper_exchange"] = self.bybit_client.exchange.stats()
+            
+            if self.metrics_tracker:
+                status["strategy_metrics"] = self.metrics_tracker.snapshot()
+            
+            return status
+            
         except Exception as e:
             logger.error(f"Chyba při získávání statusu: {e}")
             return {"error": str(e)}
\ No newline at end of file
@@ -0,0 +1,331 @@
+import asyncio
+import itertools
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ...domain.models import Candle, CandleArray, Trade, TradingSignal, StrategyMetrics
+from ...domain.repositories import IMarketDataRepository
+from ...config.settings import Settings, StrategyConfig
+from ...infrastructure.persistence.lake.candle_lake import CandleLake
+from ...strategies.indicator_cache import IndicatorCache
+from ...strategies.registry import create_strategy
+from .backtester import Backtester, MIN_SIGNAL_STRENGTH
+
+
+logger = logging.getLogger(__name__)
+
+ENSEMBLE_NAME = "ensemble"
+
+
+@dataclass
+class WalkForwardConfig:
+    """Konfigurace walk-forward analýzy"""
+    in_sample: timedelta = timedelta(days=30)
+    out_of_sample: timedelta = timedelta(days=7)
+    step: Optional[timedelta] = None  # výchozí = out_of_sample
+    # strategie -> parametr -> kandidátní hodnoty
+    parameter_grid: Dict[str, Dict[str, List[Any]]] = field(default_factory=dict)
+    # strategie -> kandidátní váhy pro kombinovaný (ensemble) signál
+    weight_grid: Dict[str, List[float]] = field(default_factory=dict)
+    min_signal_strength: float = MIN_SIGNAL_STRENGTH
+    fee_rate: Decimal = Decimal('0.00055')
+    workers: Optional[int] = None
+
+
+@dataclass
+class FoldResult:
+    """Výsledek jednoho foldu pro jeden symbol"""
+    fold_index: int
+    symbol: str
+    in_sample_start: datetime
+    in_sample_end: datetime
+    out_of_sample_start: datetime
+    out_of_sample_end: datetime
+    parameters: Dict[str, Dict[str, Any]]
+    weights: Dict[str, float]
+    trades: Dict[str, List[Trade]]  # out-of-sample obchody podle strategie
+    indicator_cache_hits: int = 0
+
+
+@dataclass
+class WalkForwardReport:
+    """Agregované výsledky walk-forward analýzy"""
+    folds: List[FoldResult] = field(default_factory=list)
+
+    def metrics_series(self) -> Dict[str, List[Tuple[datetime, StrategyMetrics]]]:
+        """Časová řada out-of-sample metrik pro každou strategii (přes všechny symboly)"""
+        windows: Dict[int, datetime] = {}
+        trades: Dict[str, Dict[int, List[Trade]]] = {}
+        for fold in self.folds:
+            windows[fold.fold_index] = fold.out_of_sample_start
+            for name, fold_trades in fold.trades.items():
+                trades.setdefault(name, {}).setdefault(fold.fold_index, []).extend(fold_trades)
+
+        series: Dict[str, List[Tuple[datetime, StrategyMetrics]]] = {}
+        for name, by_fold in trades.items():
+            points = []
+            for fold_index in sorted(windows):
+                metrics = StrategyMetrics(strategy_name=name)
+                metrics.update_metrics(by_fold.get(fold_index, []))
+                points.append((windows[fold_index], metrics))
+            series[name] = points
+        return series
+
+    def overall_metrics(self) -> Dict[str, StrategyMetrics]:
+        """Souhrnné out-of-sample metriky pro každou strategii"""
+        trades: Dict[str, List[Trade]] = {}
+        for fold in self.folds:
+            for name, fold_trades in fold.trades.items():
+                trades.setdefault(name, []).extend(fold_trades)
+
+        result = {}
+        for name, strategy_trades in trades.items():
+            metrics = StrategyMetrics(strategy_name=name)
+            metrics.update_metrics(strategy_trades)
+            result[name] = metrics
+        return result
+
+    def chosen_weights(self) -> Dict[str, List[float]]:
+        """Váhy vybrané v jednotlivých foldech (pro posouzení konfigurace vah)"""
+        weights: Dict[str, List[float]] = {}
+        for fold in sorted(self.folds, key=lambda f: (f.fold_index, f.symbol)):
+            for name, weight in fold.weights.items():
+                weights.setdefault(name, []).append(weight)
+        return weights
+
+
+@dataclass
+class _FoldTask:
+    """Vstup pro zpracování jednoho foldu ve worker procesu"""
+    fold_index: int
+    symbol: str
+    series: List[Candle]
+    out_of_sample_index: int
+    window: Tuple[datetime, datetime, datetime, datetime]
+    strategies: Dict[str, StrategyConfig]
+    parameter_grid: Dict[str, Dict[str, List[Any]]]
+    weight_grid: Dict[str, List[float]]
+    min_signal_strength: float
+    position_size_usd: Decimal
+    fee_rate: Decimal
+
+
+class WalkForwardAnalyzer:
+    """Walk-forward validace strategií s paralelním během foldů
+
+    Pro každé klouzavé okno se parametry (a volitelně váhy) strategií
+    optimalizují na in-sample části a vyhodnotí na následujícím out-of-sample
+    okně. Foldy všech symbolů běží paralelně ve worker procesech, indikátory
+    se v rámci foldu počítají jen jednou (viz `IndicatorCache`).
+    """
+
+    def __init__(
+        self,
+        settings: Settings,
+        config: Optional[WalkForwardConfig] = None,
+        progress: Optional[Callable[[int, int, FoldResult], None]] = None
+    ):
+        self.settings = settings
+        self.config = config or WalkForwardConfig()
+        self.progress = progress
+
+    def build_tasks(self, candles_by_symbol: Dict[str, List[Candle]]) -> List[_FoldTask]:
+        """Rozdělí data všech symbolů na klouzavá in-sample/out-of-sample okna"""
+        strategies = {name: cfg for name, cfg in self.settings.strategies.items() if cfg.enabled}
+        series_by_symbol = {s: c for s, c in candles_by_symbol.items() if c}
+        if not strategies or not series_by_symbol:
+            return []
+
+        first = min(c[0].timestamp for c in series_by_symbol.values())
+        last = max(c[-1].timestamp for c in series_by_symbol.values())
+        step = self.config.step or self.config.out_of_sample
+
+        timelines = {s: CandleArray.from_candles(c) for s, c in series_by_symbol.items()}
+
+        tasks = []
+        fold_index = 0
+        window_start = first
+        while window_start + self.config.in_sample <= last:
+            is_end = window_start + self.config.in_sample
+            oos_end = is_end + self.config.out_of_sample
+
+            for symbol, candles in series_by_symbol.items():
+                timeline = timelines[symbol]
+                start, oos_start = timeline.index_range(_ms(window_start), _ms(is_end) - 1)
+                _, stop = timeline.index_range(_ms(is_end), _ms(oos_end) - 1)
+                if oos_start - start < 2 or stop <= oos_start:
+                    continue
+                tasks.append(_FoldTask(
+                    fold_index=fold_index,
+                    symbol=symbol,
+                    series=candles[start:stop],
+                    out_of_sample_index=oos_start - start,
+                    window=(window_start, is_end, is_end, oos_end),
+                    strategies=strategies,
+                    parameter_grid=self.config.parameter_grid,
+                    weight_grid=self.config.weight_grid,
+                    min_signal_strength=self.config.min_signal_strength,
+                    position_size_usd=self.settings.trading.risk_management.position_size_usd,
+                    fee_rate=self.config.fee_rate
+                ))
+
+            fold_index += 1
+            window_start += step
+
+        return tasks
+
+    def run(self, candles_by_symbol: Dict[str, List[Candle]]) -> WalkForwardReport:
+        """Spustí walk-forward analýzu (foldy paralelně v procesech)"""
+        tasks = self.build_tasks(candles_by_symbol)
+        report = WalkForwardReport()
+        total = len(tasks)
+        if not tasks:
+            logger.warning("Walk-forward: nedostatek dat pro vytvoření foldů")
+            return report
+
+        workers = self.config.workers or min(total, os.cpu_count() or 1)
+        logger.info(f"Walk-forward: {total} foldů, {workers} worker procesů")
+
+        if workers <= 1:
+            for task in tasks:
+                self._on_fold_done(report, _run_fold(task), total)
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = [executor.submit(_run_fold, task) for task in tasks]
+                for future in as_completed(futures):
+                    self._on_fold_done(report, future.result(), total)
+
+        report.folds.sort(key=lambda f: (f.fold_index, f.symbol))
+        return report
+
+    async def run_from_repository(
+        self,
+        market_data_repository: IMarketDataRepository,
+        symbols: List[str],
+        start_time: datetime,
+        end_time: datetime
+    ) -> WalkForwardReport:
+        """Načte svíčky z repository a spustí analýzu mimo event loop"""
+        candles_by_symbol = {}
+        for symbol in symbols:
+            candles_by_symbol[symbol] = await market_data_repository.get_candles(symbol, start_time, end_time)
+
+        return await asyncio.get_event_loop().run_in_executor(None, self.run, candles_by_symbol)
+
+    async def run_from_lake(
+        self,
+        candle_lake: CandleLake,
+        symbols: List[str],
+        interval: str,
+        start_time: datetime,
+        end_time: datetime
+    ) -> WalkForwardReport:
+        """Načte svíčky ze sloupcového archivu a spustí analýzu mimo event loop"""
+        candles_by_symbol = {}
+        for symbol in symbols:
+            array = await candle_lake.read_range_async(symbol, interval, start_time, end_time)
+            candles_by_symbol[symbol] = array.to_candles()
+
+        return await asyncio.get_event_loop().run_in_executor(None, self.run, candles_by_symbol)
+
+    def _on_fold_done(self, report: WalkForwardReport, result: FoldResult, total: int) -> None:
+        """Zaznamená dokončený fold a nahlásí průběh"""
+        report.folds.append(result)
+        done = len(report.folds)
+        logger.info(f"Walk-forward: fold {result.fold_index} ({result.symbol}) hotov [{done}/{total}]")
+        if self.progress:
+            self.progress(done, total, result)
+
+
+def _ms(value: datetime) -> int:
+    return int(value.timestamp() * 1000)
+
+
+def _parameter_candidates(config: StrategyConfig, grid: Dict[str, List[Any]]) -> List[Dict[str, Any]]:
+    """Vrátí všechny kombinace parametrů z gridu (ostatní parametry z konfigurace)"""
+    if not grid:
+        return [dict(config.parameters)]
+    names = list(grid)
+    return [
+        {**config.parameters, **dict(zip(names, values))}
+        for values in itertools.product(*(grid[name] for name in names))
+    ]
+
+
+def _total_pnl(trades: List[Trade]) -> Decimal:
+    return sum((t.pnl for t in trades if t.pnl), Decimal('0'))
+
+
+def _run_fold(task: _FoldTask) -> FoldResult:
+    """Vstupní bod worker procesu"""
+    return asyncio.run(_evaluate_fold(task))
+
+
+async def _evaluate_fold(task: _FoldTask) -> FoldResult:
+    """Optimalizuje strategie na in-sample části a vyhodnotí je na out-of-sample"""
+    series = task.series
+    split = task.out_of_sample_index
+    cache = IndicatorCache(series)
+    backtester = Backtester(task.position_size_usd, task.fee_rate)
+
+    parameters: Dict[str, Dict[str, Any]] = {}
+    in_sample_signals: Dict[str, List[Optional[TradingSignal]]] = {}
+    out_of_sample_signals: Dict[str, List[Optional[TradingSignal]]] = {}
+    trades: Dict[str, List[Trade]] = {}
+
+    for name, config in task.strategies.items():
+        best = None
+        for candidate in _parameter_candidates(config, task.parameter_grid.get(name, {})):
+            strategy = create_strategy(name, replace(config, parameters=candidate))
+            if strategy is None:
+                break
+            strategy.indicator_cache = cache
+            signals = await backtester.collect_signals(strategy, series, 0, split)
+            score = _total_pnl(backtester.simulate(series, signals, 0, name))
+            if best is None or score > best[0]:
+                best = (score, candidate, strategy, signals)
+
+        if best is None:
+            continue
+
+        _, candidate, strategy, signals = best
+        parameters[name] = candidate
+        in_sample_signals[name] = signals
+        out_of_sample_signals[name] = await backtester.collect_signals(strategy, series, split, len(series))
+        trades[name] = backtester.simulate(series, out_of_sample_signals[name], split, name)
+
+    # Kombinovaný signál: váhy z konfigurace, případně optimalizované z gridu
+    weights = {name: task.strategies[name].weight for name in in_sample_signals}
+    grid_names = [name for name in task.weight_grid if name in weights]
+    if grid_names:
+        best_weights, best_score = dict(weights), None
+        for values in itertools.product(*(task.weight_grid[name] for name in grid_names)):
+            candidate = {**weights, **dict(zip(grid_names, values))}
+            combined = Backtester.combine_signals(in_sample_signals, candidate, task.min_signal_strength)
+            score = _total_pnl(backtester.simulate(series, combined, 0, ENSEMBLE_NAME))
+            if best_score is None or score > best_score:
+                best_weights, best_score = candidate, score
+        weights = best_weights
+
+    if out_of_sample_signals:
+        combined = Backtester.combine_signals(out_of_sample_signals, weights, task.min_signal_strength)
+        trades[ENSEMBLE_NAME] = backtester.simulate(series, combined, split, ENSEMBLE_NAME)
+
+    is_start, is_end, oos_start, oos_end = task.window
+    return FoldResult(
+        fold_index=task.fold_index,
+        symbol=task.symbol,
+        in_sample_start=is_start,
+        in_sample_end=is_end,
+        out_of_sample_start=oos_start,
+        out_of_sample_end=oos_end,
+        parameters=parameters,
+        weights=weights,
+        trades=trades,
+        indicator_cache_hits=cache.hits
+    )
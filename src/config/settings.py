@@ -13,6 +13,11 @@ class ApiConfig:
     bybit_api_secret: str = ""
     bybit_testnet: bool = True
     trading_enabled: bool = False
+    # Obchody na simulované burze (tržní data z Bybitu)
+    paper_trading: bool = False
+    paper_balance: Decimal = Decimal('10000')
+    paper_taker_fee: Decimal = Decimal('0.00055')
+    paper_maker_fee: Decimal = Decimal('0.0002')
     tradingview_username: str = ""
     tradingview_password: str = ""
     openai_api_key: str = ""
@@ -30,6 +35,55 @@ class RiskManagementConfig:
     take_profit_percentage: float = 5.0
     max_positions: int = 3
     position_size_usd: Decimal = Decimal('100')
+    # Start se zapnutým kill switchem (objednávky zvyšující expozici se zamítají)
+    kill_switch: bool = False
+
+
+@dataclass
+class ExecutionConfig:
+    """Konfigurace exekučních algoritmů pro velké objednávky"""
+    # market (vše jednou objednávkou) | twap | iceberg
+    algo: str = "market"
+    # Menší objednávky jdou vždy jako jeden market
+    min_notional_usd: Decimal = Decimal('1000')
+    # Za kolik sekund se má velká objednávka vyřídit a v kolika krocích
+    duration: float = 60.0
+    slices: int = 6
+    # Dílčí objednávka nejvýš tento podíl likvidity protistrany do `depth_bps` od nejlepší ceny
+    participation: float = 0.25
+    depth_bps: float = 20.0
+    # Iceberg: neplněná dílčí objednávka se po `child_timeout` sekundách zruší a zadá znovu
+    child_timeout: float = 10.0
+    # Interval dotazů na stav dílčích objednávek (sekundy)
+    poll_interval: float = 1.0
+
+
+@dataclass
+class StopManagementConfig:
+    """Konfigurace lokálního řízení stopů z tiků"""
+    enabled: bool = False
+    # Trailing stop v % od nejlepší ceny (0 = vypnuto) a minimální posun stopu
+    trailing_pct: float = 0.0
+    trail_step_pct: float = 0.1
+    # Po pohybu o `break_even_trigger_pct` % jde stop na vstup + offset (0 = vypnuto)
+    break_even_trigger_pct: float = 0.0
+    break_even_offset_pct: float = 0.05
+    # Uzavření pozice po tolika minutách (0 = vypnuto)
+    time_stop_minutes: float = 0.0
+    # Interval dávky posunů stopů na burzu a kontroly časových stopů (sekundy)
+    amend_interval: float = 1.0
+
+
+@dataclass
+class ShardingConfig:
+    """Konfigurace režimu koordinátor/workery (symboly rozdělené mezi procesy)"""
+    enabled: bool = False
+    workers: int = 2
+    # Body každého workeru na hash kruhu
+    virtual_nodes: int = 64
+    # Worker se hlásí každých `heartbeat_interval` s, po `heartbeat_timeout` s ticha je mrtvý
+    heartbeat_interval: float = 2.0
+    heartbeat_timeout: float = 10.0
 
 
 @dataclass
@@ -37,8 +91,26 @@ class TradingConfig:
     """Konfigurace tradingu"""
     default_symbols: List[str] = field(default_factory=lambda: ["BTCUSDT", "ETHUSDT", "SOLUSDT"])
     refresh_interval: int = 60
+    # Svíčky pro analýzu (Bybit interval a počet) - orchestrator i shard workery
+    kline_interval: str = "15"
+    kline_limit: int = 200
+    # Symbol se analyzuje nejvýš jednou za tolik sekund
+    min_analysis_interval: float = 300.0
     risk_management: RiskManagementConfig = field(default_factory=RiskManagementConfig)
     indicators: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    # Kontrola pozic v position booku proti burze (0 = vypnuto)
+    position_reconcile_interval: float = 60.0
+    # Dotaz na stav odeslaných objednávek (0 = vypnuto)
+    order_poll_interval: float = 2.0
+    # Nejvýš tolik symbolů se v analytické fázi cyklu zpracovává souběžně
+    analysis_concurrency: int = 16
+    # Strategie v pracovních procesech (0 = přímo v event loopu)
+    strategy_workers: int = 0
+    # Obnova parametrů kontraktů (tick, krok lotu, limity); 0 = jen při startu
+    instrument_refresh_interval: float = 3600.0
+    execution: ExecutionConfig = field(default_factory=ExecutionConfig)
+    stops: StopManagementConfig = field(default_factory=StopManagementConfig)
+    sharding: ShardingConfig = field(default_factory=ShardingConfig)
 
 
 @dataclass
@@ -57,6 +129,24 @@ class DatabaseConfig:
     type: str = "sqlite"
     path: str = "data/trading.db"
     auto_migrate: bool = True
+    # Volitelný sloupcový archiv svíček (prázdná cesta = vypnuto, vyžaduje pyarrow)
+    candle_lake_path: str = ""
+    candle_lake_format: str = "arrow"
+    # Partition s tolika part soubory se po appendu sloučí (0 = vypnuto)
+    candle_lake_compact_parts: int = 32
+    # Write-behind fronta pro svíčky, tickery a order booky
+    write_behind: bool = True
+    write_batch_size: int = 500
+    write_flush_interval: float = 1.0
+    write_queue_size: int = 10000
+    # Kompakce tickerů a order booků (0 = vypnuto)
+    compaction_interval: float = 3600.0
+    raw_retention_hours: float = 24.0
+    bar_retention_days: float = 90.0
+    order_book_keyframe_interval: int = 100
+    snapshot_retention_days: float = 7.0
+    # Pozice v paměti se zápisem do databáze na pozadí
+    position_book: bool = True
 
 
 @dataclass
@@ -115,6 +205,10 @@ class Settings:
                     bybit_api_secret=bybit_cfg.get('api_secret', ''),
                     bybit_testnet=bybit_cfg.get('testnet', True),
                     trading_enabled=bybit_cfg.get('trading_enabled', False),
+                    paper_trading=bybit_cfg.get('paper_trading', False),
+                    paper_balance=Decimal(str(bybit_cfg.get('paper_balance', 10000))),
+                    paper_taker_fee=Decimal(str(bybit_cfg.get('paper_taker_fee', '0.00055'))),
+                    paper_maker_fee=Decimal(str(bybit_cfg.get('paper_maker_fee', '0.0002'))),
                     tradingview_username=api_data.get('tradingview', {}).get('username', ''),
                     tradingview_password=api_data.get('tradingview', {}).get('password', ''),
                     openai_api_key=api_data.get('openai', {}).get('api_key', ''),
@@ -127,6 +221,9 @@ class Settings:
             if 'trading' in data:
                 trading_data = data['trading']
                 risk_data = trading_data.get('risk_management', {})
+                execution_data = trading_data.get('execution', {})
+                stops_data = trading_data.get('stops', {})
+                sharding_data = trading_data.get('sharding', {})
                 
                 risk_config = RiskManagementConfig(
                     max_position_size_usd=Decimal(str(risk_data.get('max_position_size_usd', 1000))),
@@ -134,14 +231,49 @@ class Settings:
                     stop_loss_percentage=risk_data.get('stop_loss_percentage', 2.0),
                     take_profit_percentage=risk_data.get('take_profit_percentage', 5.0),
                     max_positions=trading_data.get('max_positions', 3),
-                    position_size_usd=Decimal(str(trading_data.get('position_size', 100)))
+                    position_size_usd=Decimal(str(trading_data.get('position_size', 100))),
+                    kill_switch=risk_data.get('kill_switch', False)
                 )
                 
                 settings.trading = TradingConfig(
                     default_symbols=trading_data.get('default_symbols', ["BTCUSDT", "ETHUSDT", "SOLUSDT"]),
                     refresh_interval=trading_data.get('refresh_interval', 60),
+                    kline_interval=str(trading_data.get('kline_interval', "15")),
+                    kline_limit=trading_data.get('kline_limit', 200),
+                    min_analysis_interval=trading_data.get('min_analysis_interval', 300.0),
                     risk_management=risk_config,
-                    indicators=trading_data.get('indicators', {})
+                    indicators=trading_data.get('indicators', {}),
+                    position_reconcile_interval=trading_data.get('position_reconcile_interval', 60.0),
+                    order_poll_interval=trading_data.get('order_poll_interval', 2.0),
+                    analysis_concurrency=trading_data.get('analysis_concurrency', 16),
+                    strategy_workers=trading_data.get('strategy_workers', 0),
+                    instrument_refresh_interval=trading_data.get('instrument_refresh_interval', 3600.0),
+                    execution=ExecutionConfig(
+                        algo=execution_data.get('algo', "market"),
+                        min_notional_usd=Decimal(str(execution_data.get('min_notional_usd', 1000))),
+                        duration=execution_data.get('duration', 60.0),
+                        slices=execution_data.get('slices', 6),
+                        participation=execution_data.get('participation', 0.25),
+                        depth_bps=execution_data.get('depth_bps', 20.0),
+                        child_timeout=execution_data.get('child_timeout', 10.0),
+                        poll_interval=execution_data.get('poll_interval', 1.0)
+                    ),
+                    stops=StopManagementConfig(
+                        enabled=stops_data.get('enabled', False),
+                        trailing_pct=stops_data.get('trailing_pct', 0.0),
+                        trail_step_pct=stops_data.get('trail_step_pct', 0.1),
+                        break_even_trigger_pct=stops_data.get('break_even_trigger_pct', 0.0),
+                        break_even_offset_pct=stops_data.get('break_even_offset_pct', 0.05),
+                        time_stop_minutes=stops_data.get('time_stop_minutes', 0.0),
+                        amend_interval=stops_data.get('amend_interval', 1.0)
+                    ),
+                    sharding=ShardingConfig(
+                        enabled=sharding_data.get('enabled', False),
+                        workers=sharding_data.get('workers', 2),
+                        virtual_nodes=sharding_data.get('virtual_nodes', 64),
+                        heartbeat_interval=sharding_data.get('heartbeat_interval', 2.0),
+                        heartbeat_timeout=sharding_data.get('heartbeat_timeout', 10.0)
+                    )
                 )
             
             # Strategie
@@ -162,7 +294,20 @@ class Settings:
                     enabled=db_data.get('enabled', True),
                     type=db_data.get('type', 'sqlite'),
                     path=db_data.get('path', 'data/trading.db'),
-                    auto_migrate=db_data.get('auto_migrate', True)
+                    auto_migrate=db_data.get('auto_migrate', True),
+                    candle_lake_path=db_data.get('candle_lake_path', ''),
+                    candle_lake_format=db_data.get('candle_lake_format', 'arrow'),
+                    candle_lake_compact_parts=db_data.get('candle_lake_compact_parts', 32),
+                    write_behind=db_data.get('write_behind', True),
+                    write_batch_size=db_data.get('write_batch_size', 500),
+                    write_flush_interval=db_data.get('write_flush_interval', 1.0),
+                    write_queue_size=db_data.get('write_queue_size', 10000),
+                    compaction_interval=db_data.get('compaction_interval', 3600.0),
+                    raw_retention_hours=db_data.get('raw_retention_hours', 24.0),
+                    bar_retention_days=db_data.get('bar_retention_days', 90.0),
+                    order_book_keyframe_interval=db_data.get('order_book_keyframe_interval', 100),
+                    snapshot_retention_days=db_data.get('snapshot_retention_days', 7.0),
+                    position_book=db_data.get('position_book', True)
                 )
             
             # Logování
@@ -202,6 +347,7 @@ class Settings:
         settings.api.bybit_api_secret = os.getenv('BYBIT_API_SECRET', '')
         settings.api.bybit_testnet = os.getenv('BYBIT_TESTNET', 'true').lower() == 'true'
         settings.api.trading_enabled = os.getenv('BYBIT_TRADING_ENABLED', 'false').lower() == 'true'
+        settings.api.paper_trading = os.getenv('BYBIT_PAPER_TRADING', 'false').lower() == 'true'
         settings.api.openai_api_key = os.getenv('OPENAI_API_KEY', '')
         
         # Environment
@@ -1,15 +1,19 @@
 """Doménové modely pro trading assistant"""
 
-from .trade import Trade, Position, TradeType, TradeStatus, OrderType
-from .market_data import Candle, Ticker, OrderBook
+from .trade import Trade, Position, TradeType, TradeStatus, OrderType, PnlSummary
+from .order import Order, OrderState, ExecutionEvent, ORDER_TRANSITIONS
+from .market_data import Candle, CandleArray, Ticker, OrderBook, OrderBookArray, Instrument
 from .strategy import TradingSignal, SignalType, SignalStrength, StrategyConfig, StrategyMetrics
 
 __all__ = [
     # Trade models
-    'Trade', 'Position', 'TradeType', 'TradeStatus', 'OrderType',
+    'Trade', 'Position', 'TradeType', 'TradeStatus', 'OrderType', 'PnlSummary',
+    
+    # Order models
+    'Order', 'OrderState', 'ExecutionEvent', 'ORDER_TRANSITIONS',
     
     # Market data models
-    'Candle', 'Ticker', 'OrderBook',
+    'Candle', 'CandleArray', 'Ticker', 'OrderBook', 'OrderBookArray', 'Instrument',
     
     # Strategy models
     'TradingSignal', 'SignalType', 'SignalStrength', 'StrategyConfig', 'StrategyMetrics'
@@ -1,8 +1,10 @@
 from dataclasses import dataclass
 from datetime import datetime
-from decimal import Decimal
+from decimal import Decimal, ROUND_DOWN, ROUND_HALF_UP
 from typing import List, Optional
 
+import numpy as np
+
 
 @dataclass
 class Candle:
@@ -14,6 +16,7 @@ class Candle:
     low: Decimal
     close: Decimal
     volume: Decimal
+    interval: str = "15"  # Bybit interval (minuty, "D", "W", ...)
     
     @property
     def is_bullish(self) -> bool:
@@ -77,4 +80,161 @@ class OrderBook:
         """Spread mezi nejlepším bid a ask"""
         if self.best_bid and self.best_ask:
             return self.best_ask - self.best_bid
-        return None
\ No newline at end of file
+        return None
+
+
+@dataclass
+class Instrument:
+    """Obchodní parametry kontraktu (v5 instruments-info)"""
+    symbol: str
+    tick_size: Decimal
+    qty_step: Decimal
+    min_qty: Decimal
+    max_qty: Decimal
+    # Limitní objednávky smí být větší než market (maxMktOrderQty)
+    max_market_qty: Decimal
+    min_notional: Decimal = Decimal('0')
+    min_price: Decimal = Decimal('0')
+    max_price: Optional[Decimal] = None
+    status: str = "Trading"
+
+    def round_quantity(self, quantity: Decimal) -> Decimal:
+        """Množství zaokrouhlené dolů na krok lotu"""
+        return _round_step(quantity, self.qty_step, ROUND_DOWN)
+
+    def round_price(self, price: Decimal, rounding: str = ROUND_HALF_UP) -> Decimal:
+        """Cena zaokrouhlená na tick"""
+        return _round_step(price, self.tick_size, rounding)
+
+
+def _round_step(value: Decimal, step: Decimal, rounding: str) -> Decimal:
+    if step <= 0:
+        return value
+    return (value / step).to_integral_value(rounding) * step
+
+
+@dataclass
+class CandleArray:
+    """Sloupcová (NumPy) reprezentace řady svíček jednoho symbolu
+
+    Časy jsou epoch milisekundy (int64), ceny a objemy float64. Slouží pro
+    backtesty a hromadné výpočty, kde by seznam `Candle` s Decimal byl pomalý.
+    """
+    symbol: str
+    timestamp: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.timestamp)
+
+    @classmethod
+    def empty(cls, symbol: str) -> 'CandleArray':
+        """Vytvoří prázdné pole svíček"""
+        floats = np.empty(0, dtype=np.float64)
+        return cls(symbol, np.empty(0, dtype=np.int64), floats, floats, floats, floats, floats)
+
+    @classmethod
+    def from_candles(cls, candles: List[Candle]) -> 'CandleArray':
+        """Převede seznam svíček na sloupcová pole"""
+        if not candles:
+            return cls.empty("")
+        return cls(
+            symbol=candles[0].symbol,
+            timestamp=np.fromiter(
+                (int(c.timestamp.timestamp() * 1000) for c in candles), dtype=np.int64, count=len(candles)
+            ),
+            open=np.fromiter((float(c.open) for c in candles), dtype=np.float64, count=len(candles)),
+            high=np.fromiter((float(c.high) for c in candles), dtype=np.float64, count=len(candles)),
+            low=np.fromiter((float(c.low) for c in candles), dtype=np.float64, count=len(candles)),
+            close=np.fromiter((float(c.close) for c in candles), dtype=np.float64, count=len(candles)),
+            volume=np.fromiter((float(c.volume) for c in candles), dtype=np.float64, count=len(candles)),
+        )
+
+    def to_candles(self) -> List[Candle]:
+        """Převede pole zpět na seznam `Candle` objektů"""
+        return [
+            Candle(
+                symbol=self.symbol,
+                timestamp=datetime.fromtimestamp(int(ts) / 1000),
+                open=Decimal(repr(float(o))),
+                high=Decimal(repr(float(h))),
+                low=Decimal(repr(float(lo))),
+                close=Decimal(repr(float(c))),
+                volume=Decimal(repr(float(v)))
+            )
+            for ts, o, h, lo, c, v in zip(
+                self.timestamp.tolist(), self.open.tolist(), self.high.tolist(),
+                self.low.tolist(), self.close.tolist(), self.volume.tolist()
+            )
+        ]
+
+    def slice(self, start: int, stop: int) -> 'CandleArray':
+        """Vrátí pohled (bez kopie) na svíčky v rozsahu indexů"""
+        return CandleArray(
+            self.symbol, self.timestamp[start:stop], self.open[start:stop], self.high[start:stop],
+            self.low[start:stop], self.close[start:stop], self.volume[start:stop]
+        )
+
+    def index_range(self, start_ms: int, end_ms: int) -> tuple[int, int]:
+        """Vrátí rozsah indexů [start, stop) pro časy start_ms <= ts <= end_ms"""
+        start = int(np.searchsorted(self.timestamp, start_ms, side='left'))
+        stop = int(np.searchsorted(self.timestamp, end_ms, side='right'))
+        return start, stop
+
+
+@dataclass
+class OrderBookArray:
+    """Sloupcová (NumPy) řada snapshotů plné hloubky order booku
+
+    `timestamp` jsou epoch milisekundy (int64), ostatní pole mají tvar
+    (snapshoty x úrovně) float64. Úroveň 0 je nejlepší cena, chybějící
+    úrovně jsou NaN. Slouží pro backtesty mikrostruktury trhu.
+    """
+    symbol: str
+    timestamp: np.ndarray
+    bid_price: np.ndarray
+    bid_size: np.ndarray
+    ask_price: np.ndarray
+    ask_size: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.timestamp)
+
+    @classmethod
+    def empty(cls, symbol: str) -> 'OrderBookArray':
+        """Vytvoří prázdnou řadu"""
+        levels = np.empty((0, 0), dtype=np.float64)
+        return cls(symbol, np.empty(0, dtype=np.int64), levels, levels, levels, levels)
+
+    def since(self, start_ms: int) -> 'OrderBookArray':
+        """Snapshoty s časem >= start_ms (pohled bez kopie)"""
+        start = int(np.searchsorted(self.timestamp, start_ms, side='left'))
+        return OrderBookArray(
+            self.symbol, self.timestamp[start:], self.bid_price[start:], self.bid_size[start:],
+            self.ask_price[start:], self.ask_size[start:]
+        )
+
+    @property
+    def spread(self) -> np.ndarray:
+        """Spread nejlepších cen pro každý snapshot"""
+        return self.ask_price[:, 0] - self.bid_price[:, 0]
+
+    def to_order_book(self, index: int) -> OrderBook:
+        """Převede jeden snapshot zpět na `OrderBook`"""
+        def _levels(prices: np.ndarray, sizes: np.ndarray) -> List[tuple[Decimal, Decimal]]:
+            mask = ~np.isnan(prices)
+            return [
+                (Decimal(repr(p)), Decimal(repr(s)))
+                for p, s in zip(prices[mask].tolist(), sizes[mask].tolist())
+            ]
+
+        return OrderBook(
+            symbol=self.symbol,
+            bids=_levels(self.bid_price[index], self.bid_size[index]),
+            asks=_levels(self.ask_price[index], self.ask_size[index]),
+            timestamp=datetime.fromtimestamp(int(self.timestamp[index]) / 1000)
+        )
@@ -0,0 +1,99 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+from decimal import Decimal
+from enum import Enum
+from typing import Dict, FrozenSet, Optional
+
+from .trade import TradeType
+
+
+class OrderState(Enum):
+    PENDING = "pending"
+    ACKNOWLEDGED = "acknowledged"
+    PARTIALLY_FILLED = "partially_filled"
+    FILLED = "filled"
+    CANCELLED = "cancelled"
+    REJECTED = "rejected"
+
+
+# Povolené přechody stavů objednávky (koncové stavy nemají žádné)
+ORDER_TRANSITIONS: Dict[OrderState, FrozenSet[OrderState]] = {
+    OrderState.PENDING: frozenset({
+        OrderState.ACKNOWLEDGED, OrderState.PARTIALLY_FILLED, OrderState.FILLED,
+        OrderState.CANCELLED, OrderState.REJECTED
+    }),
+    OrderState.ACKNOWLEDGED: frozenset({
+        OrderState.PARTIALLY_FILLED, OrderState.FILLED, OrderState.CANCELLED, OrderState.REJECTED
+    }),
+    OrderState.PARTIALLY_FILLED: frozenset({
+        OrderState.PARTIALLY_FILLED, OrderState.FILLED, OrderState.CANCELLED
+    }),
+    OrderState.FILLED: frozenset(),
+    OrderState.CANCELLED: frozenset(),
+    OrderState.REJECTED: frozenset(),
+}
+
+
+@dataclass
+class ExecutionEvent:
+    """Stav objednávky hlášený burzou (kumulativní plnění)"""
+    order_link_id: str
+    state: OrderState
+    filled_quantity: Decimal = Decimal('0')
+    avg_fill_price: Optional[Decimal] = None
+    exchange_order_id: Optional[str] = None
+    timestamp: datetime = field(default_factory=datetime.now)
+    # Kumulativní poplatek za dosavadní plnění
+    fee: Decimal = Decimal('0')
+
+
+@dataclass
+class Order:
+    """Objednávka na burze a její stav
+
+    `order_link_id` je klientské ID známé před odesláním - podle něj se
+    párují události z burzy i obchod v žurnálu.
+    """
+    order_link_id: str
+    symbol: str
+    side: TradeType
+    quantity: Decimal
+    price: Decimal = Decimal('0')
+    state: OrderState = OrderState.PENDING
+    exchange_order_id: Optional[str] = None
+    filled_quantity: Decimal = Decimal('0')
+    avg_fill_price: Optional[Decimal] = None
+    fee: Decimal = Decimal('0')
+    trade_id: Optional[str] = None
+    # Jen snižuje pozici - plnění ji v žurnálu uzavře
+    reduce_only: bool = False
+    created_at: datetime = field(default_factory=datetime.now)
+    updated_at: Optional[datetime] = None
+
+    @property
+    def is_terminal(self) -> bool:
+        return not ORDER_TRANSITIONS[self.state]
+
+    def apply(self, event: ExecutionEvent) -> bool:
+        """Aplikuje událost; False, pokud je neplatná nebo zastaralá
+
+        Události mohou chodit opakovaně i mimo pořadí - přechod mimo
+        `ORDER_TRANSITIONS` nebo pokles plnění se ignoruje.
+        """
+        if event.state not in ORDER_TRANSITIONS[self.state]:
+            return False
+        if event.filled_quantity < self.filled_quantity:
+            return False
+        if event.state == self.state and event.filled_quantity == self.filled_quantity:
+            return False
+
+        self.state = event.state
+        self.filled_quantity = event.filled_quantity
+        if event.avg_fill_price:
+            self.avg_fill_price = event.avg_fill_price
+        if event.fee > self.fee:
+            self.fee = event.fee
+        if event.exchange_order_id:
+            self.exchange_order_id = event.exchange_order_id
+        self.updated_at = event.timestamp
+        return True
@@ -1,9 +1,10 @@
+import math
 from dataclasses import dataclass
 from datetime import datetime
 from decimal import Decimal
 from enum import Enum
 from typing import Dict, Any, Optional, List
-from .trade import Trade, TradeType
+from .trade import Trade, TradeType, PnlSummary
 from .market_data import Candle
 
 
@@ -52,7 +53,11 @@ class StrategyConfig:
 
 @dataclass
 class StrategyMetrics:
-    """Metriky výkonnosti strategie"""
+    """Metriky výkonnosti strategie
+
+    Metriky se počítají průběžně po každém uzavřeném obchodu (`record_trade`),
+    takže stav lze uložit a po restartu pokračovat bez přehrávání historie.
+    """
     strategy_name: str
     total_trades: int = 0
     winning_trades: int = 0
@@ -63,36 +68,83 @@ class StrategyMetrics:
     avg_win: Decimal = Decimal('0')
     avg_loss: Decimal = Decimal('0')
     profit_factor: float = 0.0
+    # Sharpe na obchod (průměr / směrodatná odchylka PnL obchodů, bez anualizace)
     sharpe_ratio: float = 0.0
     
     # Časové údaje
     created_at: datetime = datetime.now()
     updated_at: datetime = datetime.now()
     
-    def update_metrics(self, trades: List[Trade]) -> None:
-        """Aktualizuje metriky na základě seznamu obchodů"""
-        self.total_trades = len(trades)
-        winning = [t for t in trades if t.pnl and t.pnl > 0]
-        losing = [t for t in trades if t.pnl and t.pnl < 0]
+    # Průběžný stav akumulátoru
+    gross_profit: Decimal = Decimal('0')
+    gross_loss: Decimal = Decimal('0')
+    peak_pnl: Decimal = Decimal('0')
+    pnl_mean: float = 0.0
+    # Součet čtverců odchylek od průměru (Welford)
+    pnl_m2: float = 0.0
+    
+    def record_trade(self, pnl: Optional[Decimal]) -> None:
+        """Započítá jeden uzavřený obchod v O(1)"""
+        pnl = pnl or Decimal('0')
+        self.total_trades += 1
+        if pnl > 0:
+            self.winning_trades += 1
+            self.gross_profit += pnl
+        elif pnl < 0:
+            self.losing_trades += 1
+            self.gross_loss -= pnl
         
-        self.winning_trades = len(winning)
-        self.losing_trades = len(losing)
-        self.total_pnl = sum(t.pnl for t in trades if t.pnl)
+        # Drawdown kumulativního PnL od dosavadního maxima
+        self.total_pnl += pnl
+        if self.total_pnl > self.peak_pnl:
+            self.peak_pnl = self.total_pnl
+        self.max_drawdown = max(self.max_drawdown, self.peak_pnl - self.total_pnl)
         
-        if self.total_trades > 0:
-            self.win_rate = self.winning_trades / self.total_trades
-            
-        if winning:
-            self.avg_win = sum(t.pnl for t in winning) / len(winning)
-            
-        if losing:
-            self.avg_loss = sum(abs(t.pnl) for t in losing) / len(losing)
-            
-        # Profit factor: celkový zisk / celková ztráta
-        total_wins = sum(t.pnl for t in winning)
-        total_losses = sum(abs(t.pnl) for t in losing)
+        # Welfordův průměr a rozptyl
+        value = float(pnl)
+        delta = value - self.pnl_mean
+        self.pnl_mean += delta / self.total_trades
+        self.pnl_m2 += delta * (value - self.pnl_mean)
+        
+        self.refresh()
+    
+    def refresh(self) -> None:
+        """Dopočítá odvozené metriky z průběžného stavu"""
+        self.win_rate = self.winning_trades / self.total_trades if self.total_trades else 0.0
+        self.avg_win = self.gross_profit / self.winning_trades if self.winning_trades else Decimal('0')
+        self.avg_loss = self.gross_loss / self.losing_trades if self.losing_trades else Decimal('0')
+        self.profit_factor = float(self.gross_profit / self.gross_loss) if self.gross_loss > 0 else 0.0
         
-        if total_losses > 0:
-            self.profit_factor = float(total_wins / total_losses)
-            
-        self.updated_at = datetime.now()
\ No newline at end of file
+        self.sharpe_ratio = 0.0
+        if self.total_trades > 1:
+            std = math.sqrt(self.pnl_m2 / (self.total_trades - 1))
+            if std > 0:
+                self.sharpe_ratio = self.pnl_mean / std
+        self.updated_at = datetime.now()
+    
+    def update_metrics(self, trades: List[Trade]) -> None:
+        """Přepočítá metriky ze seznamu obchodů (v pořadí uzavření)"""
+        self.total_trades = self.winning_trades = self.losing_trades = 0
+        self.total_pnl = self.max_drawdown = Decimal('0')
+        self.gross_profit = self.gross_loss = self.peak_pnl = Decimal('0')
+        self.pnl_mean = self.pnl_m2 = 0.0
+        for trade in trades:
+            self.record_trade(trade.pnl)
+        self.refresh()
+    
+    def apply_summary(self, summary: PnlSummary) -> None:
+        """Převezme metriky z agregovaného souhrnu (např. z repository)
+
+        Souhrn nenese pořadí obchodů, drawdown a Sharpe se tím nemění.
+        """
+        self.total_trades = summary.trades
+        self.winning_trades = summary.winning_trades
+        self.losing_trades = summary.losing_trades
+        self.total_pnl = summary.total_pnl
+        self.gross_profit = summary.gross_profit
+        self.gross_loss = summary.gross_loss
+        self.win_rate = summary.win_rate
+        self.avg_win = summary.avg_win
+        self.avg_loss = summary.avg_loss
+        self.profit_factor = summary.profit_factor
+        self.updated_at = datetime.now()
@@ -1,7 +1,7 @@
 from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
-from typing import Optional
+from typing import Iterable, Optional
 from decimal import Decimal
 
 
@@ -72,4 +72,62 @@ class Position:
     @property
     def market_value(self) -> Decimal:
         """Tržní hodnota pozice"""
-        return self.size * self.current_price
\ No newline at end of file
+        return self.size * self.current_price
+
+
+@dataclass
+class PnlSummary:
+    """Agregované realizované PnL skupiny obchodů (den, symbol, strategie)"""
+    trades: int = 0
+    winning_trades: int = 0
+    losing_trades: int = 0
+    gross_profit: Decimal = Decimal('0')
+    # Součet ztrát v absolutní hodnotě
+    gross_loss: Decimal = Decimal('0')
+    
+    @classmethod
+    def from_trades(cls, trades: Iterable[Trade]) -> 'PnlSummary':
+        """Sečte obchody jedním průchodem"""
+        summary = cls()
+        for trade in trades:
+            summary.add(trade.pnl)
+        return summary
+    
+    def add(self, pnl: Optional[Decimal]) -> None:
+        """Přičte jeden obchod"""
+        self.trades += 1
+        if pnl and pnl > 0:
+            self.winning_trades += 1
+            self.gross_profit += pnl
+        elif pnl and pnl < 0:
+            self.losing_trades += 1
+            self.gross_loss -= pnl
+    
+    def merge(self, other: 'PnlSummary') -> None:
+        """Přičte jiný souhrn"""
+        self.trades += other.trades
+        self.winning_trades += other.winning_trades
+        self.losing_trades += other.losing_trades
+        self.gross_profit += other.gross_profit
+        self.gross_loss += other.gross_loss
+    
+    @property
+    def total_pnl(self) -> Decimal:
+        return self.gross_profit - self.gross_loss
+    
+    @property
+    def win_rate(self) -> float:
+        return self.winning_trades / self.trades if self.trades else 0.0
+    
+    @property
+    def avg_win(self) -> Decimal:
+        return self.gross_profit / self.winning_trades if self.winning_trades else Decimal('0')
+    
+    @property
+    def avg_loss(self) -> Decimal:
+        return self.gross_loss / self.losing_trades if self.losing_trades else Decimal('0')
+    
+    @property
+    def profit_factor(self) -> float:
+        """Celkový zisk / celková ztráta (0 bez ztrátových obchodů)"""
+        return float(self.gross_profit / self.gross_loss) if self.gross_loss > 0 else 0.0
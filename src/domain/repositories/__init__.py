@@ -2,9 +2,14 @@
 
 from .trade_repository import ITradeRepository, IPositionRepository
 from .market_data_repository import IMarketDataRepository
+from .strategy_metrics_repository import IStrategyMetricsRepository
+from .unit_of_work import IUnitOfWork, NullUnitOfWork
 
 __all__ = [
     'ITradeRepository',
     'IPositionRepository', 
-    'IMarketDataRepository'
+    'IMarketDataRepository',
+    'IStrategyMetricsRepository',
+    'IUnitOfWork',
+    'NullUnitOfWork'
 ]
\ No newline at end of file
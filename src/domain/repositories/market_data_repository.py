@@ -1,7 +1,7 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Iterable, List, Optional
 from datetime import datetime
-from ..models import Candle, Ticker, OrderBook
+from ..models import Candle, Ticker, OrderBook, OrderBookArray
 
 
 class IMarketDataRepository(ABC):
@@ -12,24 +12,31 @@ class IMarketDataRepository(ABC):
         """Uloží svíčku do databáze"""
         pass
     
+    async def save_candles(self, candles: Iterable[Candle]) -> None:
+        """Uloží více svíček najednou (implementace mohou zapisovat v jedné transakci)"""
+        for candle in candles:
+            await self.save_candle(candle)
+    
     @abstractmethod
     async def get_candles(
         self, 
         symbol: str, 
         start_time: datetime, 
         end_time: datetime,
-        limit: Optional[int] = None
+        limit: Optional[int] = None,
+        interval: str = "15"
     ) -> List[Candle]:
-        """Získá historická OHLCV data"""
+        """Získá historická OHLCV data daného intervalu"""
         pass
     
     @abstractmethod
     async def get_latest_candles(
         self, 
         symbol: str, 
-        count: int = 100
+        count: int = 100,
+        interval: str = "15"
     ) -> List[Candle]:
-        """Získá posledních N svíček"""
+        """Získá posledních N svíček daného intervalu"""
         pass
     
     @abstractmethod
@@ -37,6 +44,11 @@ class IMarketDataRepository(ABC):
         """Uloží ticker data"""
         pass
     
+    async def save_tickers(self, tickers: Iterable[Ticker]) -> None:
+        """Uloží více tickerů najednou"""
+        for ticker in tickers:
+            await self.save_ticker(ticker)
+    
     @abstractmethod
     async def get_latest_ticker(self, symbol: str) -> Optional[Ticker]:
         """Získá nejnovější ticker pro symbol"""
@@ -47,7 +59,24 @@ class IMarketDataRepository(ABC):
         """Uloží order book"""
         pass
     
+    async def save_order_books(self, order_books: Iterable[OrderBook]) -> None:
+        """Uloží více order booků najednou"""
+        for order_book in order_books:
+            await self.save_order_book(order_book)
+    
     @abstractmethod
     async def get_latest_order_book(self, symbol: str) -> Optional[OrderBook]:
         """Získá nejnovější order book"""
-        pass
\ No newline at end of file
+        pass
+    
+    async def get_order_book_history(
+        self,
+        symbol: str,
+        start_time: datetime,
+        end_time: datetime
+    ) -> OrderBookArray:
+        """Řada snapshotů plné hloubky v časovém rozsahu (včetně hranic)
+
+        Implementace bez uložené hloubky vrací prázdnou řadu.
+        """
+        return OrderBookArray.empty(symbol)
@@ -0,0 +1,22 @@
+from abc import ABC, abstractmethod
+from typing import List, Optional
+from ..models import StrategyMetrics
+
+
+class IStrategyMetricsRepository(ABC):
+    """Interface pro uložený stav metrik strategií"""
+    
+    @abstractmethod
+    async def save_metrics(self, metrics: StrategyMetrics) -> StrategyMetrics:
+        """Uloží metriky strategie"""
+        pass
+    
+    @abstractmethod
+    async def get_metrics(self, strategy_name: str) -> Optional[StrategyMetrics]:
+        """Najde metriky strategie"""
+        pass
+    
+    @abstractmethod
+    async def get_all_metrics(self) -> List[StrategyMetrics]:
+        """Najde metriky všech strategií"""
+        pass
@@ -1,7 +1,7 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
-from datetime import datetime
-from ..models import Trade, Position
+from typing import AsyncIterator, Dict, List, Optional
+from datetime import date, datetime
+from ..models import Trade, Position, PnlSummary
 
 
 class ITradeRepository(ABC):
@@ -9,7 +9,7 @@ class ITradeRepository(ABC):
     
     @abstractmethod
     async def save_trade(self, trade: Trade) -> Trade:
-        """Uloží obchod do databáze"""
+        """Uloží nový obchod do databáze (bez ID dostane `new_trade_id()`)"""
         pass
     
     @abstractmethod
@@ -41,9 +41,105 @@ class ITradeRepository(ABC):
         """Najde všechny otevřené obchody"""
         pass
     
+    # Streamované varianty (po stránkách, nejnovější první). Výchozí
+    # implementace načte celý seznam, SQL repository stránkují přes keyset.
+    
+    async def iter_trades_by_symbol(self, symbol: str, page_size: int = 500) -> AsyncIterator[Trade]:
+        """Postupně vrací obchody pro daný symbol"""
+        for trade in await self.get_trades_by_symbol(symbol):
+            yield trade
+    
+    async def iter_trades_by_strategy(self, strategy_name: str, page_size: int = 500) -> AsyncIterator[Trade]:
+        """Postupně vrací obchody pro danou strategii"""
+        for trade in await self.get_trades_by_strategy(strategy_name):
+            yield trade
+    
+    async def iter_trades_by_date_range(
+        self,
+        start_date: datetime,
+        end_date: datetime,
+        page_size: int = 500
+    ) -> AsyncIterator[Trade]:
+        """Postupně vrací obchody v daném časovém rozmezí"""
+        for trade in await self.get_trades_by_date_range(start_date, end_date):
+            yield trade
+    
+    async def iter_open_trades(self, page_size: int = 500) -> AsyncIterator[Trade]:
+        """Postupně vrací otevřené obchody"""
+        for trade in await self.get_open_trades():
+            yield trade
+    
+    # Agregace realizovaného PnL podle dne uzavření obchodu (dny včetně hranic).
+    # Výchozí implementace prochází obchody, SQL repository čtou souhrnnou tabulku.
+    
+    async def get_pnl_summary(
+        self,
+        start_day: Optional[date] = None,
+        end_day: Optional[date] = None,
+        symbol: Optional[str] = None,
+        strategy_name: Optional[str] = None
+    ) -> PnlSummary:
+        """Souhrn PnL za období, volitelně pro jeden symbol nebo strategii"""
+        summary = PnlSummary()
+        async for trade in self._iter_realized_trades(start_day, end_day):
+            if symbol is not None and trade.symbol != symbol:
+                continue
+            if strategy_name is not None and (trade.strategy_name or "") != strategy_name:
+                continue
+            summary.add(trade.pnl)
+        return summary
+    
+    async def get_daily_pnl(
+        self,
+        start_day: Optional[date] = None,
+        end_day: Optional[date] = None
+    ) -> Dict[date, PnlSummary]:
+        """Souhrn PnL za období po dnech"""
+        result: Dict[date, PnlSummary] = {}
+        async for trade in self._iter_realized_trades(start_day, end_day):
+            day = (trade.closed_at or trade.created_at).date()
+            result.setdefault(day, PnlSummary()).add(trade.pnl)
+        return dict(sorted(result.items()))
+    
+    async def get_pnl_by_symbol(
+        self,
+        start_day: Optional[date] = None,
+        end_day: Optional[date] = None
+    ) -> Dict[str, PnlSummary]:
+        """Souhrn PnL za období po symbolech"""
+        result: Dict[str, PnlSummary] = {}
+        async for trade in self._iter_realized_trades(start_day, end_day):
+            result.setdefault(trade.symbol, PnlSummary()).add(trade.pnl)
+        return dict(sorted(result.items()))
+    
+    async def get_pnl_by_strategy(
+        self,
+        start_day: Optional[date] = None,
+        end_day: Optional[date] = None
+    ) -> Dict[str, PnlSummary]:
+        """Souhrn PnL za období po strategiích"""
+        result: Dict[str, PnlSummary] = {}
+        async for trade in self._iter_realized_trades(start_day, end_day):
+            result.setdefault(trade.strategy_name or "", PnlSummary()).add(trade.pnl)
+        return dict(sorted(result.items()))
+    
+    async def _iter_realized_trades(
+        self,
+        start_day: Optional[date],
+        end_day: Optional[date]
+    ) -> AsyncIterator[Trade]:
+        # Obchod se vytváří před uzavřením, horní mez created_at tedy platí i pro den uzavření
+        end = datetime.combine(end_day, datetime.max.time()) if end_day else datetime.max
+        async for trade in self.iter_trades_by_date_range(datetime.min, end):
+            if trade.pnl is None:
+                continue
+            day = (trade.closed_at or trade.created_at).date()
+            if (start_day is None or day >= start_day) and (end_day is None or day <= end_day):
+                yield trade
+    
     @abstractmethod
     async def update_trade(self, trade: Trade) -> Trade:
-        """Aktualizuje existující obchod"""
+        """Aktualizuje existující obchod (neexistující vyvolá ValueError)"""
         pass
     
     @abstractmethod
@@ -0,0 +1,24 @@
+from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
+from typing import AsyncContextManager, AsyncIterator
+
+
+class IUnitOfWork(ABC):
+    """Interface pro unit of work nad trade a position repository
+
+    Zápisy repository uvnitř `begin()` se provedou jednou transakcí při
+    výstupu z bloku bez výjimky. Výjimka uvnitř bloku zahodí všechny.
+    """
+
+    @abstractmethod
+    def begin(self) -> AsyncContextManager[None]:
+        """Otevře jednotku práce (vnořené volání se připojí k vnější)"""
+        pass
+
+
+class NullUnitOfWork(IUnitOfWork):
+    """Bez jednotky práce - každý zápis je vlastní transakce"""
+
+    @asynccontextmanager
+    async def begin(self) -> AsyncIterator[None]:
+        yield
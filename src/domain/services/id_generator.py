@@ -0,0 +1,90 @@
+import os
+import socket
+import threading
+import time
+import zlib
+from typing import Optional
+
+
+TIME_BITS = 48
+NODE_BITS = 24
+SEQUENCE_BITS = 16
+
+_NODE_MASK = (1 << NODE_BITS) - 1
+_SEQUENCE_MASK = (1 << SEQUENCE_BITS) - 1
+# 48 + 24 + 16 bitů jako hex pevné délky - lexikografické pořadí = časové
+_HEX_WIDTH = (TIME_BITS + NODE_BITS + SEQUENCE_BITS) // 4
+
+
+def default_node() -> int:
+    """Uzel z PID a hostname
+
+    XOR s konstantou hostu je prostý, procesy na jednom stroji tedy mají
+    různé uzly (PID se na Linuxu vejde do 22 bitů).
+    """
+    host = zlib.crc32(socket.gethostname().encode()) & _NODE_MASK
+    return (os.getpid() ^ host) & _NODE_MASK
+
+
+class IdGenerator:
+    """Monotónní, časově řaditelná ID bez kolizí (čas ms | uzel | sekvence)
+
+    - čas: 48 bitů milisekund od epochy; posun hodin zpět se ignoruje
+      (pokračuje se od posledního času)
+    - uzel: 24 bitů, výchozí z PID a hostname, po forku se přepočítá
+    - sekvence: 16 bitů v rámci milisekundy; po vyčerpání se pokračuje
+      další milisekundou (ID "předbíhají" hodiny, ale zůstávají unikátní)
+
+    Generování je thread-safe.
+    """
+
+    def __init__(self, prefix: str = "", node: Optional[int] = None):
+        self.prefix = prefix
+        self._explicit_node = node
+        self._lock = threading.Lock()
+        self._reset()
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._reset)
+
+    @property
+    def node(self) -> int:
+        return self._node
+
+    def _reset(self) -> None:
+        self._node = (self._explicit_node if self._explicit_node is not None else default_node()) & _NODE_MASK
+        self._last_ms = 0
+        self._sequence = 0
+        # Zámek z rodiče mohl zůstat zamčený jiným vláknem
+        self._lock = threading.Lock()
+
+    def next_int(self) -> int:
+        """Další ID jako 88bitové číslo"""
+        now = time.time_ns() // 1_000_000
+        with self._lock:
+            if now > self._last_ms:
+                self._last_ms = now
+                self._sequence = 0
+            else:
+                self._sequence = (self._sequence + 1) & _SEQUENCE_MASK
+                if self._sequence == 0:
+                    self._last_ms += 1
+            return (self._last_ms << (NODE_BITS + SEQUENCE_BITS)) | (self._node << SEQUENCE_BITS) | self._sequence
+
+    def next_id(self) -> str:
+        """Další ID jako text s prefixem"""
+        return f"{self.prefix}{self.next_int():0{_HEX_WIDTH}x}"
+
+
+def id_timestamp_ms(value: str, prefix: str = "") -> int:
+    """Čas (ms od epochy) zakódovaný v ID"""
+    return int(value[len(prefix):], 16) >> (NODE_BITS + SEQUENCE_BITS)
+
+
+TRADE_ID_PREFIX = "trade_"
+
+_trade_ids = IdGenerator(TRADE_ID_PREFIX)
+
+
+def new_trade_id() -> str:
+    """Nové ID obchodu (sdílený generátor procesu)"""
+    return _trade_ids.next_id()
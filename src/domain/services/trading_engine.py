@@ -1,7 +1,8 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from datetime import datetime
+from typing import Awaitable, Callable, List, Optional
 from decimal import Decimal
-from ..models import Trade, TradingSignal, Position
+from ..models import Trade, TradingSignal, Position, TradeStatus
 from ..repositories import ITradeRepository, IPositionRepository
 
 
@@ -14,8 +15,8 @@ class ITradingEngine(ABC):
         pass
     
     @abstractmethod
-    async def close_position(self, symbol: str) -> Optional[Trade]:
-        """Uzavře pozici pro daný symbol"""
+    async def close_position(self, symbol: str, price: Optional[Decimal] = None) -> Optional[Trade]:
+        """Uzavře pozici pro daný symbol za `price` (výstupní cena)"""
         pass
     
     @abstractmethod
@@ -35,10 +36,13 @@ class TradingEngine(ITradingEngine):
     def __init__(
         self, 
         trade_repository: ITradeRepository,
-        position_repository: IPositionRepository
+        position_repository: IPositionRepository,
+        on_trade_closed: Optional[Callable[[Trade], Awaitable[None]]] = None
     ):
         self.trade_repository = trade_repository
         self.position_repository = position_repository
+        # Volá se s každým uzavíracím obchodem (např. průběžné metriky strategií)
+        self.on_trade_closed = on_trade_closed
     
     async def execute_trade(self, signal: TradingSignal) -> Optional[Trade]:
         """Vykoná obchod na základě signálu"""
@@ -51,7 +55,7 @@ class TradingEngine(ITradingEngine):
             # Pokud je signál opačný než stávající pozice, uzavři ji
             if existing_position:
                 if (existing_position.side.value != signal.signal_type.value):
-                    await self.close_position(signal.symbol)
+                    await self.close_position(signal.symbol, signal.price)
             
             # Vytvoř nový obchod
             from ..models.trade import TradeType
@@ -80,8 +84,12 @@ class TradingEngine(ITradingEngine):
             print(f"Chyba při vykonávání obchodu: {e}")
             return None
     
-    async def close_position(self, symbol: str) -> Optional[Trade]:
-        """Uzavře pozici pro daný symbol"""
+    async def close_position(self, symbol: str, price: Optional[Decimal] = None) -> Optional[Trade]:
+        """Uzavře pozici pro daný symbol
+
+        `price` je výstupní cena (plnění, poslední cena), bez ní se použije
+        `current_price` pozice.
+        """
         try:
             position = await self.position_repository.get_position_by_symbol(symbol)
             if not position:
@@ -91,23 +99,43 @@ class TradingEngine(ITradingEngine):
             from ..models.trade import TradeType
             close_side = TradeType.SELL if position.side.value == "buy" else TradeType.BUY
             
+            exit_price = price or position.current_price
+            direction = 1 if position.side.value == "buy" else -1
+            pnl = (exit_price - position.entry_price) * position.size * direction
+            
             close_trade = Trade(
                 symbol=symbol,
                 side=close_side,
                 quantity=position.size,
-                price=position.current_price
+                price=exit_price,
+                status=TradeStatus.CLOSED,
+                strategy_name=await self._position_strategy(position),
+                closed_at=datetime.now(),
+                entry_price=position.entry_price,
+                exit_price=exit_price,
+                pnl=pnl
             )
             
             # Uzavři pozici
             await self.position_repository.close_position(symbol)
             
             # Ulož uzavírací obchod
-            return await self.trade_repository.save_trade(close_trade)
+            saved_trade = await self.trade_repository.save_trade(close_trade)
+            if self.on_trade_closed:
+                await self.on_trade_closed(saved_trade)
+            return saved_trade
             
         except Exception as e:
             print(f"Chyba při uzavírání pozice: {e}")
             return None
     
+    async def _position_strategy(self, position: Position) -> str:
+        """Strategie, která pozici otevřela (poslední obchod stejného směru)"""
+        async for trade in self.trade_repository.iter_trades_by_symbol(position.symbol, page_size=20):
+            if trade.side == position.side and trade.strategy_name:
+                return trade.strategy_name
+        return ""
+    
     async def calculate_position_size(
         self, 
         signal: TradingSignal, 
@@ -9,7 +9,9 @@ from datetime import datetime
 import json
 import logging
 
-from ....domain.models import Candle, Ticker, Trade, Position, TradeType, OrderBook
+from ....domain.models import (
+    Candle, Ticker, Trade, Position, TradeType, OrderBook, ExecutionEvent, OrderState, Instrument
+)
 
 
 logger = logging.getLogger(__name__)
@@ -20,6 +22,21 @@ class BybitApiError(Exception):
     pass
 
 
+# orderStatus v5 API -> stav objednávky
+ORDER_STATUS_MAP = {
+    "Created": OrderState.PENDING,
+    "New": OrderState.ACKNOWLEDGED,
+    "Untriggered": OrderState.ACKNOWLEDGED,
+    "Triggered": OrderState.ACKNOWLEDGED,
+    "PartiallyFilled": OrderState.PARTIALLY_FILLED,
+    "Filled": OrderState.FILLED,
+    "Cancelled": OrderState.CANCELLED,
+    "PartiallyFilledCanceled": OrderState.CANCELLED,
+    "Deactivated": OrderState.CANCELLED,
+    "Rejected": OrderState.REJECTED,
+}
+
+
 class BybitClient:
     """Asynchronní Bybit API klient"""
     
@@ -142,7 +159,8 @@ class BybitClient:
                     high=Decimal(item[2]),
                     low=Decimal(item[3]),
                     close=Decimal(item[4]),
-                    volume=Decimal(item[5])
+                    volume=Decimal(item[5]),
+                    interval=interval
                 )
                 candles.append(candle)
             
@@ -207,6 +225,50 @@ class BybitClient:
             logger.error(f"Chyba při získávání orderbook pro {symbol}: {e}")
             return None
     
+    async def get_instruments(self, page_size: int = 1000, raise_errors: bool = False) -> List[Instrument]:
+        """Parametry všech linear kontraktů - jeden průchod přes stránky (`nextPageCursor`)
+
+        Chyba se standardně zaloguje a vrátí se prázdný seznam, s `raise_errors`
+        se propaguje (neúplný seznam se nevrací).
+        """
+        params = {
+            "category": "linear",
+            "limit": page_size
+        }
+        instruments = []
+        
+        try:
+            while True:
+                data = await self._make_request("GET", "/v5/market/instruments-info", params)
+                for item in data.get("list", []):
+                    price_filter = item.get("priceFilter", {})
+                    lot_filter = item.get("lotSizeFilter", {})
+                    max_price = price_filter.get("maxPrice")
+                    max_qty = Decimal(lot_filter.get("maxOrderQty") or "Infinity")
+                    instruments.append(Instrument(
+                        symbol=item.get("symbol"),
+                        tick_size=Decimal(price_filter.get("tickSize") or "0"),
+                        qty_step=Decimal(lot_filter.get("qtyStep") or "0"),
+                        min_qty=Decimal(lot_filter.get("minOrderQty") or "0"),
+                        max_qty=max_qty,
+                        max_market_qty=Decimal(lot_filter.get("maxMktOrderQty") or max_qty),
+                        min_notional=Decimal(lot_filter.get("minNotionalValue") or "0"),
+                        min_price=Decimal(price_filter.get("minPrice") or "0"),
+                        max_price=Decimal(max_price) if max_price else None,
+                        status=item.get("status", "Trading")
+                    ))
+                
+                cursor = data.get("nextPageCursor")
+                if not cursor:
+                    return instruments
+                params = dict(params, cursor=cursor)
+            
+        except Exception as e:
+            if raise_errors:
+                raise
+            logger.error(f"Chyba při získávání parametrů kontraktů: {e}")
+            return []
+    
     # Trading metody
     async def place_order(
         self,
@@ -216,9 +278,11 @@ class BybitClient:
         order_type: str = "Market",
         price: Optional[Decimal] = None,
         stop_loss: Optional[Decimal] = None,
-        take_profit: Optional[Decimal] = None
+        take_profit: Optional[Decimal] = None,
+        order_link_id: Optional[str] = None,
+        reduce_only: bool = False
     ) -> Optional[str]:
-        """Zadá objednávku na burzu"""
+        """Zadá objednávku na burzu (`order_link_id` = klientské ID objednávky)"""
         params = {
             "category": "linear",
             "symbol": symbol,
@@ -236,6 +300,12 @@ class BybitClient:
         if take_profit:
             params["takeProfit"] = str(take_profit)
         
+        if order_link_id:
+            params["orderLinkId"] = order_link_id
+        
+        if reduce_only:
+            params["reduceOnly"] = True
+        
         try:
             data = await self._make_request("POST", "/v5/order/create", params, authenticated=True)
             return data.get("orderId")
@@ -244,8 +314,91 @@ class BybitClient:
             logger.error(f"Chyba při zadávání objednávky: {e}")
             return None
     
-    async def get_positions(self) -> List[Position]:
-        """Získá aktivní pozice"""
+    async def cancel_order(self, symbol: str, order_link_id: str) -> bool:
+        """Zruší objednávku podle klientského ID (False, pokud ji burza nezrušila)"""
+        params = {
+            "category": "linear",
+            "symbol": symbol,
+            "orderLinkId": order_link_id
+        }
+        
+        try:
+            await self._make_request("POST", "/v5/order/cancel", params, authenticated=True)
+            return True
+            
+        except Exception as e:
+            logger.error(f"Chyba při rušení objednávky {order_link_id}: {e}")
+            return False
+    
+    async def get_order(self, symbol: str, order_link_id: str) -> Optional[ExecutionEvent]:
+        """Aktuální stav objednávky podle klientského ID (None, pokud ji burza nezná)"""
+        params = {
+            "category": "linear",
+            "symbol": symbol,
+            "orderLinkId": order_link_id
+        }
+        
+        try:
+            data = await self._make_request("GET", "/v5/order/realtime", params, authenticated=True)
+            orders = data.get("list", [])
+            if not orders:
+                return None
+            
+            item = orders[0]
+            state = ORDER_STATUS_MAP.get(item.get("orderStatus"))
+            if state is None:
+                logger.warning(f"Neznámý stav objednávky {order_link_id}: {item.get('orderStatus')}")
+                return None
+            
+            avg_price = item.get("avgPrice")
+            return ExecutionEvent(
+                order_link_id=item.get("orderLinkId", order_link_id),
+                state=state,
+                filled_quantity=Decimal(item.get("cumExecQty") or "0"),
+                avg_fill_price=Decimal(avg_price) if avg_price else None,
+                exchange_order_id=item.get("orderId"),
+                timestamp=datetime.fromtimestamp(int(item.get("updatedTime") or time.time() * 1000) / 1000),
+                fee=Decimal(item.get("cumExecFee") or "0")
+            )
+            
+        except Exception as e:
+            logger.error(f"Chyba při získávání objednávky {order_link_id}: {e}")
+            return None
+    
+    async def set_trading_stop(
+        self,
+        symbol: str,
+        stop_loss: Optional[Decimal] = None,
+        take_profit: Optional[Decimal] = None
+    ) -> bool:
+        """Nastaví stop loss / take profit celé pozice symbolu"""
+        params = {
+            "category": "linear",
+            "symbol": symbol,
+            "tpslMode": "Full",
+            "positionIdx": 0
+        }
+        
+        if stop_loss is not None:
+            params["stopLoss"] = str(stop_loss)
+        
+        if take_profit is not None:
+            params["takeProfit"] = str(take_profit)
+        
+        try:
+            await self._make_request("POST", "/v5/position/trading-stop", params, authenticated=True)
+            return True
+            
+        except Exception as e:
+            logger.error(f"Chyba při nastavení stopu pro {symbol}: {e}")
+            return False
+    
+    async def get_positions(self, raise_errors: bool = False) -> List[Position]:
+        """Získá aktivní pozice
+
+        Chyba se standardně zaloguje a vrátí se prázdný seznam. S `raise_errors`
+        se propaguje - prázdný seznam pak vždy znamená, že pozice nejsou.
+        """
         params = {
             "category": "linear",
             "settleCoin": "USDT"
@@ -272,6 +425,8 @@ class BybitClient:
             return positions
             
         except Exception as e:
+            if raise_errors:
+                raise
             logger.error(f"Chyba při získávání pozic: {e}")
             return []
     
@@ -0,0 +1,115 @@
+import asyncio
+import json
+import logging
+from dataclasses import dataclass, asdict
+from decimal import Decimal
+from typing import Any, Callable, Dict, List
+
+import aiohttp
+
+
+logger = logging.getLogger(__name__)
+
+
+# Bybit přijme v jedné subscribe zprávě nejvýš 10 topiců
+SUBSCRIBE_BATCH = 10
+PING_INTERVAL = 20.0
+
+
+@dataclass
+class StreamStats:
+    """Čítače veřejného streamu"""
+    messages: int = 0
+    trades: int = 0
+    tickers: int = 0
+    reconnects: int = 0
+    errors: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class BybitPublicStream:
+    """Veřejný websocket stream Bybit v5 (linear) - obchody a tickery
+
+    Každá cena (poslední obchod z `publicTrade.*`, `lastPrice` z
+    `tickers.*`) jde do `on_price(symbol, cena, timestamp v sekundách)`.
+    Po výpadku spojení se stream znovu připojí s rostoucí pauzou
+    (nejvýš `max_backoff` sekund) a znovu přihlásí topicy.
+    """
+
+    def __init__(
+        self,
+        symbols: List[str],
+        on_price: Callable[[str, Decimal, float], Any],
+        testnet: bool = True,
+        max_backoff: float = 30.0
+    ):
+        self.symbols = list(dict.fromkeys(symbols))
+        self.on_price = on_price
+        self.max_backoff = max_backoff
+        if testnet:
+            self.url = "wss://stream-testnet.bybit.com/v5/public/linear"
+        else:
+            self.url = "wss://stream.bybit.com/v5/public/linear"
+        self._stats = StreamStats()
+
+    def topics(self) -> List[str]:
+        return [f"{kind}.{symbol}" for symbol in self.symbols for kind in ("publicTrade", "tickers")]
+
+    def handle_message(self, message: Dict[str, Any]) -> int:
+        """Zpracuje zprávu streamu (počet předaných cen)"""
+        self._stats.messages += 1
+        topic = message.get("topic", "")
+        data = message.get("data")
+        if topic.startswith("publicTrade.") and data:
+            # Obchody chodí po dávkách, stačí poslední cena dávky
+            trade = data[-1]
+            self._stats.trades += len(data)
+            self.on_price(trade["s"], Decimal(trade["p"]), int(trade["T"]) / 1000)
+            return 1
+        if topic.startswith("tickers.") and data and data.get("lastPrice"):
+            # Delta zprávy tickeru nemusí obsahovat lastPrice
+            self._stats.tickers += 1
+            self.on_price(data["symbol"], Decimal(data["lastPrice"]), int(message.get("ts", 0)) / 1000)
+            return 1
+        return 0
+
+    async def run(self) -> None:
+        """Drží spojení a zpracovává zprávy (do zrušení tasku)"""
+        backoff = 1.0
+        while True:
+            try:
+                async with aiohttp.ClientSession() as session:
+                    async with session.ws_connect(self.url, heartbeat=PING_INTERVAL) as ws:
+                        await self._subscribe(ws)
+                        logger.info(f"Stream připojen: {len(self.symbols)} symbolů")
+                        backoff = 1.0
+                        async for msg in ws:
+                            if msg.type == aiohttp.WSMsgType.TEXT:
+                                self._dispatch(msg.data)
+                            elif msg.type in (aiohttp.WSMsgType.ERROR, aiohttp.WSMsgType.CLOSED):
+                                break
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._stats.errors += 1
+                logger.warning(f"Stream odpojen: {e}")
+            self._stats.reconnects += 1
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, self.max_backoff)
+
+    def stats(self) -> Dict[str, Any]:
+        return self._stats.to_dict()
+
+    async def _subscribe(self, ws: aiohttp.ClientWebSocketResponse) -> None:
+        topics = self.topics()
+        for i in range(0, len(topics), SUBSCRIBE_BATCH):
+            await ws.send_json({"op": "subscribe", "args": topics[i:i + SUBSCRIBE_BATCH]})
+
+    def _dispatch(self, raw: str) -> None:
+        try:
+            self.handle_message(json.loads(raw))
+        except Exception as e:
+            self._stats.errors += 1
+            logger.error(f"Chyba při zpracování zprávy streamu: {e}")
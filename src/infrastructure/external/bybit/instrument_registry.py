@@ -0,0 +1,147 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, asdict, field
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Any, Dict, Optional
+
+from ....domain.models import Instrument
+from .bybit_client import BybitClient
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class InstrumentCheck:
+    """Výsledek kontroly objednávky proti parametrům kontraktu
+
+    `quantity` je množství zaokrouhlené na krok lotu - to se má odeslat.
+    """
+    quantity: Decimal
+    reason: str = ""
+
+    def __bool__(self) -> bool:
+        return not self.reason
+
+
+@dataclass
+class InstrumentStats:
+    """Čítače registru kontraktů"""
+    instruments: int = 0
+    refreshes: int = 0
+    refresh_errors: int = 0
+    checks: int = 0
+    rounded: int = 0
+    unknown_symbols: int = 0
+    rejected: int = 0
+    # důvod -> počet zamítnutí
+    rejections: Dict[str, int] = field(default_factory=dict)
+    loaded_at: Optional[float] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class InstrumentRegistry:
+    """Cache parametrů kontraktů - tick, krok lotu, min/max množství a notional
+
+    Načte se jedním stránkovaným průchodem v5 instruments-info (`load`) a
+    periodicky se obnovuje (`run`). Nová cache nahradí starou celá, při chybě
+    obnovy zůstává předchozí. Zaokrouhlení i kontrola jsou lokální, bez
+    dotazu na burzu. Symbol, který v cache není, projde beze změny -
+    rozhodne burza.
+    """
+
+    def __init__(self, bybit_client: BybitClient, page_size: int = 1000):
+        self.bybit_client = bybit_client
+        self.page_size = page_size
+        self._instruments: Dict[str, Instrument] = {}
+        self._stats = InstrumentStats()
+
+    def __len__(self) -> int:
+        return len(self._instruments)
+
+    def get(self, symbol: str) -> Optional[Instrument]:
+        return self._instruments.get(symbol)
+
+    async def load(self) -> bool:
+        """Načte parametry všech kontraktů (False při chybě, cache zůstane)"""
+        try:
+            instruments = await self.bybit_client.get_instruments(self.page_size, raise_errors=True)
+        except Exception as e:
+            self._stats.refresh_errors += 1
+            logger.error(f"Chyba při načítání parametrů kontraktů: {e}")
+            return False
+        if not instruments:
+            # Prázdná odpověď je spíš výpadek než konec všech kontraktů
+            self._stats.refresh_errors += 1
+            logger.warning("Burza nevrátila žádné kontrakty, ponechávám předchozí parametry")
+            return False
+        self._instruments = {instrument.symbol: instrument for instrument in instruments}
+        self._stats.refreshes += 1
+        self._stats.loaded_at = time.time()
+        logger.info(f"Načteny parametry {len(self._instruments)} kontraktů")
+        return True
+
+    async def run(self, interval: float) -> None:
+        """Obnovuje cache každých `interval` sekund (do zrušení tasku)"""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.load()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Chyba při obnově parametrů kontraktů: {e}")
+
+    def round_quantity(self, symbol: str, quantity: Decimal) -> Decimal:
+        """Množství zaokrouhlené dolů na krok lotu (neznámý symbol beze změny)"""
+        instrument = self._instruments.get(symbol)
+        return instrument.round_quantity(quantity) if instrument else quantity
+
+    def round_price(self, symbol: str, price: Decimal, rounding: str = ROUND_HALF_UP) -> Decimal:
+        """Cena zaokrouhlená na tick (neznámý symbol beze změny)"""
+        instrument = self._instruments.get(symbol)
+        return instrument.round_price(price, rounding) if instrument else price
+
+    def check_order(
+        self,
+        symbol: str,
+        quantity: Decimal,
+        price: Optional[Decimal] = None,
+        market: bool = True
+    ) -> InstrumentCheck:
+        """Zaokrouhlí množství a ověří limity kontraktu
+
+        Notional se počítá z `price` (u market objednávky cena signálu).
+        Bybit u linear kontraktů publikuje jen minimální notional - horní
+        mez hlídá maximální množství (u market objednávek `max_market_qty`).
+        """
+        self._stats.checks += 1
+        instrument = self._instruments.get(symbol)
+        if instrument is None:
+            self._stats.unknown_symbols += 1
+            return InstrumentCheck(quantity)
+
+        rounded = instrument.round_quantity(quantity)
+        if rounded != quantity:
+            self._stats.rounded += 1
+        if instrument.status != "Trading":
+            return self._reject(rounded, "not_trading")
+        if rounded <= 0 or rounded < instrument.min_qty:
+            return self._reject(rounded, "min_qty")
+        if rounded > (instrument.max_market_qty if market else instrument.max_qty):
+            return self._reject(rounded, "max_qty")
+        if price is not None and rounded * price < instrument.min_notional:
+            return self._reject(rounded, "min_notional")
+        return InstrumentCheck(rounded)
+
+    def stats(self) -> Dict[str, Any]:
+        self._stats.instruments = len(self._instruments)
+        return self._stats.to_dict()
+
+    def _reject(self, quantity: Decimal, reason: str) -> InstrumentCheck:
+        self._stats.rejected += 1
+        self._stats.rejections[reason] = self._stats.rejections.get(reason, 0) + 1
+        return InstrumentCheck(quantity, reason)
@@ -0,0 +1,113 @@
+import logging
+import time
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
+
+from ....domain.models import ExecutionEvent, OrderBook, OrderState, Position, TradeType
+from ..bybit.bybit_client import BybitClient
+from .paper_exchange import PaperExchange
+
+
+logger = logging.getLogger(__name__)
+
+
+class PaperBybitClient(BybitClient):
+    """BybitClient pro paper trading - tržní data živě, obchody na `PaperExchange`
+
+    Veřejné endpointy (svíčky, tickery, order book) jdou na Bybit beze
+    změny. Objednávky, pozice a zůstatek obsluhuje simulovaná burza. Před
+    párováním i před dotazem na stav objednávky se kniha symbolu obnoví,
+    pokud je starší než `book_max_age` sekund.
+    """
+
+    def __init__(
+        self,
+        exchange: PaperExchange,
+        testnet: bool = False,
+        book_depth: int = 50,
+        book_max_age: float = 1.0
+    ):
+        # Veřejná data nepotřebují API klíče
+        super().__init__(api_key="", api_secret="", testnet=testnet)
+        self.exchange = exchange
+        self.book_depth = book_depth
+        self.book_max_age = book_max_age
+        self._book_fetched: Dict[str, float] = {}
+
+    async def get_orderbook(self, symbol: str, limit: int = 25) -> Optional[OrderBook]:
+        """Získá order book a předá ho simulované burze"""
+        book = await super().get_orderbook(symbol, limit)
+        if book:
+            self.exchange.update_book(book)
+            self._book_fetched[symbol] = time.monotonic()
+        return book
+
+    async def place_order(
+        self,
+        symbol: str,
+        side: str,
+        qty: Decimal,
+        order_type: str = "Market",
+        price: Optional[Decimal] = None,
+        stop_loss: Optional[Decimal] = None,
+        take_profit: Optional[Decimal] = None,
+        order_link_id: Optional[str] = None,
+        reduce_only: bool = False
+    ) -> Optional[str]:
+        """Zadá objednávku na simulovanou burzu (pozice se nettují)"""
+        await self._refresh_book(symbol)
+        order = self.exchange.place_order(
+            symbol,
+            TradeType.BUY if side.lower() == "buy" else TradeType.SELL,
+            Decimal(str(qty)),
+            price=price if order_type != "Market" else None,
+            order_link_id=order_link_id,
+            stop_loss=stop_loss,
+            take_profit=take_profit,
+            reduce_only=reduce_only
+        )
+        if order.state == OrderState.REJECTED:
+            logger.error(
+                f"Paper objednávka {symbol} odmítnuta (chybí order book, neplatné množství "
+                f"nebo reduce-only bez pozice)"
+            )
+            return None
+        return order.order_id
+
+    async def cancel_order(self, symbol: str, order_link_id: str) -> bool:
+        """Zruší čekající simulovanou objednávku"""
+        order = self.exchange.get_order(order_link_id)
+        return order is not None and self.exchange.cancel_order(order.order_id)
+
+    async def get_order(self, symbol: str, order_link_id: str) -> Optional[ExecutionEvent]:
+        """Stav simulované objednávky"""
+        await self._refresh_book(symbol)
+        order = self.exchange.get_order(order_link_id)
+        return order.to_event() if order else None
+
+    async def set_trading_stop(
+        self,
+        symbol: str,
+        stop_loss: Optional[Decimal] = None,
+        take_profit: Optional[Decimal] = None
+    ) -> bool:
+        """Stop loss / take profit simulované pozice"""
+        return self.exchange.set_stops(symbol, stop_loss, take_profit)
+
+    async def get_positions(self, raise_errors: bool = False) -> List[Position]:
+        """Pozice simulované burzy"""
+        return self.exchange.get_positions()
+
+    async def get_account_balance(self) -> Decimal:
+        """Zůstatek simulovaného účtu"""
+        return self.exchange.balance
+
+    async def get_account_assets(self) -> List[Dict[str, Any]]:
+        """Jediný coin USDT simulovaného účtu"""
+        balance = str(self.exchange.balance)
+        return [{"coin": "USDT", "walletBalance": balance, "availableBalance": balance, "equity": balance}]
+
+    async def _refresh_book(self, symbol: str) -> None:
+        fetched = self._book_fetched.get(symbol)
+        if fetched is None or time.monotonic() - fetched > self.book_max_age:
+            await self.get_orderbook(symbol, self.book_depth)
@@ -0,0 +1,426 @@
+import itertools
+import logging
+from collections import deque
+from dataclasses import dataclass, asdict
+from decimal import Decimal
+from typing import Any, Deque, Dict, List, Optional
+
+from ....domain.models import ExecutionEvent, OrderBook, OrderState, Position, TradeType
+
+
+logger = logging.getLogger(__name__)
+
+
+# Výchozí poplatky Bybit linear (VIP 0)
+DEFAULT_TAKER_FEE = Decimal('0.00055')
+DEFAULT_MAKER_FEE = Decimal('0.0002')
+
+_ZERO = Decimal('0')
+_BPS = Decimal('0.0001')
+
+
+@dataclass
+class PaperFill:
+    """Jedno plnění simulované objednávky"""
+    order_id: str
+    symbol: str
+    side: TradeType
+    price: Decimal
+    quantity: Decimal
+    fee: Decimal
+    is_maker: bool
+    timestamp_ms: int
+
+
+@dataclass
+class PaperOrder:
+    """Simulovaná objednávka (limitní bez ceny = market)"""
+    order_id: str
+    order_link_id: str
+    symbol: str
+    side: TradeType
+    quantity: Decimal
+    price: Optional[Decimal] = None
+    state: OrderState = OrderState.ACKNOWLEDGED
+    filled_quantity: Decimal = _ZERO
+    # Součet cena * množství plnění (průměrná cena = notional / filled)
+    filled_notional: Decimal = _ZERO
+    fees: Decimal = _ZERO
+    stop_loss: Optional[Decimal] = None
+    take_profit: Optional[Decimal] = None
+    reduce_only: bool = False
+    # Zobrazené množství na cenové hladině před objednávkou a celé hladiny
+    queue_ahead: Decimal = _ZERO
+    level_quantity: Decimal = _ZERO
+    created_ms: int = 0
+    updated_ms: int = 0
+
+    @property
+    def remaining(self) -> Decimal:
+        return self.quantity - self.filled_quantity
+
+    @property
+    def avg_price(self) -> Optional[Decimal]:
+        return self.filled_notional / self.filled_quantity if self.filled_quantity else None
+
+    def to_event(self) -> ExecutionEvent:
+        return ExecutionEvent(
+            order_link_id=self.order_link_id,
+            state=self.state,
+            filled_quantity=self.filled_quantity,
+            avg_fill_price=self.avg_price,
+            exchange_order_id=self.order_id,
+            fee=self.fees
+        )
+
+
+@dataclass
+class PaperPosition:
+    """Čistá pozice symbolu (kladná velikost = long)"""
+    symbol: str
+    size: Decimal = _ZERO
+    # Vstupní notional otevřené části (bez dělení - uzavření celé pozice je přesné)
+    cost: Decimal = _ZERO
+    realized_pnl: Decimal = _ZERO
+    stop_loss: Optional[Decimal] = None
+    take_profit: Optional[Decimal] = None
+    opened_ms: int = 0
+
+    @property
+    def entry_price(self) -> Decimal:
+        return self.cost / abs(self.size) if self.size else _ZERO
+
+
+@dataclass
+class PaperExchangeStats:
+    """Čítače simulované burzy"""
+    orders: int = 0
+    rejected: int = 0
+    fills: int = 0
+    maker_fills: int = 0
+    stop_triggers: int = 0
+    fees_paid: Decimal = _ZERO
+
+    def to_dict(self) -> Dict[str, Any]:
+        result = asdict(self)
+        result["fees_paid"] = float(self.fees_paid)
+        return result
+
+
+class _Book:
+    """Lokální kopie L2 knihy - vlastní market plnění ji do dalšího snímku vyčerpávají"""
+
+    __slots__ = ("bids", "asks", "timestamp_ms")
+
+    def __init__(self, book: OrderBook):
+        self.bids: List[List[Decimal]] = [[price, qty] for price, qty in book.bids if qty > 0]
+        self.asks: List[List[Decimal]] = [[price, qty] for price, qty in book.asks if qty > 0]
+        self.timestamp_ms = int(book.timestamp.timestamp() * 1000)
+
+    def side(self, taker_side: TradeType) -> List[List[Decimal]]:
+        """Hladiny, proti kterým se plní taker daného směru"""
+        return self.asks if taker_side == TradeType.BUY else self.bids
+
+    @property
+    def mid(self) -> Optional[Decimal]:
+        if self.bids and self.asks:
+            return (self.bids[0][0] + self.asks[0][0]) / 2
+        return None
+
+    def level_quantity(self, side: TradeType, price: Decimal) -> Optional[Decimal]:
+        """Množství na hladině vlastní strany; None, pokud je cena mimo zobrazenou hloubku"""
+        levels = self.bids if side == TradeType.BUY else self.asks
+        if not levels:
+            return None
+        for level_price, qty in levels:
+            if level_price == price:
+                return qty
+        beyond = price < levels[-1][0] if side == TradeType.BUY else price > levels[-1][0]
+        return None if beyond else _ZERO
+
+
+class PaperExchange:
+    """Simulovaná burza: párování objednávek proti L2 knize
+
+    Knihu dodává `update_book()` (živá data nebo záznam snímků). Market
+    objednávka prochází hladiny protistrany (skluz plyne z hloubky knihy,
+    navíc `slippage_bps`), co se nevejde do zobrazené hloubky, se zruší.
+    Limitní objednávka nejdřív vezme, co jde za limitní cenu, zbytek čeká
+    ve frontě za množstvím zobrazeným na své hladině. Úbytek hladiny
+    v dalších snímcích nejdřív zkracuje frontu před objednávkou, pak ji
+    plní (částečná plnění); překřížení ceny ji doplní celou.
+
+    Stop loss / take profit z objednávky se nastaví na pozici a spouští se
+    středem knihy - pozici uzavře reduce-only market objednávka. Reduce-only
+    objednávka jen zmenšuje protisměrnou pozici: množství se omezí na její
+    velikost, nad plochou pozicí se odmítne. Pozice jsou čisté
+    (one-way) po symbolech, zůstatek = vklad + realizované PnL - poplatky.
+
+    Vše je synchronní a bez I/O, takže poslouží i jako model plnění backtestu.
+    """
+
+    def __init__(
+        self,
+        balance: Decimal = Decimal('10000'),
+        taker_fee: Decimal = DEFAULT_TAKER_FEE,
+        maker_fee: Decimal = DEFAULT_MAKER_FEE,
+        slippage_bps: Decimal = _ZERO,
+        fill_history: int = 10000
+    ):
+        self.initial_balance = Decimal(balance)
+        self.taker_fee = Decimal(taker_fee)
+        self.maker_fee = Decimal(maker_fee)
+        self.slippage_bps = Decimal(slippage_bps)
+        self.fills: Deque[PaperFill] = deque(maxlen=fill_history)
+        self.orders: Dict[str, PaperOrder] = {}
+        self.positions: Dict[str, PaperPosition] = {}
+        self._books: Dict[str, _Book] = {}
+        # symbol -> čekající limitní objednávky
+        self._resting: Dict[str, List[PaperOrder]] = {}
+        self._by_link_id: Dict[str, str] = {}
+        self._sequence = itertools.count(1)
+        self._stats = PaperExchangeStats()
+        self._realized = _ZERO
+
+    @property
+    def balance(self) -> Decimal:
+        """Zůstatek (vklad + realizované PnL - poplatky)"""
+        return self.initial_balance + self._realized - self._stats.fees_paid
+
+    def mid_price(self, symbol: str) -> Optional[Decimal]:
+        book = self._books.get(symbol)
+        return book.mid if book else None
+
+    def update_book(self, book: OrderBook) -> int:
+        """Nový snímek knihy: doplní čekající objednávky a spustí SL/TP (počet plnění)"""
+        fills_before = self._stats.fills
+        local = _Book(book)
+        self._books[book.symbol] = local
+
+        for order in list(self._resting.get(book.symbol, ())):
+            self._update_resting(order, local)
+        self._check_triggers(book.symbol, local)
+        return self._stats.fills - fills_before
+
+    def place_order(
+        self,
+        symbol: str,
+        side: TradeType,
+        quantity: Decimal,
+        price: Optional[Decimal] = None,
+        order_link_id: Optional[str] = None,
+        stop_loss: Optional[Decimal] = None,
+        take_profit: Optional[Decimal] = None,
+        reduce_only: bool = False
+    ) -> PaperOrder:
+        """Zadá objednávku (bez `price` market) a hned ji spáruje"""
+        book = self._books.get(symbol)
+        now = book.timestamp_ms if book else 0
+        order_id = f"paper-{next(self._sequence)}"
+        order = PaperOrder(
+            order_id=order_id, order_link_id=order_link_id or order_id, symbol=symbol, side=side,
+            quantity=Decimal(quantity), price=price, stop_loss=stop_loss, take_profit=take_profit,
+            reduce_only=reduce_only, created_ms=now, updated_ms=now
+        )
+        if reduce_only:
+            order.quantity = min(order.quantity, self._reducible(order))
+        self.orders[order_id] = order
+        self._by_link_id[order.order_link_id] = order_id
+        self._stats.orders += 1
+
+        if book is None or order.quantity <= 0 or (price is not None and price <= 0):
+            order.state = OrderState.REJECTED
+            self._stats.rejected += 1
+            return order
+
+        self._take(order, book, limit=price)
+        if order.remaining <= 0:
+            return order
+        if price is None:
+            # Market objednávka nad zobrazenou hloubku - zbytek se zruší
+            order.state = OrderState.CANCELLED
+            return order
+
+        level = book.level_quantity(side, price) or _ZERO
+        order.queue_ahead = level
+        order.level_quantity = level
+        self._resting.setdefault(symbol, []).append(order)
+        return order
+
+    def cancel_order(self, order_id: str) -> bool:
+        """Zruší čekající objednávku"""
+        order = self.orders.get(order_id)
+        if order is None or order not in self._resting.get(order.symbol, ()):
+            return False
+        self._resting[order.symbol].remove(order)
+        order.state = OrderState.CANCELLED
+        return True
+
+    def set_stops(
+        self,
+        symbol: str,
+        stop_loss: Optional[Decimal] = None,
+        take_profit: Optional[Decimal] = None
+    ) -> bool:
+        """Změní SL/TP otevřené pozice (None = beze změny)"""
+        position = self.positions.get(symbol)
+        if position is None or position.size == 0:
+            return False
+        if stop_loss is not None:
+            position.stop_loss = stop_loss
+        if take_profit is not None:
+            position.take_profit = take_profit
+        return True
+
+    def get_order(self, order_link_id: str) -> Optional[PaperOrder]:
+        order_id = self._by_link_id.get(order_link_id)
+        return self.orders.get(order_id) if order_id else None
+
+    def get_positions(self) -> List[Position]:
+        """Otevřené pozice jako doménové `Position` (ocenění středem knihy)"""
+        positions = []
+        for position in self.positions.values():
+            if position.size == 0:
+                continue
+            size = abs(position.size)
+            mark = self.mid_price(position.symbol) or position.entry_price
+            direction = 1 if position.size > 0 else -1
+            positions.append(Position(
+                symbol=position.symbol,
+                side=TradeType.BUY if direction > 0 else TradeType.SELL,
+                size=size,
+                entry_price=position.entry_price,
+                current_price=mark,
+                unrealized_pnl=(mark - position.entry_price) * size * direction,
+                margin=position.entry_price * size
+            ))
+        return positions
+
+    def stats(self) -> Dict[str, Any]:
+        result = self._stats.to_dict()
+        result["balance"] = float(self.balance)
+        result["resting_orders"] = sum(len(orders) for orders in self._resting.values())
+        return result
+
+    def _reducible(self, order: PaperOrder) -> Decimal:
+        """Velikost protisměrné pozice, kterou může objednávka zmenšit"""
+        position = self.positions.get(order.symbol)
+        if position is None or position.size == 0 or (position.size > 0) == (order.side == TradeType.BUY):
+            return _ZERO
+        return abs(position.size)
+
+    def _take(self, order: PaperOrder, book: _Book, limit: Optional[Decimal]) -> None:
+        """Plní objednávku jako taker proti hladinám protistrany až po `limit`"""
+        levels = book.side(order.side)
+        buy = order.side == TradeType.BUY
+        slippage = self.slippage_bps * _BPS
+        while levels and order.remaining > 0:
+            level = levels[0]
+            if limit is not None and (level[0] > limit if buy else level[0] < limit):
+                break
+            quantity = min(order.remaining, level[1])
+            price = level[0] * (1 + slippage) if buy else level[0] * (1 - slippage)
+            self._fill(order, price, quantity, is_maker=False, timestamp_ms=book.timestamp_ms)
+            level[1] -= quantity
+            if level[1] <= 0:
+                levels.pop(0)
+
+    def _update_resting(self, order: PaperOrder, book: _Book) -> None:
+        """Posune frontu čekající objednávky podle nového snímku"""
+        if order.reduce_only:
+            # Pozice se mezitím zmenšila (jiná objednávka, SL/TP) - zbytek nesmí otevřít novou
+            reducible = self._reducible(order)
+            if reducible <= 0:
+                self._resting[order.symbol].remove(order)
+                order.state = OrderState.CANCELLED
+                return
+            order.quantity = order.filled_quantity + min(order.remaining, reducible)
+
+        opposite = book.side(order.side)
+        buy = order.side == TradeType.BUY
+        if opposite and (opposite[0][0] <= order.price if buy else opposite[0][0] >= order.price):
+            # Cena prošla přes limit - doplní se celá za svou cenu
+            self._fill(order, order.price, order.remaining, is_maker=True, timestamp_ms=book.timestamp_ms)
+        else:
+            level = book.level_quantity(order.side, order.price)
+            if level is None:
+                # Hladina mimo zobrazenou hloubku - o frontě nic nevíme
+                return
+            decrease = max(_ZERO, order.level_quantity - level)
+            from_queue = min(order.queue_ahead, decrease)
+            order.queue_ahead -= from_queue
+            order.level_quantity = level
+            filled = min(order.remaining, decrease - from_queue)
+            if filled > 0:
+                self._fill(order, order.price, filled, is_maker=True, timestamp_ms=book.timestamp_ms)
+
+        if order.remaining <= 0:
+            self._resting[order.symbol].remove(order)
+
+    def _fill(self, order: PaperOrder, price: Decimal, quantity: Decimal, is_maker: bool, timestamp_ms: int) -> None:
+        fee = price * quantity * (self.maker_fee if is_maker else self.taker_fee)
+        order.filled_quantity += quantity
+        order.filled_notional += price * quantity
+        order.fees += fee
+        order.updated_ms = timestamp_ms
+        order.state = OrderState.FILLED if order.remaining <= 0 else OrderState.PARTIALLY_FILLED
+
+        self._stats.fills += 1
+        self._stats.fees_paid += fee
+        if is_maker:
+            self._stats.maker_fills += 1
+        self.fills.append(PaperFill(order.order_id, order.symbol, order.side, price, quantity, fee, is_maker, timestamp_ms))
+        self._apply_to_position(order, price, quantity, timestamp_ms)
+
+    def _apply_to_position(self, order: PaperOrder, price: Decimal, quantity: Decimal, timestamp_ms: int) -> None:
+        position = self.positions.get(order.symbol)
+        if position is None:
+            position = self.positions[order.symbol] = PaperPosition(order.symbol)
+
+        signed = quantity if order.side == TradeType.BUY else -quantity
+        if position.size == 0 or (position.size > 0) == (signed > 0):
+            # Otevření nebo navýšení
+            if position.size == 0:
+                position.opened_ms = timestamp_ms
+            position.cost += price * quantity
+            position.size += signed
+        else:
+            size = abs(position.size)
+            closing = min(size, quantity)
+            direction = 1 if position.size > 0 else -1
+            released = position.cost if closing == size else position.cost * closing / size
+            pnl = (price * closing - released) * direction
+            position.realized_pnl += pnl
+            self._realized += pnl
+            position.cost -= released
+            position.size += signed
+            if position.size == 0:
+                position.stop_loss = position.take_profit = None
+            elif (position.size > 0) != (direction > 0):
+                # Přetočení pozice - zbytek otevřen za cenu plnění
+                position.cost = price * abs(position.size)
+                position.opened_ms = timestamp_ms
+                position.stop_loss = position.take_profit = None
+
+        if position.size != 0:
+            if order.stop_loss is not None:
+                position.stop_loss = order.stop_loss
+            if order.take_profit is not None:
+                position.take_profit = order.take_profit
+
+    def _check_triggers(self, symbol: str, book: _Book) -> None:
+        position = self.positions.get(symbol)
+        mid = book.mid
+        if position is None or position.size == 0 or mid is None:
+            return
+        long = position.size > 0
+        stop_hit = position.stop_loss is not None and (mid <= position.stop_loss if long else mid >= position.stop_loss)
+        target_hit = position.take_profit is not None and (
+            mid >= position.take_profit if long else mid <= position.take_profit
+        )
+        if not (stop_hit or target_hit):
+            return
+
+        self._stats.stop_triggers += 1
+        logger.info(f"Paper {symbol}: {'stop loss' if stop_hit else 'take profit'} spuštěn na {mid}")
+        self.place_order(symbol, TradeType.SELL if long else TradeType.BUY, abs(position.size), reduce_only=True)
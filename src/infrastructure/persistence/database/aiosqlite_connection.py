@@ -0,0 +1,207 @@
+import asyncio
+import logging
+import os
+import sqlite3
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional, Sequence, TypeVar
+
+import aiosqlite
+
+from .sqlite_migrations import ensure_schema_at_path
+from .sqlite_schema import SCHEMA, SCHEMA_VERSION
+from .unit_of_work import current_unit
+
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+
+class AiosqliteDatabase:
+    """Dlouho žijící aiosqlite připojení sdílená všemi async repository
+
+    aiosqlite drží připojení na vlastním vlákně a dotazy mu předává frontou,
+    takže se nesoutěží o výchozí thread pool event loopu. Zápisy se
+    serializují zámkem a každý `transaction()` blok je jedna transakce.
+    Čtení jdou přes samostatné read-only připojení (WAL), takže stejně jako
+    u `SqliteConnectionManager` nevidí rozpracovanou transakci zápisu ani
+    unit of work. Řádky vrací postupně `stream` (async kurzor), bez načtení
+    celé sady do paměti. In-memory databáze má jediné připojení, čtení se
+    proto řadí za zápisový zámek.
+
+    Schéma se před otevřením připojení vytvoří nebo zmigruje
+    (`sqlite_migrations`). Instance se sdílí pro stejný soubor přes `for_path`.
+    """
+
+    _instances: Dict[str, 'AiosqliteDatabase'] = {}
+
+    def __init__(
+        self,
+        db_path: str,
+        auto_migrate: bool = True,
+        cache_size_kib: int = 64 * 1024,
+        mmap_size: int = 256 * 1024 * 1024,
+        busy_timeout_ms: int = 5000
+    ):
+        self.db_path = db_path
+        self.auto_migrate = auto_migrate
+        self.cache_size_kib = cache_size_kib
+        self.mmap_size = mmap_size
+        self.busy_timeout_ms = busy_timeout_ms
+
+        self._conn: Optional[aiosqlite.Connection] = None
+        self._reader: Optional[aiosqlite.Connection] = None
+        self._connect_lock = asyncio.Lock()
+        self._write_lock = asyncio.Lock()
+        # Počet zápisových transakcí (commitů)
+        self.write_transactions = 0
+
+    @classmethod
+    def for_path(cls, db_path: str, auto_migrate: bool = True) -> 'AiosqliteDatabase':
+        """Vrátí sdílenou databázi pro daný soubor"""
+        key = db_path if db_path == ":memory:" else os.path.abspath(db_path)
+        database = cls._instances.get(key)
+        if database is None:
+            database = cls(db_path, auto_migrate)
+            cls._instances[key] = database
+        return database
+
+    @classmethod
+    async def close_all(cls) -> None:
+        """Uzavře všechna sdílená připojení"""
+        databases = list(cls._instances.values())
+        cls._instances.clear()
+        for database in databases:
+            await database.close()
+
+    async def connection(self) -> aiosqlite.Connection:
+        """Vrátí otevřené připojení (při prvním volání ho vytvoří)"""
+        if self._conn is None:
+            async with self._connect_lock:
+                if self._conn is None:
+                    self._conn = await self._connect()
+        return self._conn
+
+    @asynccontextmanager
+    async def reading(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Připojení pro čtení - jen commitnutá data"""
+        if self.db_path == ":memory:":
+            conn = await self.connection()
+            async with self._write_lock:
+                yield conn
+            return
+        if self._reader is None:
+            await self.connection()
+            async with self._connect_lock:
+                if self._reader is None:
+                    self._reader = await self._open(query_only=True)
+        yield self._reader
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Zápisová transakce - commit při úspěchu, rollback při výjimce"""
+        conn = await self.connection()
+        async with self._write_lock:
+            try:
+                yield conn
+            except BaseException:
+                await conn.rollback()
+                raise
+            else:
+                await conn.commit()
+                self.write_transactions += 1
+
+    async def unit_write(self, fn: Callable[[aiosqlite.Connection], Awaitable[T]]) -> Optional[T]:
+        """Zápis, který se v otevřené unit of work jen zařadí do její transakce
+
+        Mimo unit of work běží ve vlastní transakci. Uvnitř vrací None.
+        """
+        unit = current_unit()
+        if unit is None:
+            async with self.transaction() as conn:
+                return await fn(conn)
+        unit.defer(self, fn)
+        return None
+
+    async def run_unit(self, fns: List[Callable[[aiosqlite.Connection], Awaitable[Any]]]) -> None:
+        """Provede odložené zápisy unit of work jednou transakcí"""
+        async with self.transaction() as conn:
+            for fn in fns:
+                await fn(conn)
+
+    async def execute_write(self, sql: str, params: Iterable[Any] = ()) -> int:
+        """Provede jeden zápisový příkaz v transakci a vrátí počet změněných řádků"""
+        async with self.transaction() as conn:
+            cursor = await conn.execute(sql, tuple(params))
+            rowcount = cursor.rowcount
+            await cursor.close()
+            return rowcount
+
+    async def execute_many(self, sql: str, params: Sequence[Iterable[Any]]) -> None:
+        """Provede příkaz pro všechny sady parametrů v jedné transakci"""
+        if not params:
+            return
+        async with self.transaction() as conn:
+            await conn.executemany(sql, params)
+
+    async def fetch_one(self, sql: str, params: Iterable[Any] = ()) -> Optional[sqlite3.Row]:
+        """Vrátí první řádek výsledku"""
+        async with self.reading() as conn:
+            async with conn.execute(sql, tuple(params)) as cursor:
+                return await cursor.fetchone()
+
+    async def stream(self, sql: str, params: Iterable[Any] = ()) -> AsyncIterator[sqlite3.Row]:
+        """Postupně vrací řádky výsledku z async kurzoru"""
+        if self.db_path == ":memory:":
+            # Zámek se nesmí držet přes yield - volající může mezi řádky zapisovat
+            async with self.reading() as conn:
+                async with conn.execute(sql, tuple(params)) as cursor:
+                    rows = await cursor.fetchall()
+            for row in rows:
+                yield row
+            return
+        async with self.reading() as conn:
+            async with conn.execute(sql, tuple(params)) as cursor:
+                async for row in cursor:
+                    yield row
+
+    async def close(self) -> None:
+        """Uzavře připojení"""
+        connections = [conn for conn in (self._reader, self._conn) if conn is not None]
+        self._reader = self._conn = None
+        for conn in connections:
+            try:
+                await conn.close()
+            except sqlite3.Error as e:
+                logger.warning(f"Chyba při zavírání aiosqlite připojení: {e}")
+
+    async def _connect(self) -> aiosqlite.Connection:
+        if self.db_path != ":memory:":
+            # Migrace běží jednorázově přes synchronní připojení mimo event loop
+            await asyncio.get_event_loop().run_in_executor(
+                None, ensure_schema_at_path, self.db_path, self.auto_migrate
+            )
+        return await self._open()
+
+    async def _open(self, query_only: bool = False) -> aiosqlite.Connection:
+        connector = aiosqlite.connect(self.db_path, timeout=self.busy_timeout_ms / 1000)
+        # Vlákno připojení nesmí blokovat ukončení procesu, když se zapomene zavřít
+        connector.daemon = True
+        conn = await connector
+        conn.row_factory = sqlite3.Row
+        if self.db_path != ":memory:":
+            await conn.execute("PRAGMA journal_mode=WAL")
+        await conn.execute("PRAGMA synchronous=NORMAL")
+        await conn.execute(f"PRAGMA cache_size=-{int(self.cache_size_kib)}")
+        await conn.execute(f"PRAGMA mmap_size={int(self.mmap_size)}")
+        await conn.execute("PRAGMA temp_store=MEMORY")
+        await conn.execute(f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}")
+        if query_only:
+            await conn.execute("PRAGMA query_only=ON")
+        elif self.db_path == ":memory:":
+            # In-memory databáze je vždy nová, stačí vytvořit aktuální schéma
+            for statement in SCHEMA:
+                await conn.execute(statement)
+            await conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            await conn.commit()
+        return conn
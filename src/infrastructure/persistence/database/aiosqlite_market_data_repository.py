@@ -0,0 +1,143 @@
+from typing import Iterable, List, Optional
+from datetime import datetime
+
+from ....domain.models import Candle, Ticker, OrderBook, OrderBookArray
+from ....domain.repositories import IMarketDataRepository
+from .aiosqlite_connection import AiosqliteDatabase
+from .order_book_codec import OrderBookEncoder, decode_series
+from .sqlite_schema import (
+    UPSERT_CANDLE, INSERT_TICKER, INSERT_ORDER_BOOK, UPSERT_ORDER_BOOK_SNAPSHOT,
+    LATEST_ORDER_BOOK_SNAPSHOT_TS, order_book_snapshots_query, to_epoch_ms,
+    candle_to_params, row_to_candle, ticker_to_params, row_to_ticker,
+    order_book_to_params, row_to_order_book
+)
+
+
+class AiosqliteMarketDataRepository(IMarketDataRepository):
+    """Nativně asynchronní market data repository nad aiosqlite"""
+
+    def __init__(self, db_path: str, auto_migrate: bool = True, order_book_keyframe_interval: int = 100):
+        self.db_path = db_path
+        self._db = AiosqliteDatabase.for_path(db_path, auto_migrate)
+        self._order_book_encoder = OrderBookEncoder(order_book_keyframe_interval)
+
+    async def save_candle(self, candle: Candle) -> None:
+        """Uloží svíčku do databáze"""
+        await self._db.execute_write(UPSERT_CANDLE, candle_to_params(candle))
+
+    async def save_candles(self, candles: Iterable[Candle]) -> None:
+        """Uloží svíčky jedním executemany v jedné transakci"""
+        await self._db.execute_many(UPSERT_CANDLE, [candle_to_params(candle) for candle in candles])
+
+    async def get_candles(
+        self,
+        symbol: str,
+        start_time: datetime,
+        end_time: datetime,
+        limit: Optional[int] = None,
+        interval: str = "15"
+    ) -> List[Candle]:
+        """Získá historická OHLCV data"""
+        query = """
+            SELECT * FROM candles
+            WHERE symbol = ? AND interval = ? AND ts BETWEEN ? AND ?
+            ORDER BY ts ASC
+        """
+        params = [symbol, interval, to_epoch_ms(start_time), to_epoch_ms(end_time)]
+
+        if limit:
+            query += " LIMIT ?"
+            params.append(limit)
+
+        return [row_to_candle(row) async for row in self._db.stream(query, params)]
+
+    async def get_latest_candles(self, symbol: str, count: int = 100, interval: str = "15") -> List[Candle]:
+        """Získá posledních N svíček"""
+        candles = [
+            row_to_candle(row)
+            async for row in self._db.stream("""
+                SELECT * FROM candles
+                WHERE symbol = ? AND interval = ?
+                ORDER BY ts DESC
+                LIMIT ?
+            """, (symbol, interval, count))
+        ]
+
+        # Vrať v chronologickém pořadí
+        candles.reverse()
+        return candles
+
+    async def save_ticker(self, ticker: Ticker) -> None:
+        """Uloží ticker data"""
+        await self._db.execute_write(INSERT_TICKER, ticker_to_params(ticker))
+
+    async def save_tickers(self, tickers: Iterable[Ticker]) -> None:
+        """Uloží tickery jedním executemany v jedné transakci"""
+        await self._db.execute_many(INSERT_TICKER, [ticker_to_params(ticker) for ticker in tickers])
+
+    async def get_latest_ticker(self, symbol: str) -> Optional[Ticker]:
+        """Získá nejnovější ticker pro symbol"""
+        row = await self._db.fetch_one("""
+            SELECT * FROM tickers
+            WHERE symbol = ?
+            ORDER BY ts DESC
+            LIMIT 1
+        """, (symbol,))
+
+        if row:
+            return row_to_ticker(row)
+        return None
+
+    async def save_order_book(self, order_book: OrderBook) -> None:
+        """Uloží order book (top of book a snapshot plné hloubky)"""
+        await self.save_order_books([order_book])
+
+    async def save_order_books(self, order_books: Iterable[OrderBook]) -> None:
+        """Uloží order booky a jejich snapshoty v jedné transakci"""
+        order_books = list(order_books)
+        if not order_books:
+            return
+        params = [order_book_to_params(order_book) for order_book in order_books]
+        try:
+            snapshots = [self._order_book_encoder.encode(order_book) for order_book in order_books]
+            async with self._db.transaction() as conn:
+                await conn.executemany(INSERT_ORDER_BOOK, params)
+                await conn.executemany(UPSERT_ORDER_BOOK_SNAPSHOT, [s for s in snapshots if s is not None])
+        except BaseException:
+            # Transakce se vrátila, další snapshot symbolu musí být keyframe
+            self._order_book_encoder.reset({order_book.symbol for order_book in order_books})
+            raise
+
+    async def get_latest_order_book(self, symbol: str) -> Optional[OrderBook]:
+        """Získá nejnovější order book (plnou hloubku, pokud je uložená)"""
+        latest = (await self._db.fetch_one(LATEST_ORDER_BOOK_SNAPSHOT_TS, (symbol,)))[0]
+        if latest is not None:
+            history = await self._snapshots(symbol, latest, latest)
+            if len(history):
+                return history.to_order_book(len(history) - 1)
+
+        row = await self._db.fetch_one("""
+            SELECT * FROM order_books
+            WHERE symbol = ?
+            ORDER BY ts DESC
+            LIMIT 1
+        """, (symbol,))
+
+        if row:
+            # Starší data bez snapshotu - pouze best bid/ask
+            return row_to_order_book(row)
+        return None
+
+    async def get_order_book_history(
+        self,
+        symbol: str,
+        start_time: datetime,
+        end_time: datetime
+    ) -> OrderBookArray:
+        """Řada snapshotů plné hloubky v časovém rozsahu (včetně hranic)"""
+        start_ms = to_epoch_ms(start_time)
+        return (await self._snapshots(symbol, start_ms, to_epoch_ms(end_time))).since(start_ms)
+
+    async def _snapshots(self, symbol: str, start_ms: int, end_ms: int) -> OrderBookArray:
+        sql, args = order_book_snapshots_query(symbol, start_ms, end_ms)
+        return decode_series(symbol, [(row[0], row[1]) async for row in self._db.stream(sql, args)])
@@ -0,0 +1,33 @@
+from typing import List, Optional
+
+from ....domain.models import StrategyMetrics
+from ....domain.repositories import IStrategyMetricsRepository
+from .aiosqlite_connection import AiosqliteDatabase
+from .sqlite_schema import UPSERT_STRATEGY_METRICS, strategy_metrics_to_params, row_to_strategy_metrics
+
+
+class AiosqliteStrategyMetricsRepository(IStrategyMetricsRepository):
+    """Nativně asynchronní repository metrik strategií nad aiosqlite"""
+
+    def __init__(self, db_path: str, auto_migrate: bool = True):
+        self.db_path = db_path
+        self._db = AiosqliteDatabase.for_path(db_path, auto_migrate)
+
+    async def save_metrics(self, metrics: StrategyMetrics) -> StrategyMetrics:
+        """Uloží metriky strategie"""
+        await self._db.execute_write(UPSERT_STRATEGY_METRICS, strategy_metrics_to_params(metrics))
+        return metrics
+
+    async def get_metrics(self, strategy_name: str) -> Optional[StrategyMetrics]:
+        """Najde metriky strategie"""
+        row = await self._db.fetch_one("SELECT * FROM strategy_metrics WHERE strategy_name = ?", (strategy_name,))
+        if row:
+            return row_to_strategy_metrics(row)
+        return None
+
+    async def get_all_metrics(self) -> List[StrategyMetrics]:
+        """Najde metriky všech strategií"""
+        return [
+            row_to_strategy_metrics(row)
+            async for row in self._db.stream("SELECT * FROM strategy_metrics ORDER BY strategy_name")
+        ]
@@ -0,0 +1,211 @@
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence
+from datetime import date, datetime
+
+import aiosqlite
+
+from ....domain.models import Trade, Position, TradeStatus, PnlSummary
+from ....domain.repositories import ITradeRepository, IPositionRepository
+from ....domain.services.id_generator import new_trade_id
+from .aiosqlite_connection import AiosqliteDatabase
+from .sqlite_schema import (
+    INSERT_TRADE, UPDATE_TRADE, UPSERT_POSITION, trade_page_query, page_cursor,
+    pnl_summary_query, row_to_pnl_summary,
+    trade_to_params, trade_update_params, row_to_trade, position_to_params, row_to_position
+)
+
+
+async def _execute(conn: aiosqlite.Connection, sql: str, params: Sequence[Any]) -> int:
+    """Provede zápisový příkaz a vrátí počet změněných řádků"""
+    async with conn.execute(sql, tuple(params)) as cursor:
+        return cursor.rowcount
+
+
+class AiosqliteTradeRepository(ITradeRepository):
+    """Nativně asynchronní trade repository nad aiosqlite"""
+
+    def __init__(self, db_path: str, auto_migrate: bool = True):
+        self.db_path = db_path
+        self._db = AiosqliteDatabase.for_path(db_path, auto_migrate)
+
+    async def save_trade(self, trade: Trade) -> Trade:
+        """Uloží nový obchod do databáze (existující ID vyvolá IntegrityError)"""
+        if not trade.id:
+            trade.id = new_trade_id()
+
+        if not trade.created_at:
+            trade.created_at = datetime.now()
+
+        params = trade_to_params(trade)
+        await self._db.unit_write(lambda conn: _execute(conn, INSERT_TRADE, params))
+        return trade
+
+    async def get_trade_by_id(self, trade_id: str) -> Optional[Trade]:
+        """Najde obchod podle ID"""
+        row = await self._db.fetch_one("SELECT * FROM trades WHERE id = ?", (trade_id,))
+        if row:
+            return row_to_trade(row)
+        return None
+
+    async def get_trades_by_symbol(self, symbol: str) -> List[Trade]:
+        """Najde všechny obchody pro daný symbol"""
+        return await self._fetch_trades("SELECT * FROM trades WHERE symbol = ? ORDER BY created_at DESC, id DESC", (symbol,))
+
+    async def get_trades_by_strategy(self, strategy_name: str) -> List[Trade]:
+        """Najde všechny obchody pro danou strategii"""
+        return await self._fetch_trades("SELECT * FROM trades WHERE strategy_name = ? ORDER BY created_at DESC, id DESC", (strategy_name,))
+
+    async def get_trades_by_date_range(self, start_date: datetime, end_date: datetime) -> List[Trade]:
+        """Najde obchody v daném časovém rozmezí"""
+        return await self._fetch_trades(
+            "SELECT * FROM trades WHERE created_at BETWEEN ? AND ? ORDER BY created_at DESC, id DESC",
+            (start_date, end_date)
+        )
+
+    async def get_open_trades(self) -> List[Trade]:
+        """Najde všechny otevřené obchody"""
+        return await self._fetch_trades("SELECT * FROM trades WHERE status = ? ORDER BY created_at DESC, id DESC", (TradeStatus.OPEN.value,))
+
+    async def iter_trades_by_symbol(self, symbol: str, page_size: int = 500) -> AsyncIterator[Trade]:
+        """Postupně vrací obchody pro daný symbol"""
+        async for trade in self._iter_pages("symbol = ?", (symbol,), page_size):
+            yield trade
+
+    async def iter_trades_by_strategy(self, strategy_name: str, page_size: int = 500) -> AsyncIterator[Trade]:
+        """Postupně vrací obchody pro danou strategii"""
+        async for trade in self._iter_pages("strategy_name = ?", (strategy_name,), page_size):
+            yield trade
+
+    async def iter_trades_by_date_range(
+        self,
+        start_date: datetime,
+        end_date: datetime,
+        page_size: int = 500
+    ) -> AsyncIterator[Trade]:
+        """Postupně vrací obchody v daném časovém rozmezí"""
+        async for trade in self._iter_pages("created_at BETWEEN ? AND ?", (start_date, end_date), page_size):
+            yield trade
+
+    async def iter_open_trades(self, page_size: int = 500) -> AsyncIterator[Trade]:
+        """Postupně vrací otevřené obchody"""
+        async for trade in self._iter_pages("status = ?", (TradeStatus.OPEN.value,), page_size):
+            yield trade
+
+    async def _iter_pages(self, where: str, params: Sequence[Any], page_size: int) -> AsyncIterator[Trade]:
+        """Keyset stránkování - kurzor se nedrží otevřený mezi stránkami"""
+        after = None
+        while True:
+            sql, args = trade_page_query(where, params, after, page_size)
+            last_row = None
+            count = 0
+            async for row in self._db.stream(sql, args):
+                last_row = row
+                count += 1
+                yield row_to_trade(row)
+            if count < page_size:
+                return
+            after = page_cursor(last_row)
+            if after is None:
+                return
+
+    async def get_pnl_summary(
+        self,
+        start_day: Optional[date] = None,
+        end_day: Optional[date] = None,
+        symbol: Optional[str] = None,
+        strategy_name: Optional[str] = None
+    ) -> PnlSummary:
+        """Souhrn PnL za období, volitelně pro jeden symbol nebo strategii"""
+        sql, args = pnl_summary_query(start_day, end_day, symbol, strategy_name)
+        return row_to_pnl_summary(await self._db.fetch_one(sql, args))
+
+    async def get_daily_pnl(
+        self,
+        start_day: Optional[date] = None,
+        end_day: Optional[date] = None
+    ) -> Dict[date, PnlSummary]:
+        """Souhrn PnL za období po dnech"""
+        by_day = await self._grouped_pnl("day", start_day, end_day)
+        return {date.fromisoformat(day): summary for day, summary in by_day.items() if day}
+
+    async def get_pnl_by_symbol(
+        self,
+        start_day: Optional[date] = None,
+        end_day: Optional[date] = None
+    ) -> Dict[str, PnlSummary]:
+        """Souhrn PnL za období po symbolech"""
+        return await self._grouped_pnl("symbol", start_day, end_day)
+
+    async def get_pnl_by_strategy(
+        self,
+        start_day: Optional[date] = None,
+        end_day: Optional[date] = None
+    ) -> Dict[str, PnlSummary]:
+        """Souhrn PnL za období po strategiích"""
+        return await self._grouped_pnl("strategy", start_day, end_day)
+
+    async def _grouped_pnl(
+        self,
+        group_by: str,
+        start_day: Optional[date],
+        end_day: Optional[date]
+    ) -> Dict[str, PnlSummary]:
+        sql, args = pnl_summary_query(start_day, end_day, group_by=group_by)
+        return {row['key']: row_to_pnl_summary(row) async for row in self._db.stream(sql, args)}
+
+    async def update_trade(self, trade: Trade) -> Trade:
+        """Aktualizuje existující obchod"""
+        params = trade_update_params(trade)
+
+        async def _update(conn: aiosqlite.Connection):
+            if await _execute(conn, UPDATE_TRADE, params) == 0:
+                raise ValueError(f"Obchod {trade.id} neexistuje")
+
+        await self._db.unit_write(_update)
+        return trade
+
+    async def delete_trade(self, trade_id: str) -> bool:
+        """Smaže obchod"""
+        # V unit of work je výsledek známý až po commitu
+        deleted = await self._db.unit_write(lambda conn: _execute(conn, "DELETE FROM trades WHERE id = ?", (trade_id,)))
+        return deleted is None or deleted > 0
+
+    async def _fetch_trades(self, sql: str, params: tuple) -> List[Trade]:
+        return [row_to_trade(row) async for row in self._db.stream(sql, params)]
+
+
+class AiosqlitePositionRepository(IPositionRepository):
+    """Nativně asynchronní position repository nad aiosqlite"""
+
+    def __init__(self, db_path: str, auto_migrate: bool = True):
+        self.db_path = db_path
+        self._db = AiosqliteDatabase.for_path(db_path, auto_migrate)
+
+    async def save_position(self, position: Position) -> Position:
+        """Uloží pozici"""
+        params = position_to_params(position)
+        await self._db.unit_write(lambda conn: _execute(conn, UPSERT_POSITION, params))
+        return position
+
+    async def get_position_by_symbol(self, symbol: str) -> Optional[Position]:
+        """Najde pozici pro symbol"""
+        row = await self._db.fetch_one("SELECT * FROM positions WHERE symbol = ?", (symbol,))
+        if row:
+            return row_to_position(row)
+        return None
+
+    async def get_all_positions(self) -> List[Position]:
+        """Najde všechny aktivní pozice"""
+        return [
+            row_to_position(row)
+            async for row in self._db.stream("SELECT * FROM positions ORDER BY created_at DESC")
+        ]
+
+    async def update_position(self, position: Position) -> Position:
+        """Aktualizuje pozici"""
+        return await self.save_position(position)
+
+    async def close_position(self, symbol: str) -> bool:
+        """Uzavře pozici"""
+        # V unit of work je výsledek známý až po commitu
+        closed = await self._db.unit_write(lambda conn: _execute(conn, "DELETE FROM positions WHERE symbol = ?", (symbol,)))
+        return closed is None or closed > 0
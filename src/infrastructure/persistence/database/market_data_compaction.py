@@ -0,0 +1,299 @@
+"""Kompakce surových tickerů a order booků
+
+Surová data starší než `raw_retention_hours` se sbalí do minutových souhrnů
+(`ticker_bars_1m` - OHLC z last_price, `order_book_bars_1m` - poslední
+bid/ask a min/max/součet spreadu) a smažou se. Souhrny starší než
+`bar_retention_days` se mažou také. Snapshoty plné hloubky
+(`order_book_snapshots`) starší než `snapshot_retention_days` se mažou po
+hranici keyframe, aby zbylá řada šla dekódovat. Na konci běží
+`PRAGMA incremental_vacuum` a report obsahuje uvolněné místo.
+
+Práce je rozdělená na krátké zápisové transakce (symbol x okno `chunk_minutes`),
+takže zápisy z obchodního cyklu na writer vlákně nečekají na celou kompakci.
+
+Použití z příkazové řádky:
+    python -m src.infrastructure.persistence.database.market_data_compaction data/trading.db
+"""
+
+import argparse
+import asyncio
+import logging
+import sqlite3
+import sys
+import time
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .sqlite_connection import SqliteConnectionManager
+from .sqlite_migrations import ensure_schema
+from .sqlite_schema import to_epoch_ms
+
+
+logger = logging.getLogger(__name__)
+
+MINUTE_MS = 60_000
+
+ROLLUP_TICKERS = """
+    INSERT INTO ticker_bars_1m (symbol, ts, open, high, low, close, samples)
+    SELECT g.symbol, g.minute,
+           (SELECT last_price FROM tickers WHERE symbol = g.symbol AND ts = g.first_ts),
+           g.high, g.low,
+           (SELECT last_price FROM tickers WHERE symbol = g.symbol AND ts = g.last_ts),
+           g.samples
+    FROM (
+        SELECT symbol, ts / 60000 * 60000 AS minute, MIN(ts) AS first_ts, MAX(ts) AS last_ts,
+               MAX(last_price) AS high, MIN(last_price) AS low, COUNT(*) AS samples
+        FROM tickers
+        WHERE symbol = ? AND ts < ?
+        GROUP BY minute
+    ) AS g
+    WHERE true
+    ON CONFLICT (symbol, ts) DO UPDATE SET
+        high = MAX(high, excluded.high),
+        low = MIN(low, excluded.low),
+        close = excluded.close,
+        samples = samples + excluded.samples
+"""
+
+ROLLUP_ORDER_BOOKS = """
+    INSERT INTO order_book_bars_1m (
+        symbol, ts, best_bid, best_ask, spread_min, spread_max, spread_sum, spread_samples, samples
+    )
+    SELECT g.symbol, g.minute, last.best_bid, last.best_ask,
+           g.spread_min, g.spread_max, g.spread_sum, g.spread_samples, g.samples
+    FROM (
+        SELECT symbol, ts / 60000 * 60000 AS minute, MAX(ts) AS last_ts,
+               MIN(best_ask - best_bid) AS spread_min, MAX(best_ask - best_bid) AS spread_max,
+               TOTAL(best_ask - best_bid) AS spread_sum, COUNT(best_ask - best_bid) AS spread_samples,
+               COUNT(*) AS samples
+        FROM order_books
+        WHERE symbol = ? AND ts < ?
+        GROUP BY minute
+    ) AS g
+    JOIN order_books AS last ON last.symbol = g.symbol AND last.ts = g.last_ts
+    WHERE true
+    ON CONFLICT (symbol, ts) DO UPDATE SET
+        best_bid = excluded.best_bid,
+        best_ask = excluded.best_ask,
+        spread_min = MIN(COALESCE(spread_min, excluded.spread_min), COALESCE(excluded.spread_min, spread_min)),
+        spread_max = MAX(COALESCE(spread_max, excluded.spread_max), COALESCE(excluded.spread_max, spread_max)),
+        spread_sum = spread_sum + excluded.spread_sum,
+        spread_samples = spread_samples + excluded.spread_samples,
+        samples = samples + excluded.samples
+"""
+
+# Maže jen před posledním keyframe před hranicí - delta snímky za hranicí
+# by bez něj nešly dekódovat
+PRUNE_ORDER_BOOK_SNAPSHOTS = """
+    DELETE FROM order_book_snapshots
+    WHERE symbol = ? AND ts < (
+        SELECT MAX(ts) FROM order_book_snapshots
+        WHERE symbol = ? AND keyframe = 1 AND ts <= ?
+    )
+"""
+
+# (surová tabulka, rollup do souhrnů, tabulka souhrnů)
+_TABLES: List[Tuple[str, str, str]] = [
+    ("tickers", ROLLUP_TICKERS, "ticker_bars_1m"),
+    ("order_books", ROLLUP_ORDER_BOOKS, "order_book_bars_1m"),
+]
+
+
+@dataclass
+class CompactionReport:
+    """Výsledek jednoho běhu kompakce"""
+    ticker_rows: int = 0
+    order_book_rows: int = 0
+    ticker_bars: int = 0
+    order_book_bars: int = 0
+    bars_pruned: int = 0
+    snapshots_pruned: int = 0
+    page_size: int = 0
+    pages_before: int = 0
+    pages_after: int = 0
+    freelist_pages: int = 0
+    incremental_vacuum: bool = False
+    duration: float = 0.0
+
+    @property
+    def bytes_reclaimed(self) -> int:
+        return max(self.pages_before - self.pages_after, 0) * self.page_size
+
+    def to_dict(self) -> Dict[str, Any]:
+        result = asdict(self)
+        result["bytes_reclaimed"] = self.bytes_reclaimed
+        return result
+
+
+def _floor_minute(ts: int) -> int:
+    return ts // MINUTE_MS * MINUTE_MS
+
+
+def _symbols(conn: sqlite3.Connection, table: str) -> Iterator[str]:
+    """Symboly tabulky přes skoky po primárním klíči (bez full scanu)"""
+    row = conn.execute(f"SELECT MIN(symbol) FROM {table}").fetchone()
+    while row and row[0] is not None:
+        yield row[0]
+        row = conn.execute(f"SELECT MIN(symbol) FROM {table} WHERE symbol > ?", (row[0],)).fetchone()
+
+
+def _page_stats(conn: sqlite3.Connection) -> Tuple[int, int, int, int]:
+    """(page_size, page_count, freelist_count, auto_vacuum)"""
+    return tuple(
+        conn.execute(f"PRAGMA {name}").fetchone()[0]
+        for name in ("page_size", "page_count", "freelist_count", "auto_vacuum")
+    )
+
+
+class MarketDataCompactor:
+    """Periodická kompakce market dat mimo obchodní cyklus"""
+
+    def __init__(
+        self,
+        db_path: str,
+        raw_retention_hours: float = 24.0,
+        bar_retention_days: float = 90.0,
+        chunk_minutes: int = 60,
+        auto_migrate: bool = True,
+        snapshot_retention_days: float = 7.0
+    ):
+        self.db_path = db_path
+        self.raw_retention_hours = raw_retention_hours
+        self.bar_retention_days = bar_retention_days
+        self.snapshot_retention_days = snapshot_retention_days
+        self.chunk_minutes = chunk_minutes
+        self.last_report: Optional[CompactionReport] = None
+        self._db = SqliteConnectionManager.for_path(db_path)
+        self._db.write_sync(lambda conn: ensure_schema(conn, auto_migrate))
+
+    async def compact(self, now: Optional[datetime] = None) -> CompactionReport:
+        """Provede jeden běh kompakce"""
+        started = time.perf_counter()
+        now_ms = to_epoch_ms(now or datetime.now())
+        report = CompactionReport()
+        report.page_size, report.pages_before, _, auto_vacuum = await self._db.read(_page_stats)
+
+        # Hranice zarovnaná na minutu, aby se žádná minuta nesbalila jen z části
+        cutoff = _floor_minute(now_ms - int(self.raw_retention_hours * 3600 * 1000))
+        for table, rollup, _ in _TABLES:
+            rows, bars = await self._compact_table(table, rollup, cutoff)
+            if table == "tickers":
+                report.ticker_rows, report.ticker_bars = rows, bars
+            else:
+                report.order_book_rows, report.order_book_bars = rows, bars
+
+        if self.bar_retention_days > 0:
+            bar_cutoff = now_ms - int(self.bar_retention_days * 86400 * 1000)
+            report.bars_pruned = await self._db.write(
+                lambda conn: sum(
+                    conn.execute(f"DELETE FROM {bar_table} WHERE ts < ?", (bar_cutoff,)).rowcount
+                    for _, _, bar_table in _TABLES
+                )
+            )
+
+        if self.snapshot_retention_days > 0:
+            snapshot_cutoff = now_ms - int(self.snapshot_retention_days * 86400 * 1000)
+            report.snapshots_pruned = await self._prune_snapshots(snapshot_cutoff)
+
+        if auto_vacuum == 2:
+            # fetchall - každý krok pragmy uvolní jednu stránku
+            await self._db.write(lambda conn: conn.execute("PRAGMA incremental_vacuum").fetchall())
+            report.incremental_vacuum = True
+        elif report.ticker_rows or report.order_book_rows or report.snapshots_pruned:
+            logger.info(
+                "Databáze nemá auto_vacuum=INCREMENTAL, uvolněné stránky zůstanou ve freelistu. "
+                "Převod: python -m src.infrastructure.persistence.database.sqlite_migrations <db> --vacuum"
+            )
+
+        _, report.pages_after, report.freelist_pages, _ = await self._db.read(_page_stats)
+        report.duration = time.perf_counter() - started
+        self.last_report = report
+        logger.info(
+            f"Kompakce market dat: {report.ticker_rows} tickerů -> {report.ticker_bars} souhrnů, "
+            f"{report.order_book_rows} order booků -> {report.order_book_bars} souhrnů, "
+            f"smazáno {report.bars_pruned} starých souhrnů a {report.snapshots_pruned} snapshotů, uvolněno {report.bytes_reclaimed} B "
+            f"za {report.duration:.2f} s"
+        )
+        return report
+
+    async def run_forever(self, interval: float) -> None:
+        """Spouští kompakci každých `interval` sekund (do zrušení tasku)"""
+        while True:
+            try:
+                await self.compact()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Chyba při kompakci market dat: {e}")
+            await asyncio.sleep(interval)
+
+    async def _prune_snapshots(self, cutoff: int) -> int:
+        """Smaže snapshoty plné hloubky starší než `cutoff` (po symbolech)"""
+        symbols = await self._db.read(lambda conn: list(_symbols(conn, "order_book_snapshots")))
+        pruned = 0
+        for symbol in symbols:
+            pruned += await self._db.write(
+                lambda conn, symbol=symbol: conn.execute(
+                    PRUNE_ORDER_BOOK_SNAPSHOTS, (symbol, symbol, cutoff)
+                ).rowcount
+            )
+        return pruned
+
+    async def _compact_table(self, table: str, rollup: str, cutoff: int) -> Tuple[int, int]:
+        """Sbalí a smaže surové řádky starší než `cutoff` po symbolech a oknech"""
+        symbols = await self._db.read(lambda conn: list(_symbols(conn, table)))
+        chunk_ms = self.chunk_minutes * MINUTE_MS
+        rows_total = 0
+        bars_total = 0
+
+        for symbol in symbols:
+            oldest = await self._db.read(
+                lambda conn: conn.execute(f"SELECT MIN(ts) FROM {table} WHERE symbol = ?", (symbol,)).fetchone()[0]
+            )
+            if oldest is None:
+                continue
+
+            end = _floor_minute(oldest)
+            while end < cutoff:
+                end = min(end + chunk_ms, cutoff)
+
+                def _chunk(conn: sqlite3.Connection, end: int = end) -> Tuple[int, int]:
+                    bars = conn.execute(rollup, (symbol, end)).rowcount
+                    rows = conn.execute(f"DELETE FROM {table} WHERE symbol = ? AND ts < ?", (symbol, end)).rowcount
+                    return rows, bars
+
+                rows, bars = await self._db.write(_chunk)
+                rows_total += rows
+                bars_total += bars
+
+        return rows_total, bars_total
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Kompakce tickerů a order booků do minutových souhrnů")
+    parser.add_argument("db_path", help="Cesta k databázi")
+    parser.add_argument("--raw-retention-hours", type=float, default=24.0, help="Jak dlouho držet surová data")
+    parser.add_argument("--bar-retention-days", type=float, default=90.0, help="Jak dlouho držet souhrny (0 = navždy)")
+    parser.add_argument(
+        "--snapshot-retention-days", type=float, default=7.0, help="Jak dlouho držet snapshoty plné hloubky (0 = navždy)"
+    )
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+
+    try:
+        compactor = MarketDataCompactor(
+            args.db_path, args.raw_retention_hours, args.bar_retention_days,
+            snapshot_retention_days=args.snapshot_retention_days
+        )
+        report = asyncio.run(compactor.compact())
+    finally:
+        SqliteConnectionManager.close_all()
+    for key, value in report.to_dict().items():
+        print(f"{key}: {value}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
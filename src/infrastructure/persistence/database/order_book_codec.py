@@ -0,0 +1,232 @@
+"""Binární kódování plné hloubky order booku
+
+Snapshot se ukládá jako jeden blob - proud varintů (LEB128) se zigzag
+znaménkem:
+
+    flags, n_bids, n_asks, price_quantum, size_quantum,
+    bid ceny, bid velikosti, ask ceny, ask velikosti
+
+Ceny a velikosti jsou celá čísla ve škále PRICE_SCALE/SIZE_SCALE vydělená
+kvantem (NSD hodnot snapshotu, typicky tick a lot size), takže běžný krok
+ceny zabere jeden bajt.
+
+- keyframe: první cena strany absolutně, další jako rozdíl od předchozí
+  úrovně, velikosti absolutně
+- delta snímek: ceny i velikosti jako rozdíl proti předchozímu snapshotu
+  stejného symbolu (stejný počet úrovní, jinak se zapíše keyframe)
+
+Keyframe se zapisuje každých `keyframe_interval` snapshotů, čtení začíná
+od nejbližšího keyframe. Dekódování celé řady je vektorizované v NumPy.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ....domain.models import OrderBook, OrderBookArray
+from .sqlite_schema import (
+    PRICE_SCALE, SIZE_SCALE, to_epoch_ms, scale_price, scale_size
+)
+
+
+FORMAT_VERSION = 1
+_KEYFRAME = 0x01
+_HEADER_SIZE = 5
+
+_SHIFTS = (7 * np.arange(10)).astype(np.uint64)
+
+
+def zigzag_encode(values: np.ndarray) -> np.ndarray:
+    """int64 -> uint64 (malá záporná čísla na malá kladná)"""
+    values = values.astype(np.int64, copy=False)
+    return ((values << 1) ^ (values >> 63)).astype(np.uint64)
+
+
+def zigzag_decode(values: np.ndarray) -> np.ndarray:
+    values = values.astype(np.uint64, copy=False)
+    return ((values >> np.uint64(1)).astype(np.int64)) ^ -((values & np.uint64(1)).astype(np.int64))
+
+
+def varint_encode(values: np.ndarray) -> bytes:
+    """Zakóduje nezáporná čísla jako LEB128 varinty"""
+    values = values.astype(np.uint64, copy=False)
+    if len(values) == 0:
+        return b""
+    nbytes = np.ones(len(values), dtype=np.int64)
+    for k in range(1, 10):
+        nbytes += (values >> _SHIFTS[k]) > 0
+    width = int(nbytes.max())
+    columns = np.arange(width)
+    groups = ((values[:, None] >> _SHIFTS[:width]) & np.uint64(0x7F)).astype(np.uint8)
+    groups |= np.where(columns[None, :] < nbytes[:, None] - 1, 0x80, 0).astype(np.uint8)
+    return groups[columns[None, :] < nbytes[:, None]].tobytes()
+
+
+def varint_decode(data: bytes) -> np.ndarray:
+    """Dekóduje proud LEB128 varintů na uint64 pole"""
+    raw = np.frombuffer(data, dtype=np.uint8)
+    if len(raw) == 0:
+        return np.empty(0, dtype=np.uint64)
+    ends = np.flatnonzero(raw < 0x80)
+    starts = np.empty_like(ends)
+    starts[0] = 0
+    starts[1:] = ends[:-1] + 1
+    position = np.arange(len(raw)) - np.repeat(starts, ends - starts + 1)
+    payload = (raw & 0x7F).astype(np.uint64) << (7 * position).astype(np.uint64)
+    # Skupiny bitů se nepřekrývají, součet je totéž co OR
+    return np.add.reduceat(payload, starts)
+
+
+def _quantum(values: np.ndarray) -> int:
+    nonzero = np.abs(values[values != 0])
+    return int(np.gcd.reduce(nonzero)) if len(nonzero) else 1
+
+
+def _side_arrays(levels: Sequence[Tuple]) -> Tuple[np.ndarray, np.ndarray]:
+    prices = np.fromiter((scale_price(price) for price, _ in levels), dtype=np.int64, count=len(levels))
+    sizes = np.fromiter((scale_size(size) for _, size in levels), dtype=np.int64, count=len(levels))
+    return prices, sizes
+
+
+def _ladder_deltas(prices: np.ndarray) -> np.ndarray:
+    return np.diff(prices, prepend=np.int64(0))
+
+
+def encode_snapshot(
+    bid_prices: np.ndarray,
+    bid_sizes: np.ndarray,
+    ask_prices: np.ndarray,
+    ask_sizes: np.ndarray,
+    previous: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]] = None
+) -> bytes:
+    """Zakóduje snapshot (škálovaná int64 pole); bez `previous` jako keyframe"""
+    if previous is None:
+        prices = np.concatenate((_ladder_deltas(bid_prices), _ladder_deltas(ask_prices)))
+        sizes = np.concatenate((bid_sizes, ask_sizes))
+        flags = _KEYFRAME
+    else:
+        prices = np.concatenate((bid_prices - previous[0], ask_prices - previous[2]))
+        sizes = np.concatenate((bid_sizes - previous[1], ask_sizes - previous[3]))
+        flags = 0
+
+    price_quantum = _quantum(prices)
+    size_quantum = _quantum(sizes)
+    prices = prices // price_quantum
+    sizes = sizes // size_quantum
+    n_bids, n_asks = len(bid_prices), len(ask_prices)
+
+    header = np.array(
+        [flags | (FORMAT_VERSION << 4), n_bids, n_asks, price_quantum, size_quantum], dtype=np.uint64
+    )
+    body = zigzag_encode(np.concatenate((
+        prices[:n_bids], sizes[:n_bids], prices[n_bids:], sizes[n_bids:]
+    )))
+    return varint_encode(np.concatenate((header, body)))
+
+
+def decode_series(symbol: str, rows: Iterable[Tuple[int, bytes]]) -> OrderBookArray:
+    """Dekóduje řadu (ts, blob) seřazenou podle času do OrderBookArray
+
+    Řada musí začínat keyframe; delta snímky před prvním keyframe se přeskočí.
+    """
+    rows = list(rows)
+    if not rows:
+        return OrderBookArray.empty(symbol)
+
+    values = varint_decode(b"".join(blob for _, blob in rows))
+
+    timestamps: List[int] = []
+    books: List[Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]] = []
+    current = None
+    pos = 0
+    for ts, _ in rows:
+        flags, n_bids, n_asks, price_quantum, size_quantum = (int(v) for v in values[pos:pos + _HEADER_SIZE])
+        body_start = pos + _HEADER_SIZE
+        pos = body_start + 2 * (n_bids + n_asks)
+        body = zigzag_decode(values[body_start:pos])
+
+        bid_prices = body[:n_bids] * price_quantum
+        bid_sizes = body[n_bids:2 * n_bids] * size_quantum
+        ask_prices = body[2 * n_bids:2 * n_bids + n_asks] * price_quantum
+        ask_sizes = body[2 * n_bids + n_asks:] * size_quantum
+
+        if flags & _KEYFRAME:
+            current = (np.cumsum(bid_prices), bid_sizes, np.cumsum(ask_prices), ask_sizes)
+        elif current is None:
+            continue
+        else:
+            current = (
+                current[0] + bid_prices, current[1] + bid_sizes,
+                current[2] + ask_prices, current[3] + ask_sizes
+            )
+        timestamps.append(ts)
+        books.append(current)
+
+    if not books:
+        return OrderBookArray.empty(symbol)
+
+    depth = max(max(len(b[0]), len(b[2])) for b in books)
+    arrays = [np.full((len(books), depth), np.nan) for _ in range(4)]
+    for i, book in enumerate(books):
+        for array, side, scale in zip(arrays, book, (PRICE_SCALE, SIZE_SCALE, PRICE_SCALE, SIZE_SCALE)):
+            array[i, :len(side)] = side / scale
+
+    return OrderBookArray(
+        symbol=symbol,
+        timestamp=np.asarray(timestamps, dtype=np.int64),
+        bid_price=arrays[0],
+        bid_size=arrays[1],
+        ask_price=arrays[2],
+        ask_size=arrays[3]
+    )
+
+
+@dataclass
+class _BookState:
+    ts: int
+    since_keyframe: int
+    arrays: Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+
+
+class OrderBookEncoder:
+    """Stav kódování po symbolech (předchozí snapshot a vzdálenost od keyframe)"""
+
+    def __init__(self, keyframe_interval: int = 100):
+        self.keyframe_interval = max(1, keyframe_interval)
+        self._state: Dict[str, _BookState] = {}
+
+    def encode(self, order_book: OrderBook) -> Optional[Tuple[str, int, int, bytes]]:
+        """Parametry pro UPSERT_ORDER_BOOK_SNAPSHOT
+
+        Snapshot starší než poslední zakódovaný vrací None - přepsal by
+        základ už uložených delta snímků.
+        """
+        ts = to_epoch_ms(order_book.timestamp)
+        state = self._state.get(order_book.symbol)
+        if state is not None and ts < state.ts:
+            return None
+
+        bid_prices, bid_sizes = _side_arrays(order_book.bids)
+        ask_prices, ask_sizes = _side_arrays(order_book.asks)
+        arrays = (bid_prices, bid_sizes, ask_prices, ask_sizes)
+
+        keyframe = (
+            state is None
+            # Stejný čas přepíše poslední řádek, který může být základem jen sám sobě
+            or ts == state.ts
+            or state.since_keyframe + 1 >= self.keyframe_interval
+            or len(bid_prices) != len(state.arrays[0])
+            or len(ask_prices) != len(state.arrays[2])
+        )
+        blob = encode_snapshot(*arrays, previous=None if keyframe else state.arrays)
+        self._state[order_book.symbol] = _BookState(ts, 0 if keyframe else state.since_keyframe + 1, arrays)
+        return order_book.symbol, ts, int(keyframe), blob
+
+    def reset(self, symbols: Optional[Iterable[str]] = None) -> None:
+        """Zapomene stav (po chybě zápisu začne symbol znovu keyframe)"""
+        if symbols is None:
+            self._state.clear()
+            return
+        for symbol in symbols:
+            self._state.pop(symbol, None)
@@ -0,0 +1,261 @@
+import asyncio
+import logging
+from dataclasses import dataclass, field, asdict, replace
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from ....domain.models import Position
+from ....domain.repositories import IPositionRepository
+from .unit_of_work import current_unit
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PositionBookStats:
+    """Metriky zápisů a rekonciliací position booku"""
+    positions: int = 0
+    pending_writes: int = 0
+    written: int = 0
+    failed: int = 0
+    reconciliations: int = 0
+    drifted_reconciliations: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class PositionDrift:
+    """Rozdíly mezi position bookem a pozicemi na burze"""
+    checked_at: datetime = field(default_factory=datetime.now)
+    # Na burze, ale ne v booku
+    missing_locally: List[str] = field(default_factory=list)
+    # V booku, ale ne na burze
+    missing_on_exchange: List[str] = field(default_factory=list)
+    side_mismatch: Dict[str, Tuple[str, str]] = field(default_factory=dict)
+    # symbol -> (book, burza)
+    size_mismatch: Dict[str, Tuple[str, str]] = field(default_factory=dict)
+
+    @property
+    def is_clean(self) -> bool:
+        return not (self.missing_locally or self.missing_on_exchange or self.side_mismatch or self.size_mismatch)
+
+    def to_dict(self) -> Dict[str, Any]:
+        result = asdict(self)
+        result["checked_at"] = self.checked_at.isoformat()
+        result["is_clean"] = self.is_clean
+        return result
+
+
+def compare_positions(book: Dict[str, Position], exchange: List[Position]) -> PositionDrift:
+    """Porovná pozice booku s pozicemi z burzy (symbol, strana, velikost)"""
+    drift = PositionDrift()
+    remote = {position.symbol: position for position in exchange}
+
+    for symbol in sorted(remote.keys() - book.keys()):
+        drift.missing_locally.append(symbol)
+    for symbol in sorted(book.keys() - remote.keys()):
+        drift.missing_on_exchange.append(symbol)
+    for symbol in sorted(book.keys() & remote.keys()):
+        local, other = book[symbol], remote[symbol]
+        if local.side != other.side:
+            drift.side_mismatch[symbol] = (local.side.value, other.side.value)
+        elif local.size != other.size:
+            drift.size_mismatch[symbol] = (str(local.size), str(other.size))
+    return drift
+
+
+class PositionBook(IPositionRepository):
+    """Write-through position book v paměti před position repository
+
+    Pozice se při prvním přístupu (nebo `load()`) načtou z vnitřní repository
+    a čtení `get_position_by_symbol`/`get_all_positions` pak jde jen do
+    slovníku. Zápisy změní book hned a do databáze se propíší na pozadí.
+    Čekající zápisy se slučují po symbolech (stačí poslední stav), neúspěšný
+    zápis se zopakuje po `retry_delay`. `flush()`/`close()` počkají na
+    dopsání.
+
+    V otevřené unit of work se změna bookem projeví hned, ale zápis se
+    naplánuje až po commitu. Rollback vrátí book do předchozího stavu.
+
+    `reconcile()` porovná book s pozicemi z burzy a drift nahlásí (book
+    neopravuje - rozhodnutí je na obsluze).
+    """
+
+    def __init__(self, inner: IPositionRepository, retry_delay: float = 1.0):
+        self.inner = inner
+        self.retry_delay = retry_delay
+        self.last_drift: Optional[PositionDrift] = None
+        self._stats = PositionBookStats()
+        self._positions: Optional[Dict[str, Position]] = None
+        self._load_lock: Optional[asyncio.Lock] = None
+        # symbol -> poslední stav k zápisu (None = smazat)
+        self._pending: Dict[str, Optional[Position]] = {}
+        self._write_requested: Optional[asyncio.Event] = None
+        self._write_lock: Optional[asyncio.Lock] = None
+        self._task: Optional[asyncio.Task] = None
+        self._closed = False
+
+    async def load(self) -> int:
+        """Načte pozice z vnitřní repository (počet pozic)"""
+        if self._load_lock is None:
+            self._load_lock = asyncio.Lock()
+        async with self._load_lock:
+            if self._positions is None:
+                positions = await self.inner.get_all_positions()
+                self._positions = {position.symbol: position for position in positions}
+                logger.info(f"Position book načten: {len(self._positions)} pozic")
+        return len(self._positions)
+
+    async def save_position(self, position: Position) -> Position:
+        """Uloží pozici do booku, do databáze na pozadí"""
+        # Kopie v booku se už nemění, čekající zápis ji může sdílet
+        await self._apply(position.symbol, replace(position))
+        return position
+
+    async def get_position_by_symbol(self, symbol: str) -> Optional[Position]:
+        """Najde pozici pro symbol (z paměti)"""
+        position = (await self._book()).get(symbol)
+        # Kopie - úpravy volajícího se do booku dostanou jen přes save/update
+        return replace(position) if position else None
+
+    async def get_all_positions(self) -> List[Position]:
+        """Najde všechny aktivní pozice (z paměti, nejnovější první)"""
+        positions = sorted((await self._book()).values(), key=lambda p: p.created_at, reverse=True)
+        return [replace(position) for position in positions]
+
+    async def update_position(self, position: Position) -> Position:
+        """Aktualizuje pozici"""
+        return await self.save_position(position)
+
+    async def close_position(self, symbol: str) -> bool:
+        """Uzavře pozici"""
+        if symbol not in await self._book():
+            return False
+        await self._apply(symbol, None)
+        return True
+
+    async def reconcile(self, exchange_positions: List[Position]) -> PositionDrift:
+        """Porovná book s pozicemi z burzy a drift zaloguje"""
+        drift = compare_positions(await self._book(), exchange_positions)
+        self._stats.reconciliations += 1
+        if not drift.is_clean:
+            self._stats.drifted_reconciliations += 1
+            logger.warning(f"Pozice v booku se liší od burzy: {drift.to_dict()}")
+        self.last_drift = drift
+        return drift
+
+    async def run_reconciliation(
+        self,
+        fetch_positions: Callable[[], Awaitable[List[Position]]],
+        interval: float
+    ) -> None:
+        """Rekonciliuje každých `interval` sekund (do zrušení tasku)"""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.reconcile(await fetch_positions())
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Chyba dotazu na burzu není drift - jen se přeskočí
+                logger.error(f"Chyba při rekonciliaci pozic: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Metriky booku a poslední drift"""
+        self._stats.positions = len(self._positions or {})
+        self._stats.pending_writes = len(self._pending)
+        result = self._stats.to_dict()
+        result["last_drift"] = self.last_drift.to_dict() if self.last_drift else None
+        return result
+
+    async def flush(self) -> None:
+        """Zapíše všechny čekající změny"""
+        while self._pending:
+            if not await self._write_pending():
+                if self._closed:
+                    return
+                await asyncio.sleep(self.retry_delay)
+
+    async def close(self) -> None:
+        """Zastaví zapisovač a dopíše čekající změny"""
+        if self._closed:
+            return
+        if self._task:
+            async with self._write_lock:
+                self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        # Jeden pokus navíc po zastavení - co selže, zůstane jen v logu
+        self._closed = True
+        await self.flush()
+        if self._pending:
+            logger.error(f"Nezapsané změny pozic při ukončení: {sorted(self._pending)}")
+
+    async def _book(self) -> Dict[str, Position]:
+        if self._positions is None:
+            await self.load()
+        return self._positions
+
+    async def _apply(self, symbol: str, position: Optional[Position]) -> None:
+        """Změní book a naplánuje zápis (None = smazání)"""
+        book = await self._book()
+        previous = book.get(symbol)
+        self._set(symbol, position)
+
+        unit = current_unit()
+        if unit is None:
+            await self._schedule(symbol, position)
+            return
+        unit.on_rollback(lambda: self._set(symbol, previous))
+        unit.after_commit(lambda: self._schedule(symbol, position))
+
+    def _set(self, symbol: str, position: Optional[Position]) -> None:
+        if position is None:
+            self._positions.pop(symbol, None)
+        else:
+            self._positions[symbol] = position
+
+    async def _schedule(self, symbol: str, position: Optional[Position]) -> None:
+        self._pending[symbol] = position
+        if self._closed:
+            await self._write_pending()
+            return
+        if self._task is None:
+            self._write_requested = asyncio.Event()
+            self._write_lock = asyncio.Lock()
+            self._task = asyncio.create_task(self._write_loop())
+        self._write_requested.set()
+
+    async def _write_loop(self) -> None:
+        while True:
+            await self._write_requested.wait()
+            self._write_requested.clear()
+            if not await self._write_pending():
+                await asyncio.sleep(self.retry_delay)
+                self._write_requested.set()
+
+    async def _write_pending(self) -> bool:
+        """Propíše čekající změny; False, pokud některý zápis selhal"""
+        if self._write_lock is None:
+            self._write_lock = asyncio.Lock()
+        async with self._write_lock:
+            ok = True
+            for symbol in list(self._pending):
+                position = self._pending[symbol]
+                try:
+                    if position is None:
+                        await self.inner.close_position(symbol)
+                    else:
+                        await self.inner.save_position(position)
+                except Exception as e:
+                    self._stats.failed += 1
+                    logger.error(f"Chyba při zápisu pozice {symbol}: {e}")
+                    ok = False
+                    continue
+                # Mezitím mohla přijít novější změna - ta zůstane čekat
+                if self._pending.get(symbol, position) is position:
+                    self._pending.pop(symbol, None)
+                self._stats.written += 1
+            return ok
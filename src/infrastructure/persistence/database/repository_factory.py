@@ -0,0 +1,103 @@
+from dataclasses import dataclass, field
+
+from ....config.settings import DatabaseConfig
+from ....domain.repositories import (
+    ITradeRepository, IPositionRepository, IMarketDataRepository, IStrategyMetricsRepository, IUnitOfWork
+)
+from .position_book import PositionBook
+from .sqlite_connection import SqliteConnectionManager
+from .unit_of_work import UnitOfWork
+from .write_behind_market_data_repository import WriteBehindMarketDataRepository
+
+
+SUPPORTED_DATABASE_TYPES = ("sqlite", "aiosqlite")
+
+
+@dataclass
+class Repositories:
+    """Sada repository pro jeden databázový backend"""
+    trades: ITradeRepository
+    positions: IPositionRepository
+    market_data: IMarketDataRepository
+    strategy_metrics: IStrategyMetricsRepository
+    # Zápisy trades/positions jednoho rozhodnutí v jedné transakci
+    unit_of_work: IUnitOfWork = field(default_factory=UnitOfWork)
+
+    async def close(self) -> None:
+        """Vyprázdní write-behind frontu a uzavře databázová připojení
+
+        Připojení se uzavřou i tehdy, když write-behind fronta skončí
+        `WriteBehindError` - výjimka pak propadne volajícímu.
+        """
+        try:
+            if isinstance(self.market_data, WriteBehindMarketDataRepository):
+                await self.market_data.close()
+        finally:
+            if isinstance(self.positions, PositionBook):
+                await self.positions.close()
+            await close_repositories()
+
+
+def create_repositories(config: DatabaseConfig) -> Repositories:
+    """Vytvoří repository podle `database.type`
+
+    - "sqlite": sqlite3 se sdílenými připojeními na vlastních vláknech
+    - "aiosqlite": nativně asynchronní připojení přes aiosqlite
+
+    Při `write_behind` je market data repository obalené write-behind frontou,
+    při `position_book` jsou pozice v paměti se zápisem na pozadí.
+    """
+    repositories = _create_backend(config)
+    if config.write_behind:
+        repositories.market_data = WriteBehindMarketDataRepository(
+            repositories.market_data,
+            batch_size=config.write_batch_size,
+            flush_interval=config.write_flush_interval,
+            queue_size=config.write_queue_size
+        )
+    if config.position_book:
+        repositories.positions = PositionBook(repositories.positions)
+    return repositories
+
+
+def _create_backend(config: DatabaseConfig) -> Repositories:
+    if config.type == "sqlite":
+        from .sqlite_trade_repository import SqliteTradeRepository, SqlitePositionRepository
+        from .sqlite_market_data_repository import SqliteMarketDataRepository
+        from .sqlite_strategy_metrics_repository import SqliteStrategyMetricsRepository
+
+        return Repositories(
+            trades=SqliteTradeRepository(config.path, config.auto_migrate),
+            positions=SqlitePositionRepository(config.path, config.auto_migrate),
+            market_data=SqliteMarketDataRepository(
+                config.path, config.auto_migrate, config.order_book_keyframe_interval
+            ),
+            strategy_metrics=SqliteStrategyMetricsRepository(config.path, config.auto_migrate)
+        )
+
+    if config.type == "aiosqlite":
+        from .aiosqlite_trade_repository import AiosqliteTradeRepository, AiosqlitePositionRepository
+        from .aiosqlite_market_data_repository import AiosqliteMarketDataRepository
+        from .aiosqlite_strategy_metrics_repository import AiosqliteStrategyMetricsRepository
+
+        return Repositories(
+            trades=AiosqliteTradeRepository(config.path, config.auto_migrate),
+            positions=AiosqlitePositionRepository(config.path, config.auto_migrate),
+            market_data=AiosqliteMarketDataRepository(
+                config.path, config.auto_migrate, config.order_book_keyframe_interval
+            ),
+            strategy_metrics=AiosqliteStrategyMetricsRepository(config.path, config.auto_migrate)
+        )
+
+    raise ValueError(
+        f"Nepodporovaný typ databáze: {config.type} "
+        f"(podporováno: {', '.join(SUPPORTED_DATABASE_TYPES)})"
+    )
+
+
+async def close_repositories() -> None:
+    """Uzavře sdílená připojení všech backendů"""
+    SqliteConnectionManager.close_all()
+
+    from .aiosqlite_connection import AiosqliteDatabase
+    await AiosqliteDatabase.close_all()
@@ -0,0 +1,172 @@
+import asyncio
+import logging
+import os
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, TypeVar
+
+from .unit_of_work import current_unit
+
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+
+class SqliteConnectionManager:
+    """Sdílená perzistentní připojení k jednomu SQLite souboru
+
+    Všechny zápisy běží na jednom dedikovaném writer vlákně s vlastním
+    připojením (každá operace = jedna transakce), čtení běží paralelně na
+    pool vláknech, každé s vlastním dlouho žijícím připojením. Databáze je
+    ve WAL režimu, takže čtení neblokují zápis a naopak. Připojení drží cache
+    připravených statementů (`cached_statements`), takže opakované dotazy se
+    nekompilují znovu.
+
+    Instance se sdílí pro stejný soubor přes `for_path`.
+    """
+
+    _instances: Dict[str, 'SqliteConnectionManager'] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(
+        self,
+        db_path: str,
+        readers: int = 4,
+        cache_size_kib: int = 64 * 1024,
+        mmap_size: int = 256 * 1024 * 1024,
+        cached_statements: int = 256,
+        busy_timeout_ms: int = 5000
+    ):
+        self.db_path = db_path
+        self.cache_size_kib = cache_size_kib
+        self.mmap_size = mmap_size
+        self.cached_statements = cached_statements
+        self.busy_timeout_ms = busy_timeout_ms
+
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        self._closed = False
+        # Počet zápisových transakcí (commitů)
+        self.write_transactions = 0
+
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sqlite-writer")
+        if db_path == ":memory:":
+            # In-memory databáze existuje jen v jednom připojení
+            self._readers = self._writer
+        else:
+            self._readers = ThreadPoolExecutor(max_workers=readers, thread_name_prefix="sqlite-reader")
+
+        # Nastav WAL hned při vytvoření (perzistentní vlastnost souboru)
+        self._writer.submit(self._thread_connection).result()
+
+    @classmethod
+    def for_path(cls, db_path: str) -> 'SqliteConnectionManager':
+        """Vrátí sdílený manager pro daný databázový soubor"""
+        key = db_path if db_path == ":memory:" else os.path.abspath(db_path)
+        with cls._instances_lock:
+            manager = cls._instances.get(key)
+            if manager is None or manager._closed:
+                manager = cls(db_path)
+                cls._instances[key] = manager
+            return manager
+
+    @classmethod
+    def close_all(cls) -> None:
+        """Uzavře všechny sdílené managery"""
+        with cls._instances_lock:
+            managers = list(cls._instances.values())
+            cls._instances.clear()
+        for manager in managers:
+            manager.close()
+
+    async def read(self, fn: Callable[[sqlite3.Connection], T]) -> T:
+        """Spustí čtecí funkci na pool vlákně s jeho perzistentním připojením"""
+        return await asyncio.get_event_loop().run_in_executor(self._readers, self._run_read, fn)
+
+    async def write(self, fn: Callable[[sqlite3.Connection], T]) -> T:
+        """Spustí zápisovou funkci v jedné transakci na writer vlákně"""
+        return await asyncio.get_event_loop().run_in_executor(self._writer, self._run_write, fn)
+
+    async def unit_write(self, fn: Callable[[sqlite3.Connection], T]) -> Optional[T]:
+        """Zápis, který se v otevřené unit of work jen zařadí do její transakce
+
+        Mimo unit of work je totéž co `write`. Uvnitř vrací None.
+        """
+        unit = current_unit()
+        if unit is None:
+            return await self.write(fn)
+        unit.defer(self, fn)
+        return None
+
+    async def run_unit(self, fns: List[Callable[[sqlite3.Connection], object]]) -> None:
+        """Provede odložené zápisy unit of work jednou transakcí"""
+        def _run(conn: sqlite3.Connection):
+            for fn in fns:
+                fn(conn)
+
+        await self.write(_run)
+
+    def write_sync(self, fn: Callable[[sqlite3.Connection], T]) -> T:
+        """Synchronní varianta `write` (např. pro vytvoření tabulek v konstruktoru)"""
+        return self._writer.submit(self._run_write, fn).result()
+
+    def read_sync(self, fn: Callable[[sqlite3.Connection], T]) -> T:
+        """Synchronní varianta `read`"""
+        return self._readers.submit(self._run_read, fn).result()
+
+    def close(self) -> None:
+        """Dokončí rozpracované operace a uzavře všechna připojení"""
+        if self._closed:
+            return
+        self._closed = True
+        self._writer.shutdown(wait=True)
+        if self._readers is not self._writer:
+            self._readers.shutdown(wait=True)
+        with self._connections_lock:
+            for conn in self._connections:
+                try:
+                    conn.close()
+                except sqlite3.Error as e:
+                    logger.warning(f"Chyba při zavírání SQLite připojení: {e}")
+            self._connections.clear()
+
+    def _run_read(self, fn: Callable[[sqlite3.Connection], T]) -> T:
+        return fn(self._thread_connection())
+
+    def _run_write(self, fn: Callable[[sqlite3.Connection], T]) -> T:
+        conn = self._thread_connection()
+        self.write_transactions += 1
+        with conn:  # commit při úspěchu, rollback při výjimce
+            return fn(conn)
+
+    def _thread_connection(self) -> sqlite3.Connection:
+        """Vrátí (případně vytvoří) připojení aktuálního vlákna"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.db_path,
+            check_same_thread=False,
+            cached_statements=self.cached_statements,
+            timeout=self.busy_timeout_ms / 1000
+        )
+        conn.row_factory = sqlite3.Row
+        if self.db_path != ":memory:":
+            # Nový soubor - inkrementální vacuum pro kompakci (musí předcházet WAL)
+            conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+            conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA cache_size=-{int(self.cache_size_kib)}")
+        conn.execute(f"PRAGMA mmap_size={int(self.mmap_size)}")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute(f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}")
+        return conn
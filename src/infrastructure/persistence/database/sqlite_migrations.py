@@ -0,0 +1,315 @@
+"""Migrace SQLite schématu řízené přes PRAGMA user_version
+
+Verze:
+    0 - prázdná databáze
+    1 - původní schéma (ISO časy a REAL ceny, user_version nenastavené)
+    2 - kompaktní market data: epoch ms, škálovaná celá čísla, WITHOUT ROWID,
+        svíčky s intervalem
+    3 - indexy trades pro filtry a keyset stránkování
+    4 - materializovaný denní souhrn PnL (trade_pnl_daily) udržovaný triggery
+    5 - průběžné metriky strategií (strategy_metrics) dopočítané z historie
+    6 - minutové souhrny tickerů a order booků pro kompakci market dat
+    7 - snapshoty plné hloubky order booku (order_book_snapshots)
+    8 - 24h objem tickerů ve škále VOLUME_SCALE (větší rozsah než SIZE_SCALE)
+
+Použití z příkazové řádky:
+    python -m src.infrastructure.persistence.database.sqlite_migrations data/trading.db
+    python -m src.infrastructure.persistence.database.sqlite_migrations data/trading.db --check
+"""
+
+import argparse
+import logging
+import sqlite3
+import sys
+from datetime import datetime
+from decimal import Decimal
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from ....domain.models import StrategyMetrics
+
+from .sqlite_schema import (
+    SCHEMA, SCHEMA_VERSION, MARKET_DATA_SCHEMA, TRADE_INDEXES, TRADE_SUMMARY_TABLE,
+    TRADE_SUMMARY_TRIGGERS, BACKFILL_TRADE_SUMMARY, STRATEGY_METRICS_SCHEMA,
+    UPSERT_STRATEGY_METRICS, strategy_metrics_to_params, MARKET_DATA_BARS_SCHEMA,
+    ORDER_BOOK_SNAPSHOTS_SCHEMA, UPSERT_CANDLE,
+    INSERT_TICKER, INSERT_ORDER_BOOK, SIZE_SCALE, VOLUME_SCALE, to_epoch_ms, scale_price, scale_size
+)
+
+
+logger = logging.getLogger(__name__)
+
+LEGACY_VERSION = 1
+# Interval, se kterým orchestrator ukládal svíčky před přidáním sloupce
+LEGACY_CANDLE_INTERVAL = "15"
+
+_COPY_CHUNK = 10_000
+
+
+class MigrationRequiredError(Exception):
+    """Databáze má starší schéma a automatická migrace je vypnutá"""
+    pass
+
+
+def _table_columns(conn: sqlite3.Connection, table: str) -> List[str]:
+    return [row[1] for row in conn.execute(f"PRAGMA table_info({table})").fetchall()]
+
+
+def schema_version(conn: sqlite3.Connection) -> int:
+    """Zjistí verzi schématu (původní databáze nemají user_version nastavené)"""
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    if version:
+        return version
+    tables = conn.execute(
+        "SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name IN ('trades', 'positions', 'candles', 'tickers', 'order_books')"
+    ).fetchone()[0]
+    return LEGACY_VERSION if tables else 0
+
+
+def _legacy_rows(conn: sqlite3.Connection, sql: str) -> Iterator[Tuple]:
+    cursor = conn.execute(sql)
+    while True:
+        rows = cursor.fetchmany(_COPY_CHUNK)
+        if not rows:
+            return
+        yield from rows
+
+
+def _legacy_ms(value: str) -> int:
+    return to_epoch_ms(datetime.fromisoformat(value))
+
+
+def _legacy_decimal(value) -> Decimal:
+    return Decimal(str(value))
+
+
+def _rebuild(conn: sqlite3.Connection, table: str, select: str, insert: str, convert: Callable[[Tuple], Tuple]) -> int:
+    """Přejmenuje původní tabulku, vytvoří novou a zkopíruje převedená data"""
+    conn.execute(f"ALTER TABLE {table} RENAME TO {table}_v1")
+    for statement in MARKET_DATA_SCHEMA:
+        conn.execute(statement)
+
+    copied = 0
+    batch = []
+    for row in _legacy_rows(conn, select.format(table=f"{table}_v1")):
+        batch.append(convert(row))
+        if len(batch) >= _COPY_CHUNK:
+            conn.executemany(insert, batch)
+            copied += len(batch)
+            batch = []
+    if batch:
+        conn.executemany(insert, batch)
+        copied += len(batch)
+
+    conn.execute(f"DROP TABLE {table}_v1")
+    return copied
+
+
+def _migrate_1_to_2(conn: sqlite3.Connection) -> None:
+    """ISO časy a REAL ceny -> epoch ms a škálovaná celá čísla"""
+    if 'open_price' in _table_columns(conn, 'candles'):
+        copied = _rebuild(
+            conn, 'candles',
+            "SELECT symbol, timestamp, open_price, high_price, low_price, close_price, volume FROM {table}",
+            UPSERT_CANDLE,
+            lambda row: (
+                row[0], LEGACY_CANDLE_INTERVAL, _legacy_ms(row[1]),
+                scale_price(_legacy_decimal(row[2])), scale_price(_legacy_decimal(row[3])),
+                scale_price(_legacy_decimal(row[4])), scale_price(_legacy_decimal(row[5])),
+                scale_size(_legacy_decimal(row[6]))
+            )
+        )
+        logger.info(f"Migrace candles: převedeno {copied} řádků")
+
+    if 'timestamp' in _table_columns(conn, 'tickers'):
+        copied = _rebuild(
+            conn, 'tickers',
+            "SELECT symbol, timestamp, last_price, bid_price, ask_price, volume_24h, "
+            "price_change_24h, price_change_percent_24h FROM {table}",
+            INSERT_TICKER,
+            lambda row: (
+                row[0], _legacy_ms(row[1]),
+                scale_price(_legacy_decimal(row[2])), scale_price(_legacy_decimal(row[3])),
+                scale_price(_legacy_decimal(row[4])), scale_size(_legacy_decimal(row[5])),
+                scale_price(_legacy_decimal(row[6])), float(row[7])
+            )
+        )
+        logger.info(f"Migrace tickers: převedeno {copied} řádků")
+
+    if 'timestamp' in _table_columns(conn, 'order_books'):
+        copied = _rebuild(
+            conn, 'order_books',
+            "SELECT symbol, timestamp, best_bid, best_ask FROM {table}",
+            INSERT_ORDER_BOOK,
+            lambda row: (
+                row[0], _legacy_ms(row[1]),
+                scale_price(_legacy_decimal(row[2])) if row[2] is not None else None,
+                scale_price(_legacy_decimal(row[3])) if row[3] is not None else None,
+                # Původní schéma velikosti neukládalo
+                0 if row[2] is not None else None,
+                0 if row[3] is not None else None
+            )
+        )
+        logger.info(f"Migrace order_books: převedeno {copied} řádků")
+
+
+def _migrate_2_to_3(conn: sqlite3.Connection) -> None:
+    """Indexy trades (created_at, status, symbol, strategy_name)"""
+    if _table_columns(conn, 'trades'):
+        for statement in TRADE_INDEXES:
+            conn.execute(statement)
+
+
+def _migrate_3_to_4(conn: sqlite3.Connection) -> None:
+    """Souhrn trade_pnl_daily naplněný z existujících obchodů"""
+    if not _table_columns(conn, 'trades'):
+        return
+    for statement in TRADE_SUMMARY_TABLE:
+        conn.execute(statement)
+    conn.execute("DELETE FROM trade_pnl_daily")
+    conn.execute(BACKFILL_TRADE_SUMMARY)
+    for statement in TRADE_SUMMARY_TRIGGERS:
+        conn.execute(statement)
+
+
+def _migrate_4_to_5(conn: sqlite3.Connection) -> None:
+    """Tabulka strategy_metrics - jednorázově přehraje uzavřené obchody"""
+    for statement in STRATEGY_METRICS_SCHEMA:
+        conn.execute(statement)
+    if not _table_columns(conn, 'trades'):
+        return
+
+    metrics: Dict[str, StrategyMetrics] = {}
+    rows = _legacy_rows(
+        conn,
+        "SELECT COALESCE(strategy_name, ''), pnl FROM trades WHERE pnl IS NOT NULL "
+        "ORDER BY COALESCE(closed_at, created_at), id"
+    )
+    for strategy_name, pnl in rows:
+        if strategy_name not in metrics:
+            metrics[strategy_name] = StrategyMetrics(strategy_name=strategy_name, created_at=datetime.now())
+        metrics[strategy_name].record_trade(_legacy_decimal(pnl))
+
+    conn.executemany(UPSERT_STRATEGY_METRICS, [strategy_metrics_to_params(m) for m in metrics.values()])
+    logger.info(f"Migrace strategy_metrics: {len(metrics)} strategií")
+
+
+def _migrate_5_to_6(conn: sqlite3.Connection) -> None:
+    """Tabulky ticker_bars_1m a order_book_bars_1m"""
+    for statement in MARKET_DATA_BARS_SCHEMA:
+        conn.execute(statement)
+
+
+def _migrate_6_to_7(conn: sqlite3.Connection) -> None:
+    """Tabulka order_book_snapshots (dosavadní order booky mají jen top of book)"""
+    for statement in ORDER_BOOK_SNAPSHOTS_SCHEMA:
+        conn.execute(statement)
+
+
+def _migrate_7_to_8(conn: sqlite3.Connection) -> None:
+    """24h objem tickerů z SIZE_SCALE na VOLUME_SCALE (zaokrouhlení, objem je nezáporný)"""
+    if _table_columns(conn, 'tickers'):
+        factor = SIZE_SCALE // VOLUME_SCALE
+        conn.execute(f"UPDATE tickers SET volume_24h = (volume_24h + {factor // 2}) / {factor}")
+
+
+# MIGRATIONS[n] převede schéma z verze n na n + 1
+MIGRATIONS: Dict[int, Callable[[sqlite3.Connection], None]] = {
+    1: _migrate_1_to_2,
+    2: _migrate_2_to_3,
+    3: _migrate_3_to_4,
+    4: _migrate_4_to_5,
+    5: _migrate_5_to_6,
+    6: _migrate_6_to_7,
+    7: _migrate_7_to_8,
+}
+
+
+def _set_version(conn: sqlite3.Connection, version: int) -> None:
+    conn.execute(f"PRAGMA user_version = {int(version)}")
+
+
+def ensure_schema(conn: sqlite3.Connection, auto_migrate: bool = True) -> int:
+    """Vytvoří nebo zmigruje schéma na SCHEMA_VERSION v jedné transakci
+
+    Vrací verzi, ze které se vycházelo. Bez `auto_migrate` vyhodí
+    MigrationRequiredError, pokud má databáze starší schéma.
+    """
+    if conn.in_transaction:
+        conn.commit()
+    # IMMEDIATE - souběžný proces nezačne migrovat zároveň s námi
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        version = schema_version(conn)
+        if version > SCHEMA_VERSION:
+            raise MigrationRequiredError(
+                f"Databáze má novější schéma (verze {version}) než aplikace (verze {SCHEMA_VERSION})"
+            )
+        if 0 < version < SCHEMA_VERSION:
+            if not auto_migrate:
+                raise MigrationRequiredError(
+                    f"Databáze má schéma verze {version}, aplikace vyžaduje verzi {SCHEMA_VERSION}. "
+                    f"Spusť migraci (python -m {__name__} <db>) nebo zapni database.auto_migrate."
+                )
+            for step in range(version, SCHEMA_VERSION):
+                logger.info(f"Migruji schéma databáze z verze {step} na {step + 1}")
+                MIGRATIONS[step](conn)
+
+        if version != SCHEMA_VERSION:
+            for statement in SCHEMA:
+                conn.execute(statement)
+            _set_version(conn, SCHEMA_VERSION)
+        conn.commit()
+        return version
+    except BaseException:
+        conn.rollback()
+        raise
+
+
+def enable_incremental_vacuum(conn: sqlite3.Connection) -> None:
+    """Zapne auto_vacuum=INCREMENTAL
+
+    U nového souboru platí hned (musí předcházet WAL a prvním tabulkám),
+    u existující databáze až po VACUUM (`--vacuum` v CLI).
+    """
+    conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+
+
+def ensure_schema_at_path(db_path: str, auto_migrate: bool = True) -> int:
+    """`ensure_schema` přes vlastní krátkodobé připojení"""
+    conn = sqlite3.connect(db_path)
+    try:
+        enable_incremental_vacuum(conn)
+        return ensure_schema(conn, auto_migrate)
+    finally:
+        conn.close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Migrace SQLite databáze na aktuální schéma")
+    parser.add_argument("db_path", help="Cesta k databázi")
+    parser.add_argument("--check", action="store_true", help="Jen vypíše verzi schématu")
+    parser.add_argument("--vacuum", action="store_true", help="Po migraci zmenší soubor (VACUUM)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+
+    conn = sqlite3.connect(args.db_path)
+    try:
+        version = schema_version(conn)
+        if args.check:
+            print(f"Verze schématu: {version} (aktuální: {SCHEMA_VERSION})")
+            return 0 if version == SCHEMA_VERSION else 1
+
+        previous = ensure_schema(conn, auto_migrate=True)
+        print(f"Schéma: verze {previous} -> {SCHEMA_VERSION}")
+        if args.vacuum:
+            # VACUUM zároveň převede soubor na inkrementální auto_vacuum
+            enable_incremental_vacuum(conn)
+            conn.execute("VACUUM")
+        return 0
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
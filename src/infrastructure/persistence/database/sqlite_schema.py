@@ -0,0 +1,715 @@
+"""Společné SQLite schéma a převody řádků pro sqlite i aiosqlite repository"""
+
+import logging
+import sqlite3
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, List, Optional, Sequence, Tuple
+
+from ....domain.models import (
+    Trade, Position, TradeType, TradeStatus, OrderType, Candle, Ticker, OrderBook, PnlSummary,
+    StrategyMetrics
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+TRADES_SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS trades (
+        id TEXT PRIMARY KEY,
+        symbol TEXT NOT NULL,
+        side TEXT NOT NULL,
+        quantity REAL NOT NULL,
+        price REAL NOT NULL,
+        order_type TEXT NOT NULL,
+        status TEXT NOT NULL,
+        strategy_name TEXT,
+        created_at TIMESTAMP,
+        executed_at TIMESTAMP,
+        closed_at TIMESTAMP,
+        stop_loss REAL,
+        take_profit REAL,
+        entry_price REAL,
+        exit_price REAL,
+        pnl REAL,
+        commission REAL,
+        exchange_order_id TEXT,
+        notes TEXT
+    )
+    """,
+]
+
+# Indexy pro filtry repository; (created_at, id) na konci drží řazení i keyset stránkování
+TRADE_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_trades_created ON trades(created_at, id)",
+    "CREATE INDEX IF NOT EXISTS idx_trades_status_created ON trades(status, created_at, id)",
+    "CREATE INDEX IF NOT EXISTS idx_trades_symbol_created ON trades(symbol, created_at, id)",
+    "CREATE INDEX IF NOT EXISTS idx_trades_strategy_created ON trades(strategy_name, created_at, id)",
+]
+
+# Den obchodu pro souhrny PnL - den uzavření, u starších záznamů den vytvoření
+_TRADE_DAY = "COALESCE(date(COALESCE({row}.closed_at, {row}.created_at)), '')"
+# PnL v jednotkách 1/PRICE_SCALE, aby se součty sčítaly přesně
+_TRADE_PNL = "CAST(ROUND({row}.pnl * 100000000) AS INTEGER)"
+
+
+def _pnl_add(row: str) -> str:
+    pnl = _TRADE_PNL.format(row=row)
+    return f"""
+        INSERT INTO trade_pnl_daily (day, symbol, strategy_name, trades, wins, losses, gross_profit, gross_loss)
+        VALUES (
+            {_TRADE_DAY.format(row=row)}, {row}.symbol, COALESCE({row}.strategy_name, ''),
+            1, {pnl} > 0, {pnl} < 0, MAX({pnl}, 0), MAX(-{pnl}, 0)
+        )
+        ON CONFLICT (day, symbol, strategy_name) DO UPDATE SET
+            trades = trades + excluded.trades,
+            wins = wins + excluded.wins,
+            losses = losses + excluded.losses,
+            gross_profit = gross_profit + excluded.gross_profit,
+            gross_loss = gross_loss + excluded.gross_loss;
+    """
+
+
+def _pnl_remove(row: str) -> str:
+    pnl = _TRADE_PNL.format(row=row)
+    return f"""
+        UPDATE trade_pnl_daily SET
+            trades = trades - 1,
+            wins = wins - ({pnl} > 0),
+            losses = losses - ({pnl} < 0),
+            gross_profit = gross_profit - MAX({pnl}, 0),
+            gross_loss = gross_loss - MAX(-{pnl}, 0)
+        WHERE day = {_TRADE_DAY.format(row=row)}
+          AND symbol = {row}.symbol
+          AND strategy_name = COALESCE({row}.strategy_name, '');
+    """
+
+
+# Materializovaný denní souhrn realizovaného PnL (obchody s vyplněným pnl).
+# Udržují ho triggery, takže agregace pro risk a dashboard čtou jen pár řádků.
+TRADE_SUMMARY_TABLE = [
+    """
+    CREATE TABLE IF NOT EXISTS trade_pnl_daily (
+        day TEXT NOT NULL,
+        symbol TEXT NOT NULL,
+        strategy_name TEXT NOT NULL,
+        trades INTEGER NOT NULL DEFAULT 0,
+        wins INTEGER NOT NULL DEFAULT 0,
+        losses INTEGER NOT NULL DEFAULT 0,
+        gross_profit INTEGER NOT NULL DEFAULT 0,
+        gross_loss INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (day, symbol, strategy_name)
+    ) WITHOUT ROWID
+    """,
+]
+
+TRADE_SUMMARY_TRIGGERS = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_trades_pnl_insert AFTER INSERT ON trades
+    WHEN NEW.pnl IS NOT NULL
+    BEGIN {_pnl_add("NEW")} END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_trades_pnl_delete AFTER DELETE ON trades
+    WHEN OLD.pnl IS NOT NULL
+    BEGIN {_pnl_remove("OLD")} END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_trades_pnl_update_old
+    AFTER UPDATE OF pnl, closed_at, created_at, symbol, strategy_name ON trades
+    WHEN OLD.pnl IS NOT NULL
+    BEGIN {_pnl_remove("OLD")} END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_trades_pnl_update_new
+    AFTER UPDATE OF pnl, closed_at, created_at, symbol, strategy_name ON trades
+    WHEN NEW.pnl IS NOT NULL
+    BEGIN {_pnl_add("NEW")} END
+    """,
+]
+
+# Naplnění souhrnu z existujících obchodů (migrace)
+BACKFILL_TRADE_SUMMARY = f"""
+    INSERT INTO trade_pnl_daily (day, symbol, strategy_name, trades, wins, losses, gross_profit, gross_loss)
+    SELECT {_TRADE_DAY.format(row="trades")}, symbol, COALESCE(strategy_name, ''), COUNT(*),
+           SUM({_TRADE_PNL.format(row="trades")} > 0), SUM({_TRADE_PNL.format(row="trades")} < 0),
+           SUM(MAX({_TRADE_PNL.format(row="trades")}, 0)), SUM(MAX(-{_TRADE_PNL.format(row="trades")}, 0))
+    FROM trades
+    WHERE pnl IS NOT NULL
+    GROUP BY 1, 2, 3
+"""
+
+# Průběžný stav StrategyMetrics - částky * PRICE_SCALE, časy v epoch ms
+STRATEGY_METRICS_SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS strategy_metrics (
+        strategy_name TEXT PRIMARY KEY,
+        total_trades INTEGER NOT NULL,
+        winning_trades INTEGER NOT NULL,
+        losing_trades INTEGER NOT NULL,
+        gross_profit INTEGER NOT NULL,
+        gross_loss INTEGER NOT NULL,
+        peak_pnl INTEGER NOT NULL,
+        max_drawdown INTEGER NOT NULL,
+        pnl_mean REAL NOT NULL,
+        pnl_m2 REAL NOT NULL,
+        created_at INTEGER NOT NULL,
+        updated_at INTEGER NOT NULL
+    ) WITHOUT ROWID
+    """,
+]
+
+POSITIONS_SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS positions (
+        symbol TEXT PRIMARY KEY,
+        side TEXT NOT NULL,
+        size REAL NOT NULL,
+        entry_price REAL NOT NULL,
+        current_price REAL NOT NULL,
+        unrealized_pnl REAL NOT NULL,
+        margin REAL NOT NULL,
+        leverage INTEGER DEFAULT 1,
+        created_at TIMESTAMP NOT NULL
+    )
+    """,
+]
+
+MARKET_DATA_SCHEMA = [
+    # Svíčky - časy v epoch ms, ceny * PRICE_SCALE, objemy * SIZE_SCALE
+    """
+    CREATE TABLE IF NOT EXISTS candles (
+        symbol TEXT NOT NULL,
+        interval TEXT NOT NULL,
+        ts INTEGER NOT NULL,
+        open INTEGER NOT NULL,
+        high INTEGER NOT NULL,
+        low INTEGER NOT NULL,
+        close INTEGER NOT NULL,
+        volume INTEGER NOT NULL,
+        PRIMARY KEY (symbol, interval, ts)
+    ) WITHOUT ROWID
+    """,
+    # Ticker data - 24h objem v menší škále VOLUME_SCALE
+    """
+    CREATE TABLE IF NOT EXISTS tickers (
+        symbol TEXT NOT NULL,
+        ts INTEGER NOT NULL,
+        last_price INTEGER NOT NULL,
+        bid_price INTEGER NOT NULL,
+        ask_price INTEGER NOT NULL,
+        volume_24h INTEGER NOT NULL,
+        price_change_24h INTEGER NOT NULL,
+        price_change_percent_24h REAL NOT NULL,
+        PRIMARY KEY (symbol, ts)
+    ) WITHOUT ROWID
+    """,
+    # Order book (zjednodušená verze - nejlepší bid/ask a jejich velikost)
+    """
+    CREATE TABLE IF NOT EXISTS order_books (
+        symbol TEXT NOT NULL,
+        ts INTEGER NOT NULL,
+        best_bid INTEGER,
+        best_ask INTEGER,
+        bid_size INTEGER,
+        ask_size INTEGER,
+        PRIMARY KEY (symbol, ts)
+    ) WITHOUT ROWID
+    """,
+]
+
+# Minutové souhrny tickerů a order booků, do kterých kompakce sbalí starší
+# surová data (viz market_data_compaction)
+MARKET_DATA_BARS_SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS ticker_bars_1m (
+        symbol TEXT NOT NULL,
+        ts INTEGER NOT NULL,
+        open INTEGER NOT NULL,
+        high INTEGER NOT NULL,
+        low INTEGER NOT NULL,
+        close INTEGER NOT NULL,
+        samples INTEGER NOT NULL,
+        PRIMARY KEY (symbol, ts)
+    ) WITHOUT ROWID
+    """,
+    # Spread = best_ask - best_bid; průměr = spread_sum / spread_samples
+    """
+    CREATE TABLE IF NOT EXISTS order_book_bars_1m (
+        symbol TEXT NOT NULL,
+        ts INTEGER NOT NULL,
+        best_bid INTEGER,
+        best_ask INTEGER,
+        spread_min INTEGER,
+        spread_max INTEGER,
+        spread_sum INTEGER NOT NULL,
+        spread_samples INTEGER NOT NULL,
+        samples INTEGER NOT NULL,
+        PRIMARY KEY (symbol, ts)
+    ) WITHOUT ROWID
+    """,
+]
+
+# Plná hloubka order booku - blob na snapshot (viz order_book_codec),
+# keyframe = 1 u snapshotů, od kterých lze dekódovat
+ORDER_BOOK_SNAPSHOTS_SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS order_book_snapshots (
+        symbol TEXT NOT NULL,
+        ts INTEGER NOT NULL,
+        keyframe INTEGER NOT NULL,
+        data BLOB NOT NULL,
+        PRIMARY KEY (symbol, ts)
+    ) WITHOUT ROWID
+    """,
+]
+
+# Verze schématu v PRAGMA user_version (viz sqlite_migrations)
+SCHEMA_VERSION = 8
+
+SCHEMA = (
+    TRADES_SCHEMA + TRADE_INDEXES + TRADE_SUMMARY_TABLE + TRADE_SUMMARY_TRIGGERS
+    + STRATEGY_METRICS_SCHEMA + POSITIONS_SCHEMA + MARKET_DATA_SCHEMA + MARKET_DATA_BARS_SCHEMA
+    + ORDER_BOOK_SNAPSHOTS_SCHEMA
+)
+
+# Fixní měřítka celočíselných sloupců
+PRICE_DECIMALS = 8
+SIZE_DECIMALS = 6
+# 24h objem tickeru - u kontraktů s obří zásobou přesahuje v SIZE_SCALE rozsah INTEGER
+VOLUME_DECIMALS = 2
+PRICE_SCALE = 10 ** PRICE_DECIMALS
+SIZE_SCALE = 10 ** SIZE_DECIMALS
+VOLUME_SCALE = 10 ** VOLUME_DECIMALS
+_MAX_INTEGER = 2 ** 63 - 1
+
+
+# Nový obchod - duplicitní ID skončí IntegrityError místo tichého přepsání
+INSERT_TRADE = """
+    INSERT INTO trades (
+        id, symbol, side, quantity, price, order_type, status,
+        strategy_name, created_at, executed_at, closed_at,
+        stop_loss, take_profit, entry_price, exit_price,
+        pnl, commission, exchange_order_id, notes
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Parametry: trade_to_params(trade)[1:] + (trade.id,)
+UPDATE_TRADE = """
+    UPDATE trades SET
+        symbol = ?, side = ?, quantity = ?, price = ?, order_type = ?, status = ?,
+        strategy_name = ?, created_at = ?, executed_at = ?, closed_at = ?,
+        stop_loss = ?, take_profit = ?, entry_price = ?, exit_price = ?,
+        pnl = ?, commission = ?, exchange_order_id = ?, notes = ?
+    WHERE id = ?
+"""
+
+# ON CONFLICT DO UPDATE místo INSERT OR REPLACE - REPLACE nespouští DELETE
+# triggery a souhrn trade_pnl_daily by se rozešel s tabulkou trades
+UPSERT_TRADE = """
+    INSERT INTO trades (
+        id, symbol, side, quantity, price, order_type, status,
+        strategy_name, created_at, executed_at, closed_at,
+        stop_loss, take_profit, entry_price, exit_price,
+        pnl, commission, exchange_order_id, notes
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (id) DO UPDATE SET
+        symbol = excluded.symbol, side = excluded.side, quantity = excluded.quantity,
+        price = excluded.price, order_type = excluded.order_type, status = excluded.status,
+        strategy_name = excluded.strategy_name, created_at = excluded.created_at,
+        executed_at = excluded.executed_at, closed_at = excluded.closed_at,
+        stop_loss = excluded.stop_loss, take_profit = excluded.take_profit,
+        entry_price = excluded.entry_price, exit_price = excluded.exit_price,
+        pnl = excluded.pnl, commission = excluded.commission,
+        exchange_order_id = excluded.exchange_order_id, notes = excluded.notes
+"""
+
+UPSERT_POSITION = """
+    INSERT OR REPLACE INTO positions (
+        symbol, side, size, entry_price, current_price,
+        unrealized_pnl, margin, leverage, created_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+UPSERT_STRATEGY_METRICS = """
+    INSERT OR REPLACE INTO strategy_metrics (
+        strategy_name, total_trades, winning_trades, losing_trades,
+        gross_profit, gross_loss, peak_pnl, max_drawdown,
+        pnl_mean, pnl_m2, created_at, updated_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+UPSERT_CANDLE = """
+    INSERT OR REPLACE INTO candles (
+        symbol, interval, ts, open, high, low, close, volume
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+INSERT_TICKER = """
+    INSERT OR REPLACE INTO tickers (
+        symbol, ts, last_price, bid_price, ask_price,
+        volume_24h, price_change_24h, price_change_percent_24h
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+INSERT_ORDER_BOOK = """
+    INSERT OR REPLACE INTO order_books (
+        symbol, ts, best_bid, best_ask, bid_size, ask_size
+    ) VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+UPSERT_ORDER_BOOK_SNAPSHOT = """
+    INSERT OR REPLACE INTO order_book_snapshots (symbol, ts, keyframe, data) VALUES (?, ?, ?, ?)
+"""
+
+LATEST_ORDER_BOOK_SNAPSHOT_TS = "SELECT MAX(ts) FROM order_book_snapshots WHERE symbol = ?"
+
+
+def order_book_snapshots_query(symbol: str, start_ms: int, end_ms: int) -> Tuple[str, List[Any]]:
+    """Snapshoty v rozsahu včetně předcházejících od nejbližšího keyframe"""
+    sql = """
+        SELECT ts, data FROM order_book_snapshots
+        WHERE symbol = ?
+          AND ts >= COALESCE(
+              (SELECT MAX(ts) FROM order_book_snapshots WHERE symbol = ? AND keyframe = 1 AND ts <= ?), ?
+          )
+          AND ts <= ?
+        ORDER BY ts
+    """
+    return sql, [symbol, symbol, start_ms, start_ms, end_ms]
+
+
+def trade_page_query(
+    where: str,
+    params: Sequence[Any],
+    after: Optional[Tuple[Any, str]],
+    page_size: int
+) -> Tuple[str, List[Any]]:
+    """Dotaz na jednu stránku obchodů (keyset podle (created_at, id) sestupně)
+
+    `after` je (created_at, id) posledního obchodu předchozí stránky tak,
+    jak je uložený v databázi.
+    """
+    sql = f"SELECT * FROM trades WHERE {where}"
+    args = list(params)
+    if after is not None:
+        sql += " AND (created_at, id) < (?, ?)"
+        args.extend(after)
+    sql += " ORDER BY created_at DESC, id DESC LIMIT ?"
+    args.append(page_size)
+    return sql, args
+
+
+def page_cursor(row: sqlite3.Row) -> Optional[Tuple[Any, str]]:
+    """Keyset kurzor za daným řádkem (None = dál už stránkovat nejde)"""
+    if row['created_at'] is None:
+        return None
+    return row['created_at'], row['id']
+
+
+# Sloupce, podle kterých lze souhrn PnL seskupit
+PNL_GROUP_COLUMNS = {"symbol": "symbol", "strategy": "strategy_name", "day": "day"}
+
+
+def pnl_summary_query(
+    start_day: Optional[date] = None,
+    end_day: Optional[date] = None,
+    symbol: Optional[str] = None,
+    strategy_name: Optional[str] = None,
+    group_by: Optional[str] = None
+) -> Tuple[str, List[Any]]:
+    """Agregační dotaz nad trade_pnl_daily (dny včetně hranic)"""
+    conditions = []
+    args: List[Any] = []
+    if start_day is not None:
+        conditions.append("day >= ?")
+        args.append(start_day.isoformat())
+    if end_day is not None:
+        conditions.append("day <= ?")
+        args.append(end_day.isoformat())
+    if symbol is not None:
+        conditions.append("symbol = ?")
+        args.append(symbol)
+    if strategy_name is not None:
+        conditions.append("strategy_name = ?")
+        args.append(strategy_name)
+
+    columns = "SUM(trades) AS trades, SUM(wins) AS wins, SUM(losses) AS losses, " \
+              "SUM(gross_profit) AS gross_profit, SUM(gross_loss) AS gross_loss"
+    if group_by is not None:
+        key = PNL_GROUP_COLUMNS[group_by]
+        columns = f"{key} AS key, {columns}"
+
+    sql = f"SELECT {columns} FROM trade_pnl_daily"
+    if conditions:
+        sql += " WHERE " + " AND ".join(conditions)
+    if group_by is not None:
+        sql += " GROUP BY key HAVING SUM(trades) > 0 ORDER BY key"
+    return sql, args
+
+
+def row_to_pnl_summary(row: Optional[sqlite3.Row]) -> PnlSummary:
+    """Převede agregovaný řádek na PnlSummary (prázdný výsledek = nuly)"""
+    if row is None or row['trades'] is None:
+        return PnlSummary()
+    return PnlSummary(
+        trades=row['trades'],
+        winning_trades=row['wins'],
+        losing_trades=row['losses'],
+        gross_profit=unscale_price(row['gross_profit']),
+        gross_loss=unscale_price(row['gross_loss'])
+    )
+
+
+def _optional_float(value: Optional[Decimal]) -> Optional[float]:
+    return float(value) if value else None
+
+
+def _optional_decimal(value: Any) -> Optional[Decimal]:
+    return Decimal(str(value)) if value else None
+
+
+def _optional_datetime(value: Any) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value else None
+
+
+def trade_update_params(trade: Trade) -> Tuple[Any, ...]:
+    """Parametry pro UPDATE_TRADE"""
+    params = trade_to_params(trade)
+    return params[1:] + params[:1]
+
+
+def trade_to_params(trade: Trade) -> Tuple[Any, ...]:
+    """Parametry pro INSERT_TRADE/UPSERT_TRADE"""
+    return (
+        trade.id, trade.symbol, trade.side.value, float(trade.quantity),
+        float(trade.price), trade.order_type.value, trade.status.value,
+        trade.strategy_name, trade.created_at, trade.executed_at,
+        trade.closed_at, _optional_float(trade.stop_loss),
+        _optional_float(trade.take_profit),
+        _optional_float(trade.entry_price),
+        _optional_float(trade.exit_price),
+        _optional_float(trade.pnl),
+        _optional_float(trade.commission),
+        trade.exchange_order_id, trade.notes
+    )
+
+
+def row_to_trade(row: sqlite3.Row) -> Trade:
+    """Převede databázový řádek na Trade objekt"""
+    return Trade(
+        id=row['id'],
+        symbol=row['symbol'],
+        side=TradeType(row['side']),
+        quantity=Decimal(str(row['quantity'])),
+        price=Decimal(str(row['price'])),
+        order_type=OrderType(row['order_type']),
+        status=TradeStatus(row['status']),
+        strategy_name=row['strategy_name'],
+        created_at=_optional_datetime(row['created_at']),
+        executed_at=_optional_datetime(row['executed_at']),
+        closed_at=_optional_datetime(row['closed_at']),
+        stop_loss=_optional_decimal(row['stop_loss']),
+        take_profit=_optional_decimal(row['take_profit']),
+        entry_price=_optional_decimal(row['entry_price']),
+        exit_price=_optional_decimal(row['exit_price']),
+        pnl=_optional_decimal(row['pnl']),
+        commission=_optional_decimal(row['commission']),
+        exchange_order_id=row['exchange_order_id'],
+        notes=row['notes']
+    )
+
+
+def position_to_params(position: Position) -> Tuple[Any, ...]:
+    """Parametry pro UPSERT_POSITION"""
+    return (
+        position.symbol, position.side.value, float(position.size),
+        float(position.entry_price), float(position.current_price),
+        float(position.unrealized_pnl), float(position.margin),
+        position.leverage, position.created_at
+    )
+
+
+def row_to_position(row: sqlite3.Row) -> Position:
+    """Převede databázový řádek na Position objekt"""
+    return Position(
+        symbol=row['symbol'],
+        side=TradeType(row['side']),
+        size=Decimal(str(row['size'])),
+        entry_price=Decimal(str(row['entry_price'])),
+        current_price=Decimal(str(row['current_price'])),
+        unrealized_pnl=Decimal(str(row['unrealized_pnl'])),
+        margin=Decimal(str(row['margin'])),
+        leverage=row['leverage'],
+        created_at=datetime.fromisoformat(row['created_at'])
+    )
+
+
+def to_epoch_ms(value: datetime) -> int:
+    """datetime -> epoch milisekundy"""
+    return round(value.timestamp() * 1000)
+
+
+def from_epoch_ms(value: int) -> datetime:
+    """Epoch milisekundy -> datetime (lokální čas, stejně jako BybitClient)"""
+    return datetime.fromtimestamp(value / 1000)
+
+
+def scale_price(value: Any) -> int:
+    """Cena -> celé číslo v jednotkách 1/PRICE_SCALE"""
+    if not isinstance(value, Decimal):
+        value = Decimal(str(value))
+    return int(value.scaleb(PRICE_DECIMALS).to_integral_value())
+
+
+def unscale_price(value: int) -> Decimal:
+    return Decimal(value).scaleb(-PRICE_DECIMALS)
+
+
+def scale_size(value: Any) -> int:
+    """Množství/objem -> celé číslo v jednotkách 1/SIZE_SCALE"""
+    if not isinstance(value, Decimal):
+        value = Decimal(str(value))
+    return int(value.scaleb(SIZE_DECIMALS).to_integral_value())
+
+
+def unscale_size(value: int) -> Decimal:
+    return Decimal(value).scaleb(-SIZE_DECIMALS)
+
+
+def scale_volume(value: Any) -> int:
+    """24h objem -> celé číslo v jednotkách 1/VOLUME_SCALE (mimo rozsah INTEGER se ořízne)"""
+    if not isinstance(value, Decimal):
+        value = Decimal(str(value))
+    scaled = int(value.scaleb(VOLUME_DECIMALS).to_integral_value())
+    if abs(scaled) > _MAX_INTEGER:
+        logger.warning(f"24h objem {value} je mimo rozsah sloupce, ukládá se oříznutý")
+        scaled = _MAX_INTEGER if scaled > 0 else -_MAX_INTEGER
+    return scaled
+
+
+def unscale_volume(value: int) -> Decimal:
+    return Decimal(value).scaleb(-VOLUME_DECIMALS)
+
+
+def _optional_price(value: Any) -> Optional[int]:
+    return scale_price(value) if value is not None else None
+
+
+def _optional_size(value: Any) -> Optional[int]:
+    return scale_size(value) if value is not None else None
+
+
+def strategy_metrics_to_params(metrics: StrategyMetrics) -> Tuple[Any, ...]:
+    """Parametry pro UPSERT_STRATEGY_METRICS"""
+    return (
+        metrics.strategy_name, metrics.total_trades,
+        metrics.winning_trades, metrics.losing_trades,
+        scale_price(metrics.gross_profit), scale_price(metrics.gross_loss),
+        scale_price(metrics.peak_pnl), scale_price(metrics.max_drawdown),
+        metrics.pnl_mean, metrics.pnl_m2,
+        to_epoch_ms(metrics.created_at), to_epoch_ms(metrics.updated_at)
+    )
+
+
+def row_to_strategy_metrics(row: sqlite3.Row) -> StrategyMetrics:
+    """Převede databázový řádek na StrategyMetrics (odvozené metriky se dopočítají)"""
+    gross_profit = unscale_price(row['gross_profit'])
+    gross_loss = unscale_price(row['gross_loss'])
+    metrics = StrategyMetrics(
+        strategy_name=row['strategy_name'],
+        total_trades=row['total_trades'],
+        winning_trades=row['winning_trades'],
+        losing_trades=row['losing_trades'],
+        total_pnl=gross_profit - gross_loss,
+        max_drawdown=unscale_price(row['max_drawdown']),
+        created_at=from_epoch_ms(row['created_at']),
+        gross_profit=gross_profit,
+        gross_loss=gross_loss,
+        peak_pnl=unscale_price(row['peak_pnl']),
+        pnl_mean=row['pnl_mean'],
+        pnl_m2=row['pnl_m2']
+    )
+    metrics.refresh()
+    metrics.updated_at = from_epoch_ms(row['updated_at'])
+    return metrics
+
+
+def candle_to_params(candle: Candle) -> Tuple[Any, ...]:
+    """Parametry pro UPSERT_CANDLE"""
+    return (
+        candle.symbol, candle.interval, to_epoch_ms(candle.timestamp),
+        scale_price(candle.open), scale_price(candle.high),
+        scale_price(candle.low), scale_price(candle.close),
+        scale_size(candle.volume)
+    )
+
+
+def row_to_candle(row: sqlite3.Row) -> Candle:
+    """Převede databázový řádek na Candle objekt"""
+    return Candle(
+        symbol=row['symbol'],
+        timestamp=from_epoch_ms(row['ts']),
+        open=unscale_price(row['open']),
+        high=unscale_price(row['high']),
+        low=unscale_price(row['low']),
+        close=unscale_price(row['close']),
+        volume=unscale_size(row['volume']),
+        interval=row['interval']
+    )
+
+
+def ticker_to_params(ticker: Ticker) -> Tuple[Any, ...]:
+    """Parametry pro INSERT_TICKER"""
+    return (
+        ticker.symbol, to_epoch_ms(ticker.timestamp),
+        scale_price(ticker.last_price), scale_price(ticker.bid_price),
+        scale_price(ticker.ask_price), scale_volume(ticker.volume_24h),
+        scale_price(ticker.price_change_24h),
+        float(ticker.price_change_percent_24h)
+    )
+
+
+def row_to_ticker(row: sqlite3.Row) -> Ticker:
+    """Převede databázový řádek na Ticker objekt"""
+    return Ticker(
+        symbol=row['symbol'],
+        last_price=unscale_price(row['last_price']),
+        bid_price=unscale_price(row['bid_price']),
+        ask_price=unscale_price(row['ask_price']),
+        volume_24h=unscale_volume(row['volume_24h']),
+        price_change_24h=unscale_price(row['price_change_24h']),
+        price_change_percent_24h=row['price_change_percent_24h'],
+        timestamp=from_epoch_ms(row['ts'])
+    )
+
+
+def order_book_to_params(order_book: OrderBook) -> Tuple[Any, ...]:
+    """Parametry pro INSERT_ORDER_BOOK"""
+    return (
+        order_book.symbol,
+        to_epoch_ms(order_book.timestamp),
+        _optional_price(order_book.best_bid),
+        _optional_price(order_book.best_ask),
+        _optional_size(order_book.bids[0][1] if order_book.bids else None),
+        _optional_size(order_book.asks[0][1] if order_book.asks else None)
+    )
+
+
+def row_to_order_book(row: sqlite3.Row) -> OrderBook:
+    """Převede řádek na order book (pouze best bid/ask)"""
+    bids = []
+    asks = []
+    if row['best_bid'] is not None:
+        bids.append((unscale_price(row['best_bid']), unscale_size(row['bid_size'] or 0)))
+    if row['best_ask'] is not None:
+        asks.append((unscale_price(row['best_ask']), unscale_size(row['ask_size'] or 0)))
+
+    return OrderBook(
+        symbol=row['symbol'],
+        bids=bids,
+        asks=asks,
+        timestamp=from_epoch_ms(row['ts'])
+    )
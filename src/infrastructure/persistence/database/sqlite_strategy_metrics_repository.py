@@ -0,0 +1,45 @@
+import sqlite3
+from typing import List, Optional
+
+from ....domain.models import StrategyMetrics
+from ....domain.repositories import IStrategyMetricsRepository
+from .sqlite_connection import SqliteConnectionManager
+from .sqlite_migrations import ensure_schema
+from .sqlite_schema import UPSERT_STRATEGY_METRICS, strategy_metrics_to_params, row_to_strategy_metrics
+
+
+class SqliteStrategyMetricsRepository(IStrategyMetricsRepository):
+    """SQLite implementace repository metrik strategií"""
+
+    def __init__(self, db_path: str, auto_migrate: bool = True):
+        self.db_path = db_path
+        self._db = SqliteConnectionManager.for_path(db_path)
+        self._ensure_tables(auto_migrate)
+
+    def _ensure_tables(self, auto_migrate: bool):
+        """Vytvoří tabulky pokud neexistují (případně zmigruje starší schéma)"""
+        self._db.write_sync(lambda conn: ensure_schema(conn, auto_migrate))
+
+    async def save_metrics(self, metrics: StrategyMetrics) -> StrategyMetrics:
+        """Uloží metriky strategie"""
+        params = strategy_metrics_to_params(metrics)
+        await self._db.write(lambda conn: conn.execute(UPSERT_STRATEGY_METRICS, params))
+        return metrics
+
+    async def get_metrics(self, strategy_name: str) -> Optional[StrategyMetrics]:
+        """Najde metriky strategie"""
+        def _get(conn: sqlite3.Connection):
+            row = conn.execute("SELECT * FROM strategy_metrics WHERE strategy_name = ?", (strategy_name,)).fetchone()
+            if row:
+                return row_to_strategy_metrics(row)
+            return None
+
+        return await self._db.read(_get)
+
+    async def get_all_metrics(self) -> List[StrategyMetrics]:
+        """Najde metriky všech strategií"""
+        def _get(conn: sqlite3.Connection):
+            rows = conn.execute("SELECT * FROM strategy_metrics ORDER BY strategy_name").fetchall()
+            return [row_to_strategy_metrics(row) for row in rows]
+
+        return await self._db.read(_get)
@@ -0,0 +1,131 @@
+import asyncio
+import inspect
+import logging
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, asdict
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+from ....domain.repositories import IUnitOfWork
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class UnitOfWorkStats:
+    """Metriky jednotek práce"""
+    committed: int = 0
+    rolled_back: int = 0
+    deferred_writes: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class _Unit:
+    """Otevřená jednotka práce jednoho tasku"""
+
+    def __init__(self):
+        self.task = asyncio.current_task()
+        # backend -> odložené zápisové funkce v pořadí volání
+        self._writes: Dict[Any, List[Callable]] = {}
+        self._after_commit: List[Callable[[], Any]] = []
+        self._on_rollback: List[Callable[[], Any]] = []
+
+    @property
+    def write_count(self) -> int:
+        return sum(len(writes) for writes in self._writes.values())
+
+    def defer(self, backend: Any, fn: Callable) -> None:
+        """Zařadí zápis; provede ho `backend.run_unit` při commitu"""
+        self._writes.setdefault(backend, []).append(fn)
+
+    def after_commit(self, fn: Callable[[], Any]) -> None:
+        """Zavolá se po úspěšném commitu (může vrátit awaitable)"""
+        self._after_commit.append(fn)
+
+    def on_rollback(self, fn: Callable[[], Any]) -> None:
+        """Zavolá se při rollbacku (v opačném pořadí registrace)"""
+        self._on_rollback.append(fn)
+
+    async def commit(self) -> None:
+        for backend, writes in self._writes.items():
+            await backend.run_unit(writes)
+
+    async def run_after_commit(self) -> None:
+        # Data už jsou zapsaná - chyba callbacku se jen zaloguje
+        for fn in self._after_commit:
+            try:
+                result = fn()
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                logger.error(f"Chyba po commitu jednotky práce: {e}")
+
+    def rollback(self) -> None:
+        for fn in reversed(self._on_rollback):
+            try:
+                fn()
+            except Exception as e:
+                logger.error(f"Chyba při rollbacku jednotky práce: {e}")
+
+
+_current_unit: ContextVar[Optional[_Unit]] = ContextVar("unit_of_work", default=None)
+
+
+def current_unit() -> Optional[_Unit]:
+    """Otevřená jednotka práce aktuálního tasku
+
+    Tasky vytvořené uvnitř jednotky zdědí kontext, ale jejich zápisy se
+    do ní nepřidávají (např. flushery na pozadí).
+    """
+    unit = _current_unit.get()
+    if unit is not None and unit.task is asyncio.current_task():
+        return unit
+    return None
+
+
+class UnitOfWork(IUnitOfWork):
+    """Jednotka práce nad SQLite backendy (sqlite i aiosqlite)
+
+    Zápisy repository přes `unit_write` se uvnitř `begin()` jen zařadí a při
+    výstupu z bloku se provedou jednou transakcí na backend (jeden commit
+    místo commitu na každý zápis). Výjimka v bloku nebo při commitu zápisy
+    zahodí a spustí rollback callbacky (např. vrácení position booku).
+
+    Zápisy uvnitř jednotky nevrací výsledek (`None`) a čtení nevidí dosud
+    nezapsané změny. Atomicita platí pro jeden databázový soubor.
+    """
+
+    def __init__(self):
+        self.stats = UnitOfWorkStats()
+
+    @asynccontextmanager
+    async def begin(self) -> AsyncIterator[None]:
+        if current_unit() is not None:
+            yield
+            return
+
+        unit = _Unit()
+        token = _current_unit.set(unit)
+        try:
+            yield
+        except BaseException:
+            _current_unit.reset(token)
+            self._rollback(unit)
+            raise
+        _current_unit.reset(token)
+
+        try:
+            await unit.commit()
+        except BaseException:
+            self._rollback(unit)
+            raise
+        self.stats.committed += 1
+        self.stats.deferred_writes += unit.write_count
+        await unit.run_after_commit()
+
+    def _rollback(self, unit: _Unit) -> None:
+        unit.rollback()
+        self.stats.rolled_back += 1
@@ -0,0 +1,303 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+from ....domain.models import Candle, Ticker, OrderBook, OrderBookArray
+from ....domain.repositories import IMarketDataRepository
+
+
+logger = logging.getLogger(__name__)
+
+
+class WriteBehindError(Exception):
+    """Záznamy z fronty se nepodařilo zapsat ani při uzavření"""
+
+
+@dataclass
+class WriteBehindStats:
+    """Metriky jedné fronty (tabulky)"""
+    enqueued: int = 0
+    written: int = 0
+    # Záznamy v neúspěšných pokusech o zápis (dávka se zkouší znovu)
+    failed: int = 0
+    retries: int = 0
+    # Záznamy neúspěšné dávky čekající na další pokus
+    retry_pending: int = 0
+    batches: int = 0
+    queue_depth: int = 0
+    max_queue_depth: int = 0
+    backpressure_waits: int = 0
+    backpressure_wait_seconds: float = 0.0
+    last_batch_size: int = 0
+    last_flush_seconds: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class _TableQueue:
+    """Omezená fronta záznamů jedné tabulky a její flusher"""
+
+    def __init__(self, name: str, writer: Callable[[List[Any]], Awaitable[None]], maxsize: int):
+        self.name = name
+        self.writer = writer
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.flush_requested = asyncio.Event()
+        self.flush_lock = asyncio.Lock()
+        # Neúspěšná dávka - zapíše se znovu před zbytkem fronty
+        self.retry: List[Any] = []
+        self.retry_delay = 0.0
+        self.stats = WriteBehindStats()
+        self.task: Optional[asyncio.Task] = None
+
+
+class WriteBehindMarketDataRepository(IMarketDataRepository):
+    """Write-behind buffer před market data repository
+
+    Zápisy svíček, tickerů a order booků se jen vloží do omezené fronty
+    (jedna na tabulku) a vrátí se hned. Flusher na pozadí je zapisuje
+    dávkově přes `save_candles`/`save_tickers`/`save_order_books` vnitřní
+    repository (jeden executemany v jedné transakci), když fronta dosáhne
+    `batch_size` nebo uplyne `flush_interval`. Plná fronta znamená
+    backpressure - zápis počká na místo a započítá se do metrik.
+
+    Neúspěšná dávka (např. `database is locked`) se neztratí - zůstane
+    v pořadí před zbytkem fronty a flusher ji zkouší znovu s exponenciálním
+    odstupem od `retry_backoff` do `max_retry_backoff` sekund.
+
+    Čtení nejdřív dopíše čekající záznamy dané tabulky, takže vrací i data
+    z fronty. `close()` frontu vyprázdní; co se nezapíše ani po
+    `close_retries` pokusech, skončí výjimkou `WriteBehindError`.
+    """
+
+    def __init__(
+        self,
+        inner: IMarketDataRepository,
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        queue_size: int = 10000,
+        retry_backoff: float = 0.5,
+        max_retry_backoff: float = 30.0,
+        close_retries: int = 5
+    ):
+        self.inner = inner
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue_size = queue_size
+        self.retry_backoff = retry_backoff
+        self.max_retry_backoff = max_retry_backoff
+        self.close_retries = close_retries
+        self._writers: Dict[str, Callable[[List[Any]], Awaitable[None]]] = {
+            "candles": inner.save_candles,
+            "tickers": inner.save_tickers,
+            "order_books": inner.save_order_books,
+        }
+        self._tables: Optional[Dict[str, _TableQueue]] = None
+        self._closed = False
+
+    async def save_candle(self, candle: Candle) -> None:
+        """Zařadí svíčku k zápisu"""
+        await self._enqueue("candles", [candle])
+
+    async def save_candles(self, candles: Iterable[Candle]) -> None:
+        """Zařadí svíčky k zápisu"""
+        await self._enqueue("candles", candles)
+
+    async def get_candles(
+        self,
+        symbol: str,
+        start_time: datetime,
+        end_time: datetime,
+        limit: Optional[int] = None,
+        interval: str = "15"
+    ) -> List[Candle]:
+        """Získá historická OHLCV data"""
+        await self._flush_pending("candles")
+        return await self.inner.get_candles(symbol, start_time, end_time, limit, interval)
+
+    async def get_latest_candles(self, symbol: str, count: int = 100, interval: str = "15") -> List[Candle]:
+        """Získá posledních N svíček"""
+        await self._flush_pending("candles")
+        return await self.inner.get_latest_candles(symbol, count, interval)
+
+    async def save_ticker(self, ticker: Ticker) -> None:
+        """Zařadí ticker k zápisu"""
+        await self._enqueue("tickers", [ticker])
+
+    async def save_tickers(self, tickers: Iterable[Ticker]) -> None:
+        """Zařadí tickery k zápisu"""
+        await self._enqueue("tickers", tickers)
+
+    async def get_latest_ticker(self, symbol: str) -> Optional[Ticker]:
+        """Získá nejnovější ticker pro symbol"""
+        await self._flush_pending("tickers")
+        return await self.inner.get_latest_ticker(symbol)
+
+    async def save_order_book(self, order_book: OrderBook) -> None:
+        """Zařadí order book k zápisu"""
+        await self._enqueue("order_books", [order_book])
+
+    async def save_order_books(self, order_books: Iterable[OrderBook]) -> None:
+        """Zařadí order booky k zápisu"""
+        await self._enqueue("order_books", order_books)
+
+    async def get_latest_order_book(self, symbol: str) -> Optional[OrderBook]:
+        """Získá nejnovější order book"""
+        await self._flush_pending("order_books")
+        return await self.inner.get_latest_order_book(symbol)
+
+    async def get_order_book_history(
+        self,
+        symbol: str,
+        start_time: datetime,
+        end_time: datetime
+    ) -> OrderBookArray:
+        """Řada snapshotů plné hloubky"""
+        await self._flush_pending("order_books")
+        return await self.inner.get_order_book_history(symbol, start_time, end_time)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Metriky front podle tabulek"""
+        if self._tables is None:
+            return {}
+        result = {}
+        for name, table in self._tables.items():
+            table.stats.queue_depth = table.queue.qsize()
+            result[name] = table.stats.to_dict()
+        return result
+
+    async def flush(self) -> None:
+        """Zapíše vše, co je ve frontách"""
+        if self._tables is None:
+            return
+        for name in self._tables:
+            await self._flush_pending(name)
+
+    async def close(self) -> None:
+        """Zastaví flushery a vyprázdní fronty na disk
+
+        Raises:
+            WriteBehindError: část záznamů se nepodařilo zapsat
+        """
+        if self._closed:
+            return
+        self._closed = True
+        if self._tables is None:
+            return
+
+        for table in self._tables.values():
+            # Flusher se ruší jen mimo rozpracovaný zápis (jinak by se dávka ztratila)
+            async with table.flush_lock:
+                if table.task:
+                    table.task.cancel()
+        await asyncio.gather(
+            *[table.task for table in self._tables.values() if table.task],
+            return_exceptions=True
+        )
+        for attempt in range(self.close_retries):
+            await self.flush()
+            unwritten = self._unwritten()
+            if not unwritten:
+                logger.info(f"Write-behind fronty vyprázdněny: {self.stats()}")
+                return
+            if attempt + 1 < self.close_retries:
+                await asyncio.sleep(max(table.retry_delay for table in self._tables.values()))
+
+        logger.error(f"Write-behind fronty nevyprázdněny, nezapsáno: {unwritten}")
+        raise WriteBehindError(f"Nezapsané záznamy po {self.close_retries} pokusech: {unwritten}")
+
+    def _unwritten(self) -> Dict[str, int]:
+        """Počty nezapsaných záznamů podle tabulek"""
+        return {
+            name: len(table.retry) + table.queue.qsize()
+            for name, table in self._tables.items()
+            if table.retry or not table.queue.empty()
+        }
+
+    def _ensure_started(self) -> Dict[str, _TableQueue]:
+        """Vytvoří fronty a flushery při prvním zápisu (potřebuje běžící loop)"""
+        if self._tables is None:
+            self._tables = {
+                name: _TableQueue(name, writer, self.queue_size)
+                for name, writer in self._writers.items()
+            }
+            for table in self._tables.values():
+                table.task = asyncio.create_task(self._flush_loop(table))
+        return self._tables
+
+    async def _enqueue(self, name: str, items: Iterable[Any]) -> None:
+        if self._closed:
+            # Po uzavření už se nebufferuje
+            await self._writers[name](list(items))
+            return
+
+        table = self._ensure_started()[name]
+        for item in items:
+            try:
+                table.queue.put_nowait(item)
+            except asyncio.QueueFull:
+                table.stats.backpressure_waits += 1
+                table.flush_requested.set()
+                started = time.perf_counter()
+                await table.queue.put(item)
+                table.stats.backpressure_wait_seconds += time.perf_counter() - started
+            table.stats.enqueued += 1
+
+        depth = table.queue.qsize()
+        table.stats.max_queue_depth = max(table.stats.max_queue_depth, depth)
+        if depth >= self.batch_size:
+            table.flush_requested.set()
+
+    async def _flush_loop(self, table: _TableQueue) -> None:
+        while True:
+            if table.retry:
+                # Odstup po chybě - backpressure ani plná fronta ho nezkrátí
+                await asyncio.sleep(table.retry_delay)
+            # asyncio.wait místo wait_for - zrušení flusheru pak nemůže uvíznout na Event.wait
+            waiter = asyncio.ensure_future(table.flush_requested.wait())
+            try:
+                await asyncio.wait([waiter], timeout=self.flush_interval)
+            finally:
+                waiter.cancel()
+            table.flush_requested.clear()
+            await self._flush_table(table)
+
+    async def _flush_pending(self, name: str) -> None:
+        if self._tables is not None:
+            await self._flush_table(self._tables[name])
+
+    async def _flush_table(self, table: _TableQueue) -> None:
+        """Zapíše frontu po dávkách (zámek drží pořadí zápisů)
+
+        Při chybě dávku vrátí na začátek a skončí - další pokus po odstupu.
+        """
+        async with table.flush_lock:
+            while table.retry or not table.queue.empty():
+                batch, table.retry = table.retry, []
+                if batch:
+                    table.stats.retries += 1
+                while len(batch) < self.batch_size and not table.queue.empty():
+                    batch.append(table.queue.get_nowait())
+
+                started = time.perf_counter()
+                try:
+                    await table.writer(batch)
+                except Exception as e:
+                    table.retry = batch
+                    table.retry_delay = min(self.max_retry_backoff, table.retry_delay * 2 or self.retry_backoff)
+                    table.stats.failed += len(batch)
+                    table.stats.retry_pending = len(batch)
+                    logger.error(
+                        f"Chyba při dávkovém zápisu {table.name} ({len(batch)} záznamů), "
+                        f"další pokus za {table.retry_delay:.1f} s: {e}"
+                    )
+                    return
+                table.retry_delay = 0.0
+                table.stats.retry_pending = 0
+                table.stats.written += len(batch)
+                table.stats.batches += 1
+                table.stats.last_batch_size = len(batch)
+                table.stats.last_flush_seconds = time.perf_counter() - started
@@ -0,0 +1,282 @@
+import asyncio
+import logging
+import os
+import re
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from ....domain.models import Candle, CandleArray
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as pa_ipc
+    import pyarrow.parquet as pa_parquet
+except ImportError:  # pragma: no cover - volitelná závislost
+    pa = None
+
+
+logger = logging.getLogger(__name__)
+
+COLUMNS = ("timestamp", "open", "high", "low", "close", "volume")
+_PART_RE = re.compile(r"part-(\d+)\.(arrow|parquet)$")
+
+
+class CandleLakeError(Exception):
+    """Chyba archivu svíček"""
+    pass
+
+
+class CandleLake:
+    """Sloupcový archiv historických svíček (Arrow IPC / Parquet)
+
+    Data jsou rozdělena do adresářů `symbol=.../interval=.../month=YYYY-MM`,
+    každý append zapíše nový `part-NNNNN` soubor se seřazenými řádky.
+    Partition s `compact_parts` soubory se po appendu sloučí do jednoho,
+    uzavřený měsíc hned při přechodu na další (0 = jen ruční `compact`). Formát
+    `arrow` (nekomprimované Arrow IPC) se čte přes memory mapping bez kopie
+    přímo do `CandleArray`; `parquet` je menší, ale čtení dat dekóduje.
+    """
+
+    def __init__(self, root: str, file_format: str = "arrow", compact_parts: int = 32):
+        if pa is None:
+            raise CandleLakeError("Archiv svíček vyžaduje balíček pyarrow (pip install pyarrow)")
+        if file_format not in ("arrow", "parquet"):
+            raise CandleLakeError(f"Nepodporovaný formát archivu: {file_format}")
+
+        self.root = Path(root)
+        self.file_format = file_format
+        self.compact_parts = compact_parts
+        self.schema = pa.schema([
+            ("timestamp", pa.int64()),
+            ("open", pa.float64()),
+            ("high", pa.float64()),
+            ("low", pa.float64()),
+            ("close", pa.float64()),
+            ("volume", pa.float64()),
+        ])
+        # Nejnovější uložený čas pro (symbol, interval) - živý feed nepřidává duplicity
+        self._high_water: Dict[Tuple[str, str], int] = {}
+
+    # Zápis
+
+    def append(
+        self,
+        symbol: str,
+        interval: str,
+        candles: Union[List[Candle], CandleArray],
+        backfill: bool = False
+    ) -> int:
+        """Přidá svíčky do archivu a vrátí počet zapsaných řádků
+
+        Bez `backfill` se zapisují jen svíčky novější než poslední uložená
+        (opakované appendy z živého feedu jsou tak idempotentní).
+        """
+        array = candles if isinstance(candles, CandleArray) else CandleArray.from_candles(candles)
+        if len(array) == 0:
+            return 0
+
+        order = np.argsort(array.timestamp, kind="stable")
+        array = _take(array, order)
+
+        key = (symbol, interval)
+        if not backfill:
+            high_water = self._get_high_water(symbol, interval)
+            if high_water is not None:
+                array = array.slice(int(np.searchsorted(array.timestamp, high_water, side="right")), len(array))
+                if len(array) == 0:
+                    return 0
+
+        existing = self.months(symbol, interval) if self.compact_parts else []
+        months = array.timestamp.astype("datetime64[ms]").astype("datetime64[M]")
+        boundaries = np.flatnonzero(months[1:] != months[:-1]) + 1
+        written = []
+        for start, stop in zip(np.r_[0, boundaries], np.r_[boundaries, len(array)]):
+            month = str(months[start])
+            self._write_part(self._partition(symbol, interval, month), array.slice(int(start), int(stop)))
+            written.append(month)
+        if self.compact_parts:
+            self._auto_compact(symbol, interval, existing, written)
+
+        last = int(array.timestamp[-1])
+        if self._high_water.get(key) is None or last > self._high_water[key]:
+            self._high_water[key] = last
+        return len(array)
+
+    def compact(self, symbol: str, interval: str, month: Optional[str] = None) -> int:
+        """Sloučí part soubory partition do jednoho (seřazeno, bez duplicit)
+
+        Vrací počet zkompaktovaných partition.
+        """
+        months = [month] if month else self.months(symbol, interval)
+        compacted = 0
+        for m in months:
+            partition = self._partition(symbol, interval, m)
+            parts = self._parts(partition)
+            if len(parts) < 2:
+                continue
+            merged = _concat_sorted_unique([self._read_part(p) for p in parts], symbol)
+            self._write_part(partition, merged, sequence=_part_sequence(parts[-1]) + 1)
+            for part in parts:
+                part.unlink()
+            compacted += 1
+        return compacted
+
+    # Čtení
+
+    def read_range(self, symbol: str, interval: str, start_time: datetime, end_time: datetime) -> CandleArray:
+        """Načte svíčky v časovém rozsahu (včetně krajů)
+
+        Pokud rozsah pokrývá jediný part soubor ve formátu arrow, vrácená pole
+        jsou pohledy do memory-mapped souboru bez kopie dat.
+        """
+        start_ms = _to_ms(start_time)
+        end_ms = _to_ms(end_time)
+        first_month = np.datetime64(start_ms, "ms").astype("datetime64[M]")
+        last_month = np.datetime64(end_ms, "ms").astype("datetime64[M]")
+
+        pieces = []
+        for month in self.months(symbol, interval):
+            if not first_month <= np.datetime64(month, "M") <= last_month:
+                continue
+            for part in self._parts(self._partition(symbol, interval, month)):
+                array = self._read_part(part, symbol)
+                lo, hi = array.index_range(start_ms, end_ms)
+                if hi > lo:
+                    pieces.append(array.slice(lo, hi))
+
+        if not pieces:
+            return CandleArray.empty(symbol)
+        if len(pieces) == 1:
+            return pieces[0]
+        return _concat_sorted_unique(pieces, symbol)
+
+    def months(self, symbol: str, interval: str) -> List[str]:
+        """Seznam měsíčních partition (YYYY-MM) pro symbol a interval"""
+        base = self.root / f"symbol={symbol}" / f"interval={interval}"
+        if not base.exists():
+            return []
+        return sorted(p.name.split("=", 1)[1] for p in base.iterdir() if p.is_dir() and p.name.startswith("month="))
+
+    # Async varianty pro event loop (stejný vzor jako repository)
+
+    async def append_async(
+        self,
+        symbol: str,
+        interval: str,
+        candles: Union[List[Candle], CandleArray],
+        backfill: bool = False
+    ) -> int:
+        """Asynchronní varianta `append`"""
+        return await asyncio.get_event_loop().run_in_executor(
+            None, self.append, symbol, interval, candles, backfill
+        )
+
+    async def read_range_async(
+        self, symbol: str, interval: str, start_time: datetime, end_time: datetime
+    ) -> CandleArray:
+        """Asynchronní varianta `read_range`"""
+        return await asyncio.get_event_loop().run_in_executor(
+            None, self.read_range, symbol, interval, start_time, end_time
+        )
+
+    # Interní pomocné metody
+
+    def _partition(self, symbol: str, interval: str, month: str) -> Path:
+        return self.root / f"symbol={symbol}" / f"interval={interval}" / f"month={month}"
+
+    def _parts(self, partition: Path) -> List[Path]:
+        if not partition.exists():
+            return []
+        parts = [p for p in partition.iterdir() if _PART_RE.search(p.name)]
+        return sorted(parts, key=_part_sequence)
+
+    def _auto_compact(self, symbol: str, interval: str, existing: List[str], written: List[str]) -> None:
+        """Sloučí zapsané partition přes `compact_parts` a měsíc uzavřený tímto appendem"""
+        months = set(written)
+        if existing and written[-1] > existing[-1]:
+            # Živý feed přešel do nového měsíce - předchozí už nepřibude
+            months.add(existing[-1])
+        for month in sorted(months):
+            parts = len(self._parts(self._partition(symbol, interval, month)))
+            if parts >= self.compact_parts or (month < written[-1] and parts > 1):
+                self.compact(symbol, interval, month)
+
+    def _get_high_water(self, symbol: str, interval: str) -> Optional[int]:
+        key = (symbol, interval)
+        if key not in self._high_water:
+            months = self.months(symbol, interval)
+            value = None
+            if months:
+                for part in self._parts(self._partition(symbol, interval, months[-1])):
+                    array = self._read_part(part, symbol)
+                    if len(array):
+                        last = int(array.timestamp[-1])
+                        value = last if value is None else max(value, last)
+            self._high_water[key] = value
+        return self._high_water[key]
+
+    def _write_part(self, partition: Path, array: CandleArray, sequence: Optional[int] = None) -> Path:
+        partition.mkdir(parents=True, exist_ok=True)
+        if sequence is None:
+            parts = self._parts(partition)
+            sequence = _part_sequence(parts[-1]) + 1 if parts else 0
+
+        table = pa.Table.from_arrays([pa.array(getattr(array, c)) for c in COLUMNS], schema=self.schema)
+        path = partition / f"part-{sequence:05d}.{self.file_format}"
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        if self.file_format == "arrow":
+            with pa.OSFile(str(tmp_path), "wb") as sink:
+                with pa_ipc.new_file(sink, self.schema) as writer:
+                    writer.write_table(table)
+        else:
+            pa_parquet.write_table(table, str(tmp_path))
+        os.replace(tmp_path, path)
+        return path
+
+    def _read_part(self, path: Path, symbol: str = "") -> CandleArray:
+        if path.suffix == ".arrow":
+            source = pa.memory_map(str(path), "r")
+            table = pa_ipc.open_file(source).read_all()
+        else:
+            table = pa_parquet.read_table(str(path), memory_map=True)
+        columns = [_column_to_numpy(table.column(c)) for c in COLUMNS]
+        return CandleArray(symbol or _symbol_from_path(path), *columns)
+
+
+def _column_to_numpy(column) -> np.ndarray:
+    """Převede sloupec na NumPy pole (bez kopie, pokud je to možné)"""
+    if column.num_chunks == 1:
+        return column.chunk(0).to_numpy(zero_copy_only=column.null_count == 0)
+    return column.to_numpy()
+
+
+def _take(array: CandleArray, order: np.ndarray) -> CandleArray:
+    return CandleArray(array.symbol, *(getattr(array, c)[order] for c in COLUMNS))
+
+
+def _concat_sorted_unique(pieces: List[CandleArray], symbol: str) -> CandleArray:
+    """Spojí pole svíček, seřadí je a ponechá poslední výskyt každého času"""
+    merged = CandleArray(symbol, *(np.concatenate([getattr(p, c) for p in pieces]) for c in COLUMNS))
+    order = np.argsort(merged.timestamp, kind="stable")
+    merged = _take(merged, order)
+    keep = np.r_[merged.timestamp[1:] != merged.timestamp[:-1], True]
+    return _take(merged, np.flatnonzero(keep))
+
+
+def _part_sequence(path: Path) -> int:
+    match = _PART_RE.search(path.name)
+    return int(match.group(1)) if match else -1
+
+
+def _symbol_from_path(path: Path) -> str:
+    for parent in path.parents:
+        if parent.name.startswith("symbol="):
+            return parent.name.split("=", 1)[1]
+    return ""
+
+
+def _to_ms(value: datetime) -> int:
+    return int(value.timestamp() * 1000)
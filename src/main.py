@@ -14,12 +14,18 @@ sys.path.append(str(Path(__file__).parent))
 
 from src.config.settings import get_settings
 from src.infrastructure.external.bybit.bybit_client import BybitClient
-from src.infrastructure.persistence.database.sqlite_trade_repository import (
-    SqliteTradeRepository, SqlitePositionRepository
+from src.infrastructure.external.bybit.bybit_stream import BybitPublicStream
+from src.infrastructure.external.paper.paper_client import PaperBybitClient
+from src.infrastructure.external.paper.paper_exchange import PaperExchange
+from src.infrastructure.persistence.database.repository_factory import (
+    Repositories, create_repositories
 )
-from src.infrastructure.persistence.database.sqlite_market_data_repository import SqliteMarketDataRepository
+from src.infrastructure.persistence.database.market_data_compaction import MarketDataCompactor
+from src.infrastructure.persistence.database.position_book import PositionBook
+from src.infrastructure.persistence.lake.candle_lake import CandleLake, CandleLakeError
 from src.domain.services.trading_engine import TradingEngine
 from src.application.services.trading_orchestrator import TradingOrchestrator
+from src.application.services.strategy_metrics_tracker import StrategyMetricsTracker
 
 
 # Konfigurace loggingu
@@ -42,6 +48,13 @@ class TradingApplication:
         self.settings = get_settings()
         self.orchestrator: TradingOrchestrator = None
         self.bybit_client: BybitClient = None
+        self.repositories: Repositories = None
+        self.compaction_task: asyncio.Task = None
+        self.reconcile_task: asyncio.Task = None
+        self.order_tracking_task: asyncio.Task = None
+        self.instrument_task: asyncio.Task = None
+        self.stream_task: asyncio.Task = None
+        self.stop_task: asyncio.Task = None
         
         # Vytvoř potřebné složky
         Path("logs").mkdir(exist_ok=True)
@@ -52,31 +65,81 @@ class TradingApplication:
         logger.info("Inicializuji Trading Assistant...")
         
         try:
-            # Zkontroluj API klíče
-            if not self.settings.api.bybit_api_key or not self.settings.api.bybit_api_secret:
-                logger.error("Chybí Bybit API klíče! Zkontroluj konfiguraci.")
-                return False
-            
-            # Inicializuj Bybit klienta
-            self.bybit_client = BybitClient(
-                api_key=self.settings.api.bybit_api_key,
-                api_secret=self.settings.api.bybit_api_secret,
-                testnet=self.settings.api.bybit_testnet
-            )
+            api = self.settings.api
+            if api.paper_trading:
+                # Paper trading - veřejná tržní data z Bybitu, obchody na simulované burze
+                self.bybit_client = PaperBybitClient(
+                    PaperExchange(
+                        balance=api.paper_balance,
+                        taker_fee=api.paper_taker_fee,
+                        maker_fee=api.paper_maker_fee
+                    ),
+                    testnet=api.bybit_testnet
+                )
+                logger.info("Paper trading: objednávky jdou na simulovanou burzu")
+            else:
+                # Zkontroluj API klíče
+                if not api.bybit_api_key or not api.bybit_api_secret:
+                    logger.error("Chybí Bybit API klíče! Zkontroluj konfiguraci.")
+                    return False
+                
+                # Inicializuj Bybit klienta
+                self.bybit_client = BybitClient(
+                    api_key=api.bybit_api_key,
+                    api_secret=api.bybit_api_secret,
+                    testnet=api.bybit_testnet
+                )
             
             # Test připojení
             async with self.bybit_client:
                 balance = await self.bybit_client.get_account_balance()
                 logger.info(f"Připojení k Bybit úspěšné. Zůstatek: {balance} USDT")
             
-            # Inicializuj repository
-            db_path = self.settings.database.path
-            trade_repository = SqliteTradeRepository(db_path)
-            position_repository = SqlitePositionRepository(db_path)
-            market_data_repository = SqliteMarketDataRepository(db_path)
+            # Inicializuj repository (backend podle database.type)
+            self.repositories = create_repositories(self.settings.database)
+            trade_repository = self.repositories.trades
+            position_repository = self.repositories.positions
+            market_data_repository = self.repositories.market_data
+            
+            # Position book načte pozice hned, ne až při prvním signálu
+            if isinstance(position_repository, PositionBook):
+                await position_repository.load()
+            
+            # Kompakce tickerů a order booků na pozadí
+            database = self.settings.database
+            if database.compaction_interval > 0 and database.path != ":memory:":
+                compactor = MarketDataCompactor(
+                    database.path,
+                    raw_retention_hours=database.raw_retention_hours,
+                    bar_retention_days=database.bar_retention_days,
+                    auto_migrate=database.auto_migrate,
+                    snapshot_retention_days=database.snapshot_retention_days
+                )
+                self.compaction_task = asyncio.create_task(
+                    compactor.run_forever(database.compaction_interval)
+                )
+            
+            # Volitelný sloupcový archiv svíček
+            candle_lake = None
+            if self.settings.database.candle_lake_path:
+                try:
+                    candle_lake = CandleLake(
+                        self.settings.database.candle_lake_path,
+                        self.settings.database.candle_lake_format,
+                        self.settings.database.candle_lake_compact_parts
+                    )
+                except CandleLakeError as e:
+                    logger.warning(f"Archiv svíček není dostupný: {e}")
+            
+            # Průběžné metriky strategií (stav se načte z databáze)
+            metrics_tracker = StrategyMetricsTracker(self.repositories.strategy_metrics)
+            await metrics_tracker.load()
             
             # Inicializuj trading engine
-            trading_engine = TradingEngine(trade_repository, position_repository)
+            trading_engine = TradingEngine(
+                trade_repository, position_repository,
+                on_trade_closed=metrics_tracker.record
+            )
             
             # Inicializuj orchestrator
             self.orchestrator = TradingOrchestrator(
@@ -85,8 +148,12 @@ class TradingApplication:
                 trading_engine=trading_engine,
                 trade_repository=trade_repository,
                 position_repository=position_repository,
-                market_data_repository=market_data_repository
+                market_data_repository=market_data_repository,
+                candle_lake=candle_lake,
+                metrics_tracker=metrics_tracker,
+                unit_of_work=self.repositories.unit_of_work
             )
+            await self.orchestrator.load_risk_state()
             
             logger.info("Aplikace úspěšně inicializována")
             return True
@@ -113,6 +180,11 @@ class TradingApplication:
         try:
             # Spusť orchestrator
             async with self.bybit_client:
+                await self._start_instrument_refresh()
+                await self._start_shard_workers()
+                self._start_position_reconciliation()
+                self._start_order_tracking()
+                self._start_stop_management()
                 await self.orchestrator.start()
                 
         except KeyboardInterrupt:
@@ -122,6 +194,50 @@ class TradingApplication:
         finally:
             await self.shutdown()
     
+    def _start_position_reconciliation(self):
+        """Periodicky porovnává position book s pozicemi na burze"""
+        positions = self.repositories.positions
+        interval = self.settings.trading.position_reconcile_interval
+        if isinstance(positions, PositionBook) and interval > 0:
+            self.reconcile_task = asyncio.create_task(positions.run_reconciliation(
+                lambda: self.bybit_client.get_positions(raise_errors=True), interval
+            ))
+    
+    async def _start_instrument_refresh(self):
+        """Načte parametry kontraktů před prvním obchodem a pak je periodicky obnovuje"""
+        instruments = self.orchestrator.instruments
+        await instruments.load()
+        interval = self.settings.trading.instrument_refresh_interval
+        if interval > 0:
+            self.instrument_task = asyncio.create_task(instruments.run(interval))
+    
+    async def _start_shard_workers(self):
+        """V režimu koordinátor/workery spustí worker procesy se shardy symbolů"""
+        coordinator = self.orchestrator.shard_coordinator
+        if coordinator:
+            await coordinator.start()
+    
+    def _start_order_tracking(self):
+        """Periodicky načítá stavy odeslaných objednávek"""
+        interval = self.settings.trading.order_poll_interval
+        if interval > 0:
+            self.order_tracking_task = asyncio.create_task(
+                self.orchestrator.order_pipeline.run_order_tracking(interval)
+            )
+    
+    def _start_stop_management(self):
+        """Stream cen do stop manageru a dávky posunů stopů na burzu"""
+        stop_manager = self.orchestrator.stop_manager
+        if stop_manager is None:
+            return
+        stream = BybitPublicStream(
+            self.settings.trading.default_symbols,
+            self.orchestrator.on_market_price,
+            testnet=self.settings.api.bybit_testnet
+        )
+        self.stream_task = asyncio.create_task(stream.run())
+        self.stop_task = asyncio.create_task(stop_manager.run(self.settings.trading.stops.amend_interval))
+    
     async def shutdown(self):
         """Ukončí aplikaci"""
         logger.info("Ukončuji Trading Assistant...")
@@ -129,9 +245,50 @@ class TradingApplication:
         if self.orchestrator:
             await self.orchestrator.stop()
         
+        if self.reconcile_task:
+            self.reconcile_task.cancel()
+            try:
+                await self.reconcile_task
+            except asyncio.CancelledError:
+                pass
+            self.reconcile_task = None
+        
+        if self.order_tracking_task:
+            self.order_tracking_task.cancel()
+            try:
+                await self.order_tracking_task
+            except asyncio.CancelledError:
+                pass
+            self.order_tracking_task = None
+        
+        for task in (self.stream_task, self.stop_task, self.instrument_task):
+            if task:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self.stream_task = self.stop_task = self.instrument_task = None
+        
+        # Dopiš žurnál objednávek, než se zavřou repository
+        if self.orchestrator:
+            await self.orchestrator.order_pipeline.close()
+        
         if self.bybit_client and self.bybit_client.session:
             await self.bybit_client.session.close()
         
+        if self.compaction_task:
+            self.compaction_task.cancel()
+            try:
+                await self.compaction_task
+            except asyncio.CancelledError:
+                pass
+            self.compaction_task = None
+        
+        # Dokonči zápisy (včetně write-behind fronty) a uzavři databázová připojení
+        if self.repositories:
+            await self.repositories.close()
+        
         logger.info("Aplikace ukončena")
 
 
@@ -3,6 +3,7 @@ from typing import List, Optional, Dict, Any
 from decimal import Decimal
 from ..domain.models import Candle, TradingSignal, SignalType, SignalStrength
 from ..config.settings import StrategyConfig
+from .indicator_cache import IndicatorCache, cached_indicator
 
 
 class BaseStrategy(ABC):
@@ -15,6 +16,8 @@ class BaseStrategy(ABC):
         self.weight = config.weight
         self.parameters = config.parameters
         self.risk_management = config.risk_management
+        # Volitelná cache indikátorů (používá ji backtest nad jednou řadou)
+        self.indicator_cache: Optional[IndicatorCache] = None
     
     @abstractmethod
     async def analyze(self, candles: List[Candle], symbol: str) -> Optional[TradingSignal]:
@@ -53,6 +56,7 @@ class BaseStrategy(ABC):
         else:
             return SignalStrength.WEAK
     
+    @cached_indicator('sma')
     def _calculate_sma(self, candles: List[Candle], period: int) -> List[Decimal]:
         """Vypočítá Simple Moving Average"""
         if len(candles) < period:
@@ -65,6 +69,7 @@ class BaseStrategy(ABC):
         
         return sma_values
     
+    @cached_indicator('ema')
     def _calculate_ema(self, candles: List[Candle], period: int) -> List[Decimal]:
         """Vypočítá Exponential Moving Average"""
         if len(candles) < period:
@@ -84,6 +89,7 @@ class BaseStrategy(ABC):
         
         return ema_values
     
+    @cached_indicator('rsi')
     def _calculate_rsi(self, candles: List[Candle], period: int = 14) -> List[float]:
         """Vypočítá Relative Strength Index"""
         if len(candles) < period + 1:
@@ -133,6 +139,7 @@ class BaseStrategy(ABC):
         
         return rsi_values
     
+    @cached_indicator('macd')
     def _calculate_macd(
         self, 
         candles: List[Candle], 
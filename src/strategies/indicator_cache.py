@@ -0,0 +1,75 @@
+from functools import wraps
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ..domain.models import Candle
+
+
+class IndicatorCache:
+    """Cache indikátorů spočítaných nad celou řadou svíček
+
+    Všechny indikátory v `BaseStrategy` jsou kauzální a počítají se od první
+    svíčky okna, takže indikátor nad prefixem řady je prefixem indikátoru nad
+    celou řadou. Backtest, který volá `analyze` s rostoucími prefixy jedné
+    řady, tak každý indikátor spočítá jen jednou a pak jen ořezává výsledek.
+    """
+
+    def __init__(self, series: Optional[List[Candle]] = None):
+        self._series: List[Candle] = []
+        self._values: Dict[Tuple[Any, ...], Any] = {}
+        self.hits = 0
+        self.misses = 0
+        if series is not None:
+            self.bind(series)
+
+    def bind(self, series: List[Candle]) -> None:
+        """Naváže cache na novou řadu svíček a zahodí předchozí hodnoty"""
+        self._series = series
+        self._values.clear()
+
+    def is_prefix(self, candles: List[Candle]) -> bool:
+        """Je `candles` prefixem navázané řady? (O(1) kontrola identity)"""
+        n = len(candles)
+        return (
+            0 < n <= len(self._series)
+            and candles[0] is self._series[0]
+            and candles[-1] is self._series[n - 1]
+        )
+
+    def get(self, key: Tuple[Any, ...], candles: List[Candle], compute: Callable[[List[Candle]], Any]) -> Any:
+        """Vrátí indikátor pro `candles`, spočítaný nad celou řadou jen jednou"""
+        if not self.is_prefix(candles):
+            return compute(candles)
+
+        full = self._values.get(key)
+        if full is None:
+            self.misses += 1
+            full = compute(self._series)
+            self._values[key] = full
+        else:
+            self.hits += 1
+
+        drop = len(self._series) - len(candles)
+        if isinstance(full, tuple):
+            return tuple(_trim(values, drop) for values in full)
+        return _trim(full, drop)
+
+
+def _trim(values: List[Any], drop: int) -> List[Any]:
+    """Ořízne posledních `drop` hodnot indikátoru"""
+    if drop == 0:
+        return values
+    return values[:max(len(values) - drop, 0)]
+
+
+def cached_indicator(name: str):
+    """Dekorátor indikátorové metody strategie, který použije `indicator_cache`"""
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, candles: List[Candle], *args, **kwargs):
+            cache: Optional[IndicatorCache] = getattr(self, 'indicator_cache', None)
+            if cache is None:
+                return method(self, candles, *args, **kwargs)
+            key = (name,) + args + tuple(sorted(kwargs.items()))
+            return cache.get(key, candles, lambda series: method(self, series, *args, **kwargs))
+        return wrapper
+    return decorator
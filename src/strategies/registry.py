@@ -0,0 +1,25 @@
+from typing import Dict, Optional, Type
+
+from .base_strategy import BaseStrategy
+from .trend_following_strategy import TrendFollowingStrategy
+from .rsi_macd_strategy import RsiMacdStrategy
+from .breakout_strategy import BreakoutStrategy
+from .volume_strategy import VolumeStrategy
+from ..config.settings import StrategyConfig
+
+
+# Mapování názvu strategie v konfiguraci na její třídu
+STRATEGY_CLASSES: Dict[str, Type[BaseStrategy]] = {
+    "trend_following": TrendFollowingStrategy,
+    "rsi_macd": RsiMacdStrategy,
+    "breakout": BreakoutStrategy,
+    "volume": VolumeStrategy,
+}
+
+
+def create_strategy(name: str, config: StrategyConfig) -> Optional[BaseStrategy]:
+    """Vytvoří strategii podle názvu z konfigurace (None pro neznámý název)"""
+    strategy_class = STRATEGY_CLASSES.get(name)
+    if strategy_class is None:
+        return None
+    return strategy_class(config)
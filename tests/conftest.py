@@ -1,6 +1,24 @@
 import sys
 from pathlib import Path
 
+import pytest
+
 # Ensure project root is in sys.path for imports
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
-sys.path.insert(0, str(PROJECT_ROOT))
\ No newline at end of file
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.config.settings import DatabaseConfig
+from src.infrastructure.persistence.database.repository_factory import create_repositories
+
+
+@pytest.fixture(params=["sqlite", "aiosqlite"])
+def database_config(request, tmp_path):
+    """Testovací databáze pro oba backendy (modul ji může přepsat)"""
+    return DatabaseConfig(type=request.param, path=str(tmp_path / "test.db"))
+
+
+@pytest.fixture
+async def repositories(database_config):
+    repositories = create_repositories(database_config)
+    yield repositories
+    await repositories.close()
@@ -0,0 +1,106 @@
+import asyncio
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import pytest
+
+from src.config.settings import DatabaseConfig
+from src.domain.models import Candle, Trade, TradeType, TradeStatus, OrderType
+from src.infrastructure.persistence.database.repository_factory import (
+    create_repositories, close_repositories
+)
+from src.infrastructure.persistence.database.aiosqlite_connection import AiosqliteDatabase
+from src.infrastructure.persistence.database.aiosqlite_trade_repository import AiosqliteTradeRepository
+from src.infrastructure.persistence.database.sqlite_trade_repository import SqliteTradeRepository
+
+
+@pytest.fixture
+def database_config(tmp_path):
+    return DatabaseConfig(type="aiosqlite", path=str(tmp_path / "test.db"))
+
+
+def _trade(trade_id: str, symbol: str = "BTCUSDT") -> Trade:
+    return Trade(
+        id=trade_id,
+        symbol=symbol,
+        side=TradeType.BUY,
+        quantity=Decimal("0.5"),
+        price=Decimal("30000"),
+        order_type=OrderType.MARKET,
+        status=TradeStatus.OPEN,
+        strategy_name="rsi_macd",
+        created_at=datetime(2024, 1, 1, 12, 0),
+        stop_loss=Decimal("29000")
+    )
+
+
+async def test_factory_selects_backend_and_rejects_unknown(tmp_path, repositories):
+    assert isinstance(repositories.trades, AiosqliteTradeRepository)
+    with pytest.raises(ValueError):
+        create_repositories(DatabaseConfig(type="postgres", path=str(tmp_path / "x.db")))
+
+
+async def test_trade_roundtrip_and_delete(repositories):
+    await repositories.trades.save_trade(_trade("t1"))
+    await repositories.trades.save_trade(_trade("t2", "ETHUSDT"))
+
+    loaded = await repositories.trades.get_trade_by_id("t1")
+    assert loaded.stop_loss == Decimal("29000")
+    assert loaded.status == TradeStatus.OPEN
+    assert [t.id for t in await repositories.trades.get_trades_by_symbol("ETHUSDT")] == ["t2"]
+    assert len(await repositories.trades.get_open_trades()) == 2
+
+    assert await repositories.trades.delete_trade("t1") is True
+    assert await repositories.trades.delete_trade("t1") is False
+
+
+async def test_latest_candles_are_chronological(repositories):
+    start = datetime(2024, 1, 1)
+    for i in range(5):
+        await repositories.market_data.save_candle(Candle(
+            symbol="BTCUSDT",
+            timestamp=start + timedelta(minutes=15 * i),
+            open=Decimal(i), high=Decimal(i + 1), low=Decimal(i), close=Decimal(i), volume=Decimal("1")
+        ))
+
+    latest = await repositories.market_data.get_latest_candles("BTCUSDT", 3)
+    assert [c.close for c in latest] == [Decimal(2), Decimal(3), Decimal(4)]
+
+
+async def test_schema_is_shared_with_sqlite_backend(tmp_path):
+    db_path = str(tmp_path / "shared.db")
+    await AiosqliteTradeRepository(db_path).save_trade(_trade("t1"))
+    await close_repositories()
+
+    loaded = await SqliteTradeRepository(db_path).get_trade_by_id("t1")
+    await close_repositories()
+    assert loaded is not None and loaded.quantity == Decimal("0.5")
+
+
+@pytest.mark.parametrize("path", ["reads.db", ":memory:"])
+async def test_reads_do_not_see_open_write_transaction(tmp_path, path):
+    database = AiosqliteDatabase(path if path == ":memory:" else str(tmp_path / path))
+    count = "SELECT COUNT(*) FROM positions"
+    started, written = asyncio.Event(), asyncio.Event()
+
+    async def write():
+        async with database.transaction() as conn:
+            await conn.execute(
+                "INSERT INTO positions (symbol, side, size, entry_price, current_price, unrealized_pnl, margin, "
+                "created_at) VALUES ('BTCUSDT', 'buy', 1, 1, 1, 0, 1, '2024-01-01')"
+            )
+            started.set()
+            await written.wait()
+
+    writer = asyncio.create_task(write())
+    await started.wait()
+    # Čtení během rozpracované transakce vidí jen commitnutý stav
+    read = asyncio.create_task(database.fetch_one(count))
+    await asyncio.sleep(0.05)
+    if path == ":memory:":
+        assert not read.done()
+    written.set()
+    await writer
+    assert (await read)[0] == (1 if path == ":memory:" else 0)
+    assert (await database.fetch_one(count))[0] == 1
+    await database.close()
@@ -0,0 +1,17 @@
+from benchmarks.harness import compare, measure
+
+
+def test_compare_flags_only_regressions_beyond_threshold():
+    baseline = {"fast": {"median": 1.0}, "slow": {"median": 1.0}, "gone": {"median": 1.0}}
+    results = {"fast": {"median": 1.1}, "slow": {"median": 1.5}, "new": {"median": 9.0}}
+
+    regressions = compare(results, baseline, threshold=0.2)
+
+    assert [r.name for r in regressions] == ["slow"]
+    assert round(regressions[0].change, 2) == 0.5
+
+
+def test_measure_reports_per_operation_time():
+    result = measure("noop", lambda: sum(range(100)), repeats=3, ops=100)
+    assert result.repeats == 3
+    assert result.per_op_us == result.median / 100 * 1_000_000
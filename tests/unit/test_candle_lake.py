@@ -0,0 +1,67 @@
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from src.domain.models import Candle
+from src.infrastructure.persistence.lake.candle_lake import CandleLake
+
+
+def make_candles(start, count, step=timedelta(hours=6)):
+    return [
+        Candle(
+            symbol="BTCUSDT", timestamp=start + step * i,
+            open=Decimal(100 + i), high=Decimal(101 + i), low=Decimal(99 + i),
+            close=Decimal(100 + i), volume=Decimal(5)
+        )
+        for i in range(count)
+    ]
+
+
+def test_append_partitions_by_month_and_reads_range(tmp_path):
+    lake = CandleLake(str(tmp_path))
+    candles = make_candles(datetime(2025, 1, 30), 40)  # leden + únor
+
+    assert lake.append("BTCUSDT", "360", candles) == 40
+    assert lake.months("BTCUSDT", "360") == ["2025-01", "2025-02"]
+
+    result = lake.read_range("BTCUSDT", "360", candles[5].timestamp, candles[9].timestamp)
+    assert result.close.tolist() == [105.0, 106.0, 107.0, 108.0, 109.0]
+    assert result.to_candles()[0].timestamp == candles[5].timestamp
+
+
+def test_live_appends_are_idempotent_and_compaction_merges_parts(tmp_path):
+    lake = CandleLake(str(tmp_path), compact_parts=0)
+    candles = make_candles(datetime(2025, 3, 1), 10)
+
+    lake.append("BTCUSDT", "360", candles[:6])
+    assert lake.append("BTCUSDT", "360", candles[:8]) == 2  # jen nové svíčky
+    assert lake.append("BTCUSDT", "360", candles[2:4], backfill=True) == 2  # duplicitní backfill
+
+    assert lake.compact("BTCUSDT", "360") == 1
+    merged = lake.read_range("BTCUSDT", "360", candles[0].timestamp, candles[-1].timestamp)
+    assert merged.close.tolist() == [float(c.close) for c in candles[:8]]
+    # Jediný part soubor -> pole jsou pohledy do memory-mapped souboru
+    assert not merged.close.flags.owndata
+
+
+def test_live_appends_compact_full_and_closed_partitions(tmp_path):
+    lake = CandleLake(str(tmp_path), compact_parts=4)
+    candles = make_candles(datetime(2025, 3, 28), 24)  # březen + duben
+    partition = tmp_path / "symbol=BTCUSDT" / "interval=360"
+
+    # Jedna uzavřená svíčka na append jako z živého feedu
+    for i in range(1, 7):
+        lake.append("BTCUSDT", "360", candles[:i])
+    assert len(list((partition / "month=2025-03").iterdir())) == 3  # 4 sloučeny + 2 nové
+
+    lake.append("BTCUSDT", "360", candles[:17])
+    # Přechod do dubna uzavřel březen do jednoho souboru
+    assert len(list((partition / "month=2025-03").iterdir())) == 1
+    assert len(list((partition / "month=2025-04").iterdir())) == 1
+
+    march = lake.read_range("BTCUSDT", "360", datetime(2025, 3, 1), datetime(2025, 3, 31, 23))
+    assert march.close.tolist() == [float(c.close) for c in candles[:16]]
+    assert not march.close.flags.owndata
@@ -0,0 +1,107 @@
+import asyncio
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+
+from benchmarks.offline_exchange import OfflineBybitClient
+from src.application.services.execution_scheduler import ExecutionScheduler
+from src.application.services.order_pipeline import OrderPipeline
+from src.application.services.risk_engine import RiskEngine
+from src.config.settings import ExecutionConfig, RiskManagementConfig
+from src.domain.models import OrderState, SignalStrength, SignalType, TradeStatus, TradeType, TradingSignal
+from src.domain.services.trading_engine import TradingEngine
+from src.infrastructure.external.paper.paper_client import PaperBybitClient
+from src.infrastructure.external.paper.paper_exchange import PaperExchange
+
+
+D = Decimal
+
+
+def _client(taker_fee=D("0")):
+    # Kniha z offline burzy, při každém dotazu znovu celá (doplněná likvidita)
+    client = PaperBybitClient(PaperExchange(balance=D("100000"), taker_fee=taker_fee), book_max_age=0)
+    client._make_request = OfflineBybitClient()._make_request
+    return client
+
+
+def _pipeline(repositories, client, **config):
+    values = dict(min_notional_usd=D("100"), duration=0.03, slices=3, participation=0.5, poll_interval=0.001)
+    values.update(config)
+    scheduler = ExecutionScheduler(client, ExecutionConfig(**values))
+    risk = RiskEngine(RiskManagementConfig(max_position_size_usd=D("100000")))
+    engine = TradingEngine(repositories.trades, repositories.positions)
+    pipeline = OrderPipeline(client, engine, repositories.trades, repositories.unit_of_work, risk, scheduler)
+    return pipeline, scheduler, risk
+
+
+def _signal(price):
+    return TradingSignal(
+        strategy_name="rsi_macd", symbol="BTCUSDT", signal_type=SignalType.BUY, strength=SignalStrength.STRONG,
+        confidence=0.9, price=price, timestamp=datetime(2024, 1, 1), indicators={}, reason="test"
+    )
+
+
+async def _wait_done(pipeline, order):
+    for _ in range(500):
+        if order.is_terminal:
+            break
+        await asyncio.sleep(0.005)
+    await pipeline.flush()
+
+
+async def test_twap_slices_by_depth_and_beats_single_market(repositories):
+    client = _client(taker_fee=D("0.001"))
+    book = await client.get_orderbook("BTCUSDT", 50)
+    single = client.exchange.place_order("BTCUSDT", TradeType.BUY, D("6"))
+    mid = (book.bids[0][0] + book.asks[0][0]) / 2
+    single_slippage = float((single.avg_price - mid) / mid * 10000)
+    client.exchange.place_order("BTCUSDT", TradeType.SELL, D("6"))
+    fees_before = client.exchange.stats()["fees_paid"]
+
+    pipeline, scheduler, risk = _pipeline(repositories, client, algo="twap")
+    order = await pipeline.submit(_signal(mid), D("6"))
+    # Převzetí je okamžité, dílčí objednávky běží na pozadí
+    assert order.state == OrderState.ACKNOWLEDGED and scheduler.manages(order.order_link_id)
+    await _wait_done(pipeline, order)
+
+    [report] = scheduler.reports()
+    assert order.state == OrderState.FILLED and report["filled_quantity"] == 6.0
+    assert report["children"] == 3 and 0 < report["slippage_bps"] < single_slippage
+    assert risk.exposure("BTCUSDT")["size"] == 6.0
+    # Poplatky dílčích objednávek jdou přes rodiče do denního PnL
+    assert order.fee > 0 and float(order.fee) == pytest.approx(client.exchange.stats()["fees_paid"] - fees_before)
+    assert risk.realized_pnl_today == -order.fee
+    trade = await repositories.trades.get_trade_by_id(order.trade_id)
+    assert trade.status == TradeStatus.OPEN and trade.quantity == D("6")
+    await pipeline.close()
+
+
+async def test_iceberg_replaces_resting_child_then_finishes_at_market(repositories):
+    client = _client()
+    pipeline, scheduler, _ = _pipeline(repositories, client, algo="iceberg", duration=0.05, child_timeout=0.01)
+    order = await pipeline.submit(_signal(D("100")), D("3"))
+    await _wait_done(pipeline, order)
+
+    [report] = scheduler.reports()
+    # Statická kniha limitní objednávky neplní - po timeoutu cancel/replace, po duration market
+    assert report["replaced"] >= 1 and report["children"] == report["replaced"] + 1
+    assert order.state == OrderState.FILLED and order.filled_quantity == D("3")
+    assert client.exchange.stats()["resting_orders"] == 0
+    await pipeline.close()
+
+
+async def test_cancel_stops_parent_and_releases_reservation(repositories):
+    client = _client()
+    pipeline, scheduler, risk = _pipeline(repositories, client, algo="iceberg", duration=10, child_timeout=10)
+    order = await pipeline.submit(_signal(D("100")), D("3"))
+    await asyncio.sleep(0.02)
+    assert client.exchange.stats()["resting_orders"] == 1
+
+    assert await pipeline.cancel(order.order_link_id)
+    await pipeline.flush()
+    assert order.state == OrderState.CANCELLED and not pipeline.has_active_order("BTCUSDT")
+    assert client.exchange.stats()["resting_orders"] == 0
+    assert risk.exposure("BTCUSDT")["pending"] == 0.0
+    assert scheduler.stats()["cancelled"] == 1
+    await pipeline.close()
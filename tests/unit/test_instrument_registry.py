@@ -0,0 +1,110 @@
+import asyncio
+from datetime import datetime
+from decimal import Decimal
+
+from benchmarks.offline_exchange import OfflineBybitClient
+from src.application.services.execution_scheduler import ExecutionScheduler
+from src.application.services.order_pipeline import OrderPipeline
+from src.config.settings import ExecutionConfig
+from src.domain.models import Instrument, Order, OrderState, SignalStrength, SignalType, TradeType, TradingSignal
+from src.domain.services.trading_engine import TradingEngine
+from src.infrastructure.external.bybit.bybit_client import BybitApiError
+from src.infrastructure.external.bybit.instrument_registry import InstrumentRegistry
+from src.infrastructure.external.paper.paper_client import PaperBybitClient
+from src.infrastructure.external.paper.paper_exchange import PaperExchange
+
+
+D = Decimal
+
+
+def _signal(symbol, price):
+    return TradingSignal(
+        strategy_name="rsi_macd", symbol=symbol, signal_type=SignalType.BUY, strength=SignalStrength.STRONG,
+        confidence=0.9, price=price, timestamp=datetime(2024, 1, 1), indicators={}, reason="test"
+    )
+
+
+def test_instrument_rounds_to_arbitrary_steps():
+    instrument = Instrument("XUSDT", tick_size=D("0.5"), qty_step=D("0.01"), min_qty=D("0.01"),
+                            max_qty=D("100"), max_market_qty=D("10"))
+    assert instrument.round_quantity(D("1.239")) == D("1.23")
+    assert instrument.round_price(D("101.24")) == D("101.0")
+    assert instrument.round_price(D("101.25")) == D("101.5")
+
+
+async def test_load_paginates_and_keeps_cache_on_failed_refresh():
+    client = OfflineBybitClient(instruments=[f"S{i}USDT" for i in range(25)])
+    registry = InstrumentRegistry(client, page_size=10)
+    assert await registry.load() and len(registry) == 25
+    assert client.requests["/v5/market/instruments-info"] == 3
+    assert registry.get("S24USDT").qty_step == D("0.001")
+
+    async def failing(*args, **kwargs):
+        raise BybitApiError("výpadek")
+
+    client._make_request = failing
+    assert not await registry.load()
+    assert len(registry) == 25 and registry.stats()["refresh_errors"] == 1
+
+
+async def test_check_order_rounds_and_validates_limits():
+    registry = InstrumentRegistry(OfflineBybitClient())
+    await registry.load()
+
+    check = registry.check_order("BTCUSDT", D("0.0123456"), D("30000"))
+    assert check and check.quantity == D("0.012")
+    assert registry.check_order("BTCUSDT", D("0.0009"), D("30000")).reason == "min_qty"
+    assert registry.check_order("BTCUSDT", D("0.002"), D("100")).reason == "min_notional"
+    # Market objednávka nad maxMktOrderQty, limitní do maxOrderQty projde
+    assert registry.check_order("BTCUSDT", D("200"), D("1")).reason == "max_qty"
+    assert registry.check_order("BTCUSDT", D("200"), D("1"), market=False)
+    # Neznámý symbol projde beze změny
+    assert registry.check_order("NEWUSDT", D("0.0123456"), D("1")).quantity == D("0.0123456")
+    assert registry.stats()["rejections"] == {"min_qty": 1, "min_notional": 1, "max_qty": 1}
+
+
+async def test_pipeline_sends_rounded_quantity_and_rejects_locally(repositories):
+    client = OfflineBybitClient()
+    registry = InstrumentRegistry(client)
+    await registry.load()
+    engine = TradingEngine(repositories.trades, repositories.positions)
+    pipeline = OrderPipeline(client, engine, repositories.trades, repositories.unit_of_work, instruments=registry)
+
+    signal = _signal("BTCUSDT", D("30000.12345"))
+    signal.suggested_stop_loss = signal.price * D("0.98")
+    signal.suggested_take_profit = signal.price * D("1.04")
+    order = await pipeline.submit(signal, D("10") / D("3000"))
+    sent = client.orders[order.order_link_id]
+    assert order.quantity == D("0.003") and sent["qty"] == "0.003"
+    # Stopy na tick 0.0001
+    assert (sent["stopLoss"], sent["takeProfit"]) == ("29400.1210", "31200.1284")
+
+    order = await pipeline.submit(_signal("ETHUSDT", D("2000")), D("0.002"))
+    assert order.state == OrderState.REJECTED and order.order_link_id not in client.orders
+    assert pipeline.stats()["instrument_rejected"] == 1
+    await pipeline.close()
+
+
+async def test_scheduler_children_follow_lot_step():
+    client = PaperBybitClient(PaperExchange(balance=D("100000"), taker_fee=D("0")), book_max_age=0)
+    client._make_request = OfflineBybitClient()._make_request
+    registry = InstrumentRegistry(client)
+    await registry.load()
+    sent = []
+    place_order = client.place_order
+
+    async def recording(**kwargs):
+        sent.append(kwargs["qty"])
+        assert kwargs["stop_loss"] == D("95.1235")
+        return await place_order(**kwargs)
+
+    client.place_order = recording
+    config = ExecutionConfig(algo="twap", min_notional_usd=D("0"), duration=0.01, slices=3, poll_interval=0.001)
+    scheduler = ExecutionScheduler(client, config, instruments=registry)
+    done = asyncio.Event()
+    order = Order(order_link_id="twap", symbol="BTCUSDT", side=TradeType.BUY, quantity=D("1"), price=D("100"))
+    scheduler.start(order, lambda event: event.state == OrderState.FILLED and done.set(), D("95.123456"))
+    await asyncio.wait_for(done.wait(), 5)
+
+    assert sum(sent) == D("1") and all(registry.round_quantity("BTCUSDT", q) == q for q in sent)
+    assert sent[0] == D("0.333")
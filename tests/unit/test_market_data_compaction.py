@@ -0,0 +1,85 @@
+import sqlite3
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import pytest
+
+from src.domain.models import OrderBook, Ticker
+from src.infrastructure.persistence.database.market_data_compaction import MarketDataCompactor
+from src.infrastructure.persistence.database.sqlite_connection import SqliteConnectionManager
+from src.infrastructure.persistence.database.sqlite_market_data_repository import SqliteMarketDataRepository
+from src.infrastructure.persistence.database.sqlite_schema import PRICE_SCALE
+
+
+NOW = datetime(2024, 3, 2, 12, 0)
+OLD = datetime(2024, 3, 1, 8, 0)
+
+
+def _ticker(timestamp, price):
+    return Ticker(
+        symbol="BTCUSDT", last_price=Decimal(price), bid_price=Decimal(price) - 1,
+        ask_price=Decimal(price) + 1, volume_24h=Decimal("10"), price_change_24h=Decimal("0"),
+        price_change_percent_24h=Decimal("0"), timestamp=timestamp
+    )
+
+
+def _order_book(timestamp, bid, ask):
+    return OrderBook(
+        symbol="BTCUSDT", bids=[(Decimal(bid), Decimal("1"))], asks=[(Decimal(ask), Decimal("1"))],
+        timestamp=timestamp
+    )
+
+
+@pytest.fixture
+async def db_path(tmp_path):
+    path = str(tmp_path / "market.db")
+    repository = SqliteMarketDataRepository(path)
+    # Dvě staré minuty po 30 vzorcích a jeden čerstvý ticker
+    await repository.save_tickers(
+        _ticker(OLD + timedelta(seconds=2 * i), str(100 + (i % 30) - (5 if i == 10 else 0)))
+        for i in range(60)
+    )
+    await repository.save_ticker(_ticker(NOW - timedelta(minutes=5), "150"))
+    await repository.save_order_books(
+        _order_book(OLD + timedelta(seconds=10 * i), "100", str(101 + i)) for i in range(6)
+    )
+    yield path
+    SqliteConnectionManager.close_all()
+
+
+async def test_old_rows_are_rolled_into_minute_bars(db_path):
+    compactor = MarketDataCompactor(db_path, raw_retention_hours=24)
+    report = await compactor.compact(now=NOW)
+
+    assert (report.ticker_rows, report.ticker_bars) == (60, 2)
+    assert (report.order_book_rows, report.order_book_bars) == (6, 1)
+    assert report.incremental_vacuum
+
+    conn = sqlite3.connect(db_path)
+    bars = conn.execute("SELECT open, high, low, close, samples FROM ticker_bars_1m ORDER BY ts").fetchall()
+    scale = PRICE_SCALE
+    assert bars[0] == (100 * scale, 129 * scale, 100 * scale, 129 * scale, 30)
+    assert bars[1] == (100 * scale, 129 * scale, 100 * scale, 129 * scale, 30)
+
+    spread = conn.execute(
+        "SELECT best_ask, spread_min, spread_max, spread_sum, spread_samples FROM order_book_bars_1m"
+    ).fetchone()
+    assert spread == (106 * scale, 1 * scale, 6 * scale, 21 * scale, 6)
+    assert conn.execute("SELECT COUNT(*) FROM tickers").fetchone()[0] == 1
+    conn.close()
+
+    latest = await SqliteMarketDataRepository(db_path).get_latest_ticker("BTCUSDT")
+    assert latest.last_price == Decimal("150")
+
+    # Druhý běh už nemá co dělat
+    again = await compactor.compact(now=NOW)
+    assert (again.ticker_rows, again.order_book_rows) == (0, 0)
+
+
+async def test_bar_retention_prunes_old_bars(db_path):
+    compactor = MarketDataCompactor(db_path, raw_retention_hours=1, bar_retention_days=0.5)
+    report = await compactor.compact(now=NOW)
+
+    assert report.ticker_bars == 2
+    assert report.bars_pruned == 3
+    assert report.to_dict()["bytes_reclaimed"] >= 0
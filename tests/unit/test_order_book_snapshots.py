@@ -0,0 +1,103 @@
+import sqlite3
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from src.config.settings import DatabaseConfig
+from src.domain.models import OrderBook
+from src.infrastructure.persistence.database.market_data_compaction import MarketDataCompactor
+from src.infrastructure.persistence.database.order_book_codec import (
+    OrderBookEncoder, decode_series, varint_decode, varint_encode, zigzag_decode, zigzag_encode
+)
+
+
+START = datetime(2024, 3, 1, 12, 0)
+
+
+def _book(i, depth=20):
+    mid = Decimal("42000.5") + Decimal("0.5") * (i % 7)
+    return OrderBook(
+        symbol="BTCUSDT",
+        bids=[(mid - Decimal("0.5") * (k + 1), Decimal("0.001") * (k + 1 + i % 3)) for k in range(depth)],
+        asks=[(mid + Decimal("0.5") * (k + 1), Decimal("0.002") * (k + 1)) for k in range(depth)],
+        timestamp=START + timedelta(seconds=i)
+    )
+
+
+def test_varint_and_zigzag_round_trip():
+    values = np.array([0, 1, -1, 63, -64, 2 ** 40, -(2 ** 62)], dtype=np.int64)
+    encoded = varint_encode(zigzag_encode(values))
+    assert np.array_equal(zigzag_decode(varint_decode(encoded)), values)
+    assert len(varint_encode(zigzag_encode(np.array([1, -2, 3])))) == 3
+
+
+def test_codec_round_trip_with_keyframes_and_depth_change():
+    encoder = OrderBookEncoder(keyframe_interval=4)
+    books = [_book(i, depth=20 if i != 6 else 15) for i in range(10)]
+    rows = [encoder.encode(book) for book in books]
+
+    assert [row[2] for row in rows] == [1, 0, 0, 0, 1, 0, 1, 1, 0, 0]
+    history = decode_series("BTCUSDT", [(ts, blob) for _, ts, _, blob in rows])
+
+    assert len(history) == 10
+    for i, book in enumerate(books):
+        restored = history.to_order_book(i)
+        assert restored.bids == book.bids
+        assert restored.asks == book.asks
+        assert restored.timestamp == book.timestamp
+    assert np.isnan(history.bid_price[6, 15:]).all()
+
+    # Delta snímky bez předchozího keyframe se přeskočí
+    assert len(decode_series("BTCUSDT", [(ts, blob) for _, ts, _, blob in rows[1:]])) == 6
+
+    # Starší snapshot by rozbil řetězec delt
+    assert encoder.encode(_book(3)) is None
+
+
+@pytest.fixture(params=["sqlite", "aiosqlite"])
+def database_config(request, tmp_path):
+    return DatabaseConfig(type=request.param, path=str(tmp_path / "books.db"), order_book_keyframe_interval=10)
+
+
+async def test_repository_stores_full_depth(repositories, database_config):
+    market_data = repositories.market_data
+    books = [_book(i) for i in range(25)]
+    await market_data.save_order_books(books[:12])
+    for book in books[12:]:
+        await market_data.save_order_book(book)
+
+    latest = await market_data.get_latest_order_book("BTCUSDT")
+    assert latest.bids == books[-1].bids and latest.asks == books[-1].asks
+
+    # Rozsah začíná uprostřed řetězce delt
+    history = await market_data.get_order_book_history(
+        "BTCUSDT", START + timedelta(seconds=13), START + timedelta(seconds=17)
+    )
+    assert len(history) == 5
+    assert history.bid_price.shape == (5, 20)
+    assert history.to_order_book(0).bids == books[13].bids
+    assert history.spread == pytest.approx([1.0] * 5)
+
+    conn = sqlite3.connect(database_config.path)
+    total, keyframes = conn.execute("SELECT SUM(LENGTH(data)), SUM(keyframe) FROM order_book_snapshots").fetchone()
+    conn.close()
+    assert keyframes == 3
+    # 40 úrovní, v průměru výrazně pod 4 bajty na úroveň
+    assert total / len(books) < 160
+
+
+async def test_compaction_prunes_snapshots_at_keyframe(repositories, database_config):
+    market_data = repositories.market_data
+    await market_data.save_order_books(_book(i) for i in range(25))
+    await market_data.flush()
+
+    compactor = MarketDataCompactor(database_config.path, snapshot_retention_days=1)
+    report = await compactor.compact(now=START + timedelta(days=1, seconds=15))
+
+    # Keyframy na 0, 10, 20 - zachová se řada od 10
+    assert report.snapshots_pruned == 10
+    history = await market_data.get_order_book_history("BTCUSDT", START, START + timedelta(minutes=1))
+    assert len(history) == 15
+    assert history.to_order_book(0).bids == _book(10).bids
@@ -0,0 +1,113 @@
+from datetime import datetime
+from decimal import Decimal
+
+from benchmarks.offline_exchange import OfflineBybitClient
+from src.application.services.order_pipeline import OrderPipeline
+from src.application.services.risk_engine import RiskEngine
+from src.config.settings import RiskManagementConfig
+from src.domain.models import (
+    ExecutionEvent, Order, OrderState, SignalStrength, SignalType, TradeStatus, TradeType, TradingSignal
+)
+from src.domain.services.trading_engine import TradingEngine
+
+
+def _signal(symbol="BTCUSDT"):
+    return TradingSignal(
+        strategy_name="rsi_macd", symbol=symbol, signal_type=SignalType.BUY, strength=SignalStrength.STRONG,
+        confidence=0.9, price=Decimal("100"), timestamp=datetime(2024, 1, 1), indicators={}, reason="test"
+    )
+
+
+def test_order_state_machine_ignores_stale_events():
+    order = Order(order_link_id="ord_1", symbol="BTCUSDT", side=TradeType.BUY, quantity=Decimal("3"))
+
+    assert order.apply(ExecutionEvent("ord_1", OrderState.ACKNOWLEDGED, exchange_order_id="x1"))
+    assert order.apply(ExecutionEvent("ord_1", OrderState.PARTIALLY_FILLED, Decimal("2"), Decimal("101")))
+    # Opakovaná nebo starší událost stav nezmění
+    assert not order.apply(ExecutionEvent("ord_1", OrderState.PARTIALLY_FILLED, Decimal("2")))
+    assert not order.apply(ExecutionEvent("ord_1", OrderState.PARTIALLY_FILLED, Decimal("1")))
+    assert not order.apply(ExecutionEvent("ord_1", OrderState.ACKNOWLEDGED))
+
+    assert order.apply(ExecutionEvent("ord_1", OrderState.FILLED, Decimal("3"), Decimal("102")))
+    assert order.is_terminal and order.avg_fill_price == Decimal("102")
+    assert not order.apply(ExecutionEvent("ord_1", OrderState.CANCELLED, Decimal("3")))
+    assert order.exchange_order_id == "x1"
+
+
+class RecordingClient(OfflineBybitClient):
+    """Offline burza, která si pamatuje stav žurnálu v okamžiku odeslání"""
+
+    def __init__(self, trades, reject=False):
+        super().__init__()
+        self.trades = trades
+        self.reject = reject
+        self.journaled_at_send = []
+
+    async def place_order(self, symbol, *args, **kwargs):
+        self.journaled_at_send.append(len(await self.trades.get_trades_by_symbol(symbol)))
+        if self.reject:
+            return None
+        return await super().place_order(symbol, *args, **kwargs)
+
+
+def _pipeline(repositories, client, risk_engine=None):
+    engine = TradingEngine(repositories.trades, repositories.positions)
+    return OrderPipeline(client, engine, repositories.trades, repositories.unit_of_work, risk_engine)
+
+
+async def test_order_is_sent_before_journal_and_tracked_to_fill(repositories):
+    client = RecordingClient(repositories.trades)
+    pipeline = _pipeline(repositories, client)
+
+    order = await pipeline.submit(_signal(), Decimal("2"))
+    assert client.journaled_at_send == [0]
+    assert order.state == OrderState.ACKNOWLEDGED and order.exchange_order_id == "offline-1"
+    assert await pipeline.submit(_signal(), Decimal("1")) is None
+
+    await pipeline.flush()
+    trade = await repositories.trades.get_trade_by_id(order.trade_id)
+    assert trade.status == TradeStatus.PENDING and trade.exchange_order_id == "offline-1"
+
+    assert await pipeline.poll_orders() == 1
+    await pipeline.flush()
+    trade = await repositories.trades.get_trade_by_id(order.trade_id)
+    assert order.state == OrderState.FILLED and not pipeline.has_active_order("BTCUSDT")
+    assert trade.status == TradeStatus.OPEN
+    assert trade.quantity == Decimal("2") and trade.entry_price == order.avg_fill_price
+
+    stats = pipeline.stats()
+    assert (stats["filled"], stats["journaled"], stats["journal_errors"]) == (1, 2, 0)
+    assert stats["signal_to_send"]["count"] == 1
+    await pipeline.close()
+
+
+async def test_rejected_order_is_not_journaled(repositories):
+    client = RecordingClient(repositories.trades, reject=True)
+    pipeline = _pipeline(repositories, client)
+
+    order = await pipeline.submit(_signal(), Decimal("1"))
+    await pipeline.flush()
+
+    assert order.state == OrderState.REJECTED
+    assert await repositories.trades.get_trades_by_symbol("BTCUSDT") == []
+    assert not pipeline.has_active_order("BTCUSDT")
+    assert pipeline.stats()["rejected"] == 1
+
+
+async def test_order_rejected_after_ack_unblocks_symbol(repositories):
+    risk = RiskEngine(RiskManagementConfig())
+    pipeline = _pipeline(repositories, RecordingClient(repositories.trades), risk)
+
+    order = await pipeline.submit(_signal(), Decimal("2"))
+    assert order.state == OrderState.ACKNOWLEDGED and risk.exposure("BTCUSDT")["pending"] == 2.0
+
+    # Burza objednávku po převzetí zamítla
+    assert pipeline.on_execution(ExecutionEvent(order.order_link_id, OrderState.REJECTED))
+    await pipeline.flush()
+
+    assert order.state == OrderState.REJECTED and not pipeline.has_active_order("BTCUSDT")
+    assert risk.exposure("BTCUSDT")["pending"] == 0.0
+    trade = await repositories.trades.get_trade_by_id(order.trade_id)
+    assert trade.status == TradeStatus.CANCELLED and pipeline.stats()["rejected"] == 1
+    assert await pipeline.submit(_signal(), Decimal("1")) is not None
+    await pipeline.close()
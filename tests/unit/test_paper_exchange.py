@@ -0,0 +1,180 @@
+import asyncio
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from benchmarks.offline_exchange import OfflineBybitClient
+from src.application.services.order_pipeline import OrderPipeline
+from src.application.services.stop_manager import StopManager
+from src.config.settings import RiskManagementConfig, StopManagementConfig
+from src.domain.models import (
+    OrderBook, OrderState, SignalStrength, SignalType, TradeStatus, TradeType, TradingSignal
+)
+from src.domain.services.trading_engine import TradingEngine
+from src.infrastructure.external.paper.paper_client import PaperBybitClient
+from src.infrastructure.external.paper.paper_exchange import PaperExchange
+
+
+D = Decimal
+
+
+def _book(bids, asks, step=0, symbol="BTCUSDT"):
+    return OrderBook(
+        symbol=symbol,
+        bids=[(D(p), D(q)) for p, q in bids],
+        asks=[(D(p), D(q)) for p, q in asks],
+        timestamp=datetime(2024, 1, 1) + timedelta(seconds=step)
+    )
+
+
+def test_market_order_walks_book_with_fees_and_cancels_rest():
+    exchange = PaperExchange(balance=D("1000"), taker_fee=D("0.001"))
+    exchange.update_book(_book([("99", "5")], [("101", "1"), ("102", "2")]))
+
+    order = exchange.place_order("BTCUSDT", TradeType.BUY, D("2"))
+    assert order.state == OrderState.FILLED
+    assert order.avg_price == D("101.5")
+    assert order.fees == D("0.203")
+
+    # Vlastní plnění vyčerpalo knihu - na zbytek hloubka nestačí
+    rest = exchange.place_order("BTCUSDT", TradeType.BUY, D("3"))
+    assert rest.state == OrderState.CANCELLED and rest.filled_quantity == D("1")
+
+    [position] = exchange.get_positions()
+    assert position.side == TradeType.BUY and position.size == D("3")
+    assert position.entry_price == D("305") / D("3")
+
+    exchange.place_order("BTCUSDT", TradeType.SELL, D("3"))
+    assert exchange.get_positions() == []
+    # 3 ks prodané za 99 po nákupu za 305 - poplatky všech plnění
+    assert exchange.balance == D("1000") + D("297") - D("305") - sum(fill.fee for fill in exchange.fills)
+    assert exchange.place_order("ETHUSDT", TradeType.BUY, D("1")).state == OrderState.REJECTED
+
+
+def test_limit_order_queue_position_and_partial_fills():
+    exchange = PaperExchange(maker_fee=D("0"))
+    exchange.update_book(_book([("100", "5"), ("99", "5")], [("101", "5")]))
+
+    order = exchange.place_order("BTCUSDT", TradeType.BUY, D("4"), price=D("100"))
+    assert order.state == OrderState.ACKNOWLEDGED and order.queue_ahead == D("5")
+
+    # Úbytek hladiny nejdřív zkracuje frontu před objednávkou
+    exchange.update_book(_book([("100", "2"), ("99", "5")], [("101", "5")], step=1))
+    assert order.queue_ahead == D("2") and order.filled_quantity == 0
+
+    # Hladina zmizela (cena je stále v zobrazené hloubce) - objednávka je první ve frontě
+    exchange.update_book(_book([("99.5", "1"), ("99", "5")], [("101", "5")], step=2))
+    assert order.queue_ahead == 0 and order.filled_quantity == 0
+    exchange.update_book(_book([("100", "3"), ("99", "5")], [("101", "5")], step=3))
+    exchange.update_book(_book([("100", "1"), ("99", "5")], [("101", "5")], step=4))
+    assert order.state == OrderState.PARTIALLY_FILLED and order.filled_quantity == D("2")
+
+    # Ask pod limitní cenou - objednávka se doplní celá za svou cenu
+    exchange.update_book(_book([("99", "5")], [("99.8", "5")], step=5))
+    assert order.state == OrderState.FILLED and order.avg_price == D("100")
+    assert all(fill.is_maker for fill in exchange.fills)
+
+
+def test_stop_loss_and_take_profit_close_position():
+    exchange = PaperExchange(taker_fee=D("0"))
+    exchange.update_book(_book([("99", "10")], [("101", "10")]))
+    exchange.place_order("BTCUSDT", TradeType.BUY, D("1"), stop_loss=D("95"), take_profit=D("110"))
+
+    exchange.update_book(_book([("97", "10")], [("99", "10")], step=1))
+    assert exchange.get_positions()
+    exchange.update_book(_book([("93", "10")], [("95", "10")], step=2))
+    assert exchange.get_positions() == []
+    assert exchange.stats()["stop_triggers"] == 1
+    assert exchange.balance == D("10000") + D("93") - D("101")
+
+    exchange.place_order("BTCUSDT", TradeType.SELL, D("2"), take_profit=D("90"))
+    exchange.update_book(_book([("88", "10")], [("90", "10")], step=3))
+    assert exchange.get_positions() == []
+    assert exchange.positions["BTCUSDT"].realized_pnl == D("-8") + D("2") * (D("93") - D("90"))
+
+
+def test_reduce_only_order_only_reduces_opposite_position():
+    exchange = PaperExchange(taker_fee=D("0"))
+    exchange.update_book(_book([("99", "10")], [("101", "10")]))
+    assert exchange.place_order("BTCUSDT", TradeType.SELL, D("1"), reduce_only=True).state == OrderState.REJECTED
+
+    exchange.place_order("BTCUSDT", TradeType.BUY, D("2"))
+    assert exchange.place_order("BTCUSDT", TradeType.BUY, D("1"), reduce_only=True).state == OrderState.REJECTED
+    # Množství nad pozici se omezí - reduce-only pozici nepřetočí
+    order = exchange.place_order("BTCUSDT", TradeType.SELL, D("5"), reduce_only=True)
+    assert order.state == OrderState.FILLED and order.filled_quantity == D("2")
+    assert exchange.get_positions() == []
+
+    # Čekající reduce-only objednávka po uzavření pozice jinou cestou nic neotevře
+    exchange.place_order("BTCUSDT", TradeType.BUY, D("1"))
+    resting = exchange.place_order("BTCUSDT", TradeType.SELL, D("1"), price=D("105"), reduce_only=True)
+    exchange.place_order("BTCUSDT", TradeType.SELL, D("1"))
+    exchange.update_book(_book([("106", "10")], [("107", "10")], step=1))
+    assert resting.state == OrderState.CANCELLED and resting.filled_quantity == 0
+    assert exchange.get_positions() == []
+
+
+async def test_local_stop_after_exchange_stop_does_not_open_short(repositories):
+    exchange = PaperExchange(balance=D("5000"), taker_fee=D("0"))
+    client = PaperBybitClient(exchange, book_max_age=60)
+    client._make_request = OfflineBybitClient()._make_request
+    await client.get_orderbook("BTCUSDT", client.book_depth)
+    mid = exchange.mid_price("BTCUSDT")
+
+    engine = TradingEngine(repositories.trades, repositories.positions)
+    pipeline = OrderPipeline(client, engine, repositories.trades, repositories.unit_of_work)
+    signal = TradingSignal(
+        strategy_name="rsi_macd", symbol="BTCUSDT", signal_type=SignalType.BUY, strength=SignalStrength.STRONG,
+        confidence=0.9, price=mid, timestamp=datetime(2024, 1, 1), indicators={}, reason="test",
+        suggested_stop_loss=mid * D("0.98")
+    )
+    await pipeline.submit(signal, D("0.5"))
+    assert await pipeline.poll_orders() == 1
+    await pipeline.flush()
+
+    [position] = await client.get_positions()
+    closes = []
+
+    async def on_exit(triggered):
+        closes.append(await pipeline.submit_close(triggered.symbol, TradeType.SELL, position.size, triggered.price))
+
+    stops = StopManager(client, StopManagementConfig(enabled=True), RiskManagementConfig(stop_loss_percentage=2.0),
+                        on_exit=on_exit)
+    stops.sync([position])
+
+    # Propad pod oba stopy: burza pozici uzavře sama, lokální stop pak pošle reduce-only
+    low = mid * D("0.95")
+    exchange.update_book(_book([(low, "10")], [(low + 1, "10")], step=1))
+    assert exchange.get_positions() == [] and exchange.stats()["stop_triggers"] == 1
+    assert stops.on_price("BTCUSDT", low)
+    await asyncio.sleep(0.01)
+
+    [close] = closes
+    assert close.state == OrderState.REJECTED
+    assert exchange.get_positions() == []
+    assert exchange.stats()["rejected"] == 1
+    await pipeline.close()
+
+
+async def test_paper_client_runs_order_pipeline_end_to_end(repositories):
+    client = PaperBybitClient(PaperExchange(balance=D("5000")))
+    # Order book z offline burzy místo sítě - parsování jako u živého klienta
+    client._make_request = OfflineBybitClient()._make_request
+
+    engine = TradingEngine(repositories.trades, repositories.positions)
+    pipeline = OrderPipeline(client, engine, repositories.trades, repositories.unit_of_work)
+    signal = TradingSignal(
+        strategy_name="rsi_macd", symbol="BTCUSDT", signal_type=SignalType.BUY, strength=SignalStrength.STRONG,
+        confidence=0.9, price=D("100"), timestamp=datetime(2024, 1, 1), indicators={}, reason="test"
+    )
+
+    order = await pipeline.submit(signal, D("0.5"))
+    assert order.exchange_order_id == "paper-1"
+    assert await pipeline.poll_orders() == 1
+    await pipeline.flush()
+
+    trade = await repositories.trades.get_trade_by_id(order.trade_id)
+    assert trade.status == TradeStatus.OPEN and trade.quantity == D("0.5")
+    [position] = await client.get_positions()
+    assert position.size == D("0.5") and trade.entry_price == position.entry_price
+    assert await client.get_account_balance() < D("5000")
+    await pipeline.close()
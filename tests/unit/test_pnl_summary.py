@@ -0,0 +1,101 @@
+import sqlite3
+from datetime import date, datetime
+from decimal import Decimal
+
+import pytest
+
+from src.domain.models import Trade, TradeType, TradeStatus, PnlSummary, StrategyMetrics
+from src.infrastructure.persistence.database.sqlite_connection import SqliteConnectionManager
+from src.infrastructure.persistence.database.sqlite_migrations import ensure_schema_at_path
+from src.infrastructure.persistence.database.sqlite_schema import (
+    TRADES_SCHEMA, TRADE_INDEXES, UPSERT_TRADE, trade_to_params
+)
+from src.infrastructure.persistence.database.sqlite_trade_repository import SqliteTradeRepository
+
+
+def _trade(trade_id, symbol, pnl, day, strategy="rsi_macd"):
+    return Trade(
+        id=trade_id, symbol=symbol, side=TradeType.BUY, quantity=Decimal("1"),
+        price=Decimal("100"), status=TradeStatus.CLOSED, strategy_name=strategy,
+        created_at=datetime(2024, 1, day, 9), closed_at=datetime(2024, 1, day, 15),
+        pnl=Decimal(pnl) if pnl is not None else None
+    )
+
+
+TRADES = [
+    _trade("a", "BTCUSDT", "12.5", 1),
+    _trade("b", "BTCUSDT", "-4.25", 1),
+    _trade("c", "ETHUSDT", "3", 2, strategy="breakout"),
+    _trade("d", "ETHUSDT", "-1.75", 2),
+    _trade("e", "BTCUSDT", None, 2),
+]
+
+
+@pytest.fixture
+async def trades(repositories):
+    for trade in TRADES:
+        await repositories.trades.save_trade(trade)
+    return repositories.trades
+
+
+async def test_summary_matches_python_aggregation(trades):
+    summary = await trades.get_pnl_summary()
+    assert summary == PnlSummary.from_trades(t for t in TRADES if t.pnl is not None)
+    assert summary.total_pnl == Decimal("9.5")
+    assert summary.profit_factor == pytest.approx(15.5 / 6)
+
+    day = await trades.get_pnl_summary(date(2024, 1, 2), date(2024, 1, 2))
+    assert (day.trades, day.total_pnl) == (2, Decimal("1.25"))
+
+    by_symbol = await trades.get_pnl_by_symbol()
+    assert by_symbol["BTCUSDT"].total_pnl == Decimal("8.25")
+    assert by_symbol["ETHUSDT"].win_rate == 0.5
+
+    by_strategy = await trades.get_pnl_by_strategy(end_day=date(2024, 1, 2))
+    assert by_strategy["breakout"].trades == 1
+
+    daily = await trades.get_daily_pnl()
+    assert list(daily) == [date(2024, 1, 1), date(2024, 1, 2)]
+
+
+async def test_summary_follows_updates_and_deletes(trades):
+    # Uzavření dosud otevřeného obchodu se propíše do souhrnu
+    closed = _trade("e", "BTCUSDT", "-10", 3)
+    await trades.update_trade(closed)
+    assert (await trades.get_pnl_summary(date(2024, 1, 3))).total_pnl == Decimal("-10")
+
+    # Přepsání PnL odečte původní hodnotu
+    await trades.update_trade(_trade("a", "BTCUSDT", "2.5", 1))
+    assert (await trades.get_pnl_summary(symbol="BTCUSDT")).total_pnl == Decimal("-11.75")
+
+    await trades.delete_trade("b")
+    summary = await trades.get_pnl_summary(date(2024, 1, 1), date(2024, 1, 1))
+    assert (summary.trades, summary.losing_trades, summary.total_pnl) == (1, 0, Decimal("2.5"))
+
+
+def test_migration_backfills_summary(tmp_path):
+    db_path = str(tmp_path / "v3.db")
+    conn = sqlite3.connect(db_path)
+    for statement in TRADES_SCHEMA + TRADE_INDEXES:
+        conn.execute(statement)
+    conn.executemany(UPSERT_TRADE, [trade_to_params(t) for t in TRADES])
+    conn.execute("PRAGMA user_version = 3")
+    conn.commit()
+    conn.close()
+
+    assert ensure_schema_at_path(db_path) == 3
+    conn = sqlite3.connect(db_path)
+    assert conn.execute("SELECT SUM(trades), SUM(wins) FROM trade_pnl_daily").fetchone() == (4, 2)
+    conn.close()
+
+
+async def test_strategy_metrics_from_summary(tmp_path):
+    repository = SqliteTradeRepository(str(tmp_path / "metrics.db"))
+    for trade in TRADES:
+        await repository.save_trade(trade)
+
+    metrics = StrategyMetrics(strategy_name="rsi_macd")
+    metrics.apply_summary(await repository.get_pnl_summary(strategy_name="rsi_macd"))
+    assert (metrics.total_trades, metrics.winning_trades, metrics.losing_trades) == (3, 1, 2)
+    assert metrics.avg_loss == Decimal("3")
+    SqliteConnectionManager.close_all()
@@ -0,0 +1,87 @@
+from datetime import datetime
+from decimal import Decimal
+
+from src.application.services.portfolio_sizer import PortfolioSizer, SizingRequest
+from src.application.services.risk_engine import RiskEngine
+from src.config.settings import RiskManagementConfig
+from src.domain.models import SignalStrength, SignalType, TradeType, TradingSignal
+
+
+D = Decimal
+
+
+def _request(symbol, strength, price="100", stop=None):
+    signal = TradingSignal(
+        strategy_name="rsi_macd", symbol=symbol, signal_type=SignalType.BUY, strength=SignalStrength.STRONG,
+        confidence=0.9, price=D(price), timestamp=datetime(2024, 1, 1), indicators={}, reason="test",
+        suggested_stop_loss=D(stop) if stop else None
+    )
+    return SizingRequest(signal, strength)
+
+
+def _limits(**overrides):
+    values = dict(max_position_size_usd=D("1000"), max_positions=5)
+    values.update(overrides)
+    return RiskManagementConfig(**values)
+
+
+def test_sizes_match_single_signal_rules_when_capital_suffices():
+    sizer = PortfolioSizer(_limits())
+    orders = sizer.allocate([
+        _request("BTCUSDT", 1.0, stop="90"),
+        _request("ETHUSDT", 2.0),
+        _request("SOLUSDT", 1.5, stop="99.9"),
+    ], D("10000"))
+
+    by_symbol = {order.signal.symbol: order for order in orders}
+    # Nejsilnější první
+    assert [order.signal.symbol for order in orders] == ["ETHUSDT", "SOLUSDT", "BTCUSDT"]
+    # 2 % z 10000 na vzdálenost 10 ke stop lossu = 20 ks = 2000 USD, strop 1000 USD
+    assert by_symbol["BTCUSDT"].notional == D("1000.00") and by_symbol["BTCUSDT"].quantity == D("10")
+    # Bez stop lossu 1 % zůstatku
+    assert by_symbol["ETHUSDT"].notional == D("100.00") and by_symbol["ETHUSDT"].quantity == D("1")
+    assert by_symbol["SOLUSDT"].notional == D("1000.00")
+
+
+def test_scarce_capital_split_by_strength_and_slots():
+    risk = RiskEngine(_limits(max_positions=3))
+    risk.on_fill("XRPUSDT", TradeType.BUY, D("5"), D("100"), reserved=False)
+
+    sizer = PortfolioSizer(_limits(max_positions=3))
+    orders = sizer.allocate([
+        _request("BTCUSDT", 1.0, stop="50"),
+        _request("ETHUSDT", 3.0, stop="50"),
+        _request("SOLUSDT", 0.9, stop="50"),
+        _request("ADAUSDT", 2.0, price="10", stop="9.99"),
+    ], D("2000"), risk)
+
+    # Jedna pozice otevřená -> 2 volné sloty; kapitál 2000 - 500 = 1500
+    by_symbol = {order.signal.symbol: order.notional for order in orders}
+    assert set(by_symbol) == {"ETHUSDT", "ADAUSDT"}
+    # Poměr 3 : 2 dává 900 : 600, ETH má ale strop 2 % * 2000 / 50 * 100 = 80 USD
+    assert by_symbol["ETHUSDT"] == D("80.00")
+    assert by_symbol["ADAUSDT"] == D("1000.00")
+
+
+def test_nothing_sized_without_balance_or_below_minimum():
+    sizer = PortfolioSizer(_limits(), min_order_usd=D("50"))
+    assert sizer.allocate([_request("BTCUSDT", 1.0)], D("0")) == []
+    # 1 % z 1000 = 10 USD < minimum
+    assert sizer.allocate([_request("BTCUSDT", 1.0)], D("1000")) == []
+
+
+def test_pending_orders_reduce_capital_budget():
+    risk = RiskEngine(_limits(max_positions=5))
+    risk.on_fill("XRPUSDT", TradeType.BUY, D("5"), D("100"), reserved=False)
+    # Odeslaný, dosud neplněný nákup drží kapitál stejně jako pozice
+    risk.reserve("DOTUSDT", TradeType.BUY, D("8"), D("100"))
+    # Reduce-only uzavření kapitál nedrží
+    risk.reserve("XRPUSDT", TradeType.SELL, D("5"), D("100"))
+    assert risk.reserved_notional == D("800")
+
+    orders = PortfolioSizer(_limits(max_positions=5)).allocate([
+        _request("BTCUSDT", 1.0, stop="99"),
+    ], D("2000"), risk)
+
+    # Kapitál 2000 - 500 (pozice) - 800 (rezervace) = 700
+    assert [order.notional for order in orders] == [D("700.00")]
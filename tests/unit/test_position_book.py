@@ -0,0 +1,120 @@
+import asyncio
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+
+from src.domain.models import Position, TradeType
+from src.infrastructure.persistence.database.position_book import PositionBook
+from src.infrastructure.persistence.database.sqlite_connection import SqliteConnectionManager
+from src.infrastructure.persistence.database.sqlite_trade_repository import SqlitePositionRepository
+
+
+def _position(symbol, size="1", side=TradeType.BUY, hour=9):
+    return Position(
+        symbol=symbol, side=side, size=Decimal(size), entry_price=Decimal("100"),
+        current_price=Decimal("101"), unrealized_pnl=Decimal("1"), margin=Decimal("10"),
+        created_at=datetime(2024, 1, 1, hour)
+    )
+
+
+class CountingRepository(SqlitePositionRepository):
+    """Počítá dotazy a umí simulovat výpadek zápisu"""
+
+    def __init__(self, db_path):
+        super().__init__(db_path)
+        self.reads = 0
+        self.writes = 0
+        self.fail_writes = False
+
+    async def get_position_by_symbol(self, symbol):
+        self.reads += 1
+        return await super().get_position_by_symbol(symbol)
+
+    async def get_all_positions(self):
+        self.reads += 1
+        return await super().get_all_positions()
+
+    async def save_position(self, position):
+        if self.fail_writes:
+            raise RuntimeError("disk full")
+        self.writes += 1
+        return await super().save_position(position)
+
+
+@pytest.fixture
+async def inner(tmp_path):
+    repository = CountingRepository(str(tmp_path / "positions.db"))
+    await repository.save_position(_position("BTCUSDT"))
+    repository.writes = 0
+    yield repository
+    SqliteConnectionManager.close_all()
+
+
+async def test_reads_are_served_from_memory(inner):
+    book = PositionBook(inner)
+    assert await book.load() == 1
+
+    for _ in range(10):
+        assert (await book.get_position_by_symbol("BTCUSDT")).size == Decimal("1")
+        assert await book.get_position_by_symbol("ETHUSDT") is None
+    await book.save_position(_position("ETHUSDT", hour=10))
+    assert [p.symbol for p in await book.get_all_positions()] == ["ETHUSDT", "BTCUSDT"]
+    assert inner.reads == 1
+
+    # Úprava vrácené kopie book nezmění
+    (await book.get_position_by_symbol("BTCUSDT")).size = Decimal("99")
+    assert (await book.get_position_by_symbol("BTCUSDT")).size == Decimal("1")
+    await book.close()
+
+
+async def test_writes_are_coalesced_and_persisted(inner):
+    book = PositionBook(inner)
+    for size in ("2", "3", "4"):
+        await book.update_position(_position("BTCUSDT", size=size))
+    assert await book.close_position("BTCUSDT")
+    assert not await book.close_position("BTCUSDT")
+    await book.save_position(_position("SOLUSDT", size="5"))
+    await book.flush()
+
+    assert inner.writes <= 2
+    stored = await SqlitePositionRepository.get_all_positions(inner)
+    assert [(p.symbol, p.size) for p in stored] == [("SOLUSDT", Decimal("5"))]
+    await book.close()
+
+
+async def test_failed_write_is_retried(inner):
+    book = PositionBook(inner, retry_delay=0.01)
+    inner.fail_writes = True
+    await book.save_position(_position("BTCUSDT", size="7"))
+    await asyncio.sleep(0.05)
+    assert book.stats()["pending_writes"] == 1
+
+    inner.fail_writes = False
+    await book.flush()
+    assert book.stats()["pending_writes"] == 0
+    assert book.stats()["failed"] >= 1
+    assert (await SqlitePositionRepository.get_position_by_symbol(inner, "BTCUSDT")).size == Decimal("7")
+    await book.close()
+
+
+async def test_reconcile_reports_drift(inner):
+    book = PositionBook(inner)
+    await book.save_position(_position("ETHUSDT", size="2"))
+    await book.save_position(_position("SOLUSDT"))
+
+    drift = await book.reconcile([
+        _position("BTCUSDT"),
+        _position("ETHUSDT", size="2.5"),
+        _position("XRPUSDT", side=TradeType.SELL),
+    ])
+    assert not drift.is_clean
+    assert drift.missing_locally == ["XRPUSDT"]
+    assert drift.missing_on_exchange == ["SOLUSDT"]
+    assert drift.size_mismatch == {"ETHUSDT": ("2", "2.5")}
+    assert book.stats()["last_drift"]["is_clean"] is False
+
+    clean = await book.reconcile(await book.get_all_positions())
+    assert clean.is_clean
+    assert book.stats()["drifted_reconciliations"] == 1
+    await book.close()
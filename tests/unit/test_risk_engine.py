@@ -0,0 +1,113 @@
+from datetime import date, datetime
+from decimal import Decimal
+
+from benchmarks.offline_exchange import OfflineBybitClient
+from src.application.services.order_pipeline import OrderPipeline
+from src.application.services.risk_engine import RiskEngine
+from src.config.settings import RiskManagementConfig
+from src.domain.models import (
+    ExecutionEvent, OrderState, Position, SignalStrength, SignalType, TradeType, TradingSignal
+)
+from src.domain.services.trading_engine import TradingEngine
+
+
+D = Decimal
+BUY, SELL = TradeType.BUY, TradeType.SELL
+
+
+def _limits(**overrides):
+    values = dict(max_position_size_usd=D("1000"), max_daily_loss_usd=D("100"), max_positions=2)
+    values.update(overrides)
+    return RiskManagementConfig(**values)
+
+
+def test_limits_use_reservations_and_fills():
+    risk = RiskEngine(_limits())
+
+    assert risk.check_order("BTCUSDT", BUY, D("5"), D("100"))
+    risk.reserve("BTCUSDT", BUY, D("5"), D("100"))
+    # Rezervace se počítá do velikosti pozice i do počtu pozic
+    assert risk.check_order("BTCUSDT", BUY, D("6"), D("100")).reason == "max_position_size"
+    assert risk.check_order("ETHUSDT", BUY, D("1"), D("100"))
+    risk.reserve("ETHUSDT", BUY, D("1"), D("100"))
+    assert risk.check_order("SOLUSDT", BUY, D("1"), D("10")).reason == "max_positions"
+
+    assert risk.reserved_notional == D("600")
+    risk.on_fill("BTCUSDT", BUY, D("5"), D("100"))
+    risk.release("ETHUSDT", BUY, D("1"))
+    assert risk.reserved_notional == 0
+    assert (risk.open_positions, risk.opening_positions) == (1, 0)
+    assert risk.gross_notional == D("500") and risk.net_notional == D("500")
+
+    risk.mark("BTCUSDT", D("90"))
+    assert risk.unrealized_pnl == D("-50") and risk.net_notional == D("450")
+
+    # Prodej 7 ks: 5 uzavře long (realizováno -50), 2 otevřou short
+    risk.on_fill("SOLUSDT", SELL, D("1"), D("10"), reserved=False)
+    risk.on_fill("BTCUSDT", SELL, D("7"), D("90"), reserved=False)
+    assert risk.realized_pnl_today == D("-50")
+    assert risk.exposure("BTCUSDT")["size"] == -2.0
+    assert risk.gross_notional == D("190") and risk.net_notional == D("-190")
+    assert risk.stats()["rejections"] == {"max_position_size": 1, "max_positions": 1}
+
+
+def test_kill_switch_blocks_new_exposure_only():
+    days = [date(2024, 1, 1)]
+    risk = RiskEngine(_limits(), today=lambda: days[0])
+    risk.load([Position(
+        symbol="BTCUSDT", side=BUY, size=D("2"), entry_price=D("100"), current_price=D("100"),
+        unrealized_pnl=D("0"), margin=D("200")
+    )], realized_today=D("-60"))
+
+    risk.mark("BTCUSDT", D("70"))
+    assert risk.daily_pnl == D("-120")
+    assert risk.check_order("ETHUSDT", BUY, D("1"), D("10")).reason == "kill_switch"
+    assert risk.kill_switch
+    # Snížení pozice projde i s kill switchem, přetočení na short ne
+    assert risk.check_order("BTCUSDT", SELL, D("2"), D("70"))
+    assert not risk.check_order("BTCUSDT", SELL, D("3"), D("70"))
+
+    # Nový den vynuluje realizované PnL, kill switch ale zůstává do ručního zrušení
+    days[0] = date(2024, 1, 2)
+    assert risk.daily_pnl == D("-60")
+    assert not risk.check_order("ETHUSDT", BUY, D("1"), D("10"))
+    risk.reset_kill_switch()
+    assert risk.check_order("ETHUSDT", BUY, D("1"), D("10"))
+
+    assert RiskEngine(_limits(kill_switch=True)).check_order("ETHUSDT", BUY, D("1"), D("10")).reason == "kill_switch"
+
+
+async def test_pipeline_checks_before_sending_and_counts_fills(repositories):
+    client = OfflineBybitClient()
+    risk = RiskEngine(_limits())
+    engine = TradingEngine(repositories.trades, repositories.positions)
+    pipeline = OrderPipeline(client, engine, repositories.trades, repositories.unit_of_work, risk)
+
+    def signal(symbol):
+        return TradingSignal(
+            strategy_name="rsi_macd", symbol=symbol, signal_type=SignalType.BUY, strength=SignalStrength.STRONG,
+            confidence=0.9, price=D("100"), timestamp=datetime(2024, 1, 1), indicators={}, reason="test"
+        )
+
+    rejected = await pipeline.submit(signal("ETHUSDT"), D("20"))
+    assert rejected.state == OrderState.REJECTED and client.orders == {}
+
+    order = await pipeline.submit(signal("BTCUSDT"), D("4"))
+    assert risk.exposure("BTCUSDT")["pending"] == 4.0
+    pipeline.on_execution(ExecutionEvent(order.order_link_id, OrderState.PARTIALLY_FILLED, D("1"), D("100")))
+    pipeline.on_execution(ExecutionEvent(order.order_link_id, OrderState.CANCELLED, D("3"), D("102")))
+
+    exposure = risk.exposure("BTCUSDT")
+    assert (exposure["size"], exposure["pending"]) == (3.0, 0.0)
+    # Druhé plnění: 2 ks za (3 * 102 - 100) / 2 = 103
+    assert risk.net_notional == D("309")
+    assert pipeline.stats()["risk_rejected"] == 1
+
+    # Plnění bez průměrné ceny je za cenu objednávky, druhé tedy za 2 * 101 - 100 = 102
+    order = await pipeline.submit(signal("SOLUSDT"), D("2"))
+    pipeline.on_execution(ExecutionEvent(order.order_link_id, OrderState.PARTIALLY_FILLED, D("1"), fee=D("0.1")))
+    pipeline.on_execution(ExecutionEvent(order.order_link_id, OrderState.FILLED, D("2"), D("101"), fee=D("0.25")))
+    assert risk.exposure("SOLUSDT")["net_notional"] == 2 * 102.0
+    # Kumulativní poplatky z burzy se do denního PnL započtou jednou
+    assert risk.realized_pnl_today == D("-0.25")
+    await pipeline.close()
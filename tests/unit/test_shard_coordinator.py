@@ -0,0 +1,103 @@
+import asyncio
+from datetime import datetime
+from decimal import Decimal
+
+from benchmarks.offline_exchange import OfflineBybitClient
+from src.application.services.shard_coordinator import (
+    ShardCoordinator, _WorkerHandle, _signal_from_message, _signal_to_message
+)
+from src.config.settings import Settings, ShardingConfig
+from src.domain.models import SignalStrength, SignalType, TradingSignal
+from src.domain.services.hash_ring import HashRing
+
+
+def test_ring_moves_only_keys_of_removed_node():
+    keys = [f"SYM{i}USDT" for i in range(1000)]
+    ring = HashRing([f"worker-{i}" for i in range(4)])
+    before = ring.assign(keys)
+    assert all(150 < len(shard) < 350 for shard in before.values())
+
+    ring.remove("worker-2")
+    after = ring.assign(keys)
+    assert set(after) == {"worker-0", "worker-1", "worker-3"}
+    for node, shard in after.items():
+        # Přibyly jen klíče odebraného uzlu
+        assert set(before[node]) <= set(shard) and set(shard) - set(before[node]) <= set(before["worker-2"])
+
+
+def test_signal_survives_ipc_message():
+    signal = TradingSignal(
+        strategy_name="RsiMacdStrategy", symbol="BTCUSDT", signal_type=SignalType.BUY,
+        strength=SignalStrength.STRONG, confidence=0.85, price=Decimal("30000.5"),
+        timestamp=datetime(2024, 1, 1, 12, 0), indicators={"rsi": 28.5}, reason="test",
+        suggested_stop_loss=Decimal("29400.49")
+    )
+    assert _signal_from_message(_signal_to_message(signal)) == signal
+
+
+async def _wait_for(condition, timeout=20.0):
+    for _ in range(int(timeout / 0.05)):
+        if condition():
+            return True
+        await asyncio.sleep(0.05)
+    return False
+
+
+async def test_workers_stream_analyses_and_rebalance_after_death():
+    settings = Settings()
+    settings.trading.default_symbols = [f"SYM{i}USDT" for i in range(8)]
+    settings.trading.refresh_interval = 0.2
+    settings.trading.sharding = ShardingConfig(
+        enabled=True, workers=2, heartbeat_interval=0.1, heartbeat_timeout=30
+    )
+    prices = []
+    stored = {}
+
+    async def on_candles(symbol, candles):
+        stored.setdefault(symbol, []).append(candles)
+
+    coordinator = ShardCoordinator(
+        settings, client_factory=OfflineBybitClient, on_price=lambda symbol, price, _: prices.append(symbol),
+        on_candles=on_candles
+    )
+    await coordinator.start()
+    try:
+        shards = coordinator.assignments()
+        assert len(shards) == 2 and sorted(sum(shards.values(), [])) == sorted(settings.trading.default_symbols)
+        assert await _wait_for(lambda: set(prices) == set(settings.trading.default_symbols))
+        # První analýza pošle k uložení všechny svíčky, další jen nové
+        assert all(len(batches[0]) == 200 for batches in stored.values())
+
+        victim, survivor = sorted(shards, key=lambda worker: -len(shards[worker]))
+        killed_at = len(prices)
+        coordinator._workers[victim].process.kill()
+        assert await _wait_for(lambda: coordinator.stats()["worker_deaths"] == 1)
+        assert coordinator.assignments() == {survivor: settings.trading.default_symbols}
+
+        # Po přerozdělení chodí ceny i symbolů mrtvého workeru
+        assert await _wait_for(lambda: set(prices[killed_at:]) >= set(shards[victim]))
+        stats = coordinator.stats()
+        assert stats["workers"] == 1 and stats["moved_symbols"] >= len(shards[victim])
+        # Vlastní symboly přeživší worker do `min_analysis_interval` znovu neanalyzuje
+        assert not set(prices[killed_at:]) & set(shards[survivor])
+    finally:
+        await coordinator.close()
+
+
+async def test_analysis_without_signals_replaces_older_signals():
+    settings = Settings()
+    settings.trading.default_symbols = ["BTCUSDT"]
+    coordinator = ShardCoordinator(settings)
+    coordinator._ring.add("worker-0")
+    worker = _WorkerHandle("worker-0", process=None)
+    signal = TradingSignal(
+        strategy_name="RsiMacdStrategy", symbol="BTCUSDT", signal_type=SignalType.BUY,
+        strength=SignalStrength.STRONG, confidence=0.85, price=Decimal("30000"),
+        timestamp=datetime(2024, 1, 1), indicators={}, reason="test"
+    )
+
+    await coordinator._on_message(worker, {
+        "type": "analysis", "symbol": "BTCUSDT", "signals": [_signal_to_message(signal)]
+    })
+    await coordinator._on_message(worker, {"type": "analysis", "symbol": "BTCUSDT", "signals": []})
+    assert coordinator.drain() == {}
@@ -0,0 +1,36 @@
+import asyncio
+
+import pytest
+
+from src.infrastructure.persistence.database.sqlite_connection import SqliteConnectionManager
+
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = SqliteConnectionManager.for_path(str(tmp_path / "test.db"))
+    manager.write_sync(lambda conn: conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)"))
+    yield manager
+    SqliteConnectionManager.close_all()
+
+
+def test_manager_is_shared_per_file_and_uses_wal(tmp_path, manager):
+    assert SqliteConnectionManager.for_path(str(tmp_path / "test.db")) is manager
+    mode = manager.read_sync(lambda conn: conn.execute("PRAGMA journal_mode").fetchone()[0])
+    assert mode == "wal"
+
+
+async def test_writes_are_transactional_and_reads_run_in_parallel(manager):
+    await manager.write(lambda conn: conn.execute("INSERT INTO items (name) VALUES ('a')"))
+
+    def failing(conn):
+        conn.execute("INSERT INTO items (name) VALUES ('b')")
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        await manager.write(failing)
+
+    counts = await asyncio.gather(*[
+        manager.read(lambda conn: conn.execute("SELECT COUNT(*) FROM items").fetchone()[0])
+        for _ in range(8)
+    ])
+    assert counts == [1] * 8
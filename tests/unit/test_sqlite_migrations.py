@@ -0,0 +1,156 @@
+import sqlite3
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+
+from src.domain.models import Candle, Ticker
+from src.infrastructure.persistence.database.sqlite_connection import SqliteConnectionManager
+from src.infrastructure.persistence.database.sqlite_market_data_repository import SqliteMarketDataRepository
+from src.infrastructure.persistence.database.sqlite_migrations import (
+    MigrationRequiredError, main, schema_version
+)
+from src.infrastructure.persistence.database.sqlite_schema import SCHEMA_VERSION
+
+
+LEGACY_SCHEMA = """
+    CREATE TABLE candles (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        symbol TEXT NOT NULL,
+        timestamp TIMESTAMP NOT NULL,
+        open_price REAL NOT NULL,
+        high_price REAL NOT NULL,
+        low_price REAL NOT NULL,
+        close_price REAL NOT NULL,
+        volume REAL NOT NULL,
+        UNIQUE(symbol, timestamp)
+    );
+    CREATE INDEX idx_candles_symbol_timestamp ON candles(symbol, timestamp);
+    CREATE TABLE tickers (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        symbol TEXT NOT NULL,
+        last_price REAL NOT NULL,
+        bid_price REAL NOT NULL,
+        ask_price REAL NOT NULL,
+        volume_24h REAL NOT NULL,
+        price_change_24h REAL NOT NULL,
+        price_change_percent_24h REAL NOT NULL,
+        timestamp TIMESTAMP NOT NULL
+    );
+    CREATE TABLE order_books (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        symbol TEXT NOT NULL,
+        best_bid REAL,
+        best_ask REAL,
+        spread REAL,
+        timestamp TIMESTAMP NOT NULL
+    );
+"""
+
+
+@pytest.fixture
+def legacy_db(tmp_path):
+    db_path = str(tmp_path / "legacy.db")
+    conn = sqlite3.connect(db_path)
+    conn.executescript(LEGACY_SCHEMA)
+    conn.execute(
+        "INSERT INTO candles (symbol, timestamp, open_price, high_price, low_price, close_price, volume) "
+        "VALUES ('BTCUSDT', '2024-01-01 12:15:00', 42000.5, 42100.25, 41950.0, 42050.75, 12.345)"
+    )
+    conn.execute(
+        "INSERT INTO tickers (symbol, last_price, bid_price, ask_price, volume_24h, price_change_24h, "
+        "price_change_percent_24h, timestamp) VALUES ('BTCUSDT', 42050.75, 42050.5, 42051.0, 1000.5, 0.0123, 1.23, "
+        "'2024-01-01 12:15:30.250000')"
+    )
+    conn.execute(
+        "INSERT INTO order_books (symbol, best_bid, best_ask, spread, timestamp) "
+        "VALUES ('BTCUSDT', 42050.5, 42051.0, 0.5, '2024-01-01 12:15:31')"
+    )
+    conn.commit()
+    conn.close()
+    yield db_path
+    SqliteConnectionManager.close_all()
+
+
+async def test_legacy_database_is_migrated(legacy_db):
+    repository = SqliteMarketDataRepository(legacy_db)
+
+    candles = await repository.get_latest_candles("BTCUSDT", 10)
+    assert len(candles) == 1
+    assert candles[0].timestamp == datetime(2024, 1, 1, 12, 15)
+    assert candles[0].interval == "15"
+    assert candles[0].high == Decimal("42100.25")
+    assert candles[0].volume == Decimal("12.345")
+
+    ticker = await repository.get_latest_ticker("BTCUSDT")
+    assert ticker.timestamp == datetime(2024, 1, 1, 12, 15, 30, 250000)
+    assert ticker.price_change_24h == Decimal("0.0123")
+    assert ticker.volume_24h == Decimal("1000.5")
+
+    order_book = await repository.get_latest_order_book("BTCUSDT")
+    assert order_book.spread == Decimal("0.5")
+
+    conn = sqlite3.connect(legacy_db)
+    assert schema_version(conn) == SCHEMA_VERSION
+    assert "WITHOUT ROWID" in conn.execute(
+        "SELECT sql FROM sqlite_master WHERE name = 'candles'"
+    ).fetchone()[0]
+    conn.close()
+
+
+def test_auto_migrate_disabled_refuses_legacy_database(legacy_db):
+    with pytest.raises(MigrationRequiredError):
+        SqliteMarketDataRepository(legacy_db, auto_migrate=False)
+
+    assert main([legacy_db, "--check"]) == 1
+    assert main([legacy_db]) == 0
+    assert main([legacy_db, "--check"]) == 0
+
+
+async def test_candles_are_keyed_by_interval(tmp_path):
+    repository = SqliteMarketDataRepository(str(tmp_path / "new.db"))
+    for interval in ("15", "60"):
+        await repository.save_candle(Candle(
+            symbol="ETHUSDT", timestamp=datetime(2024, 1, 1), open=Decimal("1"), high=Decimal("2"),
+            low=Decimal("0.5"), close=Decimal(interval), volume=Decimal("3"), interval=interval
+        ))
+
+    hourly = await repository.get_latest_candles("ETHUSDT", 5, interval="60")
+    assert [c.close for c in hourly] == [Decimal("60")]
+    SqliteConnectionManager.close_all()
+
+
+def _ticker(volume: str, day: int = 1) -> Ticker:
+    return Ticker(
+        symbol="1000PEPEUSDT", last_price=Decimal("0.0123"), bid_price=Decimal("0.0122"),
+        ask_price=Decimal("0.0124"), volume_24h=Decimal(volume), price_change_24h=Decimal("0"),
+        price_change_percent_24h=Decimal("0"), timestamp=datetime(2024, 1, day)
+    )
+
+
+async def test_ticker_volume_above_size_scale_range(tmp_path):
+    repository = SqliteMarketDataRepository(str(tmp_path / "new.db"))
+    # V SIZE_SCALE by 2.3e13 přeteklo INTEGER (~9.2e12 jednotek)
+    await repository.save_ticker(_ticker("23456789012345.67"))
+    assert (await repository.get_latest_ticker("1000PEPEUSDT")).volume_24h == Decimal("23456789012345.67")
+
+    # Nad rozsahem i menší škály se objem ořízne místo chyby zápisu
+    await repository.save_ticker(_ticker("1e30", day=2))
+    assert (await repository.get_latest_ticker("1000PEPEUSDT")).volume_24h == Decimal(2 ** 63 - 1).scaleb(-2)
+    SqliteConnectionManager.close_all()
+
+
+def test_ticker_volume_is_rescaled_from_version_7(tmp_path):
+    db_path = str(tmp_path / "v7.db")
+    SqliteMarketDataRepository(db_path)
+    SqliteConnectionManager.close_all()
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        "INSERT INTO tickers VALUES ('BTCUSDT', 0, 4205000000000, 4205000000000, 4205000000000, 1000505000, 0, 0)"
+    )
+    conn.execute("PRAGMA user_version = 7")
+    conn.commit()
+
+    assert main([db_path]) == 0
+    assert conn.execute("SELECT volume_24h FROM tickers").fetchone()[0] == 100051
+    conn.close()
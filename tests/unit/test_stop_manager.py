@@ -0,0 +1,103 @@
+from datetime import datetime
+from decimal import Decimal
+
+from benchmarks.offline_exchange import OfflineBybitClient
+from src.application.services.stop_manager import StopManager
+from src.config.settings import RiskManagementConfig, StopManagementConfig
+from src.domain.models import Position, TradeType
+from src.infrastructure.external.bybit.bybit_stream import BybitPublicStream
+
+
+D = Decimal
+
+
+def _manager(client=None, **config):
+    return StopManager(client or OfflineBybitClient(), StopManagementConfig(enabled=True, **config),
+                       RiskManagementConfig(stop_loss_percentage=2.0))
+
+
+def test_trailing_stop_moves_in_steps_and_exits_on_pullback():
+    stops = _manager(trailing_pct=1.0, trail_step_pct=0.5)
+    stops.track("BTCUSDT", TradeType.BUY, 100)
+    assert stops.stop_price("BTCUSDT") == D("98")
+
+    # Stop = cena - 1; posun až když nový stop převýší starý aspoň o 0,5
+    stops.on_price("BTCUSDT", 99.4)
+    assert stops.stop_price("BTCUSDT") == D("98")
+    stops.on_price("BTCUSDT", 99.6)
+    assert stops.stop_price("BTCUSDT") == D("98.6")
+    stops.on_price("BTCUSDT", 99.9)
+    assert stops.stop_price("BTCUSDT") == D("98.6")
+    stops.on_price("BTCUSDT", 102)
+    assert stops.stop_price("BTCUSDT") == D("101")
+
+    assert stops.on_price("BTCUSDT", 101.5) == []
+    [triggered] = stops.on_price("BTCUSDT", 100.9)
+    assert (triggered.reason, triggered.stop_price) == ("trailing", D("101"))
+    assert stops.stats()["positions"] == 0 and stops.on_price("BTCUSDT", 90) == []
+
+
+def test_short_break_even_and_time_stop():
+    stops = _manager(break_even_trigger_pct=1.0, break_even_offset_pct=0.2, time_stop_minutes=10)
+    stops.track("ETHUSDT", TradeType.SELL, 200, opened_at=1000.0)
+    stops.track("SOLUSDT", TradeType.BUY, 50, opened_at=1300.0)
+    assert stops.stop_price("ETHUSDT") == D("204")
+
+    # Short: po poklesu o 1 % jde stop na vstup - 0,2 %
+    stops.on_price("ETHUSDT", 198.5, timestamp=1100.0)
+    assert stops.stop_price("ETHUSDT") == D("204")
+    stops.on_price("ETHUSDT", 197.9, timestamp=1100.0)
+    assert stops.stop_price("ETHUSDT") == D("199.6")
+    [triggered] = stops.on_price("ETHUSDT", 199.7, timestamp=1200.0)
+    assert triggered.reason == "break_even"
+
+    # Časový stop podle termínu, i bez tiku symbolu
+    assert stops.check_time(1800.0) == []
+    [triggered] = stops.check_time(1900.0)
+    assert (triggered.symbol, triggered.reason) == ("SOLUSDT", "time")
+
+
+def test_sync_follows_positions_with_many_stops_per_symbol():
+    stops = _manager(trailing_pct=1.0, trail_step_pct=0.1)
+    for i in range(1000):
+        stops.track("BTCUSDT", TradeType.BUY, 100, stop_price=90 + i / 100, key=f"lot{i}")
+    # Cena 95 spustí právě stopy 95,00 - 99,99 (500 pozic)
+    assert len(stops.on_price("BTCUSDT", 95)) == 500
+
+    position = Position(
+        symbol="ETHUSDT", side=TradeType.BUY, size=D("1"), entry_price=D("100"), current_price=D("100"),
+        unrealized_pnl=D("0"), margin=D("100"), created_at=datetime.now()
+    )
+    stops.sync([position])
+    assert stops.stats()["positions"] == 1 and stops.stop_price("ETHUSDT") == D("98")
+
+
+async def test_amends_are_coalesced_per_symbol_and_sent_in_one_batch():
+    client = OfflineBybitClient()
+    stops = _manager(client, trailing_pct=1.0, trail_step_pct=0.1)
+    stops.track("BTCUSDT", TradeType.BUY, 100)
+    stops.track("ETHUSDT", TradeType.BUY, 100)
+    for price in (101, 102, 103):
+        stops.on_price("BTCUSDT", price)
+    stops.on_price("ETHUSDT", 105)
+
+    assert await stops.flush_amends() == 2
+    assert client.requests["/v5/position/trading-stop"] == 2
+    assert await stops.flush_amends() == 0
+    assert stops.stats()["amend_batches"] == 1
+
+
+def test_stream_messages_feed_prices():
+    prices = []
+    stream = BybitPublicStream(["BTCUSDT", "ETHUSDT"], lambda *args: prices.append(args))
+    assert stream.topics()[:2] == ["publicTrade.BTCUSDT", "tickers.BTCUSDT"]
+
+    stream.handle_message({"topic": "publicTrade.BTCUSDT", "data": [
+        {"s": "BTCUSDT", "p": "30000.5", "T": 1700000000000},
+        {"s": "BTCUSDT", "p": "30001", "T": 1700000000500},
+    ]})
+    stream.handle_message({"topic": "tickers.ETHUSDT", "ts": 1700000001000, "data": {"symbol": "ETHUSDT"}})
+    stream.handle_message({"topic": "tickers.ETHUSDT", "ts": 1700000002000,
+                           "data": {"symbol": "ETHUSDT", "lastPrice": "2000.1"}})
+    assert prices == [("BTCUSDT", D("30001"), 1700000000.5), ("ETHUSDT", D("2000.1"), 1700000002.0)]
+    assert stream.stats()["trades"] == 2
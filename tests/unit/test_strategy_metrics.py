@@ -0,0 +1,82 @@
+import statistics
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+
+from src.application.services.strategy_metrics_tracker import StrategyMetricsTracker
+from src.domain.models import Position, StrategyMetrics, Trade, TradeStatus, TradeType
+from src.domain.services.trading_engine import TradingEngine
+
+
+PNLS = ["10", "-4", "6", "-12", "3", "-1", "8"]
+
+
+def test_incremental_metrics_match_batch_formulas():
+    metrics = StrategyMetrics(strategy_name="rsi_macd")
+    for pnl in PNLS:
+        metrics.record_trade(Decimal(pnl))
+
+    values = [float(p) for p in PNLS]
+    assert metrics.total_trades == 7
+    assert metrics.total_pnl == Decimal("10")
+    # Maximum 12 po třetím obchodu, minimum 0 po čtvrtém
+    assert metrics.max_drawdown == Decimal("12")
+    assert metrics.sharpe_ratio == pytest.approx(statistics.mean(values) / statistics.stdev(values))
+    assert metrics.profit_factor == pytest.approx(27 / 17)
+
+    replayed = StrategyMetrics(strategy_name="rsi_macd")
+    replayed.update_metrics([Trade(pnl=Decimal(p)) for p in PNLS])
+    assert (replayed.sharpe_ratio, replayed.max_drawdown) == (metrics.sharpe_ratio, metrics.max_drawdown)
+
+
+async def test_tracker_state_survives_restart(repositories):
+    tracker = StrategyMetricsTracker(repositories.strategy_metrics)
+    await tracker.load()
+    for pnl in PNLS[:4]:
+        await tracker.record(Trade(strategy_name="breakout", pnl=Decimal(pnl)))
+    await tracker.record(Trade(strategy_name="breakout"))
+
+    restarted = StrategyMetricsTracker(repositories.strategy_metrics)
+    await restarted.load()
+    for pnl in PNLS[4:]:
+        await restarted.record(Trade(strategy_name="breakout", pnl=Decimal(pnl)))
+
+    expected = StrategyMetrics(strategy_name="breakout")
+    for pnl in PNLS:
+        expected.record_trade(Decimal(pnl))
+    stored = await repositories.strategy_metrics.get_metrics("breakout")
+    assert stored.total_trades == 7
+    assert stored.max_drawdown == expected.max_drawdown
+    assert stored.sharpe_ratio == pytest.approx(expected.sharpe_ratio)
+    assert restarted.snapshot()["breakout"]["total_pnl"] == 10.0
+
+
+async def test_close_position_records_realized_pnl(repositories):
+    tracker = StrategyMetricsTracker(repositories.strategy_metrics)
+    engine = TradingEngine(repositories.trades, repositories.positions, on_trade_closed=tracker.record)
+
+    await repositories.trades.save_trade(Trade(
+        symbol="BTCUSDT", side=TradeType.BUY, quantity=Decimal("0.5"), price=Decimal("100"),
+        strategy_name="trend_following", created_at=datetime(2024, 1, 1)
+    ))
+    await repositories.positions.save_position(Position(
+        symbol="BTCUSDT", side=TradeType.BUY, size=Decimal("0.5"), entry_price=Decimal("100"),
+        current_price=Decimal("120"), unrealized_pnl=Decimal("10"), margin=Decimal("50"),
+        created_at=datetime(2024, 1, 1)
+    ))
+
+    # Vrácené uzavření se do metrik nezapočte
+    with pytest.raises(RuntimeError):
+        async with repositories.unit_of_work.begin():
+            await engine.close_position("BTCUSDT", Decimal("90"))
+            raise RuntimeError("burza nedostupná")
+    assert tracker.get("trend_following") is None
+
+    # PnL z výstupní ceny, ne z current_price pozice
+    async with repositories.unit_of_work.begin():
+        closed = await engine.close_position("BTCUSDT", Decimal("130"))
+    assert closed.status == TradeStatus.CLOSED
+    assert closed.pnl == Decimal("15") and closed.exit_price == Decimal("130")
+    assert tracker.get("trend_following").total_pnl == Decimal("15")
+    assert (await repositories.trades.get_pnl_summary()).total_pnl == Decimal("15")
@@ -0,0 +1,36 @@
+import asyncio
+
+from benchmarks.offline_exchange import OfflineBybitClient
+from src.application.services.strategy_pool import StrategyPool
+from src.config.settings import StrategyConfig
+from src.strategies.registry import STRATEGY_CLASSES, create_strategy
+
+
+def _key(signals):
+    # Čas signálu je datetime.now() při vzniku
+    return [(s.strategy_name, s.signal_type, s.confidence, s.price, s.suggested_stop_loss) for s in signals]
+
+
+async def test_pool_returns_same_signals_as_inline_analysis():
+    client = OfflineBybitClient(kline_count=300)
+    configs = {name: StrategyConfig() for name in STRATEGY_CLASSES}
+    configs["volume"] = StrategyConfig(enabled=False)
+    strategies = [create_strategy(name, config) for name, config in configs.items() if config.enabled]
+    candles = {f"SYM{i}USDT": await client.get_klines(f"SYM{i}USDT", "15", 300) for i in range(20)}
+
+    pool = StrategyPool(configs, workers=1, max_candles=250)
+    try:
+        pooled = await asyncio.gather(*(pool.analyze(symbol, series) for symbol, series in candles.items()))
+    finally:
+        await pool.close()
+
+    expected = []
+    for symbol, series in candles.items():
+        # Pool analyzuje jen posledních `max_candles` svíček
+        signals = [await strategy.analyze(series[-250:], symbol) for strategy in strategies]
+        expected.append(_key(signal for signal in signals if signal))
+    assert [_key(signals) for signals in pooled] == expected and sum(map(len, expected)) > 0
+
+    stats = pool.stats()
+    # 20 symbolů na 2 sloty - analýzy čekaly na uvolnění sdílené paměti
+    assert stats["tasks"] == 20 and stats["slots"] == 2 and stats["slot_waits"] > 0 and stats["errors"] == 0
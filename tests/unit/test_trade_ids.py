@@ -0,0 +1,87 @@
+import asyncio
+import multiprocessing
+import sqlite3
+import threading
+from decimal import Decimal
+
+import pytest
+
+from src.domain.models import Trade, TradeType
+from src.domain.services import id_generator
+from src.domain.services.id_generator import IdGenerator, id_timestamp_ms, new_trade_id
+
+
+def _generate(count):
+    return [new_trade_id() for _ in range(count)]
+
+
+def test_ids_are_unique_across_threads_and_processes():
+    generator = IdGenerator("trade_")
+    per_thread = [[] for _ in range(8)]
+
+    def worker(out):
+        for _ in range(10_000):
+            out.append(generator.next_id())
+
+    threads = [threading.Thread(target=worker, args=(out,)) for out in per_thread]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    ids = [i for out in per_thread for i in out]
+    assert len(set(ids)) == 80_000
+    assert all(out == sorted(out) for out in per_thread)
+
+    if "fork" not in multiprocessing.get_all_start_methods():
+        pytest.skip("fork není k dispozici")
+    # Forkované procesy zdědí stav generátoru, uzel se ale přepočítá
+    with multiprocessing.get_context("fork").Pool(4) as pool:
+        batches = pool.map(_generate, [5_000] * 4)
+    batches.append(_generate(5_000))
+    assert len({i for batch in batches for i in batch}) == 25_000
+
+
+def test_clock_going_back_and_sequence_overflow(monkeypatch):
+    clock = [1_700_000_000_000 * 1_000_000]
+    monkeypatch.setattr(id_generator.time, "time_ns", lambda: clock[0])
+    generator = IdGenerator("t_", node=7)
+
+    ids = [generator.next_id() for _ in range(70_000)]
+    assert len(set(ids)) == 70_000 and ids == sorted(ids)
+    # 65536 ID na milisekundu, zbytek si půjčí další
+    assert id_timestamp_ms(ids[-1], "t_") == 1_700_000_000_001
+
+    clock[0] -= 5_000 * 1_000_000
+    assert generator.next_id() > ids[-1]
+
+
+@pytest.fixture
+def trades(repositories):
+    return repositories.trades
+
+
+async def test_concurrent_saves_lose_nothing(trades):
+    async def worker(index):
+        for _ in range(100):
+            await trades.save_trade(Trade(
+                symbol=f"SYM{index % 4}", side=TradeType.BUY, quantity=Decimal("1"), price=Decimal("10")
+            ))
+
+    await asyncio.gather(*(worker(i) for i in range(20)))
+    stored = [t for i in range(4) for t in await trades.get_trades_by_symbol(f"SYM{i}")]
+    assert len(stored) == 2000
+    assert all(t.id.startswith("trade_") for t in stored)
+
+
+async def test_insert_and_update_are_explicit(trades):
+    trade = await trades.save_trade(Trade(symbol="BTCUSDT", quantity=Decimal("1"), price=Decimal("10")))
+    with pytest.raises(sqlite3.IntegrityError):
+        await trades.save_trade(Trade(id=trade.id, symbol="ETHUSDT"))
+
+    trade.price = Decimal("11")
+    await trades.update_trade(trade)
+    assert (await trades.get_trade_by_id(trade.id)).price == Decimal("11")
+
+    with pytest.raises(ValueError):
+        await trades.update_trade(Trade(id="trade_missing", symbol="BTCUSDT"))
@@ -0,0 +1,64 @@
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import pytest
+
+from src.application.services.trade_history import load_pnl_timeline, load_recent_trade_rows
+from src.domain.models import Trade, TradeType, TradeStatus
+
+
+@pytest.fixture
+async def trades(repositories):
+    start = datetime(2024, 1, 1)
+    for i in range(23):
+        await repositories.trades.save_trade(Trade(
+            id=f"t{i:03d}",
+            symbol="BTCUSDT" if i % 2 else "ETHUSDT",
+            side=TradeType.BUY,
+            quantity=Decimal("1"),
+            price=Decimal("100"),
+            status=TradeStatus.OPEN if i % 3 else TradeStatus.CLOSED,
+            strategy_name="rsi_macd",
+            # Dvojice obchodů se stejným časem ověřují řazení podle id
+            created_at=start + timedelta(minutes=i // 2)
+        ))
+    return repositories.trades
+
+
+async def test_iterators_match_list_queries(trades):
+    by_symbol = [t.id async for t in trades.iter_trades_by_symbol("BTCUSDT", page_size=4)]
+    assert by_symbol == [t.id for t in await trades.get_trades_by_symbol("BTCUSDT")]
+    assert len(by_symbol) == 11
+
+    open_ids = [t.id async for t in trades.iter_open_trades(page_size=5)]
+    assert open_ids == [t.id for t in await trades.get_open_trades()]
+
+    by_strategy = [t.id async for t in trades.iter_trades_by_strategy("rsi_macd", page_size=3)]
+    assert len(by_strategy) == len(set(by_strategy)) == 23
+
+
+async def test_date_range_pages_are_ordered_newest_first(trades):
+    start = datetime(2024, 1, 1, 0, 2)
+    end = datetime(2024, 1, 1, 0, 6)
+    streamed = [t async for t in trades.iter_trades_by_date_range(start, end, page_size=2)]
+
+    assert [t.id for t in streamed] == [t.id for t in await trades.get_trades_by_date_range(start, end)]
+    keys = [(t.created_at, t.id) for t in streamed]
+    assert keys == sorted(keys, reverse=True)
+    assert len(streamed) == 10
+
+
+async def test_dashboard_rows_are_aggregated_while_streaming(trades):
+    start, end = datetime(2024, 1, 1), datetime(2024, 1, 1, 1)
+    timeline = await load_pnl_timeline(trades, start, end, bucket=timedelta(minutes=5), page_size=4)
+
+    # Řádek na okno a symbol, ne na obchod
+    assert [(row["timestamp"].minute, row["symbol"], row["trades"]) for row in timeline] == [
+        (0, "BTCUSDT", 5), (0, "ETHUSDT", 5),
+        (5, "BTCUSDT", 5), (5, "ETHUSDT", 5),
+        (10, "BTCUSDT", 1), (10, "ETHUSDT", 2),
+    ]
+
+    recent = await load_recent_trade_rows(trades, start, end, limit=3)
+    newest = (await trades.get_trades_by_date_range(start, end))[:3]
+    assert [(row["timestamp"], row["symbol"]) for row in recent] == [(t.created_at, t.symbol) for t in newest]
@@ -0,0 +1,177 @@
+import asyncio
+from datetime import datetime
+from decimal import Decimal
+
+from benchmarks.offline_exchange import OfflineBybitClient
+from src.application.services.trading_orchestrator import TradingOrchestrator
+from src.config.settings import Settings, StrategyConfig
+from src.domain.models import Candle, Position, SignalStrength, SignalType, TradeStatus, TradeType, TradingSignal
+from src.domain.services.trading_engine import TradingEngine
+from src.strategies.base_strategy import BaseStrategy
+
+
+D = Decimal
+
+
+class _FixedStrategy(BaseStrategy):
+    """Vrací předem dané signály (symbol -> (typ, confidence))"""
+
+    def __init__(self, signals):
+        super().__init__(StrategyConfig())
+        self.signals = signals
+        self.analyzed = []
+
+    async def analyze(self, candles, symbol):
+        self.analyzed.append(symbol)
+        if symbol not in self.signals:
+            return None
+        signal_type, confidence = self.signals[symbol]
+        return TradingSignal(
+            strategy_name=self.name, symbol=symbol, signal_type=signal_type, strength=SignalStrength.STRONG,
+            confidence=confidence, price=candles[-1].close, timestamp=datetime(2024, 1, 1), indicators={},
+            reason="test"
+        )
+
+    def get_required_candles_count(self):
+        return 1
+
+
+async def _orchestrator(repositories, symbols, signals, stops=False, **risk):
+    settings = Settings()
+    settings.trading.default_symbols = symbols
+    settings.trading.stops.enabled = stops
+    settings.trading.analysis_concurrency = 4
+    for name, value in risk.items():
+        setattr(settings.trading.risk_management, name, value)
+    settings.strategies = {}
+
+    client = OfflineBybitClient(latency=0.001)
+    orchestrator = TradingOrchestrator(
+        settings=settings,
+        bybit_client=client,
+        trading_engine=TradingEngine(repositories.trades, repositories.positions),
+        trade_repository=repositories.trades,
+        position_repository=repositories.positions,
+        market_data_repository=repositories.market_data,
+        unit_of_work=repositories.unit_of_work
+    )
+    orchestrator.strategies = [_FixedStrategy(signals)]
+
+    reads = []
+    get_all_positions = repositories.positions.get_all_positions
+
+    async def counted():
+        reads.append(1)
+        return await get_all_positions()
+
+    repositories.positions.get_all_positions = counted
+    return orchestrator, client, reads
+
+
+async def test_cycle_analyzes_all_then_submits_one_batch(repositories):
+    symbols = [f"SYM{i}USDT" for i in range(6)]
+    signals = {symbol: (SignalType.BUY, 0.81 + i / 100) for i, symbol in enumerate(symbols)}
+    orchestrator, client, reads = await _orchestrator(repositories, symbols + symbols[:2], signals, max_positions=3)
+
+    await orchestrator._run_trading_cycle()
+
+    # Duplicitní symbol se analyzuje jednou, pozice se čtou jednou za cyklus
+    assert sorted(orchestrator.strategies[0].analyzed) == sorted(symbols)
+    assert len(reads) == 1
+    # Tři volné sloty dostanou nejsilnější signály
+    assert sorted(order["symbol"] for order in client.orders.values()) == symbols[3:]
+    await orchestrator.order_pipeline.close()
+
+
+async def test_closes_run_before_opens_and_kill_switch_blocks_opens(repositories):
+    await repositories.positions.save_position(Position(
+        symbol="SYM0USDT", side=TradeType.BUY, size=D("1"), entry_price=D("100"), current_price=D("100"),
+        unrealized_pnl=D("0"), margin=D("100")
+    ))
+    signals = {"SYM0USDT": (SignalType.SELL, 0.9), "SYM1USDT": (SignalType.BUY, 0.9)}
+    orchestrator, client, _ = await _orchestrator(
+        repositories, ["SYM0USDT", "SYM1USDT"], signals, max_positions=1
+    )
+    await orchestrator.load_risk_state()
+
+    # Uzavření uvolní jediný slot pro BUY ze stejné dávky
+    await orchestrator._run_trading_cycle()
+    assert await repositories.positions.get_position_by_symbol("SYM0USDT") is None
+    assert [order["symbol"] for order in client.orders.values()] == ["SYM1USDT"]
+    await orchestrator.order_pipeline.close()
+
+    orchestrator, client, _ = await _orchestrator(repositories, ["SYM2USDT"], {"SYM2USDT": (SignalType.BUY, 0.9)})
+    orchestrator.risk_engine.engage_kill_switch("test")
+    await orchestrator._run_trading_cycle()
+    assert client.orders == {}
+    await orchestrator.order_pipeline.close()
+
+
+async def test_stop_exit_closes_position_through_exchange_fill(repositories):
+    await repositories.positions.save_position(Position(
+        symbol="SYM0USDT", side=TradeType.BUY, size=D("2"), entry_price=D("200"), current_price=D("200"),
+        unrealized_pnl=D("0"), margin=D("400")
+    ))
+    orchestrator, client, _ = await _orchestrator(repositories, ["SYM0USDT"], {}, stops=True)
+    await orchestrator.load_risk_state()
+    orchestrator.stop_manager.sync(await repositories.positions.get_all_positions())
+
+    orchestrator.on_market_price("SYM0USDT", D("150"))
+    await asyncio.sleep(0.01)
+
+    # Reduce-only objednávka na burze, pozice zůstává do plnění
+    [order] = client.orders.values()
+    assert (order["side"], order["qty"], order["reduceOnly"]) == ("Sell", "2", True)
+    assert await repositories.positions.get_position_by_symbol("SYM0USDT") is not None
+    assert orchestrator.risk_engine.exposure("SYM0USDT")["size"] == 2.0
+
+    assert await orchestrator.order_pipeline.poll_orders() == 1
+    await orchestrator.order_pipeline.flush()
+    fill = D(client._kline_rows("SYM0USDT")[0][4])
+    [closed] = await repositories.trades.get_trades_by_symbol("SYM0USDT")
+    assert closed.status == TradeStatus.CLOSED and closed.exit_price == fill
+    assert closed.pnl == (fill - D("200")) * 2
+    assert await repositories.positions.get_position_by_symbol("SYM0USDT") is None
+    assert orchestrator.risk_engine.exposure("SYM0USDT")["size"] == 0.0
+    assert orchestrator.risk_engine.realized_pnl_today == closed.pnl
+    await orchestrator.order_pipeline.close()
+
+
+async def test_archived_candles_keep_their_interval(repositories):
+    orchestrator, _, _ = await _orchestrator(repositories, ["BTCUSDT"], {})
+    appended = []
+
+    class _Lake:
+        async def append_async(self, symbol, interval, candles):
+            appended.append((symbol, interval, len(candles)))
+
+    orchestrator.candle_lake = _Lake()
+    candles = [
+        Candle(symbol="BTCUSDT", timestamp=datetime(2024, 1, 1, hour), open=D("1"), high=D("1"), low=D("1"),
+               close=D("1"), volume=D("1"), interval="60")
+        for hour in range(3)
+    ]
+    await orchestrator._store_candles("BTCUSDT", candles)
+
+    # Rozpracovaná poslední svíčka do archivu nejde
+    assert appended == [("BTCUSDT", "60", 2)]
+
+
+async def test_analysis_uses_configured_candles_and_interval(repositories):
+    orchestrator, client, _ = await _orchestrator(repositories, ["BTCUSDT"], {})
+    orchestrator.settings.trading.kline_interval = "60"
+    orchestrator.settings.trading.kline_limit = 50
+    orchestrator.settings.trading.min_analysis_interval = 0.0
+    requested = []
+    get_klines = client.get_klines
+
+    async def recorded(symbol, interval, limit):
+        requested.append((symbol, interval, limit))
+        return await get_klines(symbol, interval, limit)
+
+    client.get_klines = recorded
+    await orchestrator._analyze_symbol("BTCUSDT")
+    await orchestrator._analyze_symbol("BTCUSDT")
+
+    # Bez minimálního odstupu se symbol analyzuje znovu
+    assert requested == [("BTCUSDT", "60", 50)] * 2
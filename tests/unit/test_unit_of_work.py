@@ -0,0 +1,101 @@
+import asyncio
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+
+from src.config.settings import DatabaseConfig
+from src.domain.models import Position, SignalStrength, SignalType, TradeType, TradingSignal
+from src.domain.services.trading_engine import TradingEngine
+from src.infrastructure.persistence.database.aiosqlite_connection import AiosqliteDatabase
+from src.infrastructure.persistence.database.sqlite_connection import SqliteConnectionManager
+
+
+def _short(symbol="BTCUSDT"):
+    return Position(
+        symbol=symbol, side=TradeType.SELL, size=Decimal("1"), entry_price=Decimal("110"),
+        current_price=Decimal("100"), unrealized_pnl=Decimal("10"), margin=Decimal("10"),
+        created_at=datetime(2024, 1, 1)
+    )
+
+
+def _buy(symbol="BTCUSDT"):
+    return TradingSignal(
+        strategy_name="rsi_macd", symbol=symbol, signal_type=SignalType.BUY, strength=SignalStrength.STRONG,
+        confidence=0.9, price=Decimal("100"), timestamp=datetime(2024, 1, 1), indicators={}, reason="test",
+        suggested_position_size=Decimal("1")
+    )
+
+
+@pytest.fixture(params=[("sqlite", False), ("aiosqlite", False), ("sqlite", True)])
+def database_config(request, tmp_path):
+    database_type, position_book = request.param
+    return DatabaseConfig(type=database_type, path=str(tmp_path / "uow.db"), position_book=position_book)
+
+
+@pytest.fixture
+async def repositories(repositories, database_config):
+    path = database_config.path
+    repositories.backend = (
+        SqliteConnectionManager.for_path(path) if database_config.type == "sqlite" else AiosqliteDatabase.for_path(path)
+    )
+    await repositories.positions.save_position(_short())
+    if hasattr(repositories.positions, "flush"):
+        await repositories.positions.flush()
+    return repositories
+
+
+async def test_decision_commits_once(repositories):
+    engine = TradingEngine(repositories.trades, repositories.positions)
+    before = repositories.backend.write_transactions
+
+    async with repositories.unit_of_work.begin():
+        trade = await engine.execute_trade(_buy())
+        trade.exchange_order_id = "order-1"
+        await repositories.trades.update_trade(trade)
+        # Nic není zapsané, dokud jednotka neskončí
+        assert await repositories.trades.get_trade_by_id(trade.id) is None
+
+    if hasattr(repositories.positions, "flush"):
+        await repositories.positions.flush()
+    trades = await repositories.trades.get_trades_by_symbol("BTCUSDT")
+    assert sorted(t.side.value for t in trades) == ["buy", "buy"]
+    assert (await repositories.trades.get_trade_by_id(trade.id)).exchange_order_id == "order-1"
+    assert await repositories.positions.get_position_by_symbol("BTCUSDT") is None
+    # Jeden commit rozhodnutí (+ případný zápis position booku po commitu)
+    assert repositories.backend.write_transactions - before <= 2
+    assert repositories.unit_of_work.stats.committed == 1
+
+
+async def test_failure_rolls_back_whole_decision(repositories):
+    engine = TradingEngine(repositories.trades, repositories.positions)
+
+    with pytest.raises(RuntimeError):
+        async with repositories.unit_of_work.begin():
+            await engine.execute_trade(_buy())
+            raise RuntimeError("burza nedostupná")
+
+    assert await repositories.trades.get_trades_by_symbol("BTCUSDT") == []
+    assert (await repositories.positions.get_position_by_symbol("BTCUSDT")).side == TradeType.SELL
+    assert repositories.unit_of_work.stats.rolled_back == 1
+
+    # Chyba až při commitu (neexistující obchod) vrátí i dříve zařazené zápisy
+    with pytest.raises(ValueError):
+        async with repositories.unit_of_work.begin():
+            trade = await engine.execute_trade(_buy())
+            trade.id = "trade_missing"
+            await repositories.trades.update_trade(trade)
+    assert await repositories.trades.get_trades_by_symbol("BTCUSDT") == []
+
+
+async def test_nested_units_and_background_tasks(repositories):
+    engine = TradingEngine(repositories.trades, repositories.positions)
+
+    async with repositories.unit_of_work.begin():
+        async with repositories.unit_of_work.begin():
+            await engine.close_position("BTCUSDT")
+        # Task spuštěný uvnitř jednotky zapisuje sám za sebe
+        await asyncio.create_task(repositories.positions.save_position(_short("ETHUSDT")))
+
+    assert repositories.unit_of_work.stats.committed == 1
+    assert [p.symbol for p in await repositories.positions.get_all_positions()] == ["ETHUSDT"]
@@ -0,0 +1,67 @@
+import math
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from src.config.settings import Settings, StrategyConfig
+from src.domain.models import Candle
+from src.strategies.indicator_cache import IndicatorCache
+from src.strategies.rsi_macd_strategy import RsiMacdStrategy
+from src.application.services.walk_forward import WalkForwardAnalyzer, WalkForwardConfig, ENSEMBLE_NAME
+
+
+def make_candles(symbol, count, start=datetime(2025, 1, 1)):
+    candles = []
+    for i in range(count):
+        price = Decimal(str(round(100 + 10 * math.sin(i / 15) + 3 * math.sin(i / 4), 4)))
+        candles.append(Candle(
+            symbol=symbol,
+            timestamp=start + timedelta(minutes=15 * i),
+            open=price, high=price + Decimal('0.5'), low=price - Decimal('0.5'),
+            close=price, volume=Decimal('10') + i % 7
+        ))
+    return candles
+
+
+def test_indicator_cache_matches_direct_computation():
+    candles = make_candles("BTCUSDT", 150)
+    strategy = RsiMacdStrategy(StrategyConfig())
+    expected = [
+        (strategy._calculate_rsi(candles[:n], 14), strategy._calculate_macd(candles[:n], 12, 26, 9))
+        for n in (40, 90, 150)
+    ]
+
+    strategy.indicator_cache = IndicatorCache(candles)
+    cached = [
+        (strategy._calculate_rsi(candles[:n], 14), strategy._calculate_macd(candles[:n], 12, 26, 9))
+        for n in (40, 90, 150)
+    ]
+
+    assert cached == expected
+    assert strategy.indicator_cache.hits > 0
+
+
+def test_walk_forward_produces_metrics_series_per_strategy():
+    settings = Settings()
+    settings.strategies = {
+        "trend_following": StrategyConfig(weight=1.0, parameters={"fast_period": 9, "slow_period": 21}),
+        "rsi_macd": StrategyConfig(weight=1.2),
+    }
+    config = WalkForwardConfig(
+        in_sample=timedelta(days=3),
+        out_of_sample=timedelta(days=1),
+        parameter_grid={"trend_following": {"fast_period": [5, 9]}},
+        weight_grid={"rsi_macd": [0.8, 1.2]},
+        workers=2
+    )
+    progress = []
+    analyzer = WalkForwardAnalyzer(settings, config, progress=lambda done, total, _: progress.append((done, total)))
+
+    report = analyzer.run({s: make_candles(s, 96 * 6) for s in ("BTCUSDT", "ETHUSDT")})
+
+    assert report.folds
+    assert progress[-1][0] == progress[-1][1] == len(report.folds)
+    series = report.metrics_series()
+    assert {"trend_following", "rsi_macd", ENSEMBLE_NAME} <= set(series)
+    assert len(series["rsi_macd"]) == len({f.fold_index for f in report.folds})
+    assert all(w in (0.8, 1.2) for w in report.chosen_weights()["rsi_macd"])
+    assert all(f.parameters["trend_following"]["fast_period"] in (5, 9) for f in report.folds)
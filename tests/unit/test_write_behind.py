@@ -0,0 +1,114 @@
+import asyncio
+import sqlite3
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import pytest
+
+from src.domain.models import Candle
+from src.infrastructure.persistence.database.sqlite_connection import SqliteConnectionManager
+from src.infrastructure.persistence.database.sqlite_market_data_repository import SqliteMarketDataRepository
+from src.infrastructure.persistence.database.write_behind_market_data_repository import (
+    WriteBehindError, WriteBehindMarketDataRepository
+)
+
+
+@pytest.fixture
+def inner(tmp_path):
+    repository = SqliteMarketDataRepository(str(tmp_path / "test.db"))
+    yield repository
+    SqliteConnectionManager.close_all()
+
+
+def _candles(count: int):
+    start = datetime(2024, 1, 1)
+    return [
+        Candle(
+            symbol="BTCUSDT", timestamp=start + timedelta(minutes=15 * i),
+            open=Decimal(i), high=Decimal(i), low=Decimal(i), close=Decimal(i), volume=Decimal("1")
+        )
+        for i in range(count)
+    ]
+
+
+async def _stored_count(inner) -> int:
+    return await inner._db.read(lambda conn: conn.execute("SELECT COUNT(*) FROM candles").fetchone()[0])
+
+
+async def test_writes_are_batched_and_drained_on_close(inner):
+    buffered = WriteBehindMarketDataRepository(inner, batch_size=4, flush_interval=60, queue_size=100)
+    for candle in _candles(10):
+        await buffered.save_candle(candle)
+
+    await buffered.close()
+
+    stats = buffered.stats()["candles"]
+    assert await _stored_count(inner) == 10
+    assert stats["written"] == 10
+    assert stats["queue_depth"] == 0
+    assert stats["batches"] <= 4
+
+
+async def test_interval_flush_and_read_your_writes(inner):
+    buffered = WriteBehindMarketDataRepository(inner, batch_size=1000, flush_interval=0.05)
+    await buffered.save_candles(_candles(3))
+    await asyncio.sleep(0.2)
+    assert await _stored_count(inner) == 3
+
+    await buffered.save_candles(_candles(5)[3:])
+    latest = await buffered.get_latest_candles("BTCUSDT", 2)
+    assert [c.close for c in latest] == [Decimal(3), Decimal(4)]
+    await buffered.close()
+
+
+async def test_full_queue_applies_backpressure(inner):
+    buffered = WriteBehindMarketDataRepository(inner, batch_size=2, flush_interval=60, queue_size=2)
+    await buffered.save_candles(_candles(8))
+    await buffered.close()
+
+    stats = buffered.stats()["candles"]
+    assert stats["backpressure_waits"] > 0
+    assert await _stored_count(inner) == 8
+
+
+def _failing(inner, failures: int):
+    """save_candles, které prvních `failures` volání skončí chybou zamčené databáze"""
+    save_candles = inner.save_candles
+    calls = []
+
+    async def flaky(candles):
+        calls.append(len(candles))
+        if len(calls) <= failures:
+            raise sqlite3.OperationalError("database is locked")
+        await save_candles(candles)
+
+    inner.save_candles = flaky
+    return calls
+
+
+async def test_failed_batch_is_retried_with_backoff(inner):
+    calls = _failing(inner, failures=2)
+    buffered = WriteBehindMarketDataRepository(
+        inner, batch_size=4, flush_interval=0.01, retry_backoff=0.02, max_retry_backoff=0.05
+    )
+    await buffered.save_candles(_candles(6))
+    await asyncio.sleep(0.3)
+
+    stats = buffered.stats()["candles"]
+    assert await _stored_count(inner) == 6
+    assert (stats["written"], stats["failed"], stats["retries"], stats["retry_pending"]) == (6, 8, 2, 0)
+    # Neúspěšná dávka jde znovu celá a před zbytkem fronty
+    assert calls[:3] == [4, 4, 4]
+    await buffered.close()
+
+
+async def test_close_raises_when_rows_stay_unwritten(inner):
+    _failing(inner, failures=100)
+    buffered = WriteBehindMarketDataRepository(
+        inner, batch_size=4, flush_interval=60, retry_backoff=0.01, close_retries=3
+    )
+    await buffered.save_candles(_candles(6))
+
+    with pytest.raises(WriteBehindError, match="candles"):
+        await buffered.close()
+    assert await _stored_count(inner) == 0